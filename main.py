@@ -13,6 +13,8 @@ from PySide6.QtCore import QTranslator, QLocale, QSettings
 from src.main_window import MainWindow
 from src.utils.translations import setup_translations
 from src.utils.icon_helper import get_app_icon
+from src.utils.tracing import configure_tracing
+from src.utils.stall_monitor import configure_stall_monitor
 
 
 def main():
@@ -31,10 +33,16 @@ def main():
     # Übersetzungen laden
     translator = setup_translations(app)
     
+    # Tracing (Umgebungsvariable FINANZ_TRACE oder Einstellung)
+    configure_tracing()
+    
     # Hauptfenster erstellen und anzeigen
     window = MainWindow()
     window.show()
     
+    # Hänger-Überwachung der Oberfläche (Umgebungsvariable FINANZ_STALL_MONITOR oder Einstellung)
+    configure_stall_monitor(app)
+    
     # Anwendung starten
     sys.exit(app.exec())
 
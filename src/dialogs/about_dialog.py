@@ -12,6 +12,7 @@ import os
 from pathlib import Path
 
 from ..utils.icon_helper import get_app_pixmap, app_icon_exists
+from ..utils.stall_monitor import get_stall_monitor
 
 
 class AboutDialog(QDialog):
@@ -51,7 +52,8 @@ class AboutDialog(QDialog):
     def init_ui(self):
         """Initialisiert die Benutzeroberfläche"""
         self.setWindowTitle("Über Finanzauswertung Ehrenamt")
-        self.setFixedSize(500, 400)
+        monitor = get_stall_monitor()
+        self.setFixedSize(500, 480 if monitor is not None else 400)
         self.setModal(True)
 
         layout = QVBoxLayout(self)
@@ -131,6 +133,14 @@ class AboutDialog(QDialog):
         tech_info.setStyleSheet("color: #888888; font-size: 11px; margin-top: 10px;")
         layout.addWidget(tech_info)
 
+        # Hänger-Überwachung (nur im Diagnosemodus)
+        if monitor is not None:
+            self.stall_summary_label = QLabel(monitor.format_summary())
+            self.stall_summary_label.setWordWrap(True)
+            self.stall_summary_label.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+            self.stall_summary_label.setStyleSheet("color: #888888; font-size: 11px;")
+            layout.addWidget(self.stall_summary_label)
+
         # OK Button
         button_layout = QHBoxLayout()
         button_layout.addStretch()
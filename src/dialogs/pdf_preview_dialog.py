@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Vorschau eines BWA-Entwurfs im Programm
+
+Der Entwurf wird ohne Sachkonten-Einzelauswertungen (oder mit den ersten Buchungen je
+Sachkonto) erstellt. Seiten werden erst gerastert, wenn sie im sichtbaren Bereich liegen,
+und als Pixmaps in einem LRU-Cache gehalten.
+"""
+
+import bisect
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox, QSpinBox,
+                               QComboBox, QPushButton, QScrollArea, QWidget, QApplication)
+from PySide6.QtCore import Qt, QRect, QSize
+from PySide6.QtGui import QImage, QPixmap, QPainter, QColor
+
+from ..utils.app_paths import get_cache_dir
+from ..utils.bwa_generator import BWAPDFGenerator, DRAFT_MAX_BOOKINGS
+
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Anzahl gerasterter Seiten im Speicher
+PAGE_CACHE_SIZE = 24
+
+# Abstand zwischen den Seiten (Pixel)
+PAGE_SPACING = 12
+
+ZOOM_LEVELS = [("75 %", 0.75), ("100 %", 1.0), ("125 %", 1.25), ("150 %", 1.5)]
+
+
+class PixmapCache:
+    """Gerasterte Seiten mit Verdrängung der am längsten nicht angezeigten (LRU)"""
+
+    def __init__(self, capacity: int = PAGE_CACHE_SIZE):
+        self.capacity = capacity
+        self._pixmaps: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+
+    def get(self, key) -> Optional[QPixmap]:
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def put(self, key, pixmap: QPixmap):
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.capacity:
+            self._pixmaps.popitem(last=False)
+
+    def clear(self):
+        self._pixmaps.clear()
+
+    def keys(self) -> List[tuple]:
+        return list(self._pixmaps)
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+
+class PageView(QWidget):
+    """Zeichnet die Seiten untereinander, gerastert wird nur der neu zu zeichnende Bereich"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.document = None
+        self.zoom = 1.0
+        self.cache = PixmapCache()
+        self.render_count = 0          # Anzahl Rasterungen (für Tests und Statusanzeige)
+        self._sizes: List[QSize] = []  # Seitengröße in Pixel beim aktuellen Zoom
+        self._tops: List[int] = []     # Obere Kante jeder Seite
+        self.setAutoFillBackground(True)
+        palette = self.palette()
+        palette.setColor(self.backgroundRole(), QColor("#808080"))
+        self.setPalette(palette)
+
+    def set_document(self, document):
+        """Übernimmt ein geöffnetes PyMuPDF-Dokument (None = leeren)"""
+        self.document = document
+        self.cache.clear()
+        self._layout_pages()
+
+    def set_zoom(self, zoom: float):
+        self.zoom = zoom
+        self.cache.clear()
+        self._layout_pages()
+
+    def _layout_pages(self):
+        """Seitenpositionen aus den Seitengrößen (ohne zu rastern)"""
+        self._sizes, self._tops = [], []
+        top, width = PAGE_SPACING, 0
+        if self.document is not None:
+            for page in self.document:
+                rect = page.rect
+                size = QSize(round(rect.width * self.zoom), round(rect.height * self.zoom))
+                self._sizes.append(size)
+                self._tops.append(top)
+                top += size.height() + PAGE_SPACING
+                width = max(width, size.width())
+        self.setFixedSize(width + 2 * PAGE_SPACING, top)
+        self.update()
+
+    def page_count(self) -> int:
+        return len(self._sizes)
+
+    def page_rect(self, index: int) -> QRect:
+        size = self._sizes[index]
+        return QRect((self.width() - size.width()) // 2, self._tops[index], size.width(), size.height())
+
+    def pages_in(self, rect: QRect) -> range:
+        """Seiten, die den Bereich schneiden"""
+        first = max(bisect.bisect_right(self._tops, rect.top()) - 1, 0)
+        last = bisect.bisect_right(self._tops, rect.bottom())
+        return range(first, min(last, len(self._tops)))
+
+    def page_pixmap(self, index: int) -> QPixmap:
+        """Pixmap einer Seite aus dem Cache oder frisch gerastert"""
+        ratio = self.devicePixelRatioF()
+        key = (index, self.zoom, ratio)
+        pixmap = self.cache.get(key)
+        if pixmap is None:
+            scale = self.zoom * ratio
+            raster = self.document[index].get_pixmap(matrix=pymupdf.Matrix(scale, scale), alpha=False)
+            image = QImage(raster.samples, raster.width, raster.height, raster.stride, QImage.Format.Format_RGB888)
+            pixmap = QPixmap.fromImage(image.copy())
+            pixmap.setDevicePixelRatio(ratio)
+            self.cache.put(key, pixmap)
+            self.render_count += 1
+        return pixmap
+
+    def paintEvent(self, event):
+        if self.document is None:
+            return
+        painter = QPainter(self)
+        for index in self.pages_in(event.rect()):
+            rect = self.page_rect(index)
+            if rect.intersects(event.rect()):
+                painter.drawPixmap(rect.topLeft(), self.page_pixmap(index))
+        painter.end()
+
+
+class PDFPreviewDialog(QDialog):
+    """Entwurfsvorschau der BWA mit bedarfsweise gerasterten Seiten"""
+
+    def __init__(self, csv_processor, account_mappings: dict, parent=None):
+        super().__init__(parent)
+        self.csv_processor = csv_processor
+        self.account_mappings = account_mappings
+        self.document = None
+        self.draft_path = str(get_cache_dir("preview") / "bwa_entwurf.pdf")
+
+        self.setWindowTitle("BWA-Vorschau (Entwurf)")
+        self.resize(760, 900)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Erstellt Entwurfsoptionen und Seitenansicht"""
+        layout = QVBoxLayout(self)
+
+        options_layout = QHBoxLayout()
+        self.accounts_checkbox = QCheckBox("Sachkonten einbeziehen, je")
+        self.accounts_checkbox.toggled.connect(lambda checked: self.bookings_spin.setEnabled(checked))
+        options_layout.addWidget(self.accounts_checkbox)
+
+        self.bookings_spin = QSpinBox()
+        self.bookings_spin.setRange(1, 1000)
+        self.bookings_spin.setValue(DRAFT_MAX_BOOKINGS)
+        self.bookings_spin.setSuffix(" Buchungen")
+        self.bookings_spin.setEnabled(False)
+        options_layout.addWidget(self.bookings_spin)
+
+        self.refresh_button = QPushButton("Aktualisieren")
+        self.refresh_button.clicked.connect(self.refresh)
+        options_layout.addWidget(self.refresh_button)
+        options_layout.addStretch()
+
+        self.zoom_combo = QComboBox()
+        for label, zoom in ZOOM_LEVELS:
+            self.zoom_combo.addItem(label, zoom)
+        self.zoom_combo.setCurrentIndex(1)
+        self.zoom_combo.currentIndexChanged.connect(lambda: self.page_view.set_zoom(self.zoom_combo.currentData()))
+        options_layout.addWidget(self.zoom_combo)
+        layout.addLayout(options_layout)
+
+        self.page_view = PageView()
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidget(self.page_view)
+        self.scroll_area.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+        layout.addWidget(self.scroll_area)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+    def refresh(self) -> bool:
+        """Erstellt den Entwurf neu und zeigt ihn an"""
+        if not PYMUPDF_AVAILABLE:
+            self.status_label.setText("Vorschau nicht verfügbar: PyMuPDF ist nicht installiert")
+            return False
+
+        # Offenes Dokument vor dem Überschreiben schließen (Dateisperre unter Windows)
+        self.page_view.set_document(None)
+        self._close_document()
+
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            start = time.perf_counter()
+            generator = BWAPDFGenerator()
+            success = generator.generate_draft_pdf(
+                self.draft_path, self.csv_processor, self.account_mappings,
+                include_accounts=self.accounts_checkbox.isChecked(),
+                max_bookings=self.bookings_spin.value()
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            QApplication.restoreOverrideCursor()
+
+        if not success:
+            self.status_label.setText("Bei der Erstellung des Entwurfs ist ein Fehler aufgetreten.")
+            return False
+
+        self.document = pymupdf.open(self.draft_path)
+        self.page_view.set_zoom(self.zoom_combo.currentData())
+        self.page_view.set_document(self.document)
+        self.scroll_area.verticalScrollBar().setValue(0)
+        self.status_label.setText(f"Entwurf mit {self.document.page_count} Seiten in {elapsed:.1f} s erstellt")
+        return True
+
+    def _close_document(self):
+        if self.document is not None:
+            self.document.close()
+            self.document = None
+
+    def done(self, result):
+        """Gibt Dokument und gerasterte Seiten beim Schließen frei"""
+        self.page_view.set_document(None)
+        self._close_document()
+        self.csv_processor = None
+        super().done(result)
@@ -3,20 +3,80 @@
 Dialog zur Auswahl eines Arbeitsblatts aus Excel/ODS-Dateien
 """
 
+import threading
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                               QComboBox, QPushButton, QDialogButtonBox,
                               QTextEdit, QSplitter)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
 import pandas as pd
 
+from ..utils.workbook_session import WorkbookSession, PreviewCancelled, DEFAULT_PREVIEW_ROWS
+
+_preview_pool = None
+
+
+def preview_thread_pool() -> QThreadPool:
+    """
+    Thread-Pool für Blatt-Vorschauen
+
+    Lebt unabhängig vom Dialog, damit weder das Schließen noch das Löschen des Dialogs
+    auf einen noch laufenden (abgebrochenen) Leser wartet.
+    """
+    global _preview_pool
+    if _preview_pool is None:
+        _preview_pool = QThreadPool()
+    return _preview_pool
+
+
+class PreviewSignals(QObject):
+    """Signale des Vorschau-Workers"""
+    finished = Signal(str, object, object)  # Blatt, DataFrame, Zeilenanzahl
+    failed = Signal(str, str)  # Blatt, Fehlermeldung
+
+
+class PreviewWorker(QRunnable):
+    """Liest die Vorschau eines Blatts im Hintergrund"""
+    
+    def __init__(self, session, sheet_name, nrows):
+        super().__init__()
+        self.session = session
+        self.sheet_name = sheet_name
+        self.nrows = nrows
+        self.signals = PreviewSignals()
+        self._cancelled = threading.Event()
+        
+    def cancel(self):
+        """Bricht das Lesen ab (spätestens nach dem aktuellen Zeilenblock) und verwirft das Ergebnis"""
+        self._cancelled.set()
+        
+    def run(self):
+        """Lädt die Vorschau und meldet das Ergebnis per Signal (nicht nach dem Abbrechen)"""
+        if self._cancelled.is_set():
+            return
+        try:
+            df, total_rows = self.session.read_preview(self.sheet_name, self.nrows, cancelled=self._cancelled)
+            if not self._cancelled.is_set():
+                self.signals.finished.emit(self.sheet_name, df, total_rows)
+        except PreviewCancelled:
+            pass
+        except Exception as e:
+            if not self._cancelled.is_set():
+                self.signals.failed.emit(self.sheet_name, str(e))
+
 
 class SheetSelectionDialog(QDialog):
     """Dialog zur Auswahl eines Arbeitsblatts"""
     
-    def __init__(self, file_path, sheet_names, parent=None):
+    def __init__(self, file_path, sheet_names, parent=None, session=None, preferred_sheet=None):
         super().__init__(parent)
         self.file_path = file_path
         self.sheet_names = sheet_names
+        # Gemeinsame Arbeitsmappen-Sitzung (vermeidet erneutes Öffnen der Datei)
+        self.session = session if session is not None else WorkbookSession(file_path)
+        self.preview_rows = DEFAULT_PREVIEW_ROWS
+        self.preview_cache = {}
+        self.thread_pool = preview_thread_pool()
+        self._workers = {}
         self.selected_sheet = None
         self.preview_data = None
         
@@ -25,6 +85,11 @@ class SheetSelectionDialog(QDialog):
         self.resize(800, 600)
         
         self.setup_ui()
+        
+        # Vorauswahl des wahrscheinlichsten Buchungsblatts
+        if preferred_sheet in self.sheet_names:
+            self.sheet_combo.setCurrentText(preferred_sheet)
+            
         self.load_initial_preview()
         
     def setup_ui(self):
@@ -56,7 +121,7 @@ class SheetSelectionDialog(QDialog):
         
         # Vorschau-Button
         self.preview_button = QPushButton("Vorschau aktualisieren")
-        self.preview_button.clicked.connect(self.load_preview)
+        self.preview_button.clicked.connect(self.reload_preview)
         selection_layout.addWidget(self.preview_button)
         
         selection_layout.addStretch()
@@ -66,7 +131,7 @@ class SheetSelectionDialog(QDialog):
         splitter = QSplitter(Qt.Orientation.Vertical)
         
         # Datenvorschau
-        preview_label = QLabel("Datenvorschau (erste 10 Zeilen):")
+        preview_label = QLabel(f"Datenvorschau (erste {self.preview_rows} Zeilen):")
         preview_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
         
         self.preview_text = QTextEdit()
@@ -127,53 +192,80 @@ class SheetSelectionDialog(QDialog):
             self.load_preview()
             
     def load_preview(self):
-        """Lädt eine Vorschau des ausgewählten Blatts"""
+        """Lädt eine Vorschau des ausgewählten Blatts (im Hintergrund)"""
         current_sheet = self.sheet_combo.currentText()
         if not current_sheet:
             return
             
-        try:
-            self.preview_button.setEnabled(False)
-            self.preview_button.setText("Lade Vorschau...")
-            
-            # Datei einlesen
-            file_extension = self.file_path.lower()
-            if file_extension.endswith(('.xlsx', '.xls')):
-                engine = 'openpyxl' if file_extension.endswith('.xlsx') else 'xlrd'
-                df = pd.read_excel(self.file_path, sheet_name=current_sheet, engine=engine)
-            elif file_extension.endswith('.ods'):
-                df = pd.read_excel(self.file_path, sheet_name=current_sheet, engine='odf')
-            else:
-                return
-                
+        # Bereits geladene Vorschau sofort anzeigen
+        if current_sheet in self.preview_cache:
+            df, total_rows = self.preview_cache[current_sheet]
             self.preview_data = df
+            self.update_preview_display(df, total_rows)
+            return
             
-            # Vorschau aktualisieren
-            self.update_preview_display(df)
+        self.preview_button.setEnabled(False)
+        self.preview_button.setText("Lade Vorschau...")
+        self.preview_text.setText("Vorschau wird geladen...")
+        self.columns_text.clear()
+        
+        if current_sheet in self._workers:
+            return  # Vorschau wird bereits geladen
             
-        except Exception as e:
-            self.preview_text.setText(f"Fehler beim Laden der Vorschau: {str(e)}")
+        worker = PreviewWorker(self.session, current_sheet, self.preview_rows)
+        worker.signals.finished.connect(self.on_preview_loaded)
+        worker.signals.failed.connect(self.on_preview_failed)
+        self._workers[current_sheet] = worker
+        self.thread_pool.start(worker)
+        
+    def reload_preview(self):
+        """Verwirft die zwischengespeicherte Vorschau und lädt sie neu"""
+        current_sheet = self.sheet_combo.currentText()
+        self.preview_cache.pop(current_sheet, None)
+        self.load_preview()
+        
+    def on_preview_loaded(self, sheet_name, df, total_rows):
+        """Übernimmt eine im Hintergrund geladene Vorschau"""
+        self._workers.pop(sheet_name, None)
+        self.preview_cache[sheet_name] = (df, total_rows)
+        
+        # Nur anzeigen, wenn das Blatt noch ausgewählt ist
+        if sheet_name == self.sheet_combo.currentText():
+            self.preview_data = df
+            self.update_preview_display(df, total_rows)
+            self.preview_button.setEnabled(True)
+            self.preview_button.setText("Vorschau aktualisieren")
+            
+    def on_preview_failed(self, sheet_name, error):
+        """Zeigt einen Fehler beim Laden der Vorschau an"""
+        self._workers.pop(sheet_name, None)
+        if sheet_name == self.sheet_combo.currentText():
+            self.preview_text.setText(f"Fehler beim Laden der Vorschau: {error}")
             self.columns_text.setText("Keine Spalteninformationen verfügbar")
-        finally:
             self.preview_button.setEnabled(True)
             self.preview_button.setText("Vorschau aktualisieren")
             
-    def update_preview_display(self, df):
+    def update_preview_display(self, df, total_rows=None):
         """Aktualisiert die Vorschau-Anzeige"""
         if df is None or df.empty:
             self.preview_text.setText("Das Arbeitsblatt enthält keine Daten.")
             self.columns_text.setText("Keine Spalten verfügbar")
             return
             
-        # Datenvorschau (erste 10 Zeilen)
-        preview_df = df.head(10)
+        # Datenvorschau (erste Zeilen)
+        preview_df = df.head(self.preview_rows)
         preview_str = preview_df.to_string(max_cols=10, max_colwidth=20)
         self.preview_text.setText(preview_str)
         
         # Spalten-Information
         columns_info = []
         columns_info.append(f"Anzahl Spalten: {len(df.columns)}")
-        columns_info.append(f"Anzahl Zeilen: {len(df)}")
+        if total_rows is not None:
+            columns_info.append(f"Anzahl Zeilen: {total_rows}")
+        elif len(df) < self.preview_rows:
+            columns_info.append(f"Anzahl Zeilen: {len(df)}")
+        else:
+            columns_info.append(f"Anzahl Zeilen: mindestens {len(df)}")
         columns_info.append("")
         columns_info.append("Spalten:")
         
@@ -195,6 +287,15 @@ class SheetSelectionDialog(QDialog):
             
         self.columns_text.setText("\n".join(columns_info))
         
+    def done(self, result):
+        """Bricht ausstehende Vorschauen ab, ohne auf laufende Leser zu warten"""
+        for worker in self._workers.values():
+            # Wartende Vorschauen entfernen, laufende geben die Sitzung nach dem nächsten Zeilenblock frei
+            self.thread_pool.tryTake(worker)
+            worker.cancel()
+        self._workers.clear()
+        super().done(result)
+        
     def accept(self):
         """Bestätigt die Auswahl"""
         self.selected_sheet = self.sheet_combo.currentText()
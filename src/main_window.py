@@ -5,18 +5,25 @@ Hauptfenster der Finanzauswertung Anwendung
 
 from PySide6.QtWidgets import (QMainWindow, QVBoxLayout, QWidget, QMenuBar, 
                                QMenu, QLabel, QFrame, QApplication, QMessageBox,
-                               QFileDialog, QProgressDialog, QDialog)
+                               QFileDialog, QProgressDialog, QDialog, QSplitter, QTabWidget)
 from PySide6.QtCore import Qt, QSettings, QTimer, QEasingCurve, QPropertyAnimation, QRect
 from PySide6.QtGui import QAction, QFont, QDragEnterEvent, QDropEvent
 import os
 
 from .widgets.file_drop_area import FileDropArea
+from .widgets.booking_table import BookingBrowser
+from .widgets.bwa_tree import BWATreeWidget
 from .settings.settings_window import SettingsWindow
 from .dialogs.about_dialog import AboutDialog
+from .dialogs.pdf_preview_dialog import PDFPreviewDialog, PYMUPDF_AVAILABLE
 from .utils.file_handler import FileHandler
 from .utils.csv_processor import CSVProcessor
 from .utils.bwa_generator import BWAPDFGenerator
+from .utils.sheet_scanner import select_sheet, best_sheet
 from .utils.icon_helper import get_app_icon
+from .utils.tracing import traced, tracer
+from .utils.pdf_compaction import format_size
+from .utils.bwa_summary import load_account_names, load_super_group_mappings
 
 
 class MainWindow(QMainWindow):
@@ -33,6 +40,9 @@ class MainWindow(QMainWindow):
         self.init_ui()
         self.load_settings()
         
+        # Letzte Sitzung nach dem Anzeigen des Fensters wiederherstellen
+        QTimer.singleShot(0, self.restore_last_session)
+        
     def init_ui(self):
         """Initialisiert die Benutzeroberfläche"""
         self.setWindowTitle("Finanzauswertung Ehrenamt")
@@ -60,9 +70,25 @@ class MainWindow(QMainWindow):
         self.file_drop_area.reset_requested.connect(self.reset_csv_data)
         self.file_drop_area.settings_requested.connect(self.open_mapping_settings)
         self.file_drop_area.bwa_requested.connect(self.generate_bwa)
+        self.file_drop_area.details_requested.connect(self.toggle_details)
+        self.file_drop_area.preview_requested.connect(self.show_pdf_preview)
+        
+        # Buchungsübersicht und BWA-Struktur unter der Drop-Area (erst auf Anforderung sichtbar)
+        self.booking_browser = BookingBrowser()
+        self.bwa_tree = BWATreeWidget()
+        self.detail_tabs = QTabWidget()
+        self.detail_tabs.addTab(self.booking_browser, "Buchungen")
+        self.detail_tabs.addTab(self.bwa_tree, "BWA-Struktur")
+        self.detail_tabs.hide()
         
         # Drop-Area füllt den gesamten verfügbaren Platz
-        layout.addWidget(self.file_drop_area)
+        self.splitter = QSplitter(Qt.Orientation.Vertical)
+        self.splitter.setChildrenCollapsible(False)
+        self.splitter.addWidget(self.file_drop_area)
+        self.splitter.addWidget(self.detail_tabs)
+        self.splitter.setStretchFactor(0, 1)
+        self.splitter.setStretchFactor(1, 3)
+        layout.addWidget(self.splitter)
         
         # Drag and Drop aktivieren
         self.setAcceptDrops(True)
@@ -156,9 +182,10 @@ class MainWindow(QMainWindow):
         """Legacy-Methode für CSV-Import (für Kompatibilität)"""
         self.import_file()
                 
+    @traced("BWA anfordern", "gui")
     def generate_bwa(self):
         """Generiert ein BWA-PDF"""
-        if self.csv_processor.processed_data is None:
+        if not self.csv_processor.has_data():
             QMessageBox.warning(
                 self, 
                 "Keine Daten", 
@@ -200,6 +227,38 @@ class MainWindow(QMainWindow):
             if file_paths:
                 self.create_bwa_pdf(file_paths[0], account_mappings)
                 
+    @traced("BWA-Vorschau", "gui")
+    def show_pdf_preview(self):
+        """Zeigt einen BWA-Entwurf im Programm an (ohne Speichern und ohne externen Viewer)"""
+        if not self.csv_processor.has_data():
+            QMessageBox.warning(
+                self, 
+                "Keine Daten", 
+                "Bitte importieren Sie zuerst eine CSV-Datei."
+            )
+            return
+        if not PYMUPDF_AVAILABLE:
+            QMessageBox.warning(
+                self,
+                "Vorschau nicht verfügbar",
+                "Für die Vorschau wird PyMuPDF benötigt."
+            )
+            return
+            
+        account_mappings, _, _ = self._get_bwa_mappings()
+        dialog = PDFPreviewDialog(self.csv_processor, account_mappings, self)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        if dialog.refresh():
+            dialog.exec()
+        else:
+            QMessageBox.critical(
+                self,
+                "Fehler",
+                "Bei der Erstellung des Entwurfs ist ein Fehler aufgetreten."
+            )
+            dialog.reject()
+        
+    @traced("BWA-PDF erstellen", "gui")
     def create_bwa_pdf(self, output_path: str, account_mappings: dict):
         """Erstellt das BWA-PDF"""
         # Progress Dialog
@@ -223,11 +282,21 @@ class MainWindow(QMainWindow):
             progress.setValue(100)
             QApplication.processEvents()
             
+            # Trace nach jedem Bericht schreiben (falls Tracing aktiv)
+            tracer.write()
+            
             if success:
+                message = f"BWA-PDF wurde erfolgreich erstellt:\n{output_path}"
+                size_report = self.bwa_generator.size_report
+                if size_report.get('after', 0) < size_report.get('before', 0):
+                    message += (f"\n\nDateigröße: {format_size(size_report['before'])} → "
+                                f"{format_size(size_report['after'])}")
+                elif size_report:
+                    message += f"\n\nDateigröße: {format_size(size_report['after'])}"
                 QMessageBox.information(
                     self,
                     "Erfolgreich",
-                    f"BWA-PDF wurde erfolgreich erstellt:\n{output_path}"
+                    message
                 )
             else:
                 QMessageBox.critical(
@@ -245,6 +314,7 @@ class MainWindow(QMainWindow):
         finally:
             progress.close()
             
+    @traced("CSV-Datei verarbeiten", "gui")
     def process_csv_file(self, file_path: str):
         """Verarbeitet eine CSV-Datei"""
         progress = QProgressDialog("CSV-Datei wird verarbeitet...", "Abbrechen", 0, 100, self)
@@ -272,7 +342,7 @@ class MainWindow(QMainWindow):
                     # Signal für Mapping-Änderungen verbinden
                     self.settings_window.account_mapping_tab.mappings_changed.connect(self.update_file_status)
                     
-                self.settings_window.update_account_mappings(account_numbers)
+                self.settings_window.update_account_mappings(account_numbers, normalized=True)
                 
                 progress.setValue(100)
                 QApplication.processEvents()
@@ -289,7 +359,7 @@ class MainWindow(QMainWindow):
                         self,
                         "Erfolgreich",
                         f"CSV-Datei wurde erfolgreich importiert.\n\n"
-                        f"Anzahl Datensätze: {len(self.csv_processor.processed_data)}\n"
+                        f"Anzahl Datensätze: {self.csv_processor.get_record_count()}\n"
                         f"Anzahl Sachkonten: {len(account_numbers)}\n\n"
                         f"✅ Alle Sachkonten sind BWA-Gruppen zugeordnet.\n"
                         f"Sie können nun eine BWA erstellen."
@@ -299,7 +369,7 @@ class MainWindow(QMainWindow):
                         self,
                         "Import erfolgreich - Zuordnung erforderlich",
                         f"CSV-Datei wurde erfolgreich importiert.\n\n"
-                        f"Anzahl Datensätze: {len(self.csv_processor.processed_data)}\n"
+                        f"Anzahl Datensätze: {self.csv_processor.get_record_count()}\n"
                         f"Anzahl Sachkonten: {len(account_numbers)}\n\n"
                         f"⚠️ Nicht alle Sachkonten sind BWA-Gruppen zugeordnet.\n"
                         f"Bitte ordnen Sie die Sachkonten in den Einstellungen zu."
@@ -323,33 +393,47 @@ class MainWindow(QMainWindow):
         finally:
             progress.close()
         
+    @traced("Datei ausgewählt", "gui")
     def handle_file_selection(self, file_path):
         """Behandelt die Auswahl einer Datei"""
         if file_path and os.path.exists(file_path):
             self.process_file(file_path)
                 
+    @traced("Datei verarbeiten", "gui")
     def process_file(self, file_path: str):
         """Verarbeitet eine Datei (CSV, Excel, ODS, JSON)"""
         try:
             # JSON-Datei erkennen
-            if file_path.lower().endswith('.json'):
+            if file_path.lower().endswith(('.json', '.json.gz')):
                 self._process_json_file(file_path)
                 return
             
             # Prüfen ob die Datei mehrere Arbeitsblätter hat
+            # (Blatt-Namen werden einmal gelesen, die Sitzung wird mit dem Dialog geteilt)
             sheet_name = None
-            if self.csv_processor.has_multiple_sheets(file_path):
-                sheet_names = self.csv_processor.get_sheet_names(file_path)
-                if sheet_names and len(sheet_names) > 1:
-                    # Blatt-Auswahl-Dialog anzeigen
-                    from .dialogs.sheet_selection_dialog import SheetSelectionDialog
-                    dialog = SheetSelectionDialog(file_path, sheet_names, self)
-                    
-                    if dialog.exec() == QDialog.DialogCode.Accepted:
-                        sheet_name = dialog.get_selected_sheet()
+            sheet_names = self.csv_processor.get_sheet_names(file_path)
+            if sheet_names:
+                if len(sheet_names) > 1:
+                    # Kopfzeilen prüfen - bei genau einem passenden Blatt keine Rückfrage
+                    scan_results = self.csv_processor.scan_sheets(file_path)
+                    sheet_name = select_sheet(scan_results)
+                    if sheet_name:
+                        print(f"Arbeitsblatt automatisch gewählt: {sheet_name}")
                     else:
-                        return  # Benutzer hat abgebrochen
-                elif sheet_names:
+                        # Mehrdeutig: Blatt-Auswahl-Dialog anzeigen
+                        from .dialogs.sheet_selection_dialog import SheetSelectionDialog
+                        session = self.csv_processor.get_workbook_session(file_path)
+                        dialog = SheetSelectionDialog(
+                            file_path, sheet_names, self, session=session,
+                            preferred_sheet=best_sheet(scan_results)
+                        )
+                        
+                        if dialog.exec() == QDialog.DialogCode.Accepted:
+                            sheet_name = dialog.get_selected_sheet()
+                        else:
+                            self.csv_processor.file_handler.close_session()
+                            return  # Benutzer hat abgebrochen
+                else:
                     # Nur ein Blatt vorhanden, automatisch verwenden
                     sheet_name = sheet_names[0]
             
@@ -363,6 +447,7 @@ class MainWindow(QMainWindow):
                 f"Fehler beim Verarbeiten der Datei:\n{str(e)}"
             )
     
+    @traced("JSON-Datei verarbeiten", "gui")
     def _process_json_file(self, file_path: str):
         """Verarbeitet eine JSON-Datei mit BWA-Daten"""
         progress = QProgressDialog("JSON-Datei wird verarbeitet...", "Abbrechen", 0, 100, self)
@@ -384,6 +469,7 @@ class MainWindow(QMainWindow):
             if success:
                 # Status über FileDropArea anzeigen
                 self.file_drop_area.show_imported_file(file_path, mapping_complete=True)
+                self.refresh_details()
                 
                 progress.setValue(80)
                 QApplication.processEvents()
@@ -412,6 +498,7 @@ class MainWindow(QMainWindow):
         finally:
             progress.close()
     
+    @traced("BWA aus JSON erstellen", "gui")
     def _create_bwa_from_json(self):
         """Erstellt BWA-PDF aus JSON-Daten"""
         try:
@@ -442,6 +529,7 @@ class MainWindow(QMainWindow):
                 
                 progress.setValue(100)
                 QApplication.processEvents()
+                tracer.write()
                 
                 if success:
                     QMessageBox.information(
@@ -465,6 +553,7 @@ class MainWindow(QMainWindow):
                 f"Fehler beim Erstellen der BWA aus JSON-Daten:\n{str(e)}"
             )
             
+    @traced("Arbeitsblatt verarbeiten", "gui")
     def process_file_with_sheet(self, file_path: str, sheet_name: str = None):
         """Verarbeitet eine Datei mit dem angegebenen Arbeitsblatt"""
         file_ext = os.path.splitext(file_path)[1].lower()
@@ -487,35 +576,20 @@ class MainWindow(QMainWindow):
             QApplication.processEvents()
             
             if success:
-                # Sachkonten-Liste aktualisieren
-                account_numbers = self.csv_processor.get_account_numbers()
-                account_names = self.csv_processor.get_all_account_names()
-                
-                if not self.settings_window:
-                    self.settings_window = SettingsWindow(self)
-                    # Signal für Mapping-Änderungen verbinden
-                    self.settings_window.account_mapping_tab.mappings_changed.connect(self.update_file_status)
-                    
-                self.settings_window.update_account_mappings(account_numbers, account_names)
+                # Sachkonten-Liste und Anzeige aktualisieren
+                account_numbers, mapping_complete = self._apply_imported_data(file_path, sheet_name)
+                sheet_info = f" (Blatt: {sheet_name})" if sheet_name else ""
                 
                 progress.setValue(100)
                 QApplication.processEvents()
                 
-                # Mapping-Status prüfen
-                mapping_complete = self.check_mapping_completeness()
-                
-                # Datei-Status im Drop-Bereich anzeigen
-                sheet_info = f" (Blatt: {sheet_name})" if sheet_name else ""
-                display_path = f"{file_path}{sheet_info}"
-                self.file_drop_area.show_imported_file(display_path, mapping_complete)
-                
                 # Unterschiedliche Nachrichten je nach Zuordnungsstatus
                 if mapping_complete:
                     QMessageBox.information(
                         self,
                         "Erfolgreich",
                         f"{file_type} wurde erfolgreich importiert.\n\n"
-                        f"Anzahl Datensätze: {len(self.csv_processor.processed_data)}\n"
+                        f"Anzahl Datensätze: {self.csv_processor.get_record_count()}\n"
                         f"Anzahl Sachkonten: {len(account_numbers)}\n"
                         f"{sheet_info}\n\n"
                         f"✅ Alle Sachkonten sind BWA-Gruppen zugeordnet.\n"
@@ -526,7 +600,7 @@ class MainWindow(QMainWindow):
                         self,
                         "Import erfolgreich - Zuordnung erforderlich",
                         f"{file_type} wurde erfolgreich importiert.\n\n"
-                        f"Anzahl Datensätze: {len(self.csv_processor.processed_data)}\n"
+                        f"Anzahl Datensätze: {self.csv_processor.get_record_count()}\n"
                         f"Anzahl Sachkonten: {len(account_numbers)}\n"
                         f"{sheet_info}\n\n"
                         f"⚠️ Nicht alle Sachkonten sind BWA-Gruppen zugeordnet.\n"
@@ -551,13 +625,116 @@ class MainWindow(QMainWindow):
         finally:
             progress.close()
                 
+    def _apply_imported_data(self, file_path: str, sheet_name: str = None):
+        """Überträgt eine erfolgreich geladene Datei in Einstellungen und Anzeige"""
+        account_numbers = self.csv_processor.get_account_numbers()
+        account_names = self.csv_processor.get_all_account_names()
+        
+        if not self.settings_window:
+            self.settings_window = SettingsWindow(self)
+            # Signal für Mapping-Änderungen verbinden
+            self.settings_window.account_mapping_tab.mappings_changed.connect(self.update_file_status)
+            
+        # Nummern stammen aus den bereits normalisierten Sachkonten-Stammdaten
+        self.settings_window.update_account_mappings(account_numbers, account_names, normalized=True)
+        # Vorschau der Zuordnung zeigt Buchungen (Fehler beim Aufbau gehen an den Import)
+        self.settings_window.set_preview_data(self.csv_processor.ensure_ledger())
+        
+        # Mapping-Status prüfen
+        mapping_complete = self.check_mapping_completeness()
+        
+        # Datei-Status im Drop-Bereich anzeigen
+        sheet_info = f" (Blatt: {sheet_name})" if sheet_name else ""
+        display_path = f"{file_path}{sheet_info}"
+        self.file_drop_area.show_imported_file(display_path, mapping_complete)
+        
+        # Geöffnete Details auf die neuen Daten umstellen
+        self.refresh_details()
+        
+        # Sitzung für den nächsten Start merken
+        self.settings.setValue("last_session/file_path", file_path)
+        self.settings.setValue("last_session/sheet_name", sheet_name or "")
+        
+        return account_numbers, mapping_complete
+        
+    @traced("Letzte Sitzung laden", "gui")
+    def restore_last_session(self) -> bool:
+        """Stellt die zuletzt importierte Datei wieder her (über den Ledger-Cache)"""
+        if not self.settings.value("restore_last_session", False, type=bool):
+            return False
+            
+        file_path = self.settings.value("last_session/file_path", "")
+        sheet_name = self.settings.value("last_session/sheet_name", "") or None
+        if not file_path or not os.path.exists(file_path):
+            return False
+            
+        try:
+            if not self.csv_processor.load_file(file_path, sheet_name):
+                return False
+            self._apply_imported_data(file_path, sheet_name)
+            return True
+        except Exception as e:
+            print(f"Letzte Sitzung konnte nicht wiederhergestellt werden: {e}")
+            return False
+                
+    @traced("Daten zurücksetzen", "gui")
     def reset_csv_data(self):
         """Setzt die CSV-Daten zurück und zeigt das Standard-Drop-Area"""
         # CSV-Prozessor zurücksetzen
         self.csv_processor = CSVProcessor()
         
-        # FileDropArea zurücksetzen
+        # FileDropArea und Buchungsübersicht zurücksetzen
         self.file_drop_area.reset_to_default()
+        self.detail_tabs.hide()
+        self.refresh_details()
+        if self.settings_window:
+            self.settings_window.set_preview_data(None)
+        
+    @traced("Details", "gui")
+    def toggle_details(self):
+        """Blendet Buchungsübersicht und BWA-Struktur ein oder aus (Daten erst beim Einblenden)"""
+        visible = self.detail_tabs.isHidden()
+        self.detail_tabs.setVisible(visible)
+        if visible:
+            self.refresh_details()
+            # Platz für die Tabelle schaffen
+            if self.height() < 700:
+                self.resize(max(self.width(), 950), 750)
+        self.file_drop_area.set_details_visible(visible)
+        
+    def refresh_details(self):
+        """Übernimmt die aktuellen Buchungen in die sichtbaren Details (sonst nur leeren)"""
+        if self.detail_tabs.isHidden() or not self.csv_processor.has_data():
+            self.booking_browser.clear()
+            self.bwa_tree.clear()
+            return
+        try:
+            # Einzelbuchungen werden gebraucht - Snapshot-Journal spätestens jetzt aufbauen
+            ledger = self.csv_processor.ensure_ledger()
+        except Exception as e:
+            self.booking_browser.clear()
+            self.bwa_tree.clear()
+            QMessageBox.critical(
+                self,
+                "Fehler",
+                f"Bei der Verarbeitung ist ein Fehler aufgetreten:\n{str(e)}"
+            )
+            return
+        self.booking_browser.set_ledger(
+            ledger,
+            self.csv_processor.get_all_account_names()
+        )
+        account_mappings, account_names, super_group_mappings = self._get_bwa_mappings()
+        self.bwa_tree.set_ledger(ledger, account_mappings,
+                                 account_names, super_group_mappings)
+        
+    def _get_bwa_mappings(self):
+        """Zuordnungen und Namen wie bei der PDF-Erstellung"""
+        if not self.settings_window:
+            self.settings_window = SettingsWindow(self)
+            self.settings_window.account_mapping_tab.mappings_changed.connect(self.update_file_status)
+        account_mappings = self.settings_window.account_mapping_tab.get_account_mappings()
+        return account_mappings, load_account_names(), load_super_group_mappings()
         
     def open_mapping_settings(self):
         """Öffnet die Einstellungen auf dem BWA-Gruppen Tab"""
@@ -574,6 +751,10 @@ class MainWindow(QMainWindow):
         
     def update_file_status(self):
         """Aktualisiert den Status der importierten Datei"""
+        # BWA-Struktur folgt geänderten Zuordnungen ohne neuen Index
+        if not self.detail_tabs.isHidden() and self.bwa_tree.model.index_data is not None:
+            self.bwa_tree.set_mappings(*self._get_bwa_mappings())
+            
         if self.file_drop_area.get_current_file():
             mapping_complete = self.check_mapping_completeness()
             self.file_drop_area.show_imported_file(
@@ -583,7 +764,7 @@ class MainWindow(QMainWindow):
         
     def check_mapping_completeness(self) -> bool:
         """Prüft ob alle Sachkonten zugeordnet sind"""
-        if self.csv_processor.processed_data is None:
+        if not self.csv_processor.has_data():
             return False
             
         # Sachkonten aus CSV holen
@@ -622,4 +803,7 @@ class MainWindow(QMainWindow):
         if self.settings_window:
             self.settings_window.close()
             
+        # Trace-Datei schreiben (falls Tracing aktiv)
+        tracer.write()
+            
         event.accept()
@@ -8,10 +8,12 @@ from PySide6.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QListWidget,
                                QSplitter, QListWidgetItem, QMessageBox, QFileDialog)
 from PySide6.QtCore import QSettings, Qt, Signal
 import json
-import pandas as pd
 import csv
 import os
 
+from ..utils.account_numbers import normalize_account_number, normalize_account_numbers
+from ..widgets.bwa_preview_panel import BWAPreviewPanel
+
 
 class AccountMappingTab(QWidget):
     """Tab für Sachkonten-Gruppierung"""
@@ -28,25 +30,7 @@ class AccountMappingTab(QWidget):
     
     def normalize_account_number(self, account_nr) -> str:
         """Normalisiert eine Sachkontonummer zu einem String-Format (konsistent mit CSVProcessor)"""
-        if pd.isna(account_nr):
-            return ""
-        
-        # Zu String konvertieren und Whitespace entfernen
-        account_str = str(account_nr).strip()
-        
-        # Prüfen ob es eine Zahl ist (auch Floats)
-        if account_str.replace('.', '').replace('-', '').isdigit():
-            try:
-                # Float zu Int zu String (entfernt .0 Endungen)
-                float_val = float(account_str)
-                if float_val.is_integer():
-                    return str(int(float_val))
-                else:
-                    return account_str  # Behalte Original wenn echte Dezimalzahl
-            except ValueError:
-                pass
-        
-        return account_str
+        return normalize_account_number(account_nr)
         
     def init_ui(self):
         """Initialisiert die Benutzeroberfläche"""
@@ -174,8 +158,12 @@ class AccountMappingTab(QWidget):
         right_layout.addWidget(mapping_group)
         splitter.addWidget(right_widget)
         
+        # Live-Vorschau der BWA-Tabelle (folgt jeder gespeicherten Zuordnung)
+        self.preview_panel = BWAPreviewPanel()
+        splitter.addWidget(self.preview_panel)
+        
         # Splitter-Verhältnis setzen
-        splitter.setSizes([300, 400])
+        splitter.setSizes([250, 350, 300])
         
     def on_account_selected(self, current, previous):
         """Wird aufgerufen wenn ein Sachkonto ausgewählt wird"""
@@ -249,6 +237,7 @@ class AccountMappingTab(QWidget):
         
         # Anzeige in der Liste aktualisieren
         self.update_account_item_display(current_item, account_number)
+        self.preview_panel.move_account(account_number, group_name)
             
         self.save_settings()
         
@@ -293,6 +282,7 @@ class AccountMappingTab(QWidget):
         
         # Anzeige aktualisieren
         self.update_account_item_display(current_item, account_number)
+        self.preview_panel.move_account(account_number, None)
         
         self.save_settings()
         
@@ -309,20 +299,33 @@ class AccountMappingTab(QWidget):
             "Um neue Sachkonten zu laden, importieren Sie eine CSV-Datei über die Hauptanwendung."
         )
         
-    def update_accounts_from_csv(self, account_numbers, account_names_dict=None):
-        """Aktualisiert die Kontenliste basierend auf CSV-Daten"""
+    def update_accounts_from_csv(self, account_numbers, account_names_dict=None, normalized=False):
+        """
+        Aktualisiert die Kontenliste basierend auf CSV-Daten
+        
+        Args:
+            account_numbers (list): Sachkontonummern
+            account_names_dict (dict): Kontonummer -> Kontoname
+            normalized (bool): True wenn die Nummern bereits normalisiert, eindeutig und
+                sortiert sind (Sachkonten-Stammdaten des CSVProcessors)
+        """
+        normalize = (lambda acc: acc) if normalized else self.normalize_account_number
+        
         # Wenn Kontennamen übergeben wurden, diese speichern
         if account_names_dict:
             for account_num, account_name in account_names_dict.items():
                 if account_name and account_name.strip():
                     # Sachkontonummer normalisieren (konsistent mit CSVProcessor)
-                    normalized_num = self.normalize_account_number(account_num)
+                    normalized_num = normalize(account_num)
                     if normalized_num:
                         self.account_names[normalized_num] = account_name.strip()
         
         # Sortierte Liste der Kontonummern (alle als String normalisiert)
-        normalized_accounts = [self.normalize_account_number(acc) for acc in account_numbers]
-        sorted_accounts = sorted(set(acc for acc in normalized_accounts if acc))
+        if normalized:
+            sorted_accounts = list(account_numbers)
+        else:
+            normalized_accounts = normalize_account_numbers(account_numbers).cat.categories
+            sorted_accounts = sorted(acc for acc in normalized_accounts if acc)
         
         # Liste leeren und neu befüllen
         self.accounts_list.clear()
@@ -351,6 +354,7 @@ class AccountMappingTab(QWidget):
             
         # Bekannte Sachkonten in der Liste anzeigen
         self._populate_known_accounts()
+        self.preview_panel.set_mappings(self.account_mappings)
         
     def _populate_known_accounts(self):
         """Zeigt alle bekannten Sachkonten in der Liste an"""
@@ -394,8 +398,13 @@ class AccountMappingTab(QWidget):
         self.account_name_input.setText("")
         self.group_input.setText("")
         self.current_account_label.setText("")
+        self.preview_panel.set_mappings(self.account_mappings)
         self.save_settings()
         
+    def set_preview_data(self, data, super_group_mappings=None):
+        """Übergibt die verarbeiteten Buchungen an die BWA-Vorschau (None = Vorschau leeren)"""
+        self.preview_panel.set_ledger(data, self.account_mappings, super_group_mappings)
+        
     def get_account_mappings(self):
         """Gibt die aktuellen Sachkonten-Mappings zurück"""
         return self.account_mappings.copy()
@@ -585,6 +594,7 @@ class AccountMappingTab(QWidget):
             
             # Anzeige aktualisieren
             self.refresh_account_list_display()
+            self.preview_panel.set_mappings(self.account_mappings)
             
             # Signal senden dass sich Mappings geändert haben
             self.mappings_changed.emit()
@@ -6,11 +6,15 @@ Allgemeine Einstellungen Tab
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                                QComboBox, QGroupBox, QFormLayout, QCheckBox,
                                QPushButton, QFileDialog, QMessageBox, QLineEdit,
-                               QColorDialog)
+                               QColorDialog, QApplication)
 from PySide6.QtCore import QSettings
 from PySide6.QtGui import QColor, QPalette, QPixmap, QPainter, QIcon
 import json
 
+from ..utils.ledger_cache import LedgerCache
+from ..utils.tracing import configure_tracing
+from ..utils.stall_monitor import configure_stall_monitor
+
 
 class GeneralSettingsTab(QWidget):
     """Tab für allgemeine Einstellungen"""
@@ -112,8 +116,78 @@ class GeneralSettingsTab(QWidget):
         self.json_export_cb.setChecked(False)  # Standardmäßig deaktiviert
         reports_layout.addRow("Zusätzlicher JSON-Export:", self.json_export_cb)
         
+        self.json_compact_cb = QCheckBox()
+        self.json_compact_cb.setChecked(False)  # Standardmäßig eingerückt
+        self.json_compact_cb.setToolTip("JSON ohne Einrückung schreiben (deutlich kleinere Datei)")
+        reports_layout.addRow("JSON kompakt:", self.json_compact_cb)
+        
+        self.json_gzip_cb = QCheckBox()
+        self.json_gzip_cb.setChecked(False)
+        self.json_gzip_cb.setToolTip("JSON als gzip-komprimierte .json.gz-Datei schreiben")
+        reports_layout.addRow("JSON gzip-komprimiert:", self.json_gzip_cb)
+        
+        self.json_snapshot_cb = QCheckBox()
+        self.json_snapshot_cb.setChecked(False)  # Standardmäßig wird neu berechnet
+        self.json_snapshot_cb.setToolTip(
+            "BWA aus einem JSON-Export direkt aus den gespeicherten Auswertungen erstellen,\n"
+            "wenn die Prüfsumme von Buchungen und Zuordnungen übereinstimmt"
+        )
+        reports_layout.addRow("Geprüfte JSON-Auswertungen übernehmen:", self.json_snapshot_cb)
+        
+        # PDF-Dateigröße
+        self.pdf_compact_cb = QCheckBox()
+        self.pdf_compact_cb.setChecked(False)
+        self.pdf_compact_cb.setToolTip("Logo einmalig auf Druckauflösung (300 dpi) verkleinert einbetten")
+        reports_layout.addRow("PDF kompakt:", self.pdf_compact_cb)
+        
+        self.pdf_optimize_cb = QCheckBox()
+        self.pdf_optimize_cb.setChecked(False)
+        self.pdf_optimize_cb.setToolTip("Fertiges PDF mit PyMuPDF aufräumen (doppelte Objekte entfernen, komprimieren)")
+        reports_layout.addRow("PDF nachoptimieren:", self.pdf_optimize_cb)
+        
         layout.addWidget(reports_group)
         
+        # Import-Cache
+        cache_group = QGroupBox("Import-Cache")
+        cache_layout = QFormLayout(cache_group)
+        
+        self.ledger_cache_cb = QCheckBox()
+        self.ledger_cache_cb.setChecked(True)
+        self.ledger_cache_cb.setToolTip("Bereits verarbeitete Dateien werden beim erneuten Import aus dem Cache geladen")
+        cache_layout.addRow("Verarbeitete Dateien zwischenspeichern:", self.ledger_cache_cb)
+        
+        self.restore_last_session_cb = QCheckBox()
+        self.restore_last_session_cb.setChecked(False)
+        cache_layout.addRow("Letzte Datei beim Start laden:", self.restore_last_session_cb)
+        
+        self.clear_cache_btn = QPushButton("Cache leeren")
+        self.clear_cache_btn.clicked.connect(self.clear_ledger_cache)
+        cache_layout.addRow("", self.clear_cache_btn)
+        
+        layout.addWidget(cache_group)
+        
+        # Diagnose
+        diagnostics_group = QGroupBox("Diagnose")
+        diagnostics_layout = QFormLayout(diagnostics_group)
+        
+        self.trace_cb = QCheckBox()
+        self.trace_cb.setChecked(False)
+        self.trace_cb.setToolTip(
+            "Schreibt die Laufzeiten von Import und Berichterstellung als Trace-Datei\n"
+            "(Chrome-Trace-Format, z.B. mit ui.perfetto.dev öffnen) ins Cache-Verzeichnis"
+        )
+        diagnostics_layout.addRow("Laufzeit-Trace aufzeichnen:", self.trace_cb)
+        
+        self.stall_monitor_cb = QCheckBox()
+        self.stall_monitor_cb.setChecked(False)
+        self.stall_monitor_cb.setToolTip(
+            "Protokolliert, wann und wo die Oberfläche blockiert war\n"
+            "(Zusammenfassung im Über-Dialog, Details in der Log-Datei im Cache-Verzeichnis)"
+        )
+        diagnostics_layout.addRow("Hänger der Oberfläche protokollieren:", self.stall_monitor_cb)
+        
+        layout.addWidget(diagnostics_group)
+        
         # Einstellungen Export/Import
         settings_group = QGroupBox("Einstellungen verwalten")
         settings_layout = QVBoxLayout(settings_group)
@@ -340,6 +414,19 @@ class GeneralSettingsTab(QWidget):
         
         json_export = self.settings.value("json_export", False, type=bool)
         self.json_export_cb.setChecked(json_export)
+        self.json_compact_cb.setChecked(self.settings.value("json_export_compact", False, type=bool))
+        self.json_gzip_cb.setChecked(self.settings.value("json_export_gzip", False, type=bool))
+        self.json_snapshot_cb.setChecked(self.settings.value("json_trusted_snapshot", False, type=bool))
+        self.pdf_compact_cb.setChecked(self.settings.value("pdf_compact", False, type=bool))
+        self.pdf_optimize_cb.setChecked(self.settings.value("pdf_optimize", False, type=bool))
+        
+        # Import-Cache Optionen laden
+        self.ledger_cache_cb.setChecked(self.settings.value("ledger_cache/enabled", True, type=bool))
+        self.restore_last_session_cb.setChecked(self.settings.value("restore_last_session", False, type=bool))
+        
+        # Diagnose-Optionen laden
+        self.trace_cb.setChecked(self.settings.value("trace_enabled", False, type=bool))
+        self.stall_monitor_cb.setChecked(self.settings.value("stall_monitor_enabled", False, type=bool))
         
         # Überschriftenfarbe laden
         header_color = self.settings.value("header_color", "#0000FF")  # Standardfarbe Blau
@@ -382,6 +469,21 @@ class GeneralSettingsTab(QWidget):
         self.settings.setValue("show_page_number", self.show_page_number_cb.isChecked())
         self.settings.setValue("show_organization_footer", self.show_organization_footer_cb.isChecked())
         self.settings.setValue("json_export", self.json_export_cb.isChecked())
+        self.settings.setValue("json_export_compact", self.json_compact_cb.isChecked())
+        self.settings.setValue("json_export_gzip", self.json_gzip_cb.isChecked())
+        self.settings.setValue("json_trusted_snapshot", self.json_snapshot_cb.isChecked())
+        self.settings.setValue("pdf_compact", self.pdf_compact_cb.isChecked())
+        self.settings.setValue("pdf_optimize", self.pdf_optimize_cb.isChecked())
+        
+        # Import-Cache Optionen speichern
+        self.settings.setValue("ledger_cache/enabled", self.ledger_cache_cb.isChecked())
+        self.settings.setValue("restore_last_session", self.restore_last_session_cb.isChecked())
+        
+        # Diagnose-Optionen speichern (Tracing sofort umschalten)
+        self.settings.setValue("trace_enabled", self.trace_cb.isChecked())
+        self.settings.setValue("stall_monitor_enabled", self.stall_monitor_cb.isChecked())
+        configure_tracing()
+        configure_stall_monitor(QApplication.instance())
         
         # Überschriftenfarbe speichern
         self.settings.setValue("header_color", self.current_color.name())
@@ -403,12 +505,35 @@ class GeneralSettingsTab(QWidget):
         self.show_page_number_cb.setChecked(True)
         self.show_organization_footer_cb.setChecked(True)
         self.json_export_cb.setChecked(False)  # JSON-Export standardmäßig deaktiviert
+        self.json_compact_cb.setChecked(False)
+        self.json_gzip_cb.setChecked(False)
+        self.json_snapshot_cb.setChecked(False)
+        self.pdf_compact_cb.setChecked(False)
+        self.pdf_optimize_cb.setChecked(False)
+        
+        # Import-Cache auf Standard zurücksetzen
+        self.ledger_cache_cb.setChecked(True)
+        self.restore_last_session_cb.setChecked(False)
+        self.trace_cb.setChecked(False)
+        self.stall_monitor_cb.setChecked(False)
         
         # Überschriftenfarbe auf Standard zurücksetzen
         self.current_color = QColor(0, 0, 255)  # Blau
         self.update_color_preview()
         self.update_color_fields()
         
+    def clear_ledger_cache(self):
+        """Leert den Cache der verarbeiteten Dateien"""
+        try:
+            removed = LedgerCache().clear()
+            QMessageBox.information(
+                self,
+                "Cache geleert",
+                f"{removed} zwischengespeicherte Datei(en) wurden entfernt."
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler", f"Cache konnte nicht geleert werden:\n{str(e)}")
+        
     def export_settings(self):
         """Exportiert alle Anwendungseinstellungen in eine JSON-Datei"""
         file_path, _ = QFileDialog.getSaveFileName(
@@ -66,6 +66,7 @@ class SettingsWindow(QMainWindow):
         
         # Signal-Verbindungen für Datenaktualisierung
         self.account_mapping_tab.mappings_changed.connect(self.update_super_group_bwa_groups)
+        self.super_group_mapping_tab.super_mappings_changed.connect(self.update_preview_super_groups)
         
         # Tabs hinzufügen
         self.tab_widget.addTab(self.general_tab, "Allgemein")
@@ -155,9 +156,18 @@ class SettingsWindow(QMainWindow):
         # Obergruppen-Tab mit verfügbaren BWA-Gruppen aktualisieren
         self.update_super_group_bwa_groups()
         
-    def update_account_mappings(self, account_numbers, account_names=None):
+    def update_account_mappings(self, account_numbers, account_names=None, normalized=False):
         """Aktualisiert die Sachkonten-Liste im BWA-Gruppen Tab"""
-        self.account_mapping_tab.update_accounts_from_csv(account_numbers, account_names)
+        self.account_mapping_tab.update_accounts_from_csv(account_numbers, account_names, normalized)
+        
+    def set_preview_data(self, data):
+        """Übergibt die verarbeiteten Buchungen an die BWA-Vorschau im BWA-Gruppen Tab"""
+        self.account_mapping_tab.set_preview_data(data, self.super_group_mapping_tab.get_super_group_mappings())
+        
+    def update_preview_super_groups(self):
+        """Überträgt geänderte Obergruppen in die BWA-Vorschau"""
+        self.account_mapping_tab.preview_panel.set_super_group_mappings(
+            self.super_group_mapping_tab.get_super_group_mappings())
         
     def update_super_group_bwa_groups(self):
         """Aktualisiert die BWA-Gruppen in der Obergruppen-Zuordnung"""
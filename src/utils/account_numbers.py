@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Normalisierung von Sachkontonummern (gemeinsam für Import und Einstellungen)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_account_number(account_nr) -> str:
+    """Normalisiert eine Sachkontonummer zu einem String-Format ("4000.0" -> "4000")"""
+    if pd.isna(account_nr):
+        return ""
+    return _normalize_cached(account_nr)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_cached(account_nr) -> str:
+    """Normalisierung eines einzelnen Werts (Ergebnisse werden je Wert zwischengespeichert)"""
+    # Zu String konvertieren und Whitespace entfernen
+    account_str = str(account_nr).strip()
+
+    # Prüfen ob es eine Zahl ist (auch Floats)
+    if account_str.replace('.', '').replace('-', '').isdigit():
+        try:
+            # Float zu Int zu String (entfernt .0 Endungen)
+            float_val = float(account_str)
+            if float_val.is_integer():
+                return str(int(float_val))
+            return account_str  # Behalte Original wenn echte Dezimalzahl
+        except ValueError:
+            pass
+
+    return account_str
+
+
+def normalize_account_numbers(values) -> pd.Series:
+    """
+    Normalisiert eine ganze Spalte von Sachkontonummern
+
+    Jeder unterschiedliche Wert wird nur einmal normalisiert; das Ergebnis ist
+    kategorisch (fehlende Werte werden wie bei normalize_account_number zu "").
+
+    Args:
+        values: pandas Series oder Liste mit Sachkontonummern
+
+    Returns:
+        pd.Series: normalisierte Nummern (dtype category, Index wie die Eingabe)
+    """
+    if not isinstance(values, pd.Series):
+        values = pd.Series(list(values), dtype=object)
+
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+
+    # Verschiedene Rohwerte können dieselbe Nummer ergeben ("4000" und 4000.0)
+    normalized = [normalize_account_number(value) for value in uniques] + [""]
+    merged_codes, categories = pd.factorize(np.array(normalized, dtype=object))
+
+    # Fehlende Werte (Code -1) zeigen auf den angehängten Leerstring
+    result_codes = merged_codes[codes]
+    return pd.Series(
+        pd.Categorical.from_codes(result_codes, categories=pd.Index(categories, dtype=object)),
+        index=values.index
+    )
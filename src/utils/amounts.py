@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Exakte Betragsrechnung in ganzen Cent
+"""
+
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CENT = Decimal('0.01')
+
+
+def parse_amount_cents(value, decimal_separator: str = ",") -> Optional[int]:
+    """
+    Wandelt einen Betrag (Text oder Zahl) in ganze Cent um
+
+    Args:
+        value: Betrag wie in der Importdatei (z.B. "1.234,56 €" oder 12.5)
+        decimal_separator (str): "," für deutsche, "." für englische Notation
+
+    Returns:
+        int: Betrag in Cent oder None wenn der Wert ungültig ist
+    """
+    if pd.isna(value) or value == '':
+        return None
+
+    # Euro-Zeichen und Leerzeichen entfernen
+    cleaned = str(value).replace('€', '').replace(' ', '')
+
+    if decimal_separator == ",":
+        # Deutsche Notation: 1.234,56 -> 1234.56
+        if ',' in cleaned and '.' in cleaned:
+            cleaned = cleaned.replace('.', '').replace(',', '.')
+        elif ',' in cleaned:
+            cleaned = cleaned.replace(',', '.')
+    elif ',' in cleaned and '.' in cleaned:
+        # Englische Notation: 1,234.56 -> 1234.56
+        cleaned = cleaned.replace(',', '')
+
+    try:
+        return int(Decimal(cleaned).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+    except (InvalidOperation, ValueError):
+        # Auch "nan"/"inf" sind keine gültigen Beträge
+        return None
+
+
+def parse_amounts_cents(values: pd.Series, decimal_separator: str = ",") -> pd.Series:
+    """Wandelt eine Betragsspalte in Cent um (jeder unterschiedliche Wert wird nur einmal geparst)"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = np.array(
+        [parse_amount_cents(value, decimal_separator) for value in uniques] + [None],
+        dtype=object
+    )
+    # Fehlende Werte (Code -1) zeigen auf den angehängten None-Eintrag
+    return pd.Series(parsed[codes], index=values.index, dtype='Int64')
+
+
+def to_cents(amount) -> int:
+    """Wandelt einen Euro-Betrag (float) in ganze Cent um"""
+    if amount is None or pd.isna(amount):
+        return 0
+    return int(Decimal(str(amount)).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+def cents_to_euros(cents) -> float:
+    """Wandelt ganze Cent in einen Euro-Betrag um (nur für Anzeige und Export)"""
+    return int(cents) / 100
+
+
+def format_cents(cents) -> str:
+    """Formatiert einen Cent-Betrag mit deutscher Zahlendarstellung (z.B. "-1.234,56 €")"""
+    euros, rest = divmod(abs(int(cents)), 100)
+    formatted = f"{euros:,}".replace(",", ".") + f",{rest:02d} €"
+    if cents < 0:
+        formatted = f"-{formatted}"
+    return formatted
+
+
+def amount_cents(df: pd.DataFrame) -> pd.Series:
+    """Gibt die Beträge eines Buchungs-DataFrames in Cent (int64) zurück"""
+    if 'Betrag_Cent' in df.columns:
+        return df['Betrag_Cent'].astype('int64')
+    if 'Betrag_Clean' not in df.columns:
+        return pd.Series(0, index=df.index, dtype='int64')
+    # Fallback für DataFrames ohne Cent-Spalte
+    euros = pd.to_numeric(df['Betrag_Clean'], errors='coerce').fillna(0.0)
+    return (euros * 100).round().astype('int64')
+
+
+def sum_cents(df: pd.DataFrame) -> int:
+    """Summe aller Beträge eines Buchungs-DataFrames in Cent"""
+    if df is None or df.empty:
+        return 0
+    return int(amount_cents(df).sum())
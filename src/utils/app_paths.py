@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Verzeichnisse der Anwendung (Cache, Logs)
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from PySide6.QtCore import QStandardPaths, QCoreApplication
+
+
+def get_cache_dir(subdir: str = "") -> Path:
+    """
+    Gibt das Cache-Verzeichnis der Anwendung zurück und legt es bei Bedarf an
+
+    Priorität:
+    1. Umgebungsvariable FINANZ_CACHE_DIR
+    2. Benutzer-Cache-Verzeichnis des Betriebssystems (QStandardPaths), nur wenn der
+       Organisationsname gesetzt ist (sonst leitet Qt den Pfad vom Skriptnamen ab)
+    3. Temporäres Verzeichnis als Fallback
+
+    Args:
+        subdir (str): Optionales Unterverzeichnis (z.B. "ledger_cache")
+
+    Returns:
+        Path: Pfad zum (existierenden) Verzeichnis
+    """
+    base = os.getenv("FINANZ_CACHE_DIR")
+    if not base and QCoreApplication.organizationName():
+        base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not base:
+        base = os.path.join(tempfile.gettempdir(), "finanzauswertung_ehrenamt")
+
+    cache_dir = Path(base) / subdir if subdir else Path(base)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        # Nicht beschreibbar: auf temporäres Verzeichnis ausweichen
+        cache_dir = Path(tempfile.gettempdir()) / "finanzauswertung_ehrenamt" / subdir
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Buchungsindex: Summen und Buchungslisten je Sachkonto und Quartal ohne erneuten Durchlauf
+
+Die Positionen werden einmal nach (Sachkonto, Quartal, Buchungstag) sortiert. Jede
+Kombination ist danach ein zusammenhängender Abschnitt: Summen eines Zeitraums entstehen
+aus vorberechneten Cent-Summen, die Buchungen eines Sachkontos sind ein Ausschnitt der
+Sortierung (ein Quartal, kumuliert bis zum Quartal oder das ganze Jahr).
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .amounts import amount_cents
+
+# Spalte 0 sammelt Buchungen ohne gültiges Quartal (zählen nur kumuliert und im Jahr)
+QUARTER_SLOTS = 5
+
+
+class BookingIndex:
+    """Index über processed_data (Positionen beziehen sich auf die Zeilen des DataFrames)"""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        rows = len(data)
+
+        # Sachkonten in Reihenfolge des ersten Auftretens (wie groupby(sort=False))
+        codes, accounts = pd.factorize(data['Sachkontonr.'].astype(str), sort=False)
+        self.accounts: List[str] = [str(account) for account in accounts]
+        self._account_codes = {account: code for code, account in enumerate(self.accounts)}
+
+        quarters = data['Quartal'].to_numpy(dtype=np.int64)
+        slots = np.where((quarters >= 1) & (quarters <= 4), quarters, 0)
+        self.cents = amount_cents(data).to_numpy(dtype=np.int64)
+        self.days = pd.to_datetime(data['Buchungstag_Clean']).to_numpy().astype('datetime64[D]')
+
+        # Stabile Sortierung: gleiche Tage behalten die Reihenfolge der Datei
+        keys = codes.astype(np.int64) * QUARTER_SLOTS + slots
+        self.order = np.lexsort((self.days.view(np.int64), keys)) if rows else np.empty(0, dtype=np.intp)
+        self._bounds = np.searchsorted(keys[self.order], np.arange(len(self.accounts) * QUARTER_SLOTS + 1))
+
+        # Summen, Anzahl und erste Position je (Sachkonto, Quartal)
+        starts, ends = self._bounds[:-1], self._bounds[1:]
+        running = np.concatenate(([0], np.cumsum(self.cents[self.order])))
+        shape = (len(self.accounts), QUARTER_SLOTS)
+        self.slot_cents = (running[ends] - running[starts]).reshape(shape)   # (Sachkonten, Quartalsspalten)
+        self.slot_counts = (ends - starts).reshape(shape)                     # Anzahl Buchungen je Zelle
+        first = np.full(len(starts), rows, dtype=np.int64)
+        filled = ends > starts
+        if filled.any():
+            first[filled] = np.minimum.reduceat(self.order, starts[filled])
+        self._first = first.reshape(shape)
+
+    @staticmethod
+    def period_slots(quarter: Optional[int] = None, quarter_mode: str = "cumulative") -> Tuple[int, int]:
+        """Erste und letzte Quartalsspalte eines Zeitraums (None = ganzes Jahr)"""
+        if quarter is None:
+            return 0, QUARTER_SLOTS - 1
+        if quarter_mode == "cumulative":
+            return 0, quarter
+        return quarter, quarter
+
+    def account_cents(self, quarter: Optional[int] = None, quarter_mode: str = "cumulative") -> Dict[str, int]:
+        """Cent-Summen je Sachkonto eines Zeitraums (Reihenfolge des ersten Auftretens wie im Bericht)"""
+        low, high = self.period_slots(quarter, quarter_mode)
+        counts = self.slot_counts[:, low:high + 1].sum(axis=1)
+        totals = self.slot_cents[:, low:high + 1].sum(axis=1)
+        first = self._first[:, low:high + 1].min(axis=1)
+        present = np.flatnonzero(counts > 0)
+        present = present[np.argsort(first[present], kind='stable')]
+        return {self.accounts[code]: int(totals[code]) for code in present}
+
+    def account_counts(self, quarter: Optional[int] = None, quarter_mode: str = "cumulative") -> Dict[str, int]:
+        """Anzahl Buchungen je Sachkonto eines Zeitraums"""
+        low, high = self.period_slots(quarter, quarter_mode)
+        counts = self.slot_counts[:, low:high + 1].sum(axis=1)
+        return {self.accounts[code]: int(counts[code]) for code in np.flatnonzero(counts > 0)}
+
+    def bookings(self, account: str, quarter: Optional[int] = None, quarter_mode: str = "cumulative") -> np.ndarray:
+        """Positionen der Buchungen eines Sachkontos im Zeitraum (nach Quartal und Buchungstag sortiert)"""
+        code = self._account_codes.get(str(account))
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        low, high = self.period_slots(quarter, quarter_mode)
+        start = self._bounds[code * QUARTER_SLOTS + low]
+        end = self._bounds[code * QUARTER_SLOTS + high + 1]
+        return self.order[start:end]
+
+    def text(self, column: str, position: int) -> str:
+        """Textwert einer Buchung (leer wenn die Spalte fehlt oder der Wert fehlt)"""
+        if column not in self.data.columns:
+            return ""
+        value = self.data[column].iat[position]
+        return "" if pd.isna(value) else str(value)
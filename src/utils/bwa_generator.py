@@ -17,10 +17,20 @@ from reportlab.graphics.shapes import Drawing, Rect, String, Line
 from reportlab.graphics import renderPDF
 from PySide6.QtCore import QSettings
 from datetime import datetime, date
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
-import json
+import time
 import pandas as pd
+from .amounts import amount_cents, sum_cents, to_cents, cents_to_euros, format_cents
+from .json_export import StreamedList, InlineList, DeferredValue, write_json, JSON_SCHEMA_VERSION
+from .report_snapshot import SnapshotHasher, CHECKSUM_ALGORITHM
+from .bwa_summary import (UNASSIGNED_SUPER_GROUP, unassigned_group, build_detailed_summary,
+                          load_account_names, load_super_group_mappings)
+from .tracing import span, traced, tracer
+from .pdf_compaction import print_resolution_image, optimize_pdf, format_size
+
+# Buchungen je Sachkonto in der Entwurfsvorschau
+DRAFT_MAX_BOOKINGS = 20
 
 
 class BWAPDFGenerator:
@@ -29,6 +39,10 @@ class BWAPDFGenerator:
     def __init__(self):
         self.settings = QSettings()
         self.styles = getSampleStyleSheet()
+        self._snapshot = None  # Geprüfter JSON-Snapshot (Seiten ohne Neuberechnung)
+        self.section_timings: Dict[str, float] = {}  # Laufzeit je Abschnitt der letzten PDF-Erstellung
+        self._draft: Optional[Dict] = None  # Entwurfsoptionen der Vorschau (None = vollständige BWA)
+        self.size_report: Dict[str, int] = {}  # Dateigröße vor/nach der Optimierung (Bytes)
         self._create_custom_styles()
         
     def _create_custom_styles(self):
@@ -100,33 +114,31 @@ class BWAPDFGenerator:
         
         return self.settings.value("opening_balance", 0.0, type=float)
         
+    def _calculate_total_cents(self, csv_processor) -> int:
+        """Berechnet die Gesamtsumme aller Buchungen in Cent"""
+        if self._snapshot is not None:
+            return self._snapshot.total_cents
+        return csv_processor.get_total_cents()  # Alle Daten des Jahres
+        
     def _calculate_total_amount(self, csv_processor) -> float:
         """Berechnet die Gesamtsumme aller Buchungen"""
-        year_data = csv_processor.get_year_data()  # Alle Daten des Jahres
-        if year_data.empty:
-            return 0.0
-        # Einheitlich Betrag_Clean verwenden
-        return year_data['Betrag_Clean'].sum() if 'Betrag_Clean' in year_data.columns else 0.0
+        return cents_to_euros(self._calculate_total_cents(csv_processor))
         
     def _calculate_new_balance(self, csv_processor) -> float:
         """Berechnet den neuen Kontostand (Anfang + Summe aller Buchungen)"""
-        opening_balance = self._get_opening_balance()
-        total_amount = self._calculate_total_amount(csv_processor)
-        return opening_balance + total_amount
+        opening_cents = to_cents(self._get_opening_balance())
+        return cents_to_euros(opening_cents + self._calculate_total_cents(csv_processor))
         
     def _calculate_quarter_balance(self, quarter: int, csv_processor) -> float:
         """Berechnet den Kontostand für ein spezifisches Quartal"""
-        opening_balance = self._get_opening_balance()
-        quarter_data = csv_processor.get_data_by_quarter(quarter)
-        
-        # quarter_data ist ein DataFrame, wir brauchen die Summe der Beträge
-        if quarter_data.empty:
-            quarter_total = 0.0
+        opening_cents = to_cents(self._get_opening_balance())
+        if self._snapshot is not None:
+            quarter_cents = self._snapshot.quarter_total_cents(quarter)
         else:
-            quarter_total = quarter_data['Betrag_Clean'].sum() if 'Betrag_Clean' in quarter_data.columns else 0.0
-        
-        return opening_balance + quarter_total
+            quarter_cents = csv_processor.get_total_cents(quarter)
+        return cents_to_euros(opening_cents + quarter_cents)
         
+    @traced("BWA erstellen", "pdf")
     def generate_bwa_pdf(self, output_path: str, csv_processor, account_mappings: Dict[str, str] = None) -> bool:
         """Generiert das komplette BWA-PDF basierend auf Einstellungen oder JSON-Daten"""
         try:
@@ -144,6 +156,15 @@ class BWAPDFGenerator:
             print(f"Fehler bei der PDF-Generierung: {e}")
             return False
     
+    def generate_draft_pdf(self, output_path: str, csv_processor, account_mappings: Dict[str, str] = None,
+                           include_accounts: bool = False, max_bookings: int = DRAFT_MAX_BOOKINGS) -> bool:
+        """Generiert einen Entwurf für die Vorschau (ohne Sachkonten oder nur die ersten Buchungen je Sachkonto)"""
+        self._draft = {'accounts': include_accounts, 'max_bookings': max_bookings}
+        try:
+            return self.generate_bwa_pdf(output_path, csv_processor, account_mappings)
+        finally:
+            self._draft = None
+    
     def _generate_bwa_from_json(self, output_path: str, csv_processor) -> bool:
         """Generiert BWA-PDF aus JSON-Daten (überschreibt Einstellungen)"""
         try:
@@ -156,8 +177,19 @@ class BWAPDFGenerator:
             # Temporäre Einstellungen aus JSON setzen
             self._apply_json_settings_temporarily(json_org_data, json_balance_info, json_super_group_mappings)
             
+            # Geprüfter Snapshot: Seiten direkt aus den gespeicherten Auswertungen erstellen
+            snapshot = csv_processor.report_snapshot
+            generate_quarterly = self.settings.value("generate_quarterly_reports", True, type=bool)
+            generate_accounts = self.settings.value("generate_account_reports", True, type=bool)
+            if snapshot is not None and snapshot.covers(generate_quarterly, generate_accounts):
+                print("✅ Geprüfter JSON-Snapshot - BWA wird aus den gespeicherten Auswertungen erstellt")
+                self._snapshot = snapshot
+            
             # BWA generieren mit JSON-Daten
-            result = self._generate_bwa_from_csv(output_path, csv_processor, json_account_mappings)
+            try:
+                result = self._generate_bwa_from_csv(output_path, csv_processor, json_account_mappings)
+            finally:
+                self._snapshot = None
             
             # Einstellungen nach Generierung zurücksetzen (optional)
             # self._restore_original_settings()
@@ -194,11 +226,22 @@ class BWAPDFGenerator:
             generate_accounts = settings.value("generate_account_reports", True, type=bool)
             generate_chart = settings.value("generate_chart_report", True, type=bool)
             quarter_mode = settings.value("quarter_mode", "cumulative")
+            optimize = settings.value("pdf_optimize", False, type=bool)
+            if self._draft is not None:
+                generate_accounts = generate_accounts and self._draft['accounts']
             
             # Footer-Callback definieren
+            page_start = [0.0]
+            
             def add_footer(canvas, doc):
                 """Fügt Footer auf jeder Seite hinzu"""
-                self._add_footer_to_page(canvas, doc)
+                page_start[0] = time.perf_counter()
+                with span("Fußzeile", "pdf.seiten", page=doc.page):
+                    self._add_footer_to_page(canvas, doc)
+                    
+            def page_done(canvas, doc):
+                """Zeichnet den Aufbau einer Seite als Span auf"""
+                tracer.add_span(f"Seite {doc.page}", "pdf.seiten", page_start[0], time.perf_counter())
             
             # PDF-Dokument mit Footer-Support erstellen
             doc = BaseDocTemplate(
@@ -207,7 +250,8 @@ class BWAPDFGenerator:
                 rightMargin=2*cm,
                 leftMargin=2*cm,
                 topMargin=2*cm,
-                bottomMargin=3*cm  # Mehr Platz für Footer
+                bottomMargin=3*cm,  # Mehr Platz für Footer
+                pageCompression=1  # Inhaltsströme immer komprimieren
             )
             
             # Frame für den Hauptinhalt
@@ -223,72 +267,106 @@ class BWAPDFGenerator:
             template = PageTemplate(
                 id='normal',
                 frames=[frame],
-                onPage=add_footer
+                onPage=add_footer,
+                onPageEnd=page_done
             )
             
             doc.addPageTemplates([template])
             
             # Story (Inhalt) sammeln
             story = []
+            self.section_timings = {}
             
             # 1. Deckblatt (immer erstellen)
+            start = time.perf_counter()
             story.extend(self._create_cover_page(csv_processor))
             story.append(PageBreak())
+            self._record_section("Deckblatt", start)
             
             # 2-5. Quartalsauswertungen (optional)
             if generate_quarterly:
+                start = time.perf_counter()
                 for quarter in range(1, 5):
                     story.extend(self._create_quarter_page(quarter, csv_processor, account_mappings))
                     story.append(PageBreak())
+                self._record_section("Quartale", start)
                     
             # 6. Jahresauswertung (immer erstellen)
+            start = time.perf_counter()
             story.extend(self._create_year_page(csv_processor, account_mappings))
             story.append(PageBreak())
+            self._record_section("Jahr", start)
             
             # 7. Balkendiagramm (optional)
             if generate_chart:
+                start = time.perf_counter()
                 story.extend(self._create_chart_page(csv_processor))
                 story.append(PageBreak())
+                self._record_section("Diagramm", start)
             
             # 8. Sachkonten-Einzelauswertungen (optional)
             if generate_accounts:
-                accounts = csv_processor.get_account_numbers()
+                start = time.perf_counter()
+                if self._snapshot is not None:
+                    accounts = self._snapshot.account_numbers()
+                else:
+                    accounts = csv_processor.get_account_numbers()
                 for account in accounts:
-                    story.extend(self._create_account_page(account, csv_processor))
+                    with span("Sachkonto", "pdf", account=account):
+                        story.extend(self._create_account_page(account, csv_processor))
                     story.append(PageBreak())
+                self._record_section("Sachkonten", start)
                 
             # PDF erstellen
             # Für die Gesamtseitenzahl verwenden wir eine Schätzung
             # oder einen späteren Two-Pass-Ansatz
             self._total_pages = 0  # Wird bei Bedarf später gesetzt
+            start = time.perf_counter()
             doc.build(story)
+            self._record_section("Seitenaufbau", start)
             
             # Nach dem Build kennen wir die Seitenzahl
             self._total_pages = doc.page
             
-            # JSON-Export (falls aktiviert und nicht JSON-Quelle)
-            if not csv_processor.is_json_source:
+            # Nachoptimierung (nicht für Entwürfe der Vorschau)
+            size = os.path.getsize(output_path)
+            self.size_report = {'before': size, 'after': size}
+            if optimize and self._draft is None:
+                start = time.perf_counter()
+                self.size_report['before'], self.size_report['after'] = optimize_pdf(output_path)
+                self._record_section("Optimierung", start)
+                print(f"PDF-Größe: {format_size(self.size_report['before'])} → "
+                      f"{format_size(self.size_report['after'])}")
+            
+            # JSON-Export (falls aktiviert und weder JSON-Quelle noch Entwurf)
+            if not csv_processor.is_json_source and self._draft is None:
                 json_export_enabled = settings.value("json_export", False, type=bool)
                 if json_export_enabled:
+                    start = time.perf_counter()
                     self._generate_json_export(output_path, csv_processor, account_mappings)
+                    self._record_section("JSON-Export", start)
             
+            print("PDF-Abschnitte: " + ", ".join(
+                f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.section_timings.items()))
             return True
             
         except Exception as e:
             print(f"Fehler bei der PDF-Generierung: {e}")
             return False
             
+    def _record_section(self, name: str, start: float):
+        """Speichert die Laufzeit eines Abschnitts seit 'start' (perf_counter)"""
+        end = time.perf_counter()
+        self.section_timings[name] = self.section_timings.get(name, 0.0) + end - start
+        tracer.add_span(name, "pdf", start, end)
+        
     def _load_super_group_mappings(self) -> Dict[str, str]:
         """Lädt die Obergruppen-Mappings aus den Einstellungen oder JSON-Daten"""
         # Wenn JSON-Daten verfügbar sind, diese verwenden
         if hasattr(self, '_temp_super_group_mappings'):
             return self._temp_super_group_mappings
         
-        mappings_json = self.settings.value("super_group_mappings", "{}")
-        try:
-            return json.loads(mappings_json)
-        except (json.JSONDecodeError, TypeError):
-            return {}
+        return load_super_group_mappings()
             
     def _add_footer_to_page(self, canvas, doc):
         """Fügt Footer zu einer Seite hinzu"""
@@ -325,14 +403,18 @@ class BWAPDFGenerator:
                 canvas.drawString(page_width - 2 * cm - text_width, footer_y, organization_name)
                 canvas.restoreState()
             
+    @traced("JSON schreiben", "json")
     def _generate_json_export(self, pdf_path: str, csv_processor, account_mappings: Dict[str, str]) -> bool:
         """Generiert JSON-Export der BWA-Daten parallel zum PDF"""
         try:
-            # JSON-Pfad aus PDF-Pfad ableiten
-            json_path = pdf_path.rsplit('.', 1)[0] + '.json'
-            
             # Einstellungen laden
             settings = QSettings()
+            compact = settings.value("json_export_compact", False, type=bool)
+            compressed = settings.value("json_export_gzip", False, type=bool)
+            
+            # JSON-Pfad aus PDF-Pfad ableiten
+            json_path = pdf_path.rsplit('.', 1)[0] + ('.json.gz' if compressed else '.json')
+            
             generate_quarterly = settings.value("generate_quarterly_reports", True, type=bool)
             generate_accounts = settings.value("generate_account_reports", True, type=bool)
             quarter_mode = settings.value("quarter_mode", "cumulative")
@@ -341,15 +423,12 @@ class BWAPDFGenerator:
             super_group_mappings = self._load_super_group_mappings()
             
             # Account-Namen aus QSettings laden
-            account_names = {}
-            settings.beginGroup("account_names")
-            for key in settings.allKeys():
-                account_names[key] = settings.value(key, "")
-            settings.endGroup()
+            account_names = load_account_names()
             
             # JSON-Datenstruktur aufbauen
             json_data = {
                 "metadata": {
+                    "schema_version": JSON_SCHEMA_VERSION,
                     "export_date": datetime.now().isoformat(),
                     "year": datetime.now().year,
                     "quarter_mode": quarter_mode,
@@ -375,17 +454,22 @@ class BWAPDFGenerator:
                     if quarter_data:
                         json_data["quarterly_summaries"].append(quarter_data)
             
-            # Sachkonten-Details hinzufügen (falls aktiviert)
+            # Prüfsumme über Auswertungen, Zuordnungen und Buchungen (für den Snapshot-Schnellpfad)
+            hasher = SnapshotHasher()
+            hasher.add_sections(json_data)
+            
+            # Sachkonten-Details hinzufügen (falls aktiviert) - werden erst beim Schreiben
+            # Konto für Konto erzeugt, Buchungen als Spalten (Schema v2)
             if generate_accounts:
-                accounts = csv_processor.get_account_numbers()
-                for account in accounts:
-                    account_data = self._get_account_detail_data(account, csv_processor)
-                    if account_data:
-                        json_data["account_details"].append(account_data)
+                json_data["account_details"] = StreamedList(self._iter_account_details(csv_processor, hasher))
+            
+            # Prüfsumme erst nach den gestreamten Sachkonten schreiben
+            json_data["integrity"] = DeferredValue(
+                lambda: {"algorithm": CHECKSUM_ALGORITHM, "checksum": hasher.hexdigest()}
+            )
             
-            # JSON-Datei schreiben
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+            # JSON-Datei streamend schreiben
+            write_json(json_path, json_data, compact=compact)
             
             print(f"JSON-Export erstellt: {json_path}")
             return True
@@ -425,36 +509,9 @@ class BWAPDFGenerator:
         if year_data.empty:
             return {"summary": {}, "total": 0.0}
         
-        # Account-Namen aus QSettings laden
-        settings = QSettings()
-        account_names = {}
-        settings.beginGroup("account_names")
-        for key in settings.allKeys():
-            account_names[key] = settings.value(key, "")
-        settings.endGroup()
-        
-        # Detaillierte Zusammenfassung erstellen
-        detailed_summary = self._create_detailed_year_summary(year_data, account_mappings, account_names)
-        summary = detailed_summary.get('summary', {})
-        detailed_accounts = detailed_summary.get('detailed_accounts', {})
-        total = sum(summary.values()) if summary else 0.0
-        
-        # Obergruppen-Zuordnung hinzufügen
-        super_group_mappings = self._load_super_group_mappings()
-        grouped_summary = {}
-        
-        for bwa_group, amount in summary.items():
-            super_group = super_group_mappings.get(bwa_group, "Nicht zugeordnet")
-            if super_group not in grouped_summary:
-                grouped_summary[super_group] = {}
-            grouped_summary[super_group][bwa_group] = float(amount)
-        
-        return {
-            "summary": grouped_summary,
-            "bwa_groups": {k: float(v) for k, v in summary.items()},
-            "detailed_accounts": detailed_accounts,
-            "total": float(total)
-        }
+        # Detaillierte Zusammenfassung in Cent, Euro-Beträge erst für die JSON-Datei
+        detailed_summary = self._create_detailed_year_summary(year_data, account_mappings, load_account_names())
+        return self._summary_json(detailed_summary)
     
     def _get_quarter_summary_data(self, quarter: int, csv_processor, account_mappings: Dict[str, str]) -> Optional[Dict]:
         """Erstellt Quartalsübersicht für JSON-Export"""
@@ -463,41 +520,17 @@ class BWAPDFGenerator:
         if quarter_data.empty:
             return None
         
-        # Account-Namen aus QSettings laden
-        settings = QSettings()
-        account_names = {}
-        settings.beginGroup("account_names")
-        for key in settings.allKeys():
-            account_names[key] = settings.value(key, "")
-        settings.endGroup()
-        
-        # Detaillierte Zusammenfassung erstellen
-        detailed_summary = self._create_detailed_quarter_summary(quarter_data, account_mappings, account_names)
-        summary = detailed_summary.get('summary', {})
-        detailed_accounts = detailed_summary.get('detailed_accounts', {})
-        total = sum(summary.values()) if summary else 0.0
+        # Detaillierte Zusammenfassung in Cent, Euro-Beträge erst für die JSON-Datei
+        detailed_summary = self._create_detailed_quarter_summary(quarter_data, account_mappings, load_account_names())
         
         # Kontostandsberechnung
         opening_balance = self._get_opening_balance()
         quarter_balance = self._calculate_quarter_balance(quarter, csv_processor)
-        quarter_total = quarter_data['Betrag_Clean'].sum() if 'Betrag_Clean' in quarter_data.columns else 0.0
-        
-        # Obergruppen-Zuordnung
-        super_group_mappings = self._load_super_group_mappings()
-        grouped_summary = {}
-        
-        for bwa_group, amount in summary.items():
-            super_group = super_group_mappings.get(bwa_group, "Nicht zugeordnet")
-            if super_group not in grouped_summary:
-                grouped_summary[super_group] = {}
-            grouped_summary[super_group][bwa_group] = float(amount)
+        quarter_total = cents_to_euros(sum_cents(quarter_data))
         
         return {
             "quarter": quarter,
-            "summary": grouped_summary,
-            "bwa_groups": {k: float(v) for k, v in summary.items()},
-            "detailed_accounts": detailed_accounts,
-            "total": float(total),
+            **self._summary_json(detailed_summary),
             "balance_info": {
                 "opening_balance": float(opening_balance),
                 "quarter_transactions": float(quarter_total),
@@ -505,8 +538,68 @@ class BWAPDFGenerator:
             }
         }
     
-    def _get_account_detail_data(self, account_number: str, csv_processor) -> Optional[Dict]:
-        """Erstellt Sachkonto-Details für JSON-Export"""
+    def _summary_json(self, detailed_summary: Dict) -> Dict:
+        """Wandelt eine detaillierte Zusammenfassung (Cent) in die Euro-Abschnitte der JSON-Datei"""
+        summary = detailed_summary.get('summary', {})
+        super_group_mappings = self._load_super_group_mappings()
+        grouped_summary = {}
+        for bwa_group, cents in summary.items():
+            super_group = super_group_mappings.get(bwa_group, UNASSIGNED_SUPER_GROUP)
+            grouped_summary.setdefault(super_group, {})[bwa_group] = cents_to_euros(cents)
+        
+        detailed_accounts = {
+            group: {
+                account: {'name': details['name'], 'amount': cents_to_euros(details['cents'])}
+                for account, details in accounts.items()
+            }
+            for group, accounts in detailed_summary.get('detailed_accounts', {}).items()
+        }
+        return {
+            "summary": grouped_summary,
+            "bwa_groups": {group: cents_to_euros(cents) for group, cents in summary.items()},
+            "detailed_accounts": detailed_accounts,
+            "total": cents_to_euros(sum(summary.values()))
+        }
+    
+    def _iter_account_details(self, csv_processor, hasher: Optional[SnapshotHasher] = None):
+        """Erzeugt die Sachkonto-Details für den JSON-Export nacheinander"""
+        for account in csv_processor.get_account_numbers():
+            account_data = self._get_account_detail_data(account, csv_processor, stream=True)
+            if account_data:
+                if hasher is not None:
+                    hasher.add_account(account_data)
+                yield account_data
+                
+    def _get_transaction_columns(self, account_data, cents) -> Dict[str, List]:
+        """Buchungen eines Sachkontos als Spalten (JSON-Schema v2)"""
+        if 'Buchungsnr.' in account_data.columns:
+            numbers = account_data['Buchungsnr.'].astype(object)
+            booking_numbers = [str(value) if pd.notna(value) else '' for value in numbers]
+        else:
+            booking_numbers = [''] * len(account_data)
+            
+        if 'Verwendungszweck' in account_data.columns:
+            purposes = [str(value) for value in account_data['Verwendungszweck'].astype(object)]
+        else:
+            purposes = [''] * len(account_data)
+            
+        return {
+            "booking_number": booking_numbers,
+            "date": self._format_booking_dates(account_data, '%Y-%m-%d'),
+            "purpose": purposes,
+            "amount_cents": [int(value) for value in cents]
+        }
+        
+    def _format_booking_dates(self, data, date_format: str) -> List[str]:
+        """Formatiert die Buchungstage aller Zeilen (vektorisiert, wenn das geparste Datum vorliegt)"""
+        if 'Buchungstag_Clean' in data.columns:
+            dates = pd.to_datetime(data['Buchungstag_Clean'], errors='coerce')
+            if dates.notna().all():
+                return dates.dt.strftime(date_format).tolist()
+        return [self._format_booking_date(row, date_format) for _, row in data.iterrows()]
+    
+    def _get_account_detail_data(self, account_number: str, csv_processor, stream: bool = False) -> Optional[Dict]:
+        """Erstellt Sachkonto-Details für JSON-Export (stream=True: Spalten werden einzeilig geschrieben)"""
         account_data = csv_processor.get_data_by_account(account_number)
         
         if account_data.empty:
@@ -519,41 +612,17 @@ class BWAPDFGenerator:
             if name and str(name) != 'nan':
                 account_name = str(name)
         
-        # Buchungen aufbereiten
-        transactions = []
-        total = 0.0
-        
-        for _, row in account_data.iterrows():
-            # Datum formatieren
-            date_str = ""
-            if 'Buchungstag' in row:
-                try:
-                    if hasattr(row['Buchungstag'], 'strftime'):
-                        date_str = row['Buchungstag'].strftime('%Y-%m-%d')
-                    else:
-                        date_obj = pd.to_datetime(row['Buchungstag'])
-                        date_str = date_obj.strftime('%Y-%m-%d')
-                except:
-                    date_str = str(row['Buchungstag'])
-            
-            buchungsnr = row['Buchungsnr.'] if 'Buchungsnr.' in row and pd.notna(row['Buchungsnr.']) else ''
-            purpose = row['Verwendungszweck'] if 'Verwendungszweck' in row else ''
-            amount = row['Betrag_Clean']
-            
-            transactions.append({
-                "booking_number": str(buchungsnr),
-                "date": date_str,
-                "purpose": str(purpose),
-                "amount": float(amount)
-            })
-            
-            total += amount
+        # Buchungen als parallele Spalten aufbereiten
+        cents = amount_cents(account_data)
+        transactions = self._get_transaction_columns(account_data, cents)
+        if stream:
+            transactions = {column: InlineList(values) for column, values in transactions.items()}
         
         return {
             "account_number": str(account_number),
             "account_name": account_name,
-            "total": float(total),
-            "transaction_count": len(transactions),
+            "total": cents_to_euros(cents.sum()),
+            "transaction_count": len(account_data),
             "transactions": transactions
         }
             
@@ -665,6 +734,10 @@ class BWAPDFGenerator:
         logo_path = self.settings.value("organization/logo_path", "")
         if logo_path and os.path.exists(logo_path):
             try:
+                # Kompakte Ausgabe: Logo einmalig auf Druckauflösung verkleinern
+                if self.settings.value("pdf_compact", False, type=bool):
+                    logo_path = print_resolution_image(logo_path, 6*cm, 4*cm)
+                    
                 # Logo zentriert mit angemessener Größe
                 logo = Image(logo_path, width=6*cm, height=4*cm, kind='proportional')
                 logo.hAlign = 'CENTER'
@@ -740,9 +813,11 @@ class BWAPDFGenerator:
         """Erstellt eine Quartalsauswertung basierend auf dem gewählten Modus"""
         elements = []
         
-        # Einstellungen für Quartals-Modus laden
+        # Einstellungen für Quartals-Modus laden (bei Snapshots der Modus zum Exportzeitpunkt)
         settings = QSettings()
         quarter_mode = settings.value("quarter_mode", "cumulative")
+        if self._snapshot is not None:
+            quarter_mode = self._snapshot.quarter_mode
         
         # Titel je nach Modus
         quarter_ranges_individual = {
@@ -771,23 +846,14 @@ class BWAPDFGenerator:
         elements.append(Paragraph(title, self.title_style))
         elements.append(Spacer(1, 1*cm))
         
-        # Quartals-Daten holen
-        quarter_data = csv_processor.get_data_by_quarter(quarter)
+        # Quartals-Auswertung holen
+        detailed_summary, quarter_cents = self._get_period_summary(csv_processor, account_mappings, quarter)
         
-        if quarter_data.empty:
+        if detailed_summary is None:
             elements.append(Paragraph("Keine Daten für dieses Quartal verfügbar.", self.normal_style))
             return elements
-            
-        # Account-Namen aus QSettings laden
-        settings = QSettings()
-        account_names = {}
-        settings.beginGroup("account_names")
-        for key in settings.allKeys():
-            account_names[key] = settings.value(key, "")
-        settings.endGroup()
         
         # Detaillierte BWA-Tabelle erstellen
-        detailed_summary = self._create_detailed_quarter_summary(quarter_data, account_mappings, account_names)
         table = self._create_detailed_bwa_table(detailed_summary, f"Q{quarter}")
         
         if table:
@@ -803,16 +869,10 @@ class BWAPDFGenerator:
         opening_balance = self._get_opening_balance()
         quarter_balance = self._calculate_quarter_balance(quarter, csv_processor)
         
-        # Quartalssumme berechnen aus DataFrame
-        if quarter_data.empty:
-            quarter_total = 0.0
-        else:
-            quarter_total = quarter_data['Betrag_Clean'].sum() if 'Betrag_Clean' in quarter_data.columns else 0.0
-        
         balance_para = Paragraph(f"Kontostand 01.01.: {self._format_amount(opening_balance)}", self.normal_style)
         elements.append(balance_para)
         
-        quarter_para = Paragraph(f"Summe Quartal {quarter}: {self._format_amount(quarter_total)}", self.normal_style)
+        quarter_para = Paragraph(f"Summe Quartal {quarter}: {self._format_cents(quarter_cents)}", self.normal_style)
         elements.append(quarter_para)
         
         new_balance_para = Paragraph(f"<b>Kontostand nach Q{quarter}: {self._format_amount(quarter_balance)}</b>", self.normal_style)
@@ -833,6 +893,20 @@ class BWAPDFGenerator:
             
         return elements
         
+    def _get_period_summary(self, csv_processor, account_mappings: Dict[str, str], quarter: Optional[int] = None) -> Tuple[Optional[Dict], int]:
+        """Detaillierte Übersicht und Summe in Cent eines Quartals bzw. des Jahres (None ohne Buchungen)"""
+        if self._snapshot is not None:
+            if quarter is None:
+                return self._snapshot.year_summary(), self._snapshot.total_cents
+            return self._snapshot.quarter_summary(quarter), self._snapshot.quarter_total_cents(quarter)
+        
+        data = csv_processor.get_year_data() if quarter is None else csv_processor.get_data_by_quarter(quarter)
+        if data.empty:
+            return None, 0
+            
+        detailed_summary = self._create_detailed_quarter_summary(data, account_mappings, load_account_names())
+        return detailed_summary, sum_cents(data)
+        
     def _create_year_page(self, csv_processor, account_mappings: Dict[str, str]) -> List:
         """Erstellt die Jahresauswertung"""
         elements = []
@@ -843,23 +917,14 @@ class BWAPDFGenerator:
         elements.append(Paragraph(title, self.title_style))
         elements.append(Spacer(1, 1*cm))
         
-        # Jahres-Daten holen
-        year_data = csv_processor.get_year_data()
+        # Jahres-Auswertung holen
+        detailed_summary, year_cents = self._get_period_summary(csv_processor, account_mappings)
         
-        if year_data.empty:
+        if detailed_summary is None:
             elements.append(Paragraph("Keine Daten für das Jahr verfügbar.", self.normal_style))
             return elements
-            
-        # Account-Namen aus QSettings laden
-        settings = QSettings()
-        account_names = {}
-        settings.beginGroup("account_names")
-        for key in settings.allKeys():
-            account_names[key] = settings.value(key, "")
-        settings.endGroup()
         
         # Detaillierte BWA-Tabelle erstellen
-        detailed_summary = self._create_detailed_year_summary(year_data, account_mappings, account_names)
         table = self._create_detailed_bwa_table(detailed_summary, "Jahr")
         
         if table:
@@ -874,13 +939,11 @@ class BWAPDFGenerator:
         
         opening_balance = self._get_opening_balance()
         new_balance = self._calculate_new_balance(csv_processor)
-        # Einheitlich Betrag_Clean verwenden
-        year_total = year_data['Betrag_Clean'].sum() if not year_data.empty and 'Betrag_Clean' in year_data.columns else 0.0
         
         balance_para = Paragraph(f"Kontostand 01.01.: {self._format_amount(opening_balance)}", self.normal_style)
         elements.append(balance_para)
         
-        year_para = Paragraph(f"Summe Gesamtjahr: {self._format_amount(year_total)}", self.normal_style)
+        year_para = Paragraph(f"Summe Gesamtjahr: {self._format_cents(year_cents)}", self.normal_style)
         elements.append(year_para)
         
         new_balance_para = Paragraph(f"<b>Kontostand 31.12.: {self._format_amount(new_balance)}</b>", self.normal_style)
@@ -910,59 +973,45 @@ class BWAPDFGenerator:
         elements.append(Paragraph(title, self.title_style))
         elements.append(Spacer(1, 0.5*cm))
         
-        # Kontodaten holen
-        account_data = csv_processor.get_data_by_account(account_number)
+        # Kontodaten holen: (Buchungsnr., Datum, Verwendungszweck, Cent) je Buchung
+        max_bookings = self._draft['max_bookings'] if self._draft is not None else None
+        if self._snapshot is not None:
+            account_name, bookings, total_cents = self._get_snapshot_account_bookings(account_number)
+            booking_count = len(bookings)
+            bookings = bookings[:max_bookings]
+        else:
+            account_data = csv_processor.get_data_by_account(account_number)
+            booking_count = len(account_data)
+            account_name, bookings, total_cents = self._get_account_bookings(account_data, max_bookings)
         
-        if account_data.empty:
+        if total_cents is None:
             elements.append(Paragraph("Keine Buchungen für dieses Sachkonto.", self.normal_style))
             return elements
             
         # Sachkonto-Name (falls in den Daten vorhanden)
-        if 'Sachkonto' in account_data.columns:
-            account_name = account_data['Sachkonto'].iloc[0]
-            if account_name and str(account_name) != 'nan':
-                subtitle = Paragraph(account_name, self.subtitle_style)
-                elements.append(subtitle)
-                elements.append(Spacer(1, 0.5*cm))
+        if account_name and str(account_name) != 'nan':
+            subtitle = Paragraph(account_name, self.subtitle_style)
+            elements.append(subtitle)
+            elements.append(Spacer(1, 0.5*cm))
                 
         # Buchungstabelle erstellen - mit Buchungsnummer als erste Spalte
         table_data = [['Buchungsnr.', 'Datum', 'Verwendungszweck', 'Betrag']]
         
-        total = 0.0
         row_index = 1  # Start nach Header
         style_commands = []
         
-        for _, row in account_data.iterrows():
-            # Buchungsnummer holen (falls vorhanden)
-            buchungsnr = row['Buchungsnr.'] if 'Buchungsnr.' in row and pd.notna(row['Buchungsnr.']) else ''
-            
-            # Datum im Format DD.MM.YYYY
-            date_str = ''
-            if 'Buchungstag' in row:
-                if hasattr(row['Buchungstag'], 'strftime'):
-                    date_str = row['Buchungstag'].strftime('%d.%m.%Y')
-                else:
-                    # Fallback für String-Format
-                    try:
-                        date_obj = pd.to_datetime(row['Buchungstag'])
-                        date_str = date_obj.strftime('%d.%m.%Y')
-                    except:
-                        date_str = str(row['Buchungstag'])
-            
-            purpose = row['Verwendungszweck'] if 'Verwendungszweck' in row else ''
-            amount = row['Betrag_Clean']
-            
+        for buchungsnr, date_str, purpose, amount_in_cents in bookings:
             # Verwendungszweck kürzen wenn zu lang
             if len(str(purpose)) > 50:  # Etwas kürzer wegen der zusätzlichen Spalte
                 purpose = str(purpose)[:47] + "..."
                 
             # Betrag mit neuer Formatierungsmethode
-            amount_str = self._format_amount(amount)
+            amount_str = self._format_cents(amount_in_cents)
                 
             table_data.append([buchungsnr, date_str, purpose, amount_str])
             
             # Farbformatierung für negative/positive Beträge
-            if amount < 0:
+            if amount_in_cents < 0:
                 style_commands.append(('TEXTCOLOR', (3, row_index), (3, row_index), colors.red))
             else:
                 style_commands.append(('TEXTCOLOR', (3, row_index), (3, row_index), colors.black))
@@ -972,10 +1021,15 @@ class BWAPDFGenerator:
                 style_commands.append(('BACKGROUND', (0, row_index), (-1, row_index), colors.Color(0.98, 0.98, 0.98)))
             
             row_index += 1
-            total += amount
+            
+        # Entwurf: Hinweis auf ausgelassene Buchungen (die Summe enthält alle)
+        if booking_count > len(bookings):
+            table_data.append(['', '', f"… {booking_count - len(bookings)} weitere Buchungen (Entwurf)", ''])
+            style_commands.append(('TEXTCOLOR', (2, row_index), (2, row_index), colors.gray))
+            row_index += 1
             
                 # Summenzeile ohne HTML-Tags
-        total_str = self._format_amount(total)
+        total_str = self._format_cents(total_cents)
         table_data.append(['', '', 'GESAMTERGEBNIS JAHR', total_str])
         
         # Styling für Summenzeile
@@ -988,7 +1042,7 @@ class BWAPDFGenerator:
         ])
         
         # Textfarbe für Summe (rot bei negativ)
-        if total < 0:
+        if total_cents < 0:
             style_commands.append(('TEXTCOLOR', (3, row_index), (3, row_index), colors.red))
         else:
             style_commands.append(('TEXTCOLOR', (3, row_index), (3, row_index), colors.black))
@@ -1022,62 +1076,76 @@ class BWAPDFGenerator:
         
         return elements
         
-    def _create_quarter_summary(self, quarter_data, account_mappings: Dict[str, str]) -> Dict[str, float]:
-        """Erstellt Zusammenfassung für ein Quartal"""
-        summary = {}
+    def _get_account_bookings(self, account_data, max_bookings: Optional[int] = None) -> Tuple[Optional[str], List, Optional[int]]:
+        """Name, Buchungszeilen (höchstens max_bookings) und Summe (Cent) eines Sachkontos aus dem Buchungsjournal"""
+        if account_data.empty:
+            return None, [], None
         
-        # Gruppiert nach BWA-Gruppen
-        for _, row in quarter_data.iterrows():
-            account = str(row['Sachkontonr.'])
-            amount = row['Betrag_Clean']
+        account_name = None
+        if 'Sachkonto' in account_data.columns:
+            account_name = account_data['Sachkonto'].iloc[0]
             
-            group = account_mappings.get(account, f"Nicht zugeordnet ({account})")
+        cents = amount_cents(account_data)
+        bookings = []
+        rows = account_data if max_bookings is None else account_data.head(max_bookings)
+        for (_, row), amount_in_cents in zip(rows.iterrows(), cents):
+            # Buchungsnummer holen (falls vorhanden)
+            buchungsnr = row['Buchungsnr.'] if 'Buchungsnr.' in row and pd.notna(row['Buchungsnr.']) else ''
             
-            if group not in summary:
-                summary[group] = 0.0
-                
-            summary[group] += amount
+            # Datum im Format DD.MM.YYYY
+            date_str = self._format_booking_date(row, '%d.%m.%Y')
             
-        return summary
-    
-    def _create_detailed_quarter_summary(self, quarter_data, account_mappings: Dict[str, str], account_names: Dict[str, str] = None) -> Dict:
-        """Erstellt detaillierte Zusammenfassung für ein Quartal mit einzelnen Sachkonten"""
-        summary = {}
-        detailed_accounts = {}  # {bwa_group: {account: {'name': str, 'amount': float}}}
+            purpose = row['Verwendungszweck'] if 'Verwendungszweck' in row else ''
+            bookings.append((buchungsnr, date_str, purpose, amount_in_cents))
+        return account_name, bookings, int(cents.sum())
+        
+    def _get_snapshot_account_bookings(self, account_number: str) -> Tuple[Optional[str], List, Optional[int]]:
+        """Name, Buchungszeilen und Summe (Cent) eines Sachkontos aus dem geprüften Snapshot"""
+        account = self._snapshot.account(account_number)
+        if account is None or not account.get('transaction_count'):
+            return None, [], None
+        
+        transactions = account.get('transactions', {})
+        dates = []
+        for value in transactions.get('date', []):
+            # Exportiert im Format YYYY-MM-DD, angezeigt als DD.MM.YYYY
+            try:
+                dates.append(datetime.strptime(value, '%Y-%m-%d').strftime('%d.%m.%Y'))
+            except (TypeError, ValueError):
+                dates.append(str(value))
         
-        if account_names is None:
-            account_names = {}
+        cents = transactions.get('amount_cents', [])
+        bookings = list(zip(transactions.get('booking_number', []), dates, transactions.get('purpose', []), cents))
+        return account.get('account_name'), bookings, sum(cents)
         
-        # Gruppiert nach BWA-Gruppen und sammelt Sachkonto-Details
-        for _, row in quarter_data.iterrows():
-            account = str(row['Sachkontonr.'])
-            amount = row['Betrag_Clean']
-            
-            group = account_mappings.get(account, f"Nicht zugeordnet ({account})")
-            account_name = account_names.get(account, f"Sachkonto {account}")
-            
-            # BWA-Gruppen-Summe
-            if group not in summary:
-                summary[group] = 0.0
-                detailed_accounts[group] = {}
-            
-            summary[group] += amount
-            
-            # Sachkonto-Details sammeln
-            if account not in detailed_accounts[group]:
-                detailed_accounts[group][account] = {
-                    'name': account_name,
-                    'amount': 0.0
-                }
-            
-            detailed_accounts[group][account]['amount'] += amount
+    def _sum_cents_by_account(self, data) -> Dict[str, int]:
+        """Summiert die Beträge je Sachkonto in Cent (Reihenfolge des ersten Auftretens)"""
+        if data is None or data.empty:
+            return {}
+        totals = amount_cents(data).groupby(data['Sachkontonr.'], sort=False, observed=True).sum()
+        
+        result = {}
+        for account, total in totals.items():
+            key = str(account)
+            result[key] = result.get(key, 0) + int(total)
+        return result
+        
+    def _create_quarter_summary(self, quarter_data, account_mappings: Dict[str, str]) -> Dict[str, int]:
+        """Erstellt Zusammenfassung für ein Quartal (Cent je BWA-Gruppe)"""
+        group_cents = {}
+        
+        # Gruppiert nach BWA-Gruppen
+        for account, cents in self._sum_cents_by_account(quarter_data).items():
+            group = account_mappings.get(account, unassigned_group(account))
+            group_cents[group] = group_cents.get(group, 0) + cents
             
-        return {
-            'summary': summary,
-            'detailed_accounts': detailed_accounts
-        }
+        return group_cents
+    
+    def _create_detailed_quarter_summary(self, quarter_data, account_mappings: Dict[str, str], account_names: Dict[str, str] = None) -> Dict:
+        """Erstellt detaillierte Zusammenfassung für ein Quartal mit einzelnen Sachkonten"""
+        return build_detailed_summary(self._sum_cents_by_account(quarter_data), account_mappings, account_names)
         
-    def _create_year_summary(self, year_data, account_mappings: Dict[str, str]) -> Dict[str, float]:
+    def _create_year_summary(self, year_data, account_mappings: Dict[str, str]) -> Dict[str, int]:
         """Erstellt Zusammenfassung für das Jahr"""
         return self._create_quarter_summary(year_data, account_mappings)
     
@@ -1085,8 +1153,8 @@ class BWAPDFGenerator:
         """Erstellt detaillierte Zusammenfassung für das Jahr mit einzelnen Sachkonten"""
         return self._create_detailed_quarter_summary(year_data, account_mappings, account_names)
         
-    def _create_bwa_table(self, summary: Dict[str, float], period: str) -> Optional[Table]:
-        """Erstellt eine formatierte BWA-Tabelle mit Obergruppen-Struktur"""
+    def _create_bwa_table(self, summary: Dict[str, int], period: str) -> Optional[Table]:
+        """Erstellt eine formatierte BWA-Tabelle mit Obergruppen-Struktur (Beträge in Cent)"""
         if not summary:
             return None
             
@@ -1094,10 +1162,10 @@ class BWAPDFGenerator:
         super_group_mappings = self._load_super_group_mappings()
         
         # Daten nach Obergruppen organisieren
-        super_groups = {}  # {super_group: {bwa_group: amount}}
+        super_groups = {}  # {super_group: {bwa_group: cents}}
         
         for bwa_group, amount in summary.items():
-            super_group = super_group_mappings.get(bwa_group, "Nicht zugeordnet")
+            super_group = super_group_mappings.get(bwa_group, UNASSIGNED_SUPER_GROUP)
             
             if super_group not in super_groups:
                 super_groups[super_group] = {}
@@ -1107,7 +1175,7 @@ class BWAPDFGenerator:
         table_data = [['Obergruppe / BWA-Gruppe', f'Betrag {period}']]
         
         # Obergruppen sortiert anzeigen
-        total_overall = 0.0
+        total_overall = 0
         row_index = 1  # Start nach Header
         style_commands = []
         
@@ -1130,7 +1198,7 @@ class BWAPDFGenerator:
             super_group_total = sum(bwa_groups.values())
             
             # Obergruppen-Header mit formatiertem Betrag
-            super_group_total_str = self._format_amount(super_group_total)
+            super_group_total_str = self._format_cents(super_group_total)
             table_data.append([super_group, super_group_total_str])
             
             # Farbe für diese Obergruppe
@@ -1156,7 +1224,7 @@ class BWAPDFGenerator:
             # BWA-Gruppen innerhalb der Obergruppe
             for bwa_group in sorted(bwa_groups.keys()):
                 amount = bwa_groups[bwa_group]
-                amount_str = self._format_amount(amount)
+                amount_str = self._format_cents(amount)
                 
                 table_data.append([f"  • {bwa_group}", amount_str])
                 
@@ -1186,7 +1254,7 @@ class BWAPDFGenerator:
         
         # Gesamtergebnis
         if super_groups:
-            result_str = self._format_amount(total_overall)
+            result_str = self._format_cents(total_overall)
             
             table_data.append(['', ''])  # Extra Leerzeile
             table_data.append([f'GESAMTERGEBNIS {period.upper()}', result_str])
@@ -1245,10 +1313,10 @@ class BWAPDFGenerator:
         super_group_mappings = self._load_super_group_mappings()
         
         # Daten nach Obergruppen organisieren
-        super_groups = {}  # {super_group: {bwa_group: amount}}
+        super_groups = {}  # {super_group: {bwa_group: cents}}
         
         for bwa_group, amount in summary.items():
-            super_group = super_group_mappings.get(bwa_group, "Nicht zugeordnet")
+            super_group = super_group_mappings.get(bwa_group, UNASSIGNED_SUPER_GROUP)
             
             if super_group not in super_groups:
                 super_groups[super_group] = {}
@@ -1258,7 +1326,7 @@ class BWAPDFGenerator:
         table_data = [['Obergruppe / BWA-Gruppe', f'Betrag {period}']]
         
         # Obergruppen sortiert anzeigen
-        total_overall = 0.0
+        total_overall = 0
         row_index = 1  # Start nach Header
         style_commands = []
         
@@ -1281,7 +1349,7 @@ class BWAPDFGenerator:
             super_group_total = sum(bwa_groups.values())
             
             # Obergruppen-Header mit formatiertem Betrag
-            super_group_total_str = self._format_amount(super_group_total)
+            super_group_total_str = self._format_cents(super_group_total)
             table_data.append([super_group, super_group_total_str])
             
             # Farbe für diese Obergruppe
@@ -1307,7 +1375,7 @@ class BWAPDFGenerator:
             # BWA-Gruppen innerhalb der Obergruppe
             for bwa_group in sorted(bwa_groups.keys()):
                 bwa_group_amount = bwa_groups[bwa_group]
-                bwa_group_amount_str = self._format_amount(bwa_group_amount)
+                bwa_group_amount_str = self._format_cents(bwa_group_amount)
                 
                 table_data.append([f"  • {bwa_group}", bwa_group_amount_str])
                 
@@ -1333,13 +1401,13 @@ class BWAPDFGenerator:
                     
                     # Sachkonten nach Betrag sortieren (größte zuerst)
                     sorted_accounts = sorted(accounts.items(), 
-                                           key=lambda x: abs(x[1]['amount']), 
+                                           key=lambda x: abs(x[1]['cents']), 
                                            reverse=True)
                     
                     for account_nr, account_data in sorted_accounts:
                         account_name = account_data['name']
-                        account_amount = account_data['amount']
-                        account_amount_str = self._format_amount(account_amount)
+                        account_amount = account_data['cents']
+                        account_amount_str = self._format_cents(account_amount)
                         
                         # Sachkonto-Name kürzen falls zu lang
                         display_name = account_name
@@ -1377,7 +1445,7 @@ class BWAPDFGenerator:
         
         # Gesamtergebnis
         if super_groups:
-            result_str = self._format_amount(total_overall)
+            result_str = self._format_cents(total_overall)
             
             table_data.append(['', ''])  # Extra Leerzeile
             table_data.append([f'GESAMTERGEBNIS {period.upper()}', result_str])
@@ -1424,12 +1492,29 @@ class BWAPDFGenerator:
         
         return table
         
+    def _format_booking_date(self, row, date_format: str) -> str:
+        """Formatiert den Buchungstag einer Zeile (bevorzugt das bereits geparste Datum)"""
+        if 'Buchungstag_Clean' in row and pd.notna(row['Buchungstag_Clean']):
+            return row['Buchungstag_Clean'].strftime(date_format)
+            
+        if 'Buchungstag' not in row:
+            return ''
+            
+        # Fallback für Daten ohne geparste Spalte
+        if hasattr(row['Buchungstag'], 'strftime'):
+            return row['Buchungstag'].strftime(date_format)
+        try:
+            return pd.to_datetime(row['Buchungstag']).strftime(date_format)
+        except Exception:
+            return str(row['Buchungstag'])
+        
     def _format_amount(self, amount: float) -> str:
         """Formatiert einen Betrag mit deutscher Zahlendarstellung"""
-        formatted = f"{abs(amount):,.2f} €".replace(",", "X").replace(".", ",").replace("X", ".")
-        if amount < 0:
-            formatted = f"-{formatted}"
-        return formatted
+        return self._format_cents(to_cents(amount))
+        
+    def _format_cents(self, cents: int) -> str:
+        """Formatiert einen Cent-Betrag mit deutscher Zahlendarstellung"""
+        return format_cents(cents)
     
     def _create_chart_page(self, csv_processor) -> List:
         """Erstellt eine Seite mit Balkendiagramm aller Sachkonten"""
@@ -1440,35 +1525,27 @@ class BWAPDFGenerator:
         story.append(title)
         story.append(Spacer(1, 20))
         
-        # Daten für das Diagramm sammeln
-        accounts = csv_processor.get_account_numbers()
         chart_data = {}
-        
-        # Für jedes Sachkonto den Gesamtsaldo berechnen
-        for account in accounts:
-            account_data = csv_processor.get_data_by_account(account)
-            if not account_data.empty:
-                # Sicherstellen, dass Beträge numerisch sind
-                try:
-                    total_balance = float(account_data['Betrag'].sum())
-                except (ValueError, TypeError):
-                    # Falls das fehlschlägt, bereinige die Daten (entferne € und ersetze , durch .)
-                    amounts = account_data['Betrag'].astype(str)
-                    amounts = amounts.str.replace('€', '').str.replace(',', '.').str.strip()
-                    numeric_amounts = pd.to_numeric(amounts, errors='coerce')
-                    total_balance = float(numeric_amounts.sum())
-                
-                account_name = csv_processor.get_account_name(account)
-                
-                # Sachkonto-Namen aus QSettings holen falls vorhanden
-                settings = QSettings()
-                stored_name = settings.value(f"account_names/{account}", "")
-                if stored_name:
-                    account_name = stored_name
+        if self._snapshot is not None:
+            # Gespeicherte Salden und Namen des Snapshots
+            names = self._snapshot.account_display_names()
+            for account in self._snapshot.accounts:
+                account_number = str(account.get('account_number', ''))
+                account_name = names.get(account_number)
+                display_name = f"{account_number}: {account_name}" if account_name else f"Konto {account_number}"
+                chart_data[display_name] = cents_to_euros(to_cents(account.get('total', 0.0)))
+        else:
+            # Daten für das Diagramm aus den Sachkonten-Stammdaten (Benutzer-Namen aktuell halten)
+            csv_processor.refresh_user_account_names()
+            account_table = csv_processor.get_account_table()
+            
+            # Gesamtsaldo je Sachkonto (exakte Summe in Cent)
+            for account, row in account_table.iterrows():
+                account_name = row['Name_Benutzer'] or row['Name_Import']
                 
                 # Display-Name erstellen
                 display_name = f"{account}: {account_name}" if account_name else f"Konto {account}"
-                chart_data[display_name] = total_balance
+                chart_data[display_name] = cents_to_euros(row['Summe_Cent'])
         
         # Leeren Text hinzufügen falls keine Daten
         if not chart_data:
@@ -1618,21 +1695,18 @@ class BWAPDFGenerator:
             print(f"Fehler beim Erstellen des Sachkonto-Balkendiagramms: {e}")
             return None
     
-    def _create_supergroup_bar_chart(self, summary: Dict[str, float], period: str) -> Optional[Drawing]:
-        """Erstellt ein horizontales Balkendiagramm der Obergruppen"""
+    def _create_supergroup_bar_chart(self, summary: Dict[str, int], period: str) -> Optional[Drawing]:
+        """Erstellt ein horizontales Balkendiagramm der Obergruppen (Beträge in Cent)"""
         try:
             # Obergruppen-Mappings laden
             super_group_mappings = self._load_super_group_mappings()
             
             # Daten nach Obergruppen organisieren
-            super_groups = {}  # {super_group: total_amount}
+            super_groups = {}  # {super_group: total_cents}
             
             for bwa_group, amount in summary.items():
-                super_group = super_group_mappings.get(bwa_group, "Nicht zugeordnet")
-                
-                if super_group not in super_groups:
-                    super_groups[super_group] = 0.0
-                super_groups[super_group] += amount
+                super_group = super_group_mappings.get(bwa_group, UNASSIGNED_SUPER_GROUP)
+                super_groups[super_group] = super_groups.get(super_group, 0) + amount
             
             # Wenn keine Daten vorhanden sind
             if not super_groups:
@@ -1693,7 +1767,7 @@ class BWAPDFGenerator:
                 
                 # Wert rechts vom Balken
                 value_x = center_x + bar_area_width / 2 + 0.2 * cm
-                value_text = self._format_amount(amount)
+                value_text = self._format_cents(amount)
                 value = String(value_x, y_pos + bar_height/2 - 0.1*cm,
                               value_text, fontSize=9, textAnchor='start')
                 drawing.add(value)
@@ -1716,8 +1790,8 @@ class BWAPDFGenerator:
             print(f"Fehler beim Erstellen des Balkendiagramms: {e}")
             return None
 
-    def _create_bwa_group_bar_chart(self, summary: Dict[str, float], period: str) -> Optional[Drawing]:
-        """Erstellt ein horizontales Balkendiagramm der BWA-Gruppen"""
+    def _create_bwa_group_bar_chart(self, summary: Dict[str, int], period: str) -> Optional[Drawing]:
+        """Erstellt ein horizontales Balkendiagramm der BWA-Gruppen (Beträge in Cent)"""
         try:
             # BWA-Gruppen direkt aus dem Summary verwenden
             bwa_groups = summary.copy()
@@ -1782,7 +1856,7 @@ class BWAPDFGenerator:
                 
                 # Wert rechts vom Balken (kompakter positioniert)
                 value_x = left_margin + bar_area_width + 0.1 * cm  # Näher an die Balken
-                value_text = self._format_amount(amount)
+                value_text = self._format_cents(amount)
                 value = String(value_x, y_pos + bar_height/2 - 0.1*cm,
                               value_text, fontSize=9, textAnchor='start')
                 drawing.add(value)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Detaillierte BWA-Zusammenfassung aus Cent-Summen je Sachkonto
+
+Gemeinsame Grundlage für die PDF-Tabellen des Generators und die BWA-Struktur der
+Oberfläche (dort aus dem BookingIndex). Alle Beträge bleiben ganze Cent.
+"""
+
+import json
+from typing import Dict, Optional
+
+from PySide6.QtCore import QSettings
+
+# Obergruppe für BWA-Gruppen ohne Zuordnung
+UNASSIGNED_SUPER_GROUP = "Nicht zugeordnet"
+
+
+def unassigned_group(account: str) -> str:
+    """BWA-Gruppe eines Sachkontos ohne Zuordnung"""
+    return f"Nicht zugeordnet ({account})"
+
+
+def build_detailed_summary(account_cents: Dict[str, int], account_mappings: Dict[str, str],
+                           account_names: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Gruppiert Cent-Summen je Sachkonto nach BWA-Gruppen
+
+    Args:
+        account_cents (Dict[str, int]): Cent-Summe je Sachkonto (Reihenfolge wird übernommen)
+        account_mappings (Dict[str, str]): Sachkonto -> BWA-Gruppe
+        account_names (Dict[str, str]): Benutzerdefinierte Sachkonto-Namen
+
+    Returns:
+        Dict: {'summary': {bwa_group: cents},
+               'detailed_accounts': {bwa_group: {account: {'name': str, 'cents': int}}}}
+    """
+    group_cents = {}
+    detailed_accounts = {}
+
+    if account_names is None:
+        account_names = {}
+
+    for account, cents in account_cents.items():
+        group = account_mappings.get(account, unassigned_group(account))
+
+        # BWA-Gruppen-Summe
+        if group not in group_cents:
+            group_cents[group] = 0
+            detailed_accounts[group] = {}
+        group_cents[group] += cents
+
+        # Sachkonto-Details
+        detailed_accounts[group][account] = {
+            'name': account_names.get(account, f"Sachkonto {account}"),
+            'cents': cents
+        }
+
+    return {
+        'summary': group_cents,
+        'detailed_accounts': detailed_accounts
+    }
+
+
+def load_account_names() -> Dict[str, str]:
+    """Lädt die Sachkonto-Namen aus den Einstellungen"""
+    settings = QSettings()
+    account_names = {}
+    settings.beginGroup("account_names")
+    for key in settings.allKeys():
+        account_names[key] = settings.value(key, "")
+    settings.endGroup()
+    return account_names
+
+
+def load_super_group_mappings() -> Dict[str, str]:
+    """Lädt die Obergruppen-Zuordnung der BWA-Gruppen aus den Einstellungen"""
+    mappings_json = QSettings().value("super_group_mappings", "{}")
+    try:
+        return json.loads(mappings_json)
+    except (json.JSONDecodeError, TypeError):
+        return {}
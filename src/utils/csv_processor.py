@@ -3,14 +3,44 @@
 CSV-Datenverarbeitung für BWA-Generierung
 """
 
+import numpy as np
 import pandas as pd
 import csv
 import json
 from PySide6.QtCore import QSettings
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime, date
+import os
 import re
-from .file_handler import FileHandler
+from .file_handler import FileHandler, XLSX_CHUNK_ROWS
+from .ledger_cache import LedgerCache, PYARROW_AVAILABLE
+from .sheet_scanner import scan_sheets
+from .amounts import parse_amount_cents, amount_cents, cents_to_euros
+from .account_numbers import normalize_account_number
+from .import_pipeline import ImportPipeline, ImportContext, REQUIRED_COLUMNS, parse_booking_date
+from .json_export import open_json_file, is_json_file, json_schema_version, TRANSACTION_COLUMNS
+from .report_snapshot import ReportSnapshot
+from .tracing import traced
+
+# Alle Spalten, die Verarbeitung und Berichte lesen (beim Streaming-Import werden nur diese gelesen)
+USED_COLUMNS = REQUIRED_COLUMNS + [
+    'Buchungsnummer', 'Buchungsnr.', 'Buchungs-Nr.',
+    'Verwendungszweck', 'Beschreibung',
+    'Sachkonto', 'Sachkontobezeichnung', 'Kontobezeichnung', 'Bezeichnung', 'Name'
+]
+
+# Spalten, die nach der Verarbeitung im Buchungsjournal verbleiben (alle anderen liest kein Bericht)
+LEDGER_COLUMNS = [
+    'Sachkontonr.', 'Betrag_Clean', 'Betrag_Cent', 'Buchungstag_Clean', 'Quartal',
+    'Buchungsnr.', 'Verwendungszweck',
+    'Sachkonto', 'Sachkontobezeichnung', 'Kontobezeichnung', 'Bezeichnung', 'Name', 'Beschreibung'
+]
+
+# Mögliche Spalten für Kontobezeichnungen (in dieser Reihenfolge)
+ACCOUNT_NAME_COLUMNS = ['Sachkonto', 'Sachkontobezeichnung', 'Kontobezeichnung', 'Bezeichnung', 'Name', 'Beschreibung']
+
+# Freitext-Spalten (Arrow-Strings wenn pyarrow verfügbar ist)
+TEXT_COLUMNS = ['Buchungsnr.', 'Verwendungszweck']
 
 
 class CSVProcessor:
@@ -21,16 +51,86 @@ class CSVProcessor:
         self.raw_data = None
         self.processed_data = None
         self.file_handler = FileHandler()
+        self.ledger_cache = LedgerCache()
         self.json_data = None  # Für JSON-Import
         self.is_json_source = False  # Flag ob Daten aus JSON stammen
-        
+        self.report_snapshot = None  # Geprüfte Auswertungen eines JSON-Exports (Schnellpfad)
+        self._json_pending = False  # Buchungsjournal des JSON-Exports noch nicht aufgebaut
+        self.loaded_from_cache = False  # Flag ob Daten aus dem Ledger-Cache stammen
+        self.xlsx_chunk_rows = XLSX_CHUNK_ROWS  # Zeilen pro Teilstück beim .xlsx-Streaming
+        self.import_pipeline = ImportPipeline()  # Stufen der Rohdaten-Bereinigung (mit Messwerten)
+        self._account_table = None  # Sachkonten-Stammdaten (siehe get_account_table)
+        self._account_table_source = None
+        
+    def has_data(self) -> bool:
+        """True wenn Buchungen geladen sind (auch wenn das Journal eines Snapshots noch nicht aufgebaut ist)"""
+        return self.processed_data is not None or self._json_pending
+        
+    def ensure_ledger(self) -> Optional[pd.DataFrame]:
+        """
+        Gibt das Buchungsjournal zurück und baut es bei geprüften JSON-Snapshots erst jetzt auf
+        
+        Nur für Aufrufer, die einzelne Buchungen brauchen; Berichte aus dem Snapshot kommen ohne aus.
+        
+        Raises:
+            ValueError: Wenn das Buchungsjournal nicht aus dem JSON-Export aufgebaut werden kann
+        """
+        if self._json_pending:
+            # Vor der Verarbeitung zurücksetzen, da diese selbst auf das Journal zugreift
+            self._json_pending = False
+            try:
+                self.raw_data = self._create_dataframe_from_json()
+                if not self._process_data():
+                    raise ValueError("Buchungsjournal des JSON-Exports konnte nicht aufgebaut werden")
+            except Exception:
+                self.raw_data = None
+                self.processed_data = None
+                self._json_pending = True
+                raise
+        return self.processed_data
+        
+    def get_record_count(self) -> int:
+        """Anzahl der Buchungen (beim Snapshot aus den gespeicherten Sachkonten, ohne Journal)"""
+        if self._json_pending:
+            return self.report_snapshot.transaction_count
+        return 0 if self.processed_data is None else len(self.processed_data)
+        
+    @traced("Import", "import")
     def load_file(self, file_path: str, sheet_name: str = None) -> bool:
         """Lädt eine Datei (CSV, Excel, ODS, JSON) und verarbeitet sie"""
         try:
+            self.report_snapshot = None
+            self._json_pending = False
+            
             # JSON-Datei erkennen und laden
-            if file_path.lower().endswith('.json'):
+            if is_json_file(file_path):
                 return self._load_json_file(file_path)
             
+            # Bereits verarbeitete Datei aus dem Cache laden
+            self.loaded_from_cache = False
+            cache_key = None
+            if self.ledger_cache.is_enabled() and os.path.exists(file_path):
+                cache_key = self.ledger_cache.make_key(file_path, sheet_name, self._get_parse_settings())
+                cached_data = self.ledger_cache.load(cache_key)
+                if cached_data is not None:
+                    print(f"Verarbeitete Daten aus Cache geladen: {file_path}")
+                    self.raw_data = None
+                    self.processed_data = cached_data
+                    self.get_account_table()
+                    self.is_json_source = False
+                    self.loaded_from_cache = True
+                    self.file_handler.close_session()
+                    return True
+            
+            # .xlsx-Dateien werden in Teilstücken gestreamt (konstanter Speicherbedarf)
+            if file_path.lower().endswith('.xlsx'):
+                self.is_json_source = False
+                success = self._load_xlsx_streaming(file_path, sheet_name)
+                self.file_handler.close_session()
+                if success and cache_key:
+                    self.ledger_cache.store(cache_key, self.processed_data)
+                return success
+            
             # Andere Dateiformate mit dem FileHandler laden
             self.raw_data = self.file_handler.process_file(file_path, sheet_name)
             
@@ -44,12 +144,46 @@ class CSVProcessor:
             
             # Daten verarbeiten
             self.is_json_source = False
-            return self._process_data()
+            success = self._process_data()
+            
+            # Arbeitsmappe wird nach dem Import nicht mehr benötigt
+            self.file_handler.close_session()
+            
+            # Ergebnis für das nächste Öffnen zwischenspeichern
+            if success and cache_key:
+                self.ledger_cache.store(cache_key, self.processed_data)
+            
+            return success
             
         except Exception as e:
             print(f"Fehler beim Laden der Datei: {e}")
             return False
         
+    @traced("Excel-Streaming", "import")
+    def _load_xlsx_streaming(self, file_path: str, sheet_name: str = None) -> bool:
+        """Importiert eine .xlsx-Datei teilstückweise, gelesen werden nur die benötigten Spalten"""
+        processed_chunks = []
+        self.import_pipeline.reset_metrics()
+        chunks = self.file_handler.iter_xlsx_chunks(
+            file_path, sheet_name, USED_COLUMNS, chunk_size=self.xlsx_chunk_rows
+        )
+        for chunk in chunks:
+            processed = self._process_frame(chunk)
+            if processed is None:
+                return False
+            processed_chunks.append(processed)
+            
+        # Rohdaten werden beim Streaming nicht vorgehalten
+        self.raw_data = None
+        if len(processed_chunks) == 1:
+            df = processed_chunks[0]
+        else:
+            df = pd.concat(processed_chunks)
+        self.processed_data = self._compact_ledger(df)
+        self.get_account_table()
+        self._print_import_metrics()
+        return True
+        
     def get_csv_separator(self) -> str:
         """Holt das CSV-Trennzeichen aus den Einstellungen"""
         separator = self.settings.value("csv_separator", ";")
@@ -57,32 +191,22 @@ class CSVProcessor:
             separator = "\t"
         return separator
     
+    def _get_parse_settings(self) -> Dict[str, str]:
+        """Gibt die Einstellungen zurück, die das Verarbeitungsergebnis beeinflussen"""
+        return {
+            'decimal_separator': self.settings.value("decimal_separator", ","),
+            'csv_separator': self.get_csv_separator()
+        }
+        
     def normalize_account_number(self, account_nr) -> str:
         """Normalisiert eine Sachkontonummer zu einem String-Format"""
-        if pd.isna(account_nr):
-            return ""
-        
-        # Zu String konvertieren und Whitespace entfernen
-        account_str = str(account_nr).strip()
-        
-        # Prüfen ob es eine Zahl ist (auch Floats)
-        if account_str.replace('.', '').replace('-', '').isdigit():
-            try:
-                # Float zu Int zu String (entfernt .0 Endungen)
-                float_val = float(account_str)
-                if float_val.is_integer():
-                    return str(int(float_val))
-                else:
-                    return account_str  # Behalte Original wenn echte Dezimalzahl
-            except ValueError:
-                pass
-        
-        return account_str
+        return normalize_account_number(account_nr)
         
+    @traced("JSON laden", "import")
     def _load_json_file(self, file_path: str) -> bool:
-        """Lädt eine JSON-Datei mit BWA-Daten"""
+        """Lädt eine JSON-Datei mit BWA-Daten (.json oder gzip-komprimiert .json.gz)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
+            with open_json_file(file_path) as f:
                 self.json_data = json.load(f)
             
             # JSON-Struktur validieren
@@ -90,6 +214,17 @@ class CSVProcessor:
                 print("Ungültige JSON-Struktur für BWA-Import")
                 return False
             
+            # Schnellpfad: geprüfte Auswertungen direkt verwenden, Buchungsjournal erst bei Bedarf aufbauen
+            if self.settings.value("json_trusted_snapshot", False, type=bool):
+                self.report_snapshot = ReportSnapshot.from_json(self.json_data)
+                if self.report_snapshot is not None:
+                    print("✅ Prüfsumme des JSON-Exports bestätigt - Neuberechnung entfällt")
+                    self.raw_data = None
+                    self.processed_data = None
+                    self._json_pending = True
+                    self.is_json_source = True
+                    return True
+            
             # DataFrame aus JSON-Daten erstellen
             self.raw_data = self._create_dataframe_from_json()
             self.is_json_source = True
@@ -117,8 +252,45 @@ class CSVProcessor:
         
         return True
     
+    @traced("JSON-Buchungen aufbauen", "import")
     def _create_dataframe_from_json(self) -> pd.DataFrame:
-        """Erstellt ein DataFrame aus den JSON-Kontodaten"""
+        """Erstellt ein DataFrame aus den JSON-Kontodaten (Schema v1 oder v2)"""
+        if json_schema_version(self.json_data) >= 2:
+            return self._create_dataframe_from_json_columns()
+        return self._create_dataframe_from_json_rows()
+    
+    def _create_dataframe_from_json_columns(self) -> pd.DataFrame:
+        """Erstellt das DataFrame direkt aus den Buchungsspalten (Schema v2)"""
+        columns = {column: [] for column in TRANSACTION_COLUMNS}
+        account_numbers, account_names, counts = [], [], []
+        
+        for account in self.json_data['account_details']:
+            transactions = account.get('transactions', {})
+            count = len(transactions.get('amount_cents', []))
+            for column in TRANSACTION_COLUMNS:
+                values = transactions.get(column, [])
+                if len(values) != count:
+                    raise ValueError(f"Spalte '{column}' von Sachkonto {account.get('account_number')} "
+                                     f"hat {len(values)} statt {count} Werte")
+                columns[column].extend(values)
+            account_numbers.append(account.get('account_number', ''))
+            account_names.append(account.get('account_name', ''))
+            counts.append(count)
+        
+        # Cent liegen bereits exakt vor und werden beim Import nicht erneut geparst
+        cents = pd.array(columns['amount_cents'], dtype='Int64')
+        return pd.DataFrame({
+            'Buchungsnr.': columns['booking_number'],
+            'Sachkontonr.': np.repeat(np.array(account_numbers, dtype=object), counts),
+            'Sachkonto': np.repeat(np.array(account_names, dtype=object), counts),
+            'Buchungstag': columns['date'],
+            'Verwendungszweck': columns['purpose'],
+            'Betrag': cents.astype('Float64') / 100,
+            'Betrag_Cent': cents,
+        })
+    
+    def _create_dataframe_from_json_rows(self) -> pd.DataFrame:
+        """Erstellt ein DataFrame aus Buchungen als Objekte je Zeile (Schema v1)"""
         rows = []
         
         for account in self.json_data['account_details']:
@@ -220,10 +392,19 @@ class CSVProcessor:
         """Prüft ob eine Datei mehrere Arbeitsblätter hat"""
         return self.file_handler.has_multiple_sheets(file_path)
         
+    def get_workbook_session(self, file_path: str):
+        """Gibt die gemeinsame Arbeitsmappen-Sitzung des FileHandlers zurück"""
+        return self.file_handler.get_session(file_path)
+        
+    def scan_sheets(self, file_path: str):
+        """Prüft die Kopfzeilen aller Arbeitsblätter auf die Pflichtspalten"""
+        return scan_sheets(self.get_workbook_session(file_path), REQUIRED_COLUMNS)
+        
     def get_sheet_names(self, file_path: str) -> List[str]:
         """Gibt die Namen aller Arbeitsblätter einer Datei zurück"""
         return self.file_handler.get_sheet_names(file_path)
             
+    @traced("Verarbeitung", "import")
     def _process_data(self) -> bool:
         """Verarbeitet die geladenen Rohdaten"""
         if self.raw_data is None:
@@ -231,131 +412,88 @@ class CSVProcessor:
             
         try:
             # Kopie für Verarbeitung erstellen
-            df = self.raw_data.copy()
-            
-            # Erforderliche Spalten prüfen
-            required_columns = ['Sachkontonr.', 'Betrag', 'Buchungstag']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                print(f"Fehlende Spalten: {missing_columns}")
-                return False
-            
-            # Optionale Spalten identifizieren
-            optional_columns = ['Buchungsnummer', 'Buchungsnr.', 'Buchungs-Nr.', 'Verwendungszweck', 'Beschreibung']
-            
-            # Buchungsnummer-Spalte finden oder erstellen
-            buchungsnummer_col = None
-            for col in optional_columns:
-                if col in df.columns:
-                    buchungsnummer_col = col
-                    break
-            
-            # Falls keine Buchungsnummer-Spalte gefunden, aus Verwendungszweck extrahieren
-            if buchungsnummer_col is None and 'Verwendungszweck' in df.columns:
-                # Versuche Buchungsnummer aus Verwendungszweck zu extrahieren (Format: B240027, B250145)
-                df['Buchungsnummer'] = df['Verwendungszweck'].str.extract(r'(B\d+)', expand=False)
-                buchungsnummer_col = 'Buchungsnummer'
-            elif buchungsnummer_col is None:
-                # Fallback: leere Buchungsnummer erstellen
-                df['Buchungsnummer'] = ''
-                buchungsnummer_col = 'Buchungsnummer'
-            
-            # Optionale Spalten identifizieren
-            optional_columns = ['Belegnummer', 'Belegnr.', 'Beleg-Nr.', 'Verwendungszweck', 'Beschreibung']
-            
-            # Belegnummer-Spalte finden oder erstellen
-            belegnummer_col = None
-            for col in optional_columns:
-                if col in df.columns:
-                    belegnummer_col = col
-                    break
-            
-            # Falls keine Belegnummer-Spalte gefunden, aus Verwendungszweck extrahieren
-            if belegnummer_col is None and 'Verwendungszweck' in df.columns:
-                # Versuche Belegnummer aus Verwendungszweck zu extrahieren (Format: B240027, B250145)
-                df['Belegnummer'] = df['Verwendungszweck'].str.extract(r'(B\d+)', expand=False)
-                belegnummer_col = 'Belegnummer'
-            elif belegnummer_col is None:
-                # Fallback: leere Belegnummer erstellen
-                df['Belegnummer'] = ''
-                belegnummer_col = 'Belegnummer'
+            self.import_pipeline.reset_metrics()
+            df = self._process_frame(self.raw_data.copy())
+            if df is None:
                 return False
                 
-            # Sachkontonr. als String sicherstellen und normalisieren
-            df['Sachkontonr.'] = df['Sachkontonr.'].apply(self.normalize_account_number)
-            
-            # Leere Zeilen entfernen
-            df = df.dropna(subset=['Sachkontonr.', 'Betrag'])
-            
-            # Betrag verarbeiten (Euro-Zeichen entfernen, Komma durch Punkt ersetzen)
-            df['Betrag_Clean'] = df['Betrag'].apply(self._clean_amount)
+            self.processed_data = self._compact_ledger(df)
             
-            # Buchungstag verarbeiten
-            df['Buchungstag_Clean'] = df['Buchungstag'].apply(self._parse_date)
+            # Sachkonten-Stammdaten im selben Importlauf aufbauen
+            self.get_account_table()
             
-            # Nur Zeilen mit gültigen Daten behalten
-            df = df.dropna(subset=['Betrag_Clean', 'Buchungstag_Clean'])
-            
-            # Quartal hinzufügen
-            df['Quartal'] = df['Buchungstag_Clean'].apply(self._get_quarter)
-            
-            self.processed_data = df
+            # Rohdaten werden nach der Verarbeitung nicht mehr benötigt
+            self.raw_data = None
+            self._print_import_metrics()
             return True
             
         except Exception as e:
             print(f"Fehler bei der Datenverarbeitung: {e}")
             return False
             
-    def _clean_amount(self, amount_str: str) -> Optional[float]:
-        """Bereinigt Betragswerte"""
-        if pd.isna(amount_str) or amount_str == '':
-            return None
-            
-        try:
-            # Euro-Zeichen und Leerzeichen entfernen
-            cleaned = str(amount_str).replace('€', '').replace(' ', '')
-            
-            # Dezimaltrennzeichen standardisieren
-            decimal_separator = self.settings.value("decimal_separator", ",")
-            if decimal_separator == ",":
-                # Deutsche Notation: 1.234,56 -> 1234.56
-                if ',' in cleaned and '.' in cleaned:
-                    # Beide Zeichen vorhanden, Punkt ist Tausendertrennzeichen
-                    cleaned = cleaned.replace('.', '').replace(',', '.')
-                elif ',' in cleaned:
-                    # Nur Komma vorhanden, ist Dezimaltrennzeichen
-                    cleaned = cleaned.replace(',', '.')
+    def get_import_metrics(self) -> Dict:
+        """Messwerte der Import-Stufen des letzten Imports ({Stufe: StageMetrics})"""
+        return dict(self.import_pipeline.metrics)
+        
+    def _print_import_metrics(self):
+        """Gibt Laufzeit und Zeilenzahlen der Import-Stufen aus"""
+        if self.import_pipeline.metrics:
+            print("Import-Stufen:\n" + self.import_pipeline.format_metrics())
+            
+    def _process_frame(self, df: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Bereinigt ein DataFrame mit Rohdaten (ganze Datei oder ein Teilstück)"""
+        context = ImportContext(self.settings.value("decimal_separator", ","))
+        return self.import_pipeline.run(df, context)
+            
+    def _compact_ledger(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Wandelt das verarbeitete Buchungsjournal in speichersparende Datentypen um
+        
+        Sachkontonummern werden kategorisch, Beträge zusätzlich als Cent (int64),
+        Buchungstage als datetime64 und Quartale als int8 gespeichert. Spalten,
+        die kein Bericht liest (Rohwerte von Betrag/Buchungstag usw.), entfallen.
+        """
+        cents = amount_cents(df)
+        
+        compact = {
+            'Sachkontonr.': df['Sachkontonr.'].astype('category').cat.remove_unused_categories(),
+            # Cent sind maßgeblich, Euro-Werte nur für Anzeige und Kompatibilität
+            'Betrag_Clean': cents.astype('float64') / 100,
+            'Betrag_Cent': cents,
+            'Buchungstag_Clean': pd.to_datetime(df['Buchungstag_Clean']),
+            'Quartal': df['Quartal'].astype('int8'),
+        }
+        
+        for col in LEDGER_COLUMNS:
+            if col in compact or col not in df.columns:
+                continue
+            if col in TEXT_COLUMNS:
+                text_dtype = self._get_text_dtype()
+                compact[col] = df[col].astype(text_dtype) if text_dtype else df[col]
             else:
-                # Englische Notation: 1,234.56 -> 1234.56
-                if ',' in cleaned and '.' in cleaned:
-                    # Beide Zeichen vorhanden, Komma ist Tausendertrennzeichen
-                    cleaned = cleaned.replace(',', '')
-                    
-            return float(cleaned)
-            
-        except (ValueError, TypeError):
+                # Kontobezeichnungen wiederholen sich je Sachkonto
+                compact[col] = df[col].astype('category')
+                
+        return pd.DataFrame(compact, index=df.index)
+        
+    def _get_text_dtype(self):
+        """Datentyp für Freitext-Spalten (Arrow-Strings, None ohne pyarrow = unverändert)"""
+        if not PYARROW_AVAILABLE:
             return None
+        try:
+            # Fehlende Werte bleiben NaN (wie bei object-Spalten)
+            return pd.StringDtype("pyarrow", na_value=np.nan)
+        except TypeError:
+            return pd.StringDtype("pyarrow")
+        
+    def _clean_amount(self, amount_str: str) -> Optional[float]:
+        """Bereinigt Betragswerte"""
+        cents = parse_amount_cents(amount_str, self.settings.value("decimal_separator", ","))
+        return None if cents is None else cents_to_euros(cents)
             
     def _parse_date(self, date_str: str) -> Optional[date]:
         """Parst Datumswerte"""
-        if pd.isna(date_str) or date_str == '':
-            return None
-            
-        try:
-            # Verschiedene Datumsformate versuchen
-            formats = ['%Y.%m.%d', '%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y']
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(str(date_str).strip(), fmt).date()
-                except ValueError:
-                    continue
-                    
-            return None
-            
-        except Exception:
-            return None
+        return parse_booking_date(date_str)
             
     def _get_quarter(self, date_obj: date) -> int:
         """Bestimmt das Quartal für ein Datum"""
@@ -372,55 +510,125 @@ class CSVProcessor:
         else:
             return 4
             
+    def get_account_table(self) -> pd.DataFrame:
+        """
+        Gibt die Sachkonten-Stammdaten zurück (eine Zeile je Sachkonto, sortiert)
+        
+        Spalten: Name_Import, Name_Benutzer, Buchungen, Erste_Buchung,
+        Letzte_Buchung, Summe_Cent. Die Tabelle wird beim Import aufgebaut und
+        bei direkt gesetzten Daten bei Bedarf neu erstellt.
+        """
+        if self.ensure_ledger() is None:
+            return self._build_account_table(None)
+            
+        if self._account_table is None or self._account_table_source is not self.processed_data:
+            self._account_table = self._build_account_table(self.processed_data)
+            self._account_table_source = self.processed_data
+        return self._account_table
+        
+    @traced("Sachkonten-Stammdaten", "import")
+    def _build_account_table(self, data: Optional[pd.DataFrame]) -> pd.DataFrame:
+        """Baut die Sachkonten-Stammdaten in einem Durchlauf über das Journal auf"""
+        columns = ['Name_Import', 'Name_Benutzer', 'Buchungen', 'Erste_Buchung', 'Letzte_Buchung', 'Summe_Cent']
+        if data is None or data.empty or 'Sachkontonr.' not in data.columns:
+            return pd.DataFrame(columns=columns, index=pd.Index([], name='Sachkontonr.'))
+            
+        # Schlüssel wie in get_account_numbers (bei kategorischen Spalten nur je Kategorie berechnet)
+        keys = data['Sachkontonr.'].map(lambda acc: str(acc).strip() if pd.notna(acc) else '')
+        keys = keys.astype(str)
+        valid = keys != ''
+        grouped = amount_cents(data)[valid].groupby(keys[valid])
+        
+        table = pd.DataFrame({
+            'Buchungen': grouped.size(),
+            'Summe_Cent': grouped.sum(),
+        })
+        table.index.name = 'Sachkontonr.'
+        
+        if 'Buchungstag_Clean' in data.columns:
+            dates = pd.to_datetime(data['Buchungstag_Clean'], errors='coerce')[valid].groupby(keys[valid])
+            table['Erste_Buchung'] = dates.min()
+            table['Letzte_Buchung'] = dates.max()
+        else:
+            table['Erste_Buchung'] = pd.NaT
+            table['Letzte_Buchung'] = pd.NaT
+            
+        # Bezeichnung aus der ersten Buchung je Sachkonto (erste nicht-leere Namensspalte)
+        first_rows = data.loc[valid & ~keys.duplicated()]
+        first_keys = keys[first_rows.index]
+        source_names = pd.Series(None, index=table.index, dtype=object)
+        for col in ACCOUNT_NAME_COLUMNS:
+            if col not in data.columns:
+                continue
+            names = pd.Series(first_rows[col].to_numpy(dtype=object), index=first_keys.to_numpy())
+            names = names.map(lambda name: str(name).strip() if pd.notna(name) else None)
+            names = names[names.astype(bool) & source_names.reindex(names.index).isna()]
+            source_names.loc[names.index] = names
+        # Fehlende Bezeichnungen als None (wie bisher bei get_account_name)
+        table['Name_Import'] = source_names.astype(object).where(source_names.notna(), None)
+        
+        user_names = self._load_user_account_names()
+        table['Name_Benutzer'] = pd.Series(
+            [user_names.get(account) for account in table.index], index=table.index, dtype=object
+        )
+        
+        return table[columns].sort_index()
+        
+    def _load_user_account_names(self) -> Dict[str, str]:
+        """Liest die vom Benutzer vergebenen Sachkonten-Namen (einmal je Aufbau)"""
+        settings = QSettings()
+        names = {}
+        settings.beginGroup("account_names")
+        for key in settings.allKeys():
+            value = settings.value(key, "")
+            if value:
+                names[key] = str(value)
+        settings.endGroup()
+        return names
+        
+    def refresh_user_account_names(self):
+        """Übernimmt geänderte Benutzer-Namen in die Sachkonten-Stammdaten"""
+        table = self.get_account_table()
+        if table.empty:
+            return
+        user_names = self._load_user_account_names()
+        table['Name_Benutzer'] = pd.Series(
+            [user_names.get(account) for account in table.index], index=table.index, dtype=object
+        )
+        
+    def get_account_display_name(self, account_number: str) -> Optional[str]:
+        """Anzeigename eines Sachkontos (Benutzer-Name vor Import-Bezeichnung)"""
+        table = self.get_account_table()
+        account_number = str(account_number).strip()
+        if account_number not in table.index:
+            return None
+        row = table.loc[account_number]
+        return row['Name_Benutzer'] or row['Name_Import']
+        
     def get_account_numbers(self) -> List[str]:
-        """Gibt alle eindeutigen Sachkontonummern zurück"""
-        if self.processed_data is None:
-            return []
-            
-        # Sachkontonr. sind bereits als String gespeichert
-        accounts = self.processed_data['Sachkontonr.'].unique()
-        return sorted([str(acc).strip() for acc in accounts if pd.notna(acc) and str(acc).strip()])
+        """Gibt alle eindeutigen Sachkontonummern zurück (beim Snapshot ohne Buchungsjournal)"""
+        if self._json_pending:
+            return self.report_snapshot.account_numbers()
+        return self.get_account_table().index.tolist()
         
     def get_account_name(self, account_number: str) -> Optional[str]:
         """Gibt den Namen/Beschreibung eines Sachkontos zurück, falls vorhanden"""
-        if self.processed_data is None:
-            return None
-            
+        table = self.get_account_table()
+        
         # account_number als String sicherstellen
         account_number = str(account_number).strip()
-            
-        # Mögliche Spalten für Kontobezeichnungen
-        name_columns = ['Sachkonto', 'Sachkontobezeichnung', 'Kontobezeichnung', 'Bezeichnung', 'Name', 'Beschreibung']
-        
-        for col in name_columns:
-            if col in self.processed_data.columns:
-                # Erste Zeile mit diesem Sachkonto finden
-                # Sachkontonr. sind bereits als String gespeichert
-                matching_rows = self.processed_data[self.processed_data['Sachkontonr.'] == account_number]
-                if not matching_rows.empty:
-                    name = matching_rows[col].iloc[0]
-                    if pd.notna(name) and str(name).strip():
-                        return str(name).strip()
-        return None
+        if account_number not in table.index:
+            return None
+        return table.at[account_number, 'Name_Import']
         
     def get_all_account_names(self) -> Dict[str, str]:
         """Gibt ein Dictionary aller Sachkonten mit ihren Namen zurück"""
-        if self.processed_data is None:
-            return {}
-            
-        account_names = {}
-        account_numbers = self.get_account_numbers()
-        
-        for account_num in account_numbers:
-            name = self.get_account_name(account_num)
-            if name:
-                account_names[account_num] = name
-                
-        return account_names
+        names = self.get_account_table()['Name_Import'].dropna()
+        return names.to_dict()
         
     def get_data_by_quarter(self, quarter: int) -> pd.DataFrame:
         """Gibt Daten für ein bestimmtes Quartal zurück (basierend auf Einstellungen)"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return pd.DataFrame()
             
         # Quartals-Modus aus Einstellungen laden
@@ -432,91 +640,114 @@ class CSVProcessor:
         else:
             return self.get_data_by_quarter_individual(quarter)
             
+    # Die Zugriffsmethoden liefern mit Copy-on-Write keine defensiven Kopien:
+    # Änderungen am Ergebnis wirken sich nie auf processed_data aus.
+    
     def get_data_by_quarter_individual(self, quarter: int) -> pd.DataFrame:
         """Gibt Daten nur für das spezifische Quartal zurück (quartalsweise)"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return pd.DataFrame()
             
-        return self.processed_data[self.processed_data['Quartal'] == quarter].copy()
+        return self._select_rows(self.processed_data['Quartal'] == quarter)
         
     def get_data_by_quarter_cumulative(self, quarter: int) -> pd.DataFrame:
         """Gibt kumulative Daten vom Jahresanfang bis Ende des Quartals zurück"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return pd.DataFrame()
             
         # Für kumulative Auswertung: alle Quartale von 1 bis einschließlich dem gewünschten
-        return self.processed_data[self.processed_data['Quartal'] <= quarter].copy()
+        return self._select_rows(self.processed_data['Quartal'] <= quarter)
         
     def get_data_by_account(self, account_number: str) -> pd.DataFrame:
         """Gibt Daten für ein bestimmtes Sachkonto zurück"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return pd.DataFrame()
             
-        return self.processed_data[
-            self.processed_data['Sachkontonr.'] == account_number
-        ].copy()
+        return self._select_rows(self.processed_data['Sachkontonr.'] == account_number)
         
     def get_year_data(self) -> pd.DataFrame:
         """Gibt alle Daten des Jahres zurück"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return pd.DataFrame()
             
-        return self.processed_data.copy()
+        return self._ledger_view()
+        
+    def get_total_cents(self, quarter: Optional[int] = None) -> int:
+        """Summe der Beträge in Cent (ganzes Jahr oder Quartal gemäß Quartals-Modus)"""
+        if self.ensure_ledger() is None:
+            return 0
+            
+        cents = amount_cents(self.processed_data)
+        if quarter is not None:
+            # Nur die Cent-Spalte filtern statt ganzer Zeilen
+            quarter_mode = QSettings().value("quarter_mode", "cumulative")
+            quarters = self.processed_data['Quartal']
+            cents = cents[quarters <= quarter] if quarter_mode == "cumulative" else cents[quarters == quarter]
+        return int(cents.sum())
+        
+    def _select_rows(self, mask: pd.Series) -> pd.DataFrame:
+        """Zeilenauswahl ohne Kopie des ganzen Journals, wenn alle Zeilen ausgewählt sind"""
+        if mask.all():
+            return self._ledger_view()
+        # Auswahl per Maske legt immer neue Spalten an
+        return self.processed_data[mask]
+        
+    def _ledger_view(self) -> pd.DataFrame:
+        """
+        Flache Ansicht des ganzen Journals
+
+        Mit Copy-on-Write (ab pandas 3 immer aktiv) teilt sie den Speicher mit dem Journal,
+        Schreibzugriffe des Aufrufers erzeugen eine eigene Kopie.
+        """
+        return self.processed_data.copy(deep=False)
+        
+    def _get_cents_by_account_and_quarter(self) -> Dict[str, Dict[str, int]]:
+        """Summiert die Beträge je Sachkonto und Quartal exakt in Cent"""
+        data = self.processed_data
+        cents = amount_cents(data)
+        totals = cents.groupby(
+            [data['Sachkontonr.'], data['Quartal']], sort=False, observed=True
+        ).sum()
+        
+        result = {}
+        for (account, quarter), total in totals.items():
+            sums = result.setdefault(str(account), {'Q1': 0, 'Q2': 0, 'Q3': 0, 'Q4': 0, 'Jahr': 0})
+            if 1 <= quarter <= 4:
+                sums[f'Q{quarter}'] += int(total)
+            sums['Jahr'] += int(total)
+        return result
         
     def get_summary_by_account_group(self, account_mappings: Dict[str, str]) -> Dict[str, Dict[str, float]]:
         """Erstellt Zusammenfassung nach BWA-Gruppen"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return {}
             
-        summary = {}
+        account_cents = self._get_cents_by_account_and_quarter()
+        group_cents = {}
         
-        # Für jede BWA-Gruppe
+        # Für jede BWA-Gruppe die Cent-Summen ihrer Sachkonten addieren
         for account, group in account_mappings.items():
-            if group not in summary:
-                summary[group] = {
-                    'Q1': 0.0, 'Q2': 0.0, 'Q3': 0.0, 'Q4': 0.0, 'Jahr': 0.0
-                }
-                
-            # Daten für dieses Sachkonto
-            account_data = self.get_data_by_account(account)
-            
-            if not account_data.empty:
-                # Nach Quartalen summieren
-                for quarter in range(1, 5):
-                    quarter_data = account_data[account_data['Quartal'] == quarter]
-                    quarter_sum = quarter_data['Betrag_Clean'].sum()
-                    summary[group][f'Q{quarter}'] += quarter_sum
-                    
-                # Jahressumme
-                year_sum = account_data['Betrag_Clean'].sum()
-                summary[group]['Jahr'] += year_sum
+            sums = group_cents.setdefault(group, {'Q1': 0, 'Q2': 0, 'Q3': 0, 'Q4': 0, 'Jahr': 0})
+            for key, total in account_cents.get(str(account), {}).items():
+                sums[key] += total
                 
-        return summary
+        return {
+            group: {key: cents_to_euros(total) for key, total in sums.items()}
+            for group, sums in group_cents.items()
+        }
         
     def get_summary_by_account(self) -> Dict[str, Dict[str, float]]:
         """Erstellt Zusammenfassung nach Sachkonten"""
-        if self.processed_data is None:
+        if self.ensure_ledger() is None:
             return {}
             
+        account_cents = self._get_cents_by_account_and_quarter()
         summary = {}
-        accounts = self.get_account_numbers()
         
-        for account in accounts:
-            account_data = self.get_data_by_account(account)
-            
-            if not account_data.empty:
+        for account in self.get_account_numbers():
+            if account in account_cents:
                 summary[account] = {
-                    'Q1': 0.0, 'Q2': 0.0, 'Q3': 0.0, 'Q4': 0.0, 'Jahr': 0.0
+                    key: cents_to_euros(total) for key, total in account_cents[account].items()
                 }
                 
-                # Nach Quartalen summieren
-                for quarter in range(1, 5):
-                    quarter_data = account_data[account_data['Quartal'] == quarter]
-                    quarter_sum = quarter_data['Betrag_Clean'].sum()
-                    summary[account][f'Q{quarter}'] = quarter_sum
-                    
-                # Jahressumme
-                year_sum = account_data['Betrag_Clean'].sum()
-                summary[account]['Jahr'] = year_sum
-                
         return summary
@@ -8,12 +8,34 @@ import pandas as pd
 import chardet
 from pathlib import Path
 
+from .workbook_session import WorkbookSession, read_xlsx_header, is_empty_row
+from .tracing import span, traced, tracer
+
+# Zeilen pro Teilstück beim Streaming-Import von .xlsx-Dateien
+XLSX_CHUNK_ROWS = 50000
+
 
 class FileHandler:
     """Klasse zur Verarbeitung verschiedener Dateiformate"""
     
     def __init__(self):
         self.supported_extensions = ['.xlsx', '.xls', '.ods', '.csv']
+        self._session = None
+        
+    def get_session(self, file_path):
+        """Gibt die Arbeitsmappen-Sitzung für eine Excel/ODS-Datei zurück (wiederverwendet)"""
+        if self._session is not None and self._session.is_valid_for(file_path):
+            return self._session
+            
+        self.close_session()
+        self._session = WorkbookSession(file_path)
+        return self._session
+        
+    def close_session(self):
+        """Schließt die aktuelle Arbeitsmappen-Sitzung"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         
     def process_file(self, file_path, sheet_name=None):
         """Verarbeitet eine Datei und gibt den Inhalt zurück"""
@@ -26,12 +48,15 @@ class FileHandler:
             raise ValueError(f"Nicht unterstütztes Dateiformat: {file_extension}")
             
         try:
-            if file_extension in ['.xlsx', '.xls']:
-                return self._process_excel(file_path, sheet_name)
-            elif file_extension == '.ods':
-                return self._process_ods(file_path, sheet_name)
-            elif file_extension == '.csv':
-                return self._process_csv(file_path)
+            with span("Datei lesen", "datei", file=os.path.basename(file_path), sheet=sheet_name) as trace:
+                if file_extension in ['.xlsx', '.xls']:
+                    df = self._process_excel(file_path, sheet_name)
+                elif file_extension == '.ods':
+                    df = self._process_ods(file_path, sheet_name)
+                else:
+                    df = self._process_csv(file_path)
+                trace.set(rows=len(df), columns=len(df.columns))
+                return df
         except Exception as e:
             raise Exception(f"Fehler beim Verarbeiten der Datei: {str(e)}")
             
@@ -46,19 +71,7 @@ class FileHandler:
             return None  # CSV-Dateien haben keine Blätter
             
         try:
-            if file_extension in ['.xlsx', '.xls']:
-                engine = 'openpyxl' if file_extension == '.xlsx' else 'xlrd'
-                excel_file = pd.ExcelFile(file_path, engine=engine)
-                return excel_file.sheet_names
-            elif file_extension == '.ods':
-                try:
-                    excel_file = pd.ExcelFile(file_path, engine='odf')
-                    return excel_file.sheet_names
-                except ImportError:
-                    raise Exception(
-                        "Für ODS-Dateien ist das 'odfpy' Paket erforderlich. "
-                        "Installieren Sie es mit: pip install odfpy"
-                    )
+            return self.get_session(file_path).sheet_names
         except Exception as e:
             raise Exception(f"Fehler beim Lesen der Blatt-Namen: {str(e)}")
             
@@ -67,22 +80,22 @@ class FileHandler:
         sheet_names = self.get_sheet_names(file_path)
         return sheet_names is not None and len(sheet_names) > 1
             
+    @traced("Excel lesen", "datei")
     def _process_excel(self, file_path, sheet_name=None):
         """Verarbeitet Excel-Dateien"""
         print(f"Verarbeite Excel-Datei: {file_path}")
         if sheet_name:
             print(f"Arbeitsblatt: {sheet_name}")
         
-        # Excel-Datei lesen
-        engine = 'openpyxl' if file_path.endswith('.xlsx') else 'xlrd'
+        # Excel-Datei über die gemeinsame Sitzung lesen (nur einmal öffnen)
+        session = self.get_session(file_path)
         
         # Wenn kein sheet_name angegeben, das erste Blatt nehmen
         if sheet_name is None:
-            excel_file = pd.ExcelFile(file_path, engine=engine)
-            sheet_name = excel_file.sheet_names[0]
+            sheet_name = session.sheet_names[0]
             print(f"Kein Blatt angegeben, verwende erstes Blatt: {sheet_name}")
         
-        df = pd.read_excel(file_path, sheet_name=sheet_name, engine=engine)
+        df = session.read_sheet(sheet_name)
         
         # Grundlegende Informationen ausgeben
         print(f"Anzahl Zeilen: {len(df)}")
@@ -91,26 +104,90 @@ class FileHandler:
         
         return df
         
+    def iter_xlsx_chunks(self, file_path, sheet_name=None, columns=None, chunk_size=XLSX_CHUNK_ROWS):
+        """
+        Liest ein .xlsx-Blatt zeilenweise (openpyxl read-only) in Teilstücken
+        
+        Args:
+            file_path (str): Pfad zur .xlsx-Datei
+            sheet_name (str): Name des Blatts (None = erstes Blatt)
+            columns (list): Nur diese Spalten lesen (None = alle)
+            chunk_size (int): Maximale Zeilenanzahl pro Teilstück
+            
+        Yields:
+            pd.DataFrame: Teilstücke mit fortlaufendem Index (mindestens eines, auch bei leerem Blatt)
+        """
+        print(f"Verarbeite Excel-Datei (Streaming): {file_path}")
+        
+        # Read-only Arbeitsmappe der gemeinsamen Sitzung verwenden
+        session = self.get_session(file_path)
+        if sheet_name is None:
+            sheet_name = session.sheet_names[0]
+            print(f"Kein Blatt angegeben, verwende erstes Blatt: {sheet_name}")
+        else:
+            print(f"Arbeitsblatt: {sheet_name}")
+            
+        rows = session.excel_file.book[sheet_name].iter_rows(values_only=True)
+        
+        # Kopfzeile nach derselben Regel wie Vorschau und Blatt-Erkennung
+        header = read_xlsx_header(rows)[0]
+        if header is None:
+            yield pd.DataFrame()
+            return
+            
+        # Spaltenauswahl (Namen ohne Leerzeichen, bei Duplikaten die erste Spalte)
+        names = [
+            str(name).strip() if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+        indices = []
+        selected_names = []
+        for i, name in enumerate(names):
+            if (columns is None or name in columns) and name not in selected_names:
+                indices.append(i)
+                selected_names.append(name)
+                
+        chunk = []
+        offset = 0
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in indices]
+            if is_empty_row(values):
+                continue  # Leerzeilen überspringen (wie pandas)
+            chunk.append(values)
+            
+            if len(chunk) >= chunk_size:
+                tracer.instant("Teilstück gelesen", "datei", rows=offset + len(chunk))
+                yield self._make_chunk(chunk, selected_names, offset)
+                offset += len(chunk)
+                chunk = []
+                
+        if chunk or offset == 0:
+            yield self._make_chunk(chunk, selected_names, offset)
+            offset += len(chunk)
+            
+        print(f"Anzahl Zeilen: {offset}")
+        print(f"Gelesene Spalten: {selected_names}")
+        
+    def _make_chunk(self, rows, columns, offset):
+        """Erstellt ein Teilstück-DataFrame mit fortlaufendem Index"""
+        return pd.DataFrame(rows, columns=columns, index=pd.RangeIndex(offset, offset + len(rows)))
+        
+    @traced("ODS lesen", "datei")
     def _process_ods(self, file_path, sheet_name=None):
         """Verarbeitet LibreOffice Calc Dateien"""
         print(f"Verarbeite ODS-Datei: {file_path}")
         if sheet_name:
             print(f"Arbeitsblatt: {sheet_name}")
         
-        # ODS-Datei lesen (requires odfpy: pip install odfpy)
-        try:
-            # Wenn kein sheet_name angegeben, das erste Blatt nehmen
-            if sheet_name is None:
-                excel_file = pd.ExcelFile(file_path, engine='odf')
-                sheet_name = excel_file.sheet_names[0]
-                print(f"Kein Blatt angegeben, verwende erstes Blatt: {sheet_name}")
-                
-            df = pd.read_excel(file_path, sheet_name=sheet_name, engine='odf')
-        except ImportError:
-            raise Exception(
-                "Für ODS-Dateien ist das 'odfpy' Paket erforderlich. "
-                "Installieren Sie es mit: pip install odfpy"
-            )
+        # ODS-Datei mit dem Streaming-Leser (content.xml) lesen, ohne odfpy-DOM
+        session = self.get_session(file_path)
+        
+        # Wenn kein sheet_name angegeben, das erste Blatt nehmen
+        if sheet_name is None:
+            sheet_name = session.sheet_names[0]
+            print(f"Kein Blatt angegeben, verwende erstes Blatt: {sheet_name}")
+            
+        df = session.read_sheet(sheet_name)
         
         print(f"Anzahl Zeilen: {len(df)}")
         print(f"Anzahl Spalten: {len(df.columns)}")
@@ -118,6 +195,7 @@ class FileHandler:
         
         return df
         
+    @traced("CSV lesen", "datei")
     def _process_csv(self, file_path):
         """Verarbeitet CSV-Dateien"""
         print(f"Verarbeite CSV-Datei: {file_path}")
@@ -143,6 +221,7 @@ class FileHandler:
         
         return df
         
+    @traced("Encoding erkennen", "datei")
     def _detect_encoding(self, file_path):
         """Erkennt das Encoding einer Datei"""
         try:
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Import-Pipeline: Bereinigung der Rohdaten in einzelnen, messbaren Stufen
+"""
+
+import time
+from datetime import datetime, date
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .account_numbers import normalize_account_numbers
+from .amounts import parse_amounts_cents
+from .tracing import tracer
+
+# Pflichtspalten für die BWA-Verarbeitung
+REQUIRED_COLUMNS = ['Sachkontonr.', 'Betrag', 'Buchungstag']
+
+# Eigene Spalten für die Buchungsnummer (in dieser Reihenfolge gesucht)
+BOOKING_NUMBER_COLUMNS = ['Buchungsnummer', 'Buchungsnr.', 'Buchungs-Nr.']
+
+# Unterstützte Datumsformate (in dieser Reihenfolge versucht)
+DATE_FORMATS = ['%Y.%m.%d', '%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y']
+
+
+class PipelineError(ValueError):
+    """Fehler, der den Import einer Datei abbricht"""
+
+
+def parse_booking_date(value) -> Optional[date]:
+    """Parst einen Buchungstag (None wenn kein unterstütztes Format passt)"""
+    if pd.isna(value) or value == '':
+        return None
+
+    text = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+class ImportContext:
+    """Gemeinsamer Zustand eines Pipeline-Durchlaufs"""
+
+    def __init__(self, decimal_separator: str = ","):
+        self.decimal_separator = decimal_separator
+        self.booking_column = None  # Gefundene Buchungsnummer-Spalte
+
+
+class StageMetrics:
+    """Laufzeit und Zeilenzahlen einer Stufe (über alle Durchläufe summiert)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.runs = 0
+
+    def add(self, seconds: float, rows_in: int, rows_out: int):
+        self.seconds += seconds
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.runs += 1
+
+    def __repr__(self):
+        return (f"StageMetrics({self.name!r}, {self.seconds * 1000:.1f} ms, "
+                f"{self.rows_in} -> {self.rows_out} Zeilen)")
+
+
+class ImportStage:
+    """Basisklasse einer Pipeline-Stufe"""
+
+    name = "Stufe"
+
+    def run(self, df: pd.DataFrame, context: ImportContext) -> pd.DataFrame:
+        """Verarbeitet das DataFrame und gibt das Ergebnis zurück"""
+        raise NotImplementedError
+
+
+class ResolveColumnsStage(ImportStage):
+    """Prüft Pflichtspalten und ermittelt die Spalte für die Buchungsnummer"""
+
+    name = "Spalten"
+
+    def run(self, df, context):
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise PipelineError(f"Fehlende Spalten: {missing_columns}")
+
+        context.booking_column = next((col for col in BOOKING_NUMBER_COLUMNS if col in df.columns), None)
+        return df
+
+
+class NormalizeAccountsStage(ImportStage):
+    """Normalisiert die Sachkontonummern (nur unterschiedliche Werte)"""
+
+    name = "Sachkonten"
+
+    def run(self, df, context):
+        df['Sachkontonr.'] = normalize_account_numbers(df['Sachkontonr.'])
+        return df
+
+
+class CleanAmountsStage(ImportStage):
+    """Wandelt die Beträge exakt in Cent um"""
+
+    name = "Beträge"
+
+    def run(self, df, context):
+        # Bereits exakt vorliegende Cent (z.B. JSON-Schema v2) werden übernommen
+        if 'Betrag_Cent' not in df.columns:
+            df['Betrag_Cent'] = parse_amounts_cents(df['Betrag'], context.decimal_separator)
+        df['Betrag_Clean'] = df['Betrag_Cent'].astype('Float64') / 100
+        return df
+
+
+class ParseDatesStage(ImportStage):
+    """Parst die Buchungstage (jeder unterschiedliche Wert nur einmal)"""
+
+    name = "Buchungstage"
+
+    def run(self, df, context):
+        codes, uniques = pd.factorize(df['Buchungstag'], use_na_sentinel=True)
+        parsed = pd.to_datetime(pd.Series([parse_booking_date(value) for value in uniques] + [None], dtype=object))
+        # Fehlende Werte (Code -1) zeigen auf den angehängten leeren Eintrag
+        df['Buchungstag_Clean'] = pd.Series(parsed.to_numpy()[codes], index=df.index)
+        return df
+
+
+class EnrichStage(ImportStage):
+    """Ergänzt abgeleitete Spalten (Quartal, Buchungsnummer in 'Buchungsnr.')"""
+
+    name = "Anreicherung"
+
+    def run(self, df, context):
+        # Quartal aus dem Monat (ungültige Daten ergeben 0 und werden anschließend gefiltert)
+        months = df['Buchungstag_Clean'].dt.month
+        df['Quartal'] = ((months - 1) // 3 + 1).fillna(0).astype('int8')
+
+        # Berichte und Oberfläche lesen nur 'Buchungsnr.' (einzige Nummernspalte im Buchungsjournal):
+        # eine abweichend benannte Spalte nur übernehmen, wenn 'Buchungsnr.' fehlt
+        if 'Buchungsnr.' not in df.columns and context.booking_column is not None:
+            df['Buchungsnr.'] = df[context.booking_column]
+        return df
+
+
+class FilterStage(ImportStage):
+    """Entfernt Zeilen ohne gültigen Betrag oder Buchungstag (ein Durchlauf)"""
+
+    name = "Filter"
+
+    def run(self, df, context):
+        return df.dropna(subset=['Betrag_Cent', 'Buchungstag_Clean'])
+
+
+def default_stages() -> List[ImportStage]:
+    """Standard-Stufen des Imports in Ausführungsreihenfolge"""
+    return [
+        ResolveColumnsStage(),
+        NormalizeAccountsStage(),
+        CleanAmountsStage(),
+        ParseDatesStage(),
+        EnrichStage(),
+        FilterStage(),
+    ]
+
+
+class ImportPipeline:
+    """Führt die Import-Stufen nacheinander aus und misst jede Stufe"""
+
+    def __init__(self, stages: Optional[List[ImportStage]] = None):
+        self.stages = stages if stages is not None else default_stages()
+        self.metrics: Dict[str, StageMetrics] = {}
+
+    def add_stage(self, stage: ImportStage, before: Optional[str] = None):
+        """Fügt eine Stufe hinzu (am Ende oder vor der Stufe mit dem Namen 'before')"""
+        if before is None:
+            self.stages.append(stage)
+            return
+        names = [existing.name for existing in self.stages]
+        self.stages.insert(names.index(before), stage)
+
+    def reset_metrics(self):
+        """Setzt die Messwerte zurück (vor jedem Dateiimport)"""
+        self.metrics = {}
+
+    def run(self, df: pd.DataFrame, context: ImportContext) -> Optional[pd.DataFrame]:
+        """
+        Verarbeitet ein DataFrame mit Rohdaten (ganze Datei oder ein Teilstück)
+
+        Returns:
+            DataFrame oder None wenn der Import abgebrochen wurde
+        """
+        for stage in self.stages:
+            rows_in = len(df)
+            start = time.perf_counter()
+            try:
+                df = stage.run(df, context)
+            except PipelineError as e:
+                print(e)
+                return None
+            end = time.perf_counter()
+            metrics = self.metrics.setdefault(stage.name, StageMetrics(stage.name))
+            metrics.add(end - start, rows_in, len(df))
+            tracer.add_span(stage.name, "import", start, end, rows_in=rows_in, rows_out=len(df))
+        return df
+
+    def format_metrics(self) -> str:
+        """Messwerte als lesbare Tabelle"""
+        lines = []
+        total = sum(metrics.seconds for metrics in self.metrics.values())
+        for metrics in self.metrics.values():
+            share = metrics.seconds / total * 100 if total else 0.0
+            lines.append(f"  {metrics.name:<14} {metrics.seconds * 1000:8.1f} ms ({share:4.1f} %)  "
+                         f"{metrics.rows_in:>8} -> {metrics.rows_out:<8} Zeilen")
+        lines.append(f"  {'Gesamt':<14} {total * 1000:8.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Streamender JSON-Writer für den BWA-Export (optional kompakt und/oder gzip-komprimiert)
+"""
+
+import gzip
+import json
+from itertools import islice
+from typing import Callable, Iterable, Optional
+
+# Version des Exportformats (1: Buchungen als Objekte je Zeile, 2: Buchungen als Spalten)
+JSON_SCHEMA_VERSION = 2
+
+# Spalten der Buchungen je Sachkonto im Schema v2
+TRANSACTION_COLUMNS = ['booking_number', 'date', 'purpose', 'amount_cents']
+
+
+def json_schema_version(json_data: dict) -> int:
+    """Schema-Version einer geladenen Exportdatei (Dateien ohne Angabe sind v1)"""
+    try:
+        return int(json_data.get('metadata', {}).get('schema_version', 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+class StreamedList:
+    """Liste, deren Elemente erst beim Schreiben erzeugt werden (z.B. ein Generator)"""
+
+    def __init__(self, items: Iterable):
+        self.items = items
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class InlineList(StreamedList):
+    """Werteliste, die auch im eingerückten Format in einer Zeile geschrieben wird (Spalten im Schema v2)"""
+
+
+def open_json_file(file_path: str, mode: str = 'r'):
+    """Öffnet eine JSON-Datei als Text, .gz-Dateien werden transparent (de)komprimiert"""
+    if file_path.lower().endswith('.gz'):
+        return gzip.open(file_path, mode + 't', encoding='utf-8')
+    return open(file_path, mode, encoding='utf-8')
+
+
+def is_json_file(file_path: str) -> bool:
+    """True für .json und .json.gz"""
+    return file_path.lower().endswith(('.json', '.json.gz'))
+
+
+class DeferredValue:
+    """Wert, der erst beim Schreiben berechnet wird (z.B. eine Prüfsumme über zuvor gestreamte Daten)"""
+
+    def __init__(self, compute: Callable):
+        self.compute = compute
+
+
+class JSONStreamWriter:
+    """
+    Schreibt verschachtelte Daten als JSON, ohne StreamedList-Inhalte vorher zu sammeln
+
+    Mit indent=2 entspricht die Ausgabe json.dump(..., indent=2, ensure_ascii=False);
+    mit indent=None wird ohne Einrückung und Leerzeichen geschrieben.
+    """
+
+    def __init__(self, stream, indent: Optional[int] = 2):
+        self.stream = stream
+        self.indent = indent
+        self.item_separator = ','
+        self.key_separator = ': ' if indent is not None else ':'
+
+    def write(self, value):
+        """Schreibt einen vollständigen JSON-Wert"""
+        self._write(value, 0)
+
+    def _newline(self, level: int) -> str:
+        return '' if self.indent is None else '\n' + ' ' * (self.indent * level)
+
+    def _dumps(self, value, level: int) -> str:
+        """Serialisiert einen Wert ohne gestreamte Anteile"""
+        text = json.dumps(value, indent=self.indent, ensure_ascii=False,
+                          separators=(self.item_separator, self.key_separator))
+        if self.indent is not None and level:
+            text = text.replace('\n', self._newline(level))
+        return text
+
+    def _write(self, value, level: int):
+        write = self.stream.write
+        if isinstance(value, DeferredValue):
+            self._write(value.compute(), level)
+        elif isinstance(value, InlineList):
+            self._write_inline(value)
+        elif isinstance(value, StreamedList) or (isinstance(value, (list, tuple)) and _contains_stream(value)):
+            empty = True
+            for item in value:
+                write(('[' if empty else self.item_separator) + self._newline(level + 1))
+                self._write(item, level + 1)
+                empty = False
+            write('[]' if empty else self._newline(level) + ']')
+        elif isinstance(value, dict) and _contains_stream(value):
+            first = True
+            for key, item in value.items():
+                write(('{' if first else self.item_separator) + self._newline(level + 1))
+                write(json.dumps(str(key), ensure_ascii=False) + self.key_separator)
+                self._write(item, level + 1)
+                first = False
+            write('{}' if first else self._newline(level) + '}')
+        else:
+            write(self._dumps(value, level))
+
+    def _write_inline(self, values: InlineList, chunk_size: int = 1000):
+        """Schreibt eine Werteliste ohne Zeilenumbrüche (blockweise)"""
+        separator = self.item_separator if self.indent is None else self.item_separator + ' '
+        items = iter(values)
+        self.stream.write('[')
+        first = True
+        while True:
+            chunk = list(islice(items, chunk_size))
+            if not chunk:
+                break
+            text = separator.join(json.dumps(item, ensure_ascii=False) for item in chunk)
+            self.stream.write(text if first else separator + text)
+            first = False
+        self.stream.write(']')
+
+
+def _contains_stream(value) -> bool:
+    """True wenn ein Container (auch verschachtelt) gestreamte oder verzögerte Werte enthält"""
+    items = value.values() if isinstance(value, dict) else value
+    for item in items:
+        if isinstance(item, (StreamedList, DeferredValue)):
+            return True
+        if isinstance(item, (dict, list, tuple)) and _contains_stream(item):
+            return True
+    return False
+
+
+def write_json(file_path: str, data, compact: bool = False):
+    """
+    Schreibt Daten streamend in eine JSON-Datei
+
+    Args:
+        file_path (str): Zielpfad (.json oder .json.gz)
+        data: Daten; StreamedList-Elemente werden einzeln erzeugt und geschrieben
+        compact (bool): True = ohne Einrückung und Leerzeichen
+    """
+    with open_json_file(file_path, 'w') as f:
+        JSONStreamWriter(f, indent=None if compact else 2).write(data)
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Persistenter Cache für verarbeitete Buchungsdaten
+"""
+
+import os
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+import pandas as pd
+from PySide6.QtCore import QSettings
+
+from .app_paths import get_cache_dir
+from .tracing import traced
+
+# Parquet (pyarrow) ist optional - ohne pyarrow wird Pickle verwendet
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Bei Änderungen an der Datenverarbeitung erhöhen, damit alte Einträge ungültig werden
+CACHE_FORMAT_VERSION = 6
+
+# Standard-Obergrenze für die Cache-Größe in MB
+DEFAULT_MAX_SIZE_MB = 256
+
+
+class LedgerCache:
+    """Speichert verarbeitete Buchungs-DataFrames, Schlüssel ist der Dateiinhalt"""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.settings = QSettings()
+        self._cache_dir = Path(cache_dir) if cache_dir else None
+
+    @property
+    def cache_dir(self) -> Path:
+        """Cache-Verzeichnis (wird erst bei Bedarf angelegt)"""
+        if self._cache_dir is None:
+            self._cache_dir = get_cache_dir("ledger_cache")
+        return self._cache_dir
+
+    def is_enabled(self) -> bool:
+        """Prüft ob der Cache in den Einstellungen aktiviert ist"""
+        return self.settings.value("ledger_cache/enabled", True, type=bool)
+
+    def get_max_size_bytes(self) -> int:
+        """Gibt die maximale Cache-Größe in Bytes zurück"""
+        max_mb = self.settings.value("ledger_cache/max_size_mb", DEFAULT_MAX_SIZE_MB, type=int)
+        return max(1, max_mb) * 1024 * 1024
+
+    def make_key(self, file_path: str, sheet_name: Optional[str], parse_settings: Dict[str, str]) -> str:
+        """Erstellt den Cache-Schlüssel aus Dateiinhalt, Blatt und Import-Einstellungen"""
+        content_hash = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                content_hash.update(block)
+
+        key = hashlib.sha256()
+        key.update(f"v{CACHE_FORMAT_VERSION}\0".encode('utf-8'))
+        key.update(content_hash.hexdigest().encode('utf-8'))
+        key.update(f"\0{sheet_name or ''}".encode('utf-8'))
+        for name in sorted(parse_settings):
+            key.update(f"\0{name}={parse_settings[name]}".encode('utf-8'))
+        return key.hexdigest()
+
+    def _entry_paths(self, key: str):
+        """Mögliche Dateipfade eines Eintrags (Parquet bevorzugt)"""
+        return [self.cache_dir / f"{key}.parquet", self.cache_dir / f"{key}.pkl"]
+
+    @traced("Cache laden", "import")
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """Lädt einen Eintrag aus dem Cache (None wenn nicht vorhanden oder defekt)"""
+        for path in self._entry_paths(key):
+            if not path.exists():
+                continue
+            try:
+                if path.suffix == '.parquet':
+                    if not PYARROW_AVAILABLE:
+                        continue
+                    df = pd.read_parquet(path)
+                else:
+                    with open(path, 'rb') as f:
+                        df = pickle.load(f)
+                # Zugriffszeit aktualisieren (für LRU-Verdrängung)
+                os.utime(path, None)
+                return df
+            except Exception as e:
+                print(f"Cache-Eintrag nicht lesbar, wird verworfen: {e}")
+                self._remove(path)
+        return None
+
+    @traced("Cache speichern", "import")
+    def store(self, key: str, df: pd.DataFrame) -> bool:
+        """Speichert ein verarbeitetes DataFrame im Cache"""
+        parquet_path, pickle_path = self._entry_paths(key)
+        try:
+            if PYARROW_AVAILABLE:
+                try:
+                    self._write_atomic(parquet_path, lambda tmp: df.to_parquet(tmp))
+                    self._evict()
+                    return True
+                except Exception:
+                    # z.B. gemischte Typen in Objektspalten - Pickle-Fallback
+                    self._remove(parquet_path)
+
+            self._write_atomic(
+                pickle_path,
+                lambda tmp: tmp.write_bytes(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+            )
+            self._evict()
+            return True
+
+        except Exception as e:
+            print(f"Fehler beim Schreiben des Caches: {e}")
+            return False
+
+    def _write_atomic(self, path: Path, writer):
+        """Schreibt zunächst in eine temporäre Datei und benennt sie dann um"""
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            self._remove(tmp_path)
+
+    def _remove(self, path: Path):
+        """Löscht eine Datei ohne Fehler zu werfen"""
+        try:
+            if path.exists():
+                path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Verdrängt die am längsten nicht genutzten Einträge bis die Größengrenze passt"""
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in ('.parquet', '.pkl'):
+                continue
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        max_size = self.get_max_size_bytes()
+
+        # Älteste Einträge zuerst löschen
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def clear(self) -> int:
+        """Löscht alle Cache-Einträge und gibt die Anzahl zurück"""
+        removed = 0
+        for path in self.cache_dir.iterdir():
+            if path.suffix in ('.parquet', '.pkl', '.tmp'):
+                self._remove(path)
+                removed += 1
+        return removed
+
+    def get_size_bytes(self) -> int:
+        """Gibt die aktuelle Größe des Caches in Bytes zurück"""
+        total = 0
+        for path in self.cache_dir.iterdir():
+            if path.suffix in ('.parquet', '.pkl'):
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    continue
+        return total
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Live-Zusammenfassung für die BWA-Vorschau: Gruppensummen aus vorab summierten Sachkonten
+
+Beträge und Anzahl der Buchungen je Sachkonto und Quartal stammen aus dem Buchungsindex. Ändert
+sich die Gruppe eines Sachkontos, wandert nur dessen Summe von der alten zur neuen Gruppe.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .booking_index import BookingIndex
+from .bwa_summary import UNASSIGNED_SUPER_GROUP, unassigned_group
+
+
+class LiveSummary:
+    """BWA-Gruppen- und Obergruppensummen eines Zeitraums, inkrementell aktualisierbar"""
+
+    def __init__(self, accounts, slot_cents: np.ndarray, slot_counts: np.ndarray,
+                 account_mappings: Optional[Dict[str, str]] = None,
+                 super_group_mappings: Optional[Dict[str, str]] = None):
+        self.accounts = [str(account) for account in accounts]
+        self._slot_cents = slot_cents      # (Sachkonten, Quartalsspalten) in Cent
+        self._slot_counts = slot_counts    # Anzahl Buchungen je Zelle
+        self.account_mappings: Dict[str, str] = dict(account_mappings or {})
+        self.super_group_mappings: Dict[str, str] = dict(super_group_mappings or {})
+        self.quarter: Optional[int] = None
+        self.quarter_mode = "cumulative"
+
+        self.account_cents: Dict[str, int] = {}   # Sachkonten mit Buchungen im Zeitraum
+        self.group_cents: Dict[str, int] = {}
+        self.group_sizes: Dict[str, int] = {}     # Anzahl Sachkonten je Gruppe
+        self._regroup()
+
+    @classmethod
+    def from_index(cls, index: BookingIndex, account_mappings: Optional[Dict[str, str]] = None,
+                   super_group_mappings: Optional[Dict[str, str]] = None) -> "LiveSummary":
+        """Übernimmt die Summen je Sachkonto und Quartal des Buchungsindex (ohne den Index zu halten)"""
+        return cls(index.accounts, index.slot_cents, index.slot_counts, account_mappings, super_group_mappings)
+
+    # --- Zeitraum und Zuordnungen ---
+
+    def set_period(self, quarter: Optional[int], quarter_mode: str = "cumulative"):
+        """Wechselt den Zeitraum (Quartal 1-4 oder None für das Jahr)"""
+        self.quarter = quarter
+        self.quarter_mode = quarter_mode
+        self._regroup()
+
+    def set_mappings(self, account_mappings: Dict[str, str]):
+        """Übernimmt alle Zuordnungen auf einmal (z.B. nach einem CSV-Import)"""
+        self.account_mappings = dict(account_mappings or {})
+        self._regroup()
+
+    def set_super_group_mappings(self, super_group_mappings: Dict[str, str]):
+        """Obergruppen wirken nur auf die Darstellung, die Gruppensummen bleiben"""
+        self.super_group_mappings = dict(super_group_mappings or {})
+
+    def group_of(self, account: str) -> str:
+        """BWA-Gruppe eines Sachkontos (Benennung wie im Generator)"""
+        return self.account_mappings.get(account, unassigned_group(account))
+
+    def super_group_of(self, group: str) -> str:
+        return self.super_group_mappings.get(group, UNASSIGNED_SUPER_GROUP)
+
+    def _regroup(self):
+        """Gruppensummen aus den Sachkontosummen des Zeitraums (ohne Buchungen anzufassen)"""
+        low, high = BookingIndex.period_slots(self.quarter, self.quarter_mode)
+        counts = self._slot_counts[:, low:high + 1].sum(axis=1)
+        totals = self._slot_cents[:, low:high + 1].sum(axis=1)
+
+        self.account_cents = {self.accounts[code]: int(totals[code]) for code in np.flatnonzero(counts > 0)}
+        self.group_cents = {}
+        self.group_sizes = {}
+        for account, cents in self.account_cents.items():
+            group = self.group_of(account)
+            self.group_cents[group] = self.group_cents.get(group, 0) + cents
+            self.group_sizes[group] = self.group_sizes.get(group, 0) + 1
+
+    def move_account(self, account: str, group: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        Ordnet ein Sachkonto einer neuen Gruppe zu (leer/None = Zuordnung entfernen)
+
+        Returns:
+            Tuple[str, str]: (alte Gruppe, neue Gruppe), None wenn sich die Anzeige nicht ändert
+        """
+        account = str(account)
+        old_group = self.group_of(account)
+        if group:
+            self.account_mappings[account] = group
+        else:
+            self.account_mappings.pop(account, None)
+        new_group = self.group_of(account)
+
+        if old_group == new_group or account not in self.account_cents:
+            return None
+
+        cents = self.account_cents[account]
+        self.group_cents[old_group] -= cents
+        self.group_sizes[old_group] -= 1
+        if not self.group_sizes[old_group]:
+            del self.group_cents[old_group]
+            del self.group_sizes[old_group]
+        self.group_cents[new_group] = self.group_cents.get(new_group, 0) + cents
+        self.group_sizes[new_group] = self.group_sizes.get(new_group, 0) + 1
+        return old_group, new_group
+
+    # --- Auskünfte ---
+
+    def super_group_cents(self, super_group: str) -> int:
+        return sum(cents for group, cents in self.group_cents.items() if self.super_group_of(group) == super_group)
+
+    def total_cents(self) -> int:
+        return sum(self.group_cents.values())
+
+    def summary(self) -> Dict[str, int]:
+        """Gruppensummen in Cent (wie _create_quarter_summary des Generators)"""
+        return dict(self.group_cents)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Streamender Leser für LibreOffice Calc (ODS) Dateien
+
+Liest content.xml zeilenweise mit iterparse, sodass z.B. eine Vorschau
+nach wenigen Zeilen abbrechen kann, ohne das ganze Dokument zu parsen.
+Die Zellwerte entsprechen denen der pandas-Engine 'odf' (odfpy), die
+deutlich langsamer ist, weil sie das komplette Dokument als DOM aufbaut.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+# XML-Namensräume des OpenDocument-Formats
+TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+OFFICE_NS = "urn:oasis:names:tc:opendocument:xmlns:office:1.0"
+TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+
+TABLE_TAG = f"{{{TABLE_NS}}}table"
+ROW_TAG = f"{{{TABLE_NS}}}table-row"
+CELL_TAG = f"{{{TABLE_NS}}}table-cell"
+COVERED_CELL_TAG = f"{{{TABLE_NS}}}covered-table-cell"
+SPACE_TAG = f"{{{TEXT_NS}}}s"
+ANNOTATION_TAG = f"{{{OFFICE_NS}}}annotation"
+
+TABLE_NAME_ATTR = f"{{{TABLE_NS}}}name"
+ROWS_REPEATED_ATTR = f"{{{TABLE_NS}}}number-rows-repeated"
+COLUMNS_REPEATED_ATTR = f"{{{TABLE_NS}}}number-columns-repeated"
+VALUE_TYPE_ATTR = f"{{{OFFICE_NS}}}value-type"
+VALUE_ATTR = f"{{{OFFICE_NS}}}value"
+DATE_VALUE_ATTR = f"{{{OFFICE_NS}}}date-value"
+SPACE_COUNT_ATTR = f"{{{TEXT_NS}}}c"
+
+# Abbruch-Prüfung nach so vielen gelesenen Zeilen (auch in übersprungenen Blättern)
+CANCEL_CHECK_ROWS = 256
+
+
+def _iter_table_events(content) -> Iterator[tuple]:
+    """
+    iterparse über content.xml, das fertig gelesene Blattinhalte sofort freigibt
+
+    Liefert (event, elem) wie iterparse. Nachdem der Aufrufer das Ende eines direkten Kinds
+    eines Blatts (Zeile, Spaltendefinition, Zeilengruppe) verarbeitet hat, wird es geleert und
+    aus dem Blatt entfernt. iterparse liest voraus, daher können schon weitere Zeilen angehängt
+    sein - das fertige Kind steht trotzdem vorne, weil alle vorherigen bereits entfernt sind.
+    """
+    table = None
+    table_depth = 0
+    depth = 0
+    for event, elem in ET.iterparse(content, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if elem.tag == TABLE_TAG:
+                table, table_depth = elem, depth
+            yield event, elem
+            continue
+
+        yield event, elem
+        if table is not None and depth == table_depth + 1:
+            elem.clear()
+            table.remove(elem)
+        elif elem is table:
+            elem.clear()
+            table = None
+        elif elem.tag == ROW_TAG:
+            # Zeilen in Gruppen: Zellen freigeben, die Gruppe wird an ihrem Ende entfernt
+            elem.clear()
+        depth -= 1
+
+
+def get_sheet_names(file_path: str) -> List[str]:
+    """Gibt die Namen aller Arbeitsblätter zurück (ohne Zeilen eines Blatts im Speicher zu halten)"""
+    names = []
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("content.xml") as content:
+            for event, elem in _iter_table_events(content):
+                # Der Name steht im Start-Tag, der Inhalt des Blatts wird nicht benötigt
+                if event == "start" and elem.tag == TABLE_TAG:
+                    names.append(elem.get(TABLE_NAME_ATTR))
+    return names
+
+
+def _cell_text(elem) -> str:
+    """Textinhalt eines Elements inkl. Leerzeichen-Platzhalter (text:s), ohne Kommentare"""
+    parts = [(elem.text or "").strip("\n")]
+    for child in elem:
+        if child.tag == SPACE_TAG:
+            parts.append(" " * int(child.get(SPACE_COUNT_ATTR, "1")))
+        elif child.tag != ANNOTATION_TAG:
+            parts.append(_cell_text(child))
+        parts.append((child.tail or "").strip("\n"))
+    return "".join(parts)
+
+
+def _cell_value(cell):
+    """Wandelt eine Tabellenzelle in einen Python-Wert um (None für leere Zellen)"""
+    value_type = cell.get(VALUE_TYPE_ATTR)
+    text = _cell_text(cell) if len(cell) else ""
+
+    if text == "#N/A":
+        return np.nan
+    if value_type is None:
+        return None
+    if value_type == "float":
+        value = float(cell.get(VALUE_ATTR))
+        # Ganzzahlige Werte wie pandas als int zurückgeben
+        return int(value) if value.is_integer() else value
+    if value_type in ("percentage", "currency"):
+        return float(cell.get(VALUE_ATTR))
+    if value_type == "string":
+        return text if text != "" else None
+    if value_type == "date":
+        return pd.Timestamp(cell.get(DATE_VALUE_ATTR))
+    if value_type == "boolean":
+        return text == "TRUE"
+    if value_type == "time":
+        return pd.Timestamp(text).time()
+    raise ValueError(f"Unbekannter Zelltyp: {value_type}")
+
+
+def _row_values(row) -> list:
+    """Liest alle Zellen einer Zeile (wiederholte Spalten werden aufgefächert)"""
+    values = []
+    for cell in row:
+        if cell.tag not in (CELL_TAG, COVERED_CELL_TAG):
+            continue
+        repeat = int(cell.get(COLUMNS_REPEATED_ATTR, "1"))
+        value = _cell_value(cell) if cell.tag == CELL_TAG else None
+        values.extend([value] * repeat)
+
+    # Leere Zellen am Zeilenende entfernen (z.B. 1024 wiederholte Leerspalten)
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def read_header_rows(file_path: str, sheet_names: Optional[List[str]] = None) -> Dict[str, list]:
+    """
+    Liest in einem Durchlauf die erste Zeile (Kopfzeile wie beim Import) jedes Arbeitsblatts
+
+    Args:
+        file_path (str): Pfad zur ODS-Datei
+        sheet_names (list): Bekannte Blattnamen; sobald alle eine Kopfzeile haben, endet
+            der Durchlauf ohne die restlichen Datenzeilen zu lesen (None = ganze Datei)
+    """
+    headers = {}
+    pending = set(sheet_names) if sheet_names is not None else None
+    current_sheet = None
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("content.xml") as content:
+            for event, elem in _iter_table_events(content):
+                if elem.tag == TABLE_TAG and event == "start":
+                    current_sheet = elem.get(TABLE_NAME_ATTR)
+                    headers[current_sheet] = None
+                elif elem.tag == ROW_TAG and event == "end":
+                    # Nur die erste Zeile jedes Blatts auswerten
+                    if current_sheet is not None and headers[current_sheet] is None:
+                        headers[current_sheet] = _row_values(elem)
+                        if pending is not None:
+                            pending.discard(current_sheet)
+                            if not pending:
+                                break
+    return {name: header or [] for name, header in headers.items()}
+
+
+def read_sheet(file_path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Liest ein Arbeitsblatt als DataFrame (erste Zeile = Spaltennamen)
+
+    Liefert dasselbe Ergebnis wie pd.read_excel(..., engine='odf'), die
+    Typerkennung der Spalten übernimmt wie dort der TextParser von pandas.
+    """
+    rows = list(iter_sheet_rows(file_path, sheet_name))
+    if not rows:
+        return pd.DataFrame()
+
+    # Tabelle quadratisch auffüllen, leere Zellen als "" (wie pandas)
+    width = max(len(row) for row in rows)
+    data = [
+        ["" if value is None else value for value in row] + [""] * (width - len(row))
+        for row in rows
+    ]
+
+    try:
+        return TextParser(data, header=0, skip_blank_lines=False).read()
+    except EmptyDataError:
+        return pd.DataFrame()
+
+
+def iter_sheet_rows(file_path: str, sheet_name: Optional[str] = None,
+                    max_rows: Optional[int] = None, cancelled=None) -> Iterator[list]:
+    """
+    Liefert die Zeilen eines Arbeitsblatts als Listen von Werten
+
+    Args:
+        file_path (str): Pfad zur ODS-Datei
+        sheet_name (str): Name des Blatts (None = erstes Blatt)
+        max_rows (int): Nach so vielen Zeilen abbrechen (None = alle)
+        cancelled (threading.Event): Endet vorzeitig, sobald das Event gesetzt ist
+            (geprüft alle CANCEL_CHECK_ROWS Zeilen)
+
+    Leere Zeilen am Blattende werden nicht geliefert.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("content.xml") as content:
+            in_sheet = False
+            found_sheet = False
+            emitted = 0
+            pending_empty = 0
+            parsed_rows = 0
+
+            # Verarbeitete Zeilen werden freigegeben, damit der Speicherbedarf konstant bleibt
+            for event, elem in _iter_table_events(content):
+                if elem.tag == TABLE_TAG:
+                    if event == "start":
+                        in_sheet = sheet_name is None or elem.get(TABLE_NAME_ATTR) == sheet_name
+                        found_sheet = found_sheet or in_sheet
+                    elif in_sheet:
+                        return
+                    continue
+
+                if event != "end" or elem.tag != ROW_TAG:
+                    continue
+
+                parsed_rows += 1
+                if cancelled is not None and parsed_rows % CANCEL_CHECK_ROWS == 0 and cancelled.is_set():
+                    return
+
+                if in_sheet:
+                    values = _row_values(elem)
+                    repeat = int(elem.get(ROWS_REPEATED_ATTR, "1"))
+
+                    if not values:
+                        # Leere Zeilen nur liefern, wenn danach noch Daten folgen
+                        pending_empty += repeat
+                    else:
+                        rows = [[]] * pending_empty + [values] * repeat
+                        pending_empty = 0
+                        for row in rows:
+                            if max_rows is not None and emitted >= max_rows:
+                                return
+                            yield list(row)
+                            emitted += 1
+
+            if sheet_name is not None and not found_sheet:
+                raise ValueError(f"Arbeitsblatt nicht gefunden: {sheet_name}")
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Kompakte PDF-Ausgabe: Bilder in Druckauflösung und Nachoptimierung mit PyMuPDF
+"""
+
+import os
+import hashlib
+from typing import Dict, Tuple
+
+from .app_paths import get_cache_dir
+
+try:
+    from PIL import Image as PILImage
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Druckauflösung für eingebettete Bilder
+PRINT_DPI = 300
+
+POINTS_PER_INCH = 72.0
+
+# (Pfad, mtime, Zielgröße) -> Pfad des verkleinerten Bildes (je Programmlauf)
+_image_cache: Dict[tuple, str] = {}
+
+
+def print_resolution_image(path: str, width: float, height: float, dpi: int = PRINT_DPI) -> str:
+    """
+    Verkleinert ein Bild einmalig auf die Druckauflösung der Zielgröße
+
+    Das Ergebnis wird nach Pfad und Änderungszeit im Cache-Verzeichnis abgelegt, damit
+    jede PDF-Erstellung dieselbe (kleine) Datei einbettet.
+
+    Args:
+        path (str): Originalbild
+        width (float): Maximale Breite im PDF (Punkte)
+        height (float): Maximale Höhe im PDF (Punkte)
+        dpi (int): Zielauflösung
+
+    Returns:
+        str: Pfad des verkleinerten Bildes, das Original wenn es bereits klein genug ist
+    """
+    if not PIL_AVAILABLE:
+        return path
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return path
+    box = (round(width / POINTS_PER_INCH * dpi), round(height / POINTS_PER_INCH * dpi))
+    key = (os.path.abspath(path), mtime, box)
+    if key in _image_cache:
+        return _image_cache[key]
+
+    try:
+        with PILImage.open(path) as image:
+            if image.width <= box[0] and image.height <= box[1]:
+                result = path
+            else:
+                # JPEG-Fotos bleiben JPEG, alles andere (Transparenz, Grafiken) wird PNG
+                photo = image.format == "JPEG" and image.mode in ("RGB", "L")
+                digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+                result = str(get_cache_dir("images") / f"{digest}.{'jpg' if photo else 'png'}")
+                # Vorhandene Dateien sind vollständig, weil sie erst nach dem Schreiben umbenannt werden
+                if not os.path.exists(result):
+                    scaled = image.copy()
+                    scaled.thumbnail(box, PILImage.Resampling.LANCZOS)
+                    _save_atomic(scaled, result, photo)
+    except Exception as e:
+        print(f"Bild konnte nicht verkleinert werden ({path}): {e}")
+        return path
+
+    _image_cache[key] = result
+    return result
+
+
+def _save_atomic(image, path: str, photo: bool):
+    """Speichert zunächst in eine temporäre Datei und benennt sie dann um"""
+    temp_path = f"{path}.tmp"
+    try:
+        if photo:
+            image.save(temp_path, "JPEG", quality=90, optimize=True)
+        else:
+            image.save(temp_path, "PNG", optimize=True)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def optimize_pdf(path: str) -> Tuple[int, int]:
+    """
+    Räumt ein fertiges PDF mit PyMuPDF auf (Garbage Collection, doppelte Objekte, Kompression)
+
+    Die Datei wird nur ersetzt, wenn das Ergebnis kleiner ist.
+
+    Returns:
+        Tuple[int, int]: Dateigröße vorher und nachher in Bytes
+    """
+    before = os.path.getsize(path)
+    if not PYMUPDF_AVAILABLE:
+        return before, before
+
+    temp_path = f"{path}.optimiert"
+    try:
+        with pymupdf.open(path) as document:
+            document.save(temp_path, garbage=4, deflate=True, deflate_images=True,
+                          deflate_fonts=True, clean=True)
+        after = os.path.getsize(temp_path)
+        if after < before:
+            os.replace(temp_path, path)
+            return before, after
+    except Exception as e:
+        print(f"PDF-Optimierung fehlgeschlagen: {e}")
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return before, before
+
+
+def format_size(size: int) -> str:
+    """Dateigröße lesbar (z.B. '1,2 MB')"""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB".replace(".", ",")
+    return f"{size / (1024 * 1024):.1f} MB".replace(".", ",")
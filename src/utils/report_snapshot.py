@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Gespeicherte Auswertungen eines JSON-Exports (Prüfsumme und direkter Zugriff ohne Neuberechnung)
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Optional
+
+from .amounts import to_cents
+from .json_export import json_schema_version, TRANSACTION_COLUMNS
+
+# Abschnitte, die nicht als Ganzes in die Prüfsumme eingehen
+STREAMED_SECTIONS = ('account_details', 'integrity')
+
+CHECKSUM_ALGORITHM = 'sha256'
+
+
+def _canonical(value) -> bytes:
+    """Eindeutige Byte-Darstellung eines JSON-Werts"""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class SnapshotHasher:
+    """Berechnet die Prüfsumme eines Exports abschnittsweise (auch während des Schreibens)"""
+
+    def __init__(self):
+        self._hash = hashlib.new(CHECKSUM_ALGORITHM)
+
+    def add_sections(self, json_data: Dict):
+        """Nimmt alle Abschnitte außer den Sachkonto-Details auf (unabhängig von der Reihenfolge)"""
+        for key in sorted(json_data):
+            if key not in STREAMED_SECTIONS:
+                self._hash.update(_canonical([key, json_data[key]]))
+
+    def add_account(self, account: Dict):
+        """Nimmt ein Sachkonto mit allen Buchungsspalten auf"""
+        transactions = account.get('transactions', {})
+        self._hash.update(_canonical({
+            'account_number': account.get('account_number'),
+            'account_name': account.get('account_name'),
+            'total': account.get('total'),
+            'transaction_count': account.get('transaction_count'),
+            'transactions': {column: list(transactions.get(column, [])) for column in TRANSACTION_COLUMNS},
+        }))
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _summary_cents(entry: Dict) -> Dict:
+    """Euro-Beträge eines Übersichtsabschnitts im Format der Generator-Zusammenfassung (Cent)"""
+    return {
+        'summary': {group: to_cents(amount) for group, amount in entry.get('bwa_groups', {}).items()},
+        'detailed_accounts': {
+            group: {
+                account: {'name': details.get('name', ''), 'cents': to_cents(details.get('amount', 0.0))}
+                for account, details in accounts.items()
+            }
+            for group, accounts in entry.get('detailed_accounts', {}).items()
+        }
+    }
+
+
+def snapshot_checksum(json_data: Dict) -> str:
+    """Prüfsumme eines geladenen Exports (Buchungen, Zuordnungen und Auswertungen)"""
+    hasher = SnapshotHasher()
+    hasher.add_sections(json_data)
+    for account in json_data.get('account_details', []):
+        hasher.add_account(account)
+    return hasher.hexdigest()
+
+
+class ReportSnapshot:
+    """Zugriff auf die gespeicherten Auswertungen eines geprüften JSON-Exports"""
+
+    def __init__(self, json_data: Dict):
+        self.json_data = json_data
+        metadata = json_data.get('metadata', {})
+        self.quarter_mode = metadata.get('quarter_mode', 'cumulative')
+        self.generated_reports = metadata.get('generated_reports', {})
+        self._quarters = {entry.get('quarter'): entry for entry in json_data.get('quarterly_summaries', [])}
+        self._accounts = None
+
+    @classmethod
+    def from_json(cls, json_data: Dict) -> Optional['ReportSnapshot']:
+        """Gibt den Snapshot zurück, wenn die gespeicherte Prüfsumme passt (sonst None)"""
+        if json_schema_version(json_data) < 2:
+            return None
+        integrity = json_data.get('integrity') or {}
+        if integrity.get('algorithm') != CHECKSUM_ALGORITHM or not integrity.get('checksum'):
+            print("JSON-Export ohne Prüfsumme - Auswertungen werden neu berechnet")
+            return None
+        if snapshot_checksum(json_data) != integrity['checksum']:
+            print("⚠️ Prüfsumme des JSON-Exports stimmt nicht - Auswertungen werden neu berechnet")
+            return None
+        return cls(json_data)
+
+    def covers(self, quarterly: bool, accounts: bool) -> bool:
+        """True wenn der Snapshot alle angeforderten Berichtsteile enthält"""
+        if quarterly and not self.generated_reports.get('quarterly', False):
+            return False
+        if accounts and not self.generated_reports.get('account_details', False):
+            return False
+        return True
+
+    @property
+    def total_cents(self) -> int:
+        """Summe aller Buchungen in Cent"""
+        return to_cents(self.json_data.get('balance_info', {}).get('total_transactions', 0.0))
+
+    def year_summary(self) -> Optional[Dict]:
+        """Detaillierte Jahresübersicht {'summary', 'detailed_accounts'} in Cent oder None ohne Buchungen"""
+        yearly = self.json_data.get('yearly_summary', {})
+        if not yearly.get('bwa_groups'):
+            return None
+        return _summary_cents(yearly)
+
+    def quarter_summary(self, quarter: int) -> Optional[Dict]:
+        """Detaillierte Quartalsübersicht in Cent oder None ohne Buchungen im Quartal"""
+        entry = self._quarters.get(quarter)
+        if not entry:
+            return None
+        return _summary_cents(entry)
+
+    def quarter_total_cents(self, quarter: int) -> int:
+        """Summe der Buchungen eines Quartals in Cent (je nach gespeichertem Quartalsmodus)"""
+        entry = self._quarters.get(quarter, {})
+        return to_cents(entry.get('balance_info', {}).get('quarter_transactions', 0.0))
+
+    @property
+    def accounts(self) -> List[Dict]:
+        """Sachkonto-Details mit Buchungsspalten"""
+        return self.json_data.get('account_details', [])
+
+    @property
+    def transaction_count(self) -> int:
+        """Anzahl aller Buchungen"""
+        return sum(int(account.get('transaction_count', 0)) for account in self.accounts)
+
+    def account_numbers(self) -> List[str]:
+        return [str(account.get('account_number', '')) for account in self.accounts]
+
+    def account(self, account_number: str) -> Optional[Dict]:
+        """Sachkonto-Details einer Sachkontonummer (None wenn nicht enthalten)"""
+        if self._accounts is None:
+            self._accounts = {str(account.get('account_number', '')): account for account in self.accounts}
+        return self._accounts.get(account_number)
+
+    def account_display_names(self) -> Dict[str, str]:
+        """Namen je Sachkonto (Benutzer-Namen zum Exportzeitpunkt vor Namen aus der Importdatei)"""
+        user_names = self.json_data.get('account_names', {})
+        return {
+            str(account.get('account_number', '')):
+                user_names.get(str(account.get('account_number', ''))) or account.get('account_name', '')
+            for account in self.accounts
+        }
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Erkennung des Buchungsblatts anhand der Kopfzeilen aller Arbeitsblätter
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+# Obergrenze für parallele Lesevorgänge
+MAX_SCAN_WORKERS = 8
+
+
+class SheetScanResult:
+    """Ergebnis der Kopfzeilen-Prüfung eines Arbeitsblatts"""
+
+    def __init__(self, sheet_name: str, columns: List[str], required_columns: List[str], error: str = None):
+        self.sheet_name = sheet_name
+        self.columns = columns
+        self.error = error
+
+        stripped = {str(col).strip() for col in columns}
+        self.matched_columns = [col for col in required_columns if col in stripped]
+        self.missing_columns = [col for col in required_columns if col not in stripped]
+
+    @property
+    def score(self) -> float:
+        """Anteil der gefundenen Pflichtspalten (0.0 bis 1.0)"""
+        total = len(self.matched_columns) + len(self.missing_columns)
+        return len(self.matched_columns) / total if total else 0.0
+
+    @property
+    def qualifies(self) -> bool:
+        """True wenn alle Pflichtspalten vorhanden sind"""
+        return self.error is None and not self.missing_columns
+
+    def __repr__(self):
+        return f"SheetScanResult({self.sheet_name!r}, score={self.score:.2f})"
+
+
+def scan_sheets(session, required_columns: List[str], max_workers: Optional[int] = None) -> List[SheetScanResult]:
+    """
+    Liest die Kopfzeilen aller Blätter parallel und bewertet sie
+
+    Args:
+        session: WorkbookSession der Arbeitsmappe
+        required_columns (list): Spalten, die das Buchungsblatt enthalten muss
+        max_workers (int): Anzahl paralleler Threads (None = automatisch)
+
+    Returns:
+        list: Ergebnisse in der Reihenfolge der Blätter
+    """
+    sheet_names = session.sheet_names
+
+    def scan(sheet_name):
+        try:
+            return SheetScanResult(sheet_name, session.read_header(sheet_name), required_columns)
+        except Exception as e:
+            return SheetScanResult(sheet_name, [], required_columns, error=str(e))
+
+    if len(sheet_names) <= 1:
+        return [scan(name) for name in sheet_names]
+
+    # Arbeitsmappe vorab öffnen, damit die Threads sie gemeinsam nutzen
+    # (ODS-Kopfzeilen werden ohne odfpy in einem Durchlauf gelesen)
+    if session.engine != 'odf':
+        session.open()
+
+    workers = max_workers or min(MAX_SCAN_WORKERS, len(sheet_names))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(scan, sheet_names))
+
+
+def select_sheet(results: List[SheetScanResult]) -> Optional[str]:
+    """Gibt das Blatt zurück, wenn genau eines alle Pflichtspalten enthält"""
+    qualifying = [result.sheet_name for result in results if result.qualifies]
+    return qualifying[0] if len(qualifying) == 1 else None
+
+
+def best_sheet(results: List[SheetScanResult]) -> Optional[str]:
+    """Gibt das Blatt mit der höchsten Bewertung zurück (für die Vorauswahl im Dialog)"""
+    if not results:
+        return None
+    best = max(results, key=lambda result: result.score)
+    return best.sheet_name if best.score > 0 else None
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Überwachung der Ereignisschleife: erkennt Hänger der Oberfläche samt blockierendem Python-Stack
+
+Ein Heartbeat-Timer im Hauptthread misst die Verzögerung der Ereignisschleife. Ein
+Wächter-Thread merkt sich den Stack des Hauptthreads, sobald ein Heartbeat länger als
+die Schwelle ausbleibt. Jeder Hänger wird protokolliert (Log-Datei, Trace, Zusammenfassung).
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, QSettings
+
+from .app_paths import get_cache_dir
+from .tracing import tracer
+
+# Umgebungsvariable: "1" (Standardschwelle), Schwelle in Millisekunden oder "0" zum Abschalten
+STALL_ENV = "FINANZ_STALL_MONITOR"
+
+DEFAULT_THRESHOLD_MS = 250
+HEARTBEAT_MS = 50
+
+# Anzahl gespeicherter Hänger (ältere werden nur noch gezählt)
+MAX_STALLS = 200
+
+
+class Stall:
+    """Ein Hänger der Ereignisschleife"""
+
+    def __init__(self, started: datetime, seconds: float, stack: List[str]):
+        self.started = started
+        self.seconds = seconds
+        self.stack = stack  # Formatierter Stack des Hauptthreads während des Hängers
+
+    @property
+    def location(self) -> str:
+        """Innerste Stelle im Anwendungscode (sonst innerste Stelle überhaupt)"""
+        if not self.stack:
+            return "unbekannt"
+        for entry in reversed(self.stack):
+            if f"{os.sep}src{os.sep}" in entry or "/src/" in entry:
+                return entry.strip().splitlines()[0]
+        return self.stack[-1].strip().splitlines()[0]
+
+    def format(self) -> str:
+        """Eintrag für die Log-Datei"""
+        lines = [f"[{self.started:%Y-%m-%d %H:%M:%S}] Oberfläche {self.seconds * 1000:.0f} ms blockiert"]
+        lines.extend(entry.rstrip() for entry in self.stack)
+        return "\n".join(lines) + "\n"
+
+
+class StallMonitor(QObject):
+    """Misst die Latenz der Ereignisschleife und protokolliert Hänger über der Schwelle"""
+
+    def __init__(self, threshold_ms: int = DEFAULT_THRESHOLD_MS, heartbeat_ms: int = HEARTBEAT_MS,
+                 log_path: Optional[str] = None, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = heartbeat_ms / 1000
+        self.log_path = log_path
+        self.stalls = deque(maxlen=MAX_STALLS)
+        self.stall_count = 0
+        self.total_stall_seconds = 0.0
+        self.max_latency = 0.0
+        self.heartbeats = 0
+
+        self._lock = threading.Lock()
+        self._last_beat = 0.0
+        self._pending_stack: Optional[List[str]] = None
+        self._main_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(heartbeat_ms)
+        self._timer.timeout.connect(self._heartbeat)
+
+    @property
+    def is_running(self) -> bool:
+        return self._timer.isActive()
+
+    def start(self):
+        """Startet Heartbeat und Wächter-Thread (im Thread der Ereignisschleife aufrufen)"""
+        if self.is_running:
+            return
+        self._main_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop.clear()
+        self._timer.start()
+        self._watchdog = threading.Thread(target=self._watch, name="Hänger-Wächter", daemon=True)
+        self._watchdog.start()
+        print(f"Hänger-Überwachung aktiv (Schwelle {self.threshold * 1000:.0f} ms)")
+
+    def stop(self):
+        """Beendet die Überwachung"""
+        self._timer.stop()
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+
+    def _heartbeat(self):
+        """Timer im Hauptthread: Verzögerung seit dem letzten Heartbeat messen"""
+        now = time.perf_counter()
+        with self._lock:
+            gap = now - self._last_beat
+            stack = self._pending_stack
+            self._pending_stack = None
+            self._last_beat = now
+
+        latency = max(0.0, gap - self.interval)
+        self.heartbeats += 1
+        self.max_latency = max(self.max_latency, latency)
+        if latency >= self.threshold:
+            self._record(Stall(datetime.now(), latency, stack or []), now - gap, now)
+
+    def _watch(self):
+        """Wächter-Thread: Stack des Hauptthreads sichern, solange er blockiert ist"""
+        poll = max(0.01, self.threshold / 4)
+        while not self._stop.wait(poll):
+            with self._lock:
+                blocked = time.perf_counter() - self._last_beat - self.interval
+                if blocked < self.threshold or self._pending_stack is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_thread_id)
+                if frame is not None:
+                    self._pending_stack = traceback.format_stack(frame)
+
+    def _record(self, stall: Stall, start: float, end: float):
+        """Speichert einen Hänger und schreibt ihn ins Protokoll"""
+        self.stalls.append(stall)
+        self.stall_count += 1
+        self.total_stall_seconds += stall.seconds
+        tracer.add_span("Oberfläche blockiert", "gui.hänger", start, end, location=stall.location)
+        print(f"⚠️ Oberfläche {stall.seconds * 1000:.0f} ms blockiert: {stall.location}")
+
+        if self.log_path:
+            try:
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write(stall.format() + "\n")
+            except OSError as e:
+                print(f"Hänger-Protokoll konnte nicht geschrieben werden: {e}")
+
+    def summary(self) -> Dict:
+        """Kennzahlen der bisherigen Überwachung"""
+        locations = Counter(stall.location for stall in self.stalls)
+        return {
+            'threshold_ms': round(self.threshold * 1000),
+            'heartbeats': self.heartbeats,
+            'stalls': self.stall_count,
+            'total_ms': round(self.total_stall_seconds * 1000),
+            'max_latency_ms': round(self.max_latency * 1000),
+            'top_locations': locations.most_common(3),
+            'log_path': self.log_path,
+        }
+
+    def format_summary(self) -> str:
+        """Zusammenfassung als lesbarer Text (z.B. für den Über-Dialog)"""
+        summary = self.summary()
+        if not summary['stalls']:
+            return (f"Keine Hänger über {summary['threshold_ms']} ms "
+                    f"(größte Verzögerung {summary['max_latency_ms']} ms)")
+        lines = [f"{summary['stalls']} Hänger über {summary['threshold_ms']} ms, "
+                 f"zusammen {summary['total_ms']} ms, größte Verzögerung {summary['max_latency_ms']} ms"]
+        for location, count in summary['top_locations']:
+            lines.append(f"{count}× {location}")
+        if summary['log_path']:
+            lines.append(f"Protokoll: {summary['log_path']}")
+        return "\n".join(lines)
+
+
+# Überwachung der Anwendung (None wenn deaktiviert)
+_monitor: Optional[StallMonitor] = None
+
+
+def get_stall_monitor() -> Optional[StallMonitor]:
+    """Aktive Hänger-Überwachung oder None"""
+    return _monitor
+
+
+def default_log_path() -> str:
+    """Protokolldatei im Cache-Verzeichnis (Unterordner 'logs')"""
+    return str(get_cache_dir("logs") / "ui_stalls.log")
+
+
+def configure_stall_monitor(parent: Optional[QObject] = None) -> Optional[StallMonitor]:
+    """
+    Startet oder beendet die Hänger-Überwachung nach Umgebungsvariable und Einstellungen
+
+    Die Umgebungsvariable FINANZ_STALL_MONITOR hat Vorrang vor den Einstellungen
+    "stall_monitor_enabled" und "stall_monitor_threshold_ms".
+
+    Returns:
+        Optional[StallMonitor]: Laufende Überwachung oder None
+    """
+    global _monitor
+    settings = QSettings()
+    threshold = settings.value("stall_monitor_threshold_ms", DEFAULT_THRESHOLD_MS, type=int)
+    value = os.getenv(STALL_ENV, "").strip()
+    if value:
+        enabled = value.lower() not in ("0", "false", "no")
+        if value.isdigit() and int(value) > 1:
+            threshold = int(value)
+    else:
+        enabled = settings.value("stall_monitor_enabled", False, type=bool)
+
+    if not enabled:
+        if _monitor is not None:
+            _monitor.stop()
+            _monitor = None
+        return None
+
+    if _monitor is None:
+        _monitor = StallMonitor(threshold, log_path=default_log_path(), parent=parent)
+        _monitor.start()
+    return _monitor
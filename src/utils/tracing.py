@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Laufzeit-Tracing mit Export im Chrome-Trace-Format (chrome://tracing, ui.perfetto.dev)
+
+Aktivierung über die Umgebungsvariable FINANZ_TRACE (Pfad der Trace-Datei oder "1")
+oder die Einstellung "trace_enabled". Ist das Tracing deaktiviert, kostet ein Span
+nur eine Attributabfrage.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QSettings
+
+from .app_paths import get_cache_dir
+
+# Umgebungsvariable: Pfad der Trace-Datei, "1" für den Standardpfad oder "0" zum Abschalten
+TRACE_ENV = "FINANZ_TRACE"
+
+# Obergrenze gespeicherter Ereignisse (lange Sitzungen)
+MAX_EVENTS = 500000
+
+
+class _NullSpan:
+    """Span ohne Wirkung (Tracing deaktiviert)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Zeitabschnitt, der beim Verlassen als Complete-Event gespeichert wird"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', name: str, category: str, args: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer.add_span(self.name, self.category, self.start, time.perf_counter(), **self.args)
+        return False
+
+    def set(self, **args):
+        """Ergänzt Angaben, die erst während des Abschnitts bekannt werden (z.B. Zeilenzahl)"""
+        self.args.update(args)
+
+
+class Tracer:
+    """Sammelt Trace-Ereignisse und schreibt sie als Chrome-Trace-JSON"""
+
+    def __init__(self):
+        self.enabled = False
+        self.output_path: Optional[str] = None
+        self.dropped = 0
+        self._events: List[Dict] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._atexit_registered = False
+
+    def enable(self, output_path: str):
+        """Aktiviert das Tracing; die Ereignisse werden nach output_path geschrieben"""
+        self.output_path = output_path
+        self.enabled = True
+        if not self._atexit_registered:
+            atexit.register(self.write)
+            self._atexit_registered = True
+        print(f"Tracing aktiviert: {output_path}")
+
+    def disable(self):
+        """Deaktiviert das Tracing (gesammelte Ereignisse bleiben erhalten)"""
+        self.enabled = False
+
+    def clear(self):
+        """Verwirft alle gesammelten Ereignisse"""
+        with self._lock:
+            self._events = []
+            self._thread_names = {}
+            self.dropped = 0
+
+    def span(self, name: str, category: str = "app", **args):
+        """Kontextmanager für einen Zeitabschnitt"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, args)
+
+    def add_span(self, name: str, category: str, start: float, end: float, **args):
+        """Speichert einen bereits gemessenen Abschnitt (Zeitpunkte von time.perf_counter)"""
+        if not self.enabled:
+            return
+        self._append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+        }, args)
+
+    def instant(self, name: str, category: str = "app", **args):
+        """Speichert ein Ereignis ohne Dauer"""
+        if not self.enabled:
+            return
+        self._append({
+            "name": name, "cat": category, "ph": "i", "s": "t",
+            "ts": round((time.perf_counter() - self._origin) * 1e6, 1),
+        }, args)
+
+    def _append(self, event: Dict, args: Dict):
+        thread = threading.current_thread()
+        event["pid"] = self._pid
+        event["tid"] = thread.ident
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self._events) >= MAX_EVENTS:
+                self.dropped += 1
+                return
+            self._thread_names[thread.ident] = thread.name
+            self._events.append(event)
+
+    @property
+    def events(self) -> List[Dict]:
+        """Kopie der gesammelten Ereignisse"""
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self) -> Dict:
+        """Ereignisse im Chrome-Trace-Format (JSON Object Format)"""
+        with self._lock:
+            metadata = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                         "args": {"name": "Finanzauswertung Ehrenamt"}}]
+            metadata.extend({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                             "args": {"name": name}} for tid, name in self._thread_names.items())
+            return {
+                "traceEvents": metadata + self._events,
+                "displayTimeUnit": "ms",
+                "otherData": {"dropped_events": self.dropped},
+            }
+
+    def write(self, output_path: Optional[str] = None) -> Optional[str]:
+        """
+        Schreibt alle bisherigen Ereignisse (überschreibt die Datei)
+
+        Returns:
+            Optional[str]: Pfad der Trace-Datei oder None wenn nichts geschrieben wurde
+        """
+        output_path = output_path or self.output_path
+        if not output_path or not self._events:
+            return None
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+            return output_path
+        except OSError as e:
+            print(f"Trace-Datei konnte nicht geschrieben werden: {e}")
+            return None
+
+
+# Tracer der Anwendung
+tracer = Tracer()
+
+
+def span(name: str, category: str = "app", **args):
+    """Kontextmanager für einen Zeitabschnitt des Anwendungs-Tracers"""
+    if not tracer.enabled:
+        return _NULL_SPAN
+    return Span(tracer, name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app"):
+    """Dekorator: zeichnet jeden Aufruf der Funktion als Span auf"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with Span(tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def default_trace_path() -> str:
+    """Neue Trace-Datei im Cache-Verzeichnis (Unterordner 'traces')"""
+    return str(get_cache_dir("traces") / f"trace_{datetime.now():%Y%m%d_%H%M%S}.json")
+
+
+def configure_tracing() -> bool:
+    """
+    Aktiviert oder deaktiviert das Tracing nach Umgebungsvariable und Einstellungen
+
+    Die Umgebungsvariable FINANZ_TRACE hat Vorrang vor der Einstellung "trace_enabled".
+
+    Returns:
+        bool: True wenn das Tracing aktiv ist
+    """
+    value = os.getenv(TRACE_ENV, "").strip()
+    if value:
+        enabled = value.lower() not in ("0", "false", "no")
+        output_path = None if value.lower() in ("1", "true", "yes") else value
+    else:
+        enabled = QSettings().value("trace_enabled", False, type=bool)
+        output_path = None
+
+    if not enabled:
+        if tracer.enabled:
+            tracer.write()
+            tracer.disable()
+        return False
+
+    if not tracer.enabled:
+        tracer.enable(output_path or tracer.output_path or default_trace_path())
+    return True
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Arbeitsmappen-Sitzung: öffnet Excel/ODS-Dateien nur einmal pro Import
+"""
+
+import os
+import threading
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+
+from . import ods_reader
+
+# Standardanzahl Datenzeilen für Vorschauen
+DEFAULT_PREVIEW_ROWS = 10
+
+
+class PreviewCancelled(Exception):
+    """Vorschau wurde abgebrochen, bevor sie fertig gelesen war"""
+
+
+def _until_cancelled(rows: Iterator, cancelled) -> Iterator:
+    """Reicht Zeilen durch und endet, sobald das Event gesetzt ist (geprüft zwischen Zeilenblöcken)"""
+    for count, row in enumerate(rows, 1):
+        if count % ods_reader.CANCEL_CHECK_ROWS == 0 and cancelled.is_set():
+            return
+        yield row
+
+
+def is_empty_row(row) -> bool:
+    """True wenn eine Zeile keine Werte enthält"""
+    return all(value is None for value in row)
+
+
+def read_xlsx_header(rows: Iterator[tuple]) -> Tuple[Optional[list], int]:
+    """
+    Kopfzeile eines .xlsx-Blatts: die erste nicht-leere Zeile
+
+    Gemeinsame Regel für Streaming-Import, Vorschau und Blatt-Erkennung. Der Iterator steht
+    danach auf der ersten Zeile nach der Kopfzeile.
+
+    Returns:
+        Tuple: (Kopfzeile oder None bei leerem Blatt, Anzahl gelesener Zeilen inkl. Kopfzeile)
+    """
+    for position, row in enumerate(rows, 1):
+        if not is_empty_row(row):
+            return list(row), position
+    return None, 0
+
+
+class WorkbookSession:
+    """
+    Hält eine geöffnete Excel/ODS-Arbeitsmappe und bereits gelesene Blätter
+
+    Blatt-Namen, Vorschau und der eigentliche Import nutzen dieselbe Sitzung,
+    sodass der Container (ZIP/XML) nur einmal geparst wird. Ändert sich die
+    Datei auf der Festplatte, wird die Sitzung ungültig.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.file_extension = Path(file_path).suffix.lower()
+        self.engine = self._get_engine(self.file_extension)
+        self._signature = self._get_file_signature(file_path)
+        self._excel_file: Optional[pd.ExcelFile] = None
+        self._sheet_names: Optional[List[str]] = None
+        self._sheets: Dict[str, pd.DataFrame] = {}
+        self._ods_headers: Optional[Dict[str, list]] = None
+        self._previews: Dict[Tuple[str, int], Tuple[pd.DataFrame, Optional[int]]] = {}
+        # Vorschauen werden aus Hintergrund-Threads gelesen
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _get_engine(file_extension: str) -> str:
+        """Ermittelt die pandas-Engine für die Dateiendung"""
+        if file_extension == '.xlsx':
+            return 'openpyxl'
+        if file_extension == '.xls':
+            return 'xlrd'
+        if file_extension == '.ods':
+            return 'odf'
+        raise ValueError(f"Keine Arbeitsmappe: {file_extension}")
+
+    @staticmethod
+    def _get_file_signature(file_path: str):
+        """Änderungszeit und Größe der Datei (zur Erkennung von Änderungen)"""
+        stat = os.stat(file_path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def is_valid_for(self, file_path: str) -> bool:
+        """Prüft ob die Sitzung noch zur (unveränderten) Datei passt"""
+        try:
+            return (os.path.abspath(file_path) == os.path.abspath(self.file_path)
+                    and self._get_file_signature(file_path) == self._signature)
+        except OSError:
+            return False
+
+    @property
+    def excel_file(self) -> pd.ExcelFile:
+        """Geöffnete Arbeitsmappe (wird beim ersten Zugriff geöffnet)"""
+        with self._lock:
+            return self._open_excel_file()
+
+    def open(self) -> pd.ExcelFile:
+        """Öffnet die Arbeitsmappe (falls noch nicht geschehen)"""
+        return self.excel_file
+
+    def _open_excel_file(self) -> pd.ExcelFile:
+        """Öffnet die Arbeitsmappe beim ersten Zugriff"""
+        if self._excel_file is None:
+            try:
+                self._excel_file = pd.ExcelFile(self.file_path, engine=self.engine)
+            except ImportError:
+                if self.engine == 'odf':
+                    raise Exception(
+                        "Für ODS-Dateien ist das 'odfpy' Paket erforderlich. "
+                        "Installieren Sie es mit: pip install odfpy"
+                    )
+                raise
+        return self._excel_file
+
+    @property
+    def sheet_names(self) -> List[str]:
+        """Namen aller Arbeitsblätter"""
+        if self._sheet_names is None:
+            if self.engine == 'odf':
+                # ODS wird mit dem eigenen Streaming-Leser gelesen (ohne odfpy)
+                self._sheet_names = ods_reader.get_sheet_names(self.file_path)
+            else:
+                self._sheet_names = list(self.excel_file.sheet_names)
+        return self._sheet_names
+
+    def read_sheet(self, sheet_name: Optional[str] = None) -> pd.DataFrame:
+        """Liest ein Arbeitsblatt (bereits gelesene Blätter kommen aus dem Speicher)"""
+        if sheet_name is None:
+            sheet_name = self.sheet_names[0]
+
+        with self._lock:
+            if sheet_name not in self._sheets:
+                if self.engine == 'odf':
+                    self._sheets[sheet_name] = ods_reader.read_sheet(self.file_path, sheet_name)
+                else:
+                    self._sheets[sheet_name] = self.excel_file.parse(sheet_name=sheet_name)
+
+            # Flache Kopie, damit Aufrufer Spaltennamen ändern können ohne den Cache zu verändern
+            return self._sheets[sheet_name].copy(deep=False)
+
+    def read_preview(self, sheet_name: str, nrows: int = DEFAULT_PREVIEW_ROWS,
+                     cancelled: Optional[threading.Event] = None) -> Tuple[pd.DataFrame, Optional[int]]:
+        """
+        Liest nur die Kopfzeile und die ersten Datenzeilen eines Blatts
+
+        Mit ``cancelled`` prüfen .xlsx und ODS das Event zwischen Zeilenblöcken, sodass ein
+        abgebrochener Leser die Sitzung schnell für den Import freigibt.
+
+        Returns:
+            Tuple: (Vorschau-DataFrame, Anzahl Datenzeilen oder None wenn unbekannt)
+
+        Raises:
+            PreviewCancelled: Wenn das Event während des Lesens gesetzt wurde
+        """
+        with self._lock:
+            key = (sheet_name, nrows)
+            if key in self._previews:
+                return self._previews[key]
+
+            if sheet_name in self._sheets and self.engine != 'openpyxl':
+                # Blatt bereits vollständig gelesen
+                df = self._sheets[sheet_name]
+                preview = (df.head(nrows).copy(), len(df))
+            elif self.engine == 'openpyxl':
+                preview = self._read_xlsx_preview(sheet_name, nrows, cancelled)
+            elif self.engine == 'odf':
+                rows = list(ods_reader.iter_sheet_rows(self.file_path, sheet_name, max_rows=nrows + 1,
+                                                       cancelled=cancelled))
+                # ODS enthält keine Zeilenanzahl in den Metadaten
+                preview = (self._rows_to_frame(rows), None)
+            else:
+                df = self.excel_file.parse(sheet_name=sheet_name, nrows=nrows)
+                preview = (df, self._get_xls_row_count(sheet_name))
+
+            # Unvollständige Vorschau eines abgebrochenen Lesers nicht zwischenspeichern
+            if cancelled is not None and cancelled.is_set():
+                raise PreviewCancelled(sheet_name)
+            self._previews[key] = preview
+            return preview
+
+    def read_header(self, sheet_name: str) -> List[str]:
+        """
+        Liest nur die Spaltennamen eines Blatts
+
+        Es gilt dieselbe Kopfzeile wie beim Import, damit die Blatt-Erkennung nur Blätter
+        vorschlägt, die sich auch importieren lassen: bei .xlsx die erste nicht-leere Zeile
+        (Streaming-Import), sonst die erste Zeile. Kann für mehrere Blätter gleichzeitig aus
+        verschiedenen Threads aufgerufen werden.
+        """
+        if self.engine == 'openpyxl':
+            worksheet = self.excel_file.book[sheet_name]
+            header = read_xlsx_header(worksheet.iter_rows(values_only=True))[0] or []
+        elif sheet_name in self._sheets:
+            return [str(col) for col in self._sheets[sheet_name].columns]
+        elif self.engine == 'odf':
+            with self._lock:
+                if self._ods_headers is None:
+                    # Ein gemeinsamer Durchlauf durch content.xml für alle Blätter, der nach der
+                    # Kopfzeile des letzten Blatts endet
+                    self._ods_headers = ods_reader.read_header_rows(self.file_path, self.sheet_names)
+            header = list(self._ods_headers.get(sheet_name, []))
+        else:
+            sheet = self.excel_file.book.sheet_by_name(sheet_name)
+            header = sheet.row_values(0) if sheet.nrows else []
+
+        while header and header[-1] in (None, ''):
+            header.pop()
+        return [
+            str(name) if name not in (None, '') else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+
+    def _read_xlsx_preview(self, sheet_name: str, nrows: int,
+                           cancelled: Optional[threading.Event] = None) -> Tuple[pd.DataFrame, Optional[int]]:
+        """Vorschau einer .xlsx-Datei über die read-only Arbeitsmappe von openpyxl (wie der Streaming-Import)"""
+        worksheet = self.excel_file.book[sheet_name]
+        rows = worksheet.iter_rows(values_only=True)
+        if cancelled is not None:
+            rows = _until_cancelled(rows, cancelled)
+        header, header_position = read_xlsx_header(rows)
+        if header is None:
+            return pd.DataFrame(), 0
+        data = [list(row) for row in islice((row for row in rows if not is_empty_row(row)), nrows)]
+
+        # Zeilenanzahl aus den Blatt-Metadaten (<dimension>), falls vorhanden
+        total_rows = worksheet.max_row - header_position if worksheet.max_row else None
+        return self._rows_to_frame([header] + data), total_rows
+
+    def _get_xls_row_count(self, sheet_name: str) -> Optional[int]:
+        """Zeilenanzahl eines .xls-Blatts aus xlrd"""
+        try:
+            return self.excel_file.book.sheet_by_name(sheet_name).nrows - 1
+        except Exception:
+            return None
+
+    @staticmethod
+    def _rows_to_frame(rows: List[list]) -> pd.DataFrame:
+        """Erstellt ein DataFrame aus Zeilenwerten (erste Zeile = Spaltennamen)"""
+        if not rows:
+            return pd.DataFrame()
+
+        header = list(rows[0])
+        width = max(len(row) for row in rows)
+        header += [None] * (width - len(header))
+        columns = [
+            str(name) if name is not None else f"Unnamed: {i}"
+            for i, name in enumerate(header)
+        ]
+        data = [list(row) + [None] * (width - len(row)) for row in rows[1:]]
+        return pd.DataFrame(data, columns=columns).infer_objects()
+
+    def has_sheet_cached(self, sheet_name: str) -> bool:
+        """Prüft ob ein Blatt bereits gelesen wurde"""
+        return sheet_name in self._sheets
+
+    def close(self):
+        """Schließt die Arbeitsmappe und gibt gelesene Blätter frei"""
+        if self._excel_file is not None:
+            try:
+                self._excel_file.close()
+            except Exception:
+                pass
+        self._excel_file = None
+        self._sheets.clear()
+        self._previews.clear()
+        self._ods_headers = None
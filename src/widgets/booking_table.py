@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""
+Buchungsübersicht: virtuelle Tabelle direkt über den verarbeiteten Buchungsdaten
+
+Das Modell hält nur NumPy-Spalten und eine Zeilenreihenfolge (Positionen). Zellen werden
+erst beim Anzeigen formatiert, Sortierindizes je Spalte einmal berechnet und Filter als
+Masken kombiniert - auch eine Million Buchungen bleibt so flüssig bedienbar.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView,
+                               QComboBox, QLineEdit, QLabel, QAbstractItemView)
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, QSettings
+
+from ..utils.amounts import parse_amount_cents, format_cents
+from .period_selection import NEGATIVE_COLOR
+
+# Spaltenüberschriften der Tabelle
+COLUMNS = ["Buchungstag", "Sachkonto", "Bezeichnung", "Buchungsnr.", "Verwendungszweck", "Betrag"]
+DATE_COLUMN, ACCOUNT_COLUMN, NAME_COLUMN, BOOKING_COLUMN, PURPOSE_COLUMN, AMOUNT_COLUMN = range(len(COLUMNS))
+
+# Wartezeit nach der letzten Eingabe, bevor ein Filter angewendet wird
+FILTER_DELAY_MS = 200
+
+
+class _TextColumn:
+    """Textspalte als Codes auf eindeutige Werte (Suche und Sortierung nur über die Werte)"""
+
+    def __init__(self, codes: np.ndarray, labels: np.ndarray):
+        self.codes = codes      # Position -> Index in labels (-1 = leer)
+        self.labels = labels    # Eindeutige Anzeigetexte
+        self._lowered = None
+        self._sort_key = None
+
+    @classmethod
+    def from_series(cls, values: pd.Series) -> "_TextColumn":
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        labels = np.array([str(value) for value in uniques], dtype=object)
+        return cls(codes.astype(np.int32), labels)
+
+    def text(self, position: int) -> str:
+        code = self.codes[position]
+        return self.labels[code] if code >= 0 else ""
+
+    def sort_key(self) -> np.ndarray:
+        """Rang des Textes je Position (ohne Groß-/Kleinschreibung, leere Werte zuerst)"""
+        if self._sort_key is None:
+            order = np.argsort(self.lowered(), kind='stable')
+            rank = np.empty(len(order) + 1, dtype=np.int32)
+            rank[order] = np.arange(len(order), dtype=np.int32)
+            rank[-1] = -1
+            self._sort_key = rank[self.codes]
+        return self._sort_key
+
+    def lowered(self) -> np.ndarray:
+        if self._lowered is None:
+            self._lowered = np.array([label.lower() for label in self.labels], dtype=object)
+        return self._lowered
+
+    def matches(self, needle: str) -> np.ndarray:
+        """Maske aller Positionen, deren Text 'needle' enthält (needle bereits klein geschrieben)"""
+        hits = np.fromiter((needle in label for label in self.lowered()), dtype=bool, count=len(self.labels))
+        # Code -1 (leer) zeigt auf den angehängten False-Eintrag
+        return np.append(hits, False)[self.codes]
+
+
+class BookingTableModel(QAbstractTableModel):
+    """Tabellenmodell über processed_data mit Sortierung und Filtern ohne Kopien der Daten"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._clear_columns()
+
+    def _clear_columns(self):
+        self._index = None
+        self._days = np.empty(0, dtype='datetime64[D]')
+        self._cents = np.empty(0, dtype=np.int64)
+        self._quarters = np.empty(0, dtype=np.int8)
+        self._text_columns: Dict[int, _TextColumn] = {}
+        self._sort_cache: Dict[int, np.ndarray] = {}
+        self._order = np.empty(0, dtype=np.intp)
+        self._mask: Optional[np.ndarray] = None
+        self._rows = self._order
+
+    def set_ledger(self, data: Optional[pd.DataFrame], account_names: Optional[Dict[str, str]] = None):
+        """Übernimmt die verarbeiteten Buchungen (Filter und Sortierung werden zurückgesetzt)"""
+        self.beginResetModel()
+        self._clear_columns()
+        if data is not None and not data.empty:
+            self._index = data.index
+            self._days = data['Buchungstag_Clean'].to_numpy().astype('datetime64[D]')
+            self._cents = data['Betrag_Cent'].to_numpy(dtype=np.int64)
+            self._quarters = data['Quartal'].to_numpy(dtype=np.int8)
+
+            accounts = data['Sachkontonr.'].astype('category')
+            codes = accounts.cat.codes.to_numpy().astype(np.int32)
+            numbers = np.array([str(value) for value in accounts.cat.categories], dtype=object)
+            names = account_names or {}
+            self._text_columns[ACCOUNT_COLUMN] = _TextColumn(codes, numbers)
+            self._text_columns[NAME_COLUMN] = _TextColumn(
+                codes, np.array([names.get(number, "") for number in numbers], dtype=object))
+            for column, name in ((BOOKING_COLUMN, 'Buchungsnr.'), (PURPOSE_COLUMN, 'Verwendungszweck')):
+                if name in data.columns:
+                    self._text_columns[column] = _TextColumn.from_series(data[name])
+
+            self._order = np.arange(len(data), dtype=np.intp)
+            self._rows = self._order
+        self.endResetModel()
+
+    def clear(self):
+        """Entfernt alle Buchungen"""
+        self.set_ledger(None)
+
+    # --- Qt-Schnittstelle ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.cell_text(index.row(), column)
+        if column == AMOUNT_COLUMN:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            if role == Qt.ItemDataRole.ForegroundRole and self._cents[self._rows[index.row()]] < 0:
+                return NEGATIVE_COLOR
+        return None
+
+    def cell_text(self, row: int, column: int) -> str:
+        """Formatiert eine einzelne Zelle (nur für sichtbare Zeilen aufgerufen)"""
+        position = self._rows[row]
+        if column == DATE_COLUMN:
+            day = self._days[position]
+            return "" if np.isnat(day) else day.astype(object).strftime("%d.%m.%Y")
+        if column == AMOUNT_COLUMN:
+            return format_cents(self._cents[position])
+        text_column = self._text_columns.get(column)
+        return text_column.text(position) if text_column is not None else ""
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        """Sortiert über den vorberechneten Index der Spalte (stabil, absteigend = umgekehrt)"""
+        self.layoutAboutToBeChanged.emit()
+        ascending = self._sort_index(column)
+        self._order = ascending if order == Qt.SortOrder.AscendingOrder else ascending[::-1]
+        self._apply_mask()
+        self.layoutChanged.emit()
+
+    def _sort_index(self, column: int) -> np.ndarray:
+        """Aufsteigende Reihenfolge einer Spalte (einmal berechnet, danach aus dem Zwischenspeicher)"""
+        if column not in self._sort_cache:
+            if column == DATE_COLUMN:
+                key = self._days.view(np.int64)
+            elif column == AMOUNT_COLUMN:
+                key = self._cents
+            elif column in self._text_columns:
+                key = self._text_columns[column].sort_key()
+            else:
+                key = np.zeros(len(self._cents), dtype=np.int8)
+            self._sort_cache[column] = np.argsort(key, kind='stable')
+        return self._sort_cache[column]
+
+    # --- Filter ---
+
+    def set_filter(self, account: Optional[str] = None, quarter: Optional[int] = None,
+                   min_cents: Optional[int] = None, max_cents: Optional[int] = None, text: str = ""):
+        """
+        Zeigt nur passende Buchungen an (None bzw. leerer Text = kein Filter)
+
+        Args:
+            account (str): Sachkontonummer
+            quarter (int): Quartal 1-4
+            min_cents/max_cents (int): Betragsbereich in Cent (jeweils einschließlich)
+            text (str): Suchtext in Sachkonto, Bezeichnung, Buchungsnr. und Verwendungszweck
+        """
+        mask = None
+
+        def combine(condition):
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if account is not None:
+            accounts = self._text_columns.get(ACCOUNT_COLUMN)
+            if accounts is not None:
+                code = np.flatnonzero(accounts.labels == str(account))
+                combine(accounts.codes == (code[0] if len(code) else -2))
+        if quarter:
+            combine(self._quarters == quarter)
+        if min_cents is not None:
+            combine(self._cents >= min_cents)
+        if max_cents is not None:
+            combine(self._cents <= max_cents)
+        needle = text.strip().lower()
+        if needle:
+            # Jede Textspalte nur einmal je eindeutigem Wert durchsuchen
+            found = np.zeros(len(self._cents), dtype=bool)
+            for text_column in self._text_columns.values():
+                found |= text_column.matches(needle)
+            combine(found)
+
+        self.beginResetModel()
+        self._mask = mask
+        self._apply_mask()
+        self.endResetModel()
+
+    def _apply_mask(self):
+        self._rows = self._order if self._mask is None else self._order[self._mask[self._order]]
+
+    # --- Auskünfte ---
+
+    def total_count(self) -> int:
+        return len(self._cents)
+
+    def visible_count(self) -> int:
+        return len(self._rows)
+
+    def visible_cents(self) -> int:
+        """Summe der angezeigten Buchungen in Cent"""
+        if self._mask is None:
+            return int(self._cents.sum())
+        return int(self._cents[self._mask].sum())
+
+    def account_numbers(self) -> List[str]:
+        """Sachkontonummern (sortiert) für die Filterauswahl"""
+        accounts = self._text_columns.get(ACCOUNT_COLUMN)
+        return sorted(accounts.labels) if accounts is not None else []
+
+    def account_name(self, account: str) -> str:
+        names = self._text_columns.get(NAME_COLUMN)
+        accounts = self._text_columns.get(ACCOUNT_COLUMN)
+        if names is None:
+            return ""
+        position = np.flatnonzero(accounts.labels == account)
+        return names.labels[position[0]] if len(position) else ""
+
+    def source_index(self, row: int):
+        """Index-Wert der Zeile in processed_data"""
+        return self._index[self._rows[row]]
+
+
+class BookingBrowser(QWidget):
+    """Filterleiste und virtuelle Tabelle aller Buchungen"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = BookingTableModel(self)
+        self.init_ui()
+
+        # Eingaben sammeln und den Filter erst nach einer kurzen Pause anwenden
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self.apply_filter)
+
+    def init_ui(self):
+        """Initialisiert Filterleiste und Tabelle"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 10, 0, 0)
+
+        filter_layout = QHBoxLayout()
+        self.account_combo = QComboBox()
+        self.account_combo.setMinimumWidth(180)
+        self.account_combo.currentIndexChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.account_combo)
+
+        self.quarter_combo = QComboBox()
+        self.quarter_combo.addItem("Alle Quartale", 0)
+        for quarter in range(1, 5):
+            self.quarter_combo.addItem(f"Q{quarter}", quarter)
+        self.quarter_combo.currentIndexChanged.connect(self.apply_filter)
+        filter_layout.addWidget(self.quarter_combo)
+
+        self.min_amount_edit = QLineEdit()
+        self.min_amount_edit.setPlaceholderText("Betrag von")
+        self.min_amount_edit.setMaximumWidth(100)
+        self.max_amount_edit = QLineEdit()
+        self.max_amount_edit.setPlaceholderText("bis")
+        self.max_amount_edit.setMaximumWidth(100)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Suche in Sachkonto, Buchungsnr., Verwendungszweck")
+        self.search_edit.setClearButtonEnabled(True)
+        for edit in (self.min_amount_edit, self.max_amount_edit, self.search_edit):
+            edit.textChanged.connect(self.schedule_filter)
+            filter_layout.addWidget(edit)
+        layout.addLayout(filter_layout)
+
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.setAlternatingRowColors(True)
+        self.table_view.setWordWrap(False)
+        # Feste Zeilenhöhen und Spaltenbreiten: Qt muss keine Zeilen zum Ausmessen formatieren
+        vertical_header = self.table_view.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        vertical_header.hide()
+        header = self.table_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(False)
+        for column, width in enumerate((90, 80, 160, 90, 260, 110)):
+            header.resizeSection(column, width)
+        header.setSectionResizeMode(PURPOSE_COLUMN, QHeaderView.ResizeMode.Stretch)
+        header.setSortIndicator(DATE_COLUMN, Qt.SortOrder.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+        layout.addWidget(self.table_view)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666666; font-size: 11px;")
+        layout.addWidget(self.status_label)
+
+    def set_ledger(self, data: Optional[pd.DataFrame], account_names: Optional[Dict[str, str]] = None):
+        """Zeigt die verarbeiteten Buchungen an und setzt alle Filter zurück"""
+        self.model.set_ledger(data, account_names)
+
+        for widget in (self.account_combo, self.quarter_combo, self.min_amount_edit,
+                       self.max_amount_edit, self.search_edit):
+            widget.blockSignals(True)
+        self.account_combo.clear()
+        self.account_combo.addItem("Alle Sachkonten", None)
+        for number in self.model.account_numbers():
+            name = self.model.account_name(number)
+            self.account_combo.addItem(f"{number} – {name}" if name else number, number)
+        self.quarter_combo.setCurrentIndex(0)
+        for edit in (self.min_amount_edit, self.max_amount_edit, self.search_edit):
+            edit.clear()
+        for widget in (self.account_combo, self.quarter_combo, self.min_amount_edit,
+                       self.max_amount_edit, self.search_edit):
+            widget.blockSignals(False)
+
+        # Gewählte Sortierung auf die neuen Daten anwenden
+        header = self.table_view.horizontalHeader()
+        self.model.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        self.update_status()
+
+    def clear(self):
+        """Entfernt alle Buchungen aus der Ansicht"""
+        self.set_ledger(None)
+
+    def schedule_filter(self):
+        """Startet die Wartezeit für Texteingaben neu"""
+        self._filter_timer.start()
+
+    def apply_filter(self):
+        """Überträgt die Filterleiste auf das Modell"""
+        self._filter_timer.stop()
+        min_cents = self._parse_amount(self.min_amount_edit)
+        max_cents = self._parse_amount(self.max_amount_edit)
+        self.model.set_filter(
+            account=self.account_combo.currentData(),
+            quarter=self.quarter_combo.currentData(),
+            min_cents=min_cents,
+            max_cents=max_cents,
+            text=self.search_edit.text()
+        )
+        self.update_status()
+
+    def _parse_amount(self, edit: QLineEdit) -> Optional[int]:
+        """Betrag aus einem Eingabefeld (ungültige Eingaben werden rot markiert und ignoriert)"""
+        text = edit.text().strip()
+        decimal_separator = QSettings().value("decimal_separator", ",")
+        cents = parse_amount_cents(text, decimal_separator) if text else None
+        edit.setStyleSheet("" if cents is not None or not text else "border: 1px solid #c62828;")
+        return cents
+
+    def update_status(self):
+        """Anzahl und Summe der angezeigten Buchungen"""
+        visible = self.model.visible_count()
+        total = self.model.total_count()
+        count = f"{visible:,}".replace(",", ".")
+        if visible != total:
+            count += f" von {total:,}".replace(",", ".")
+        self.status_label.setText(f"{count} Buchungen, Summe {format_cents(self.model.visible_cents())}")
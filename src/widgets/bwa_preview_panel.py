@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Live-Vorschau der BWA-Tabelle während der Sachkonten-Zuordnung
+
+Beim Ändern einer Zuordnung werden nur die Zeilen der alten und neuen Gruppe (und ihrer
+Obergruppen) angepasst - ohne Neuberechnung aus den Buchungen.
+"""
+
+from typing import Dict, Optional
+
+import pandas as pd
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
+                               QLabel, QGroupBox, QHeaderView)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+
+from ..utils.amounts import format_cents
+from ..utils.booking_index import BookingIndex
+from ..utils.live_summary import LiveSummary
+from .period_selection import NEGATIVE_COLOR, create_period_combos, selected_period
+
+
+class BWAPreviewPanel(QWidget):
+    """BWA-Tabelle (Obergruppe → BWA-Gruppe) eines Zeitraums mit inkrementellen Updates"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.live_summary: Optional[LiveSummary] = None
+        self._super_items: Dict[str, QTreeWidgetItem] = {}
+        self._group_items: Dict[str, QTreeWidgetItem] = {}
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialisiert Zeitraumauswahl und Tabelle"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        preview_group = QGroupBox("BWA-Vorschau")
+        preview_layout = QVBoxLayout(preview_group)
+
+        period_layout = QHBoxLayout()
+        self.period_combo, self.mode_combo = create_period_combos(self.apply_period)
+        period_layout.addWidget(self.period_combo)
+        period_layout.addWidget(self.mode_combo)
+        preview_layout.addLayout(period_layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Obergruppe / BWA-Gruppe", "Betrag"])
+        self.tree.setUniformRowHeights(True)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setSortingEnabled(False)
+        header = self.tree.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
+        header.resizeSection(1, 110)
+        preview_layout.addWidget(self.tree)
+
+        self.total_label = QLabel("Keine Buchungen geladen")
+        self.total_label.setStyleSheet("font-weight: bold;")
+        preview_layout.addWidget(self.total_label)
+
+        layout.addWidget(preview_group)
+
+    # --- Daten ---
+
+    def set_ledger(self, data: Optional[pd.DataFrame], account_mappings: Optional[Dict[str, str]] = None,
+                   super_group_mappings: Optional[Dict[str, str]] = None):
+        """Summiert die Buchungen einmal je Sachkonto und Quartal und zeigt die Vorschau an"""
+        if data is None or data.empty:
+            self.clear()
+            return
+        # Nur die Summen je Sachkonto und Quartal bleiben, der Index selbst wird verworfen
+        self.live_summary = LiveSummary.from_index(BookingIndex(data), account_mappings, super_group_mappings)
+        self.apply_period()
+
+    def clear(self):
+        """Entfernt die Vorschau (z.B. nach dem Zurücksetzen der Daten)"""
+        self.live_summary = None
+        self._rebuild()
+
+    def apply_period(self):
+        """Zeigt den gewählten Zeitraum an"""
+        quarter, quarter_mode = selected_period(self.period_combo, self.mode_combo)
+        if self.live_summary is not None:
+            self.live_summary.set_period(quarter, quarter_mode)
+        self._rebuild()
+
+    def set_mappings(self, account_mappings: Dict[str, str]):
+        """Alle Zuordnungen neu übernehmen (z.B. nach einem CSV-Import der Zuordnungen)"""
+        if self.live_summary is not None:
+            self.live_summary.set_mappings(account_mappings)
+            self._rebuild()
+
+    def set_super_group_mappings(self, super_group_mappings: Dict[str, str]):
+        """Obergruppen geändert: nur die Anordnung der Zeilen ändert sich"""
+        if self.live_summary is not None:
+            self.live_summary.set_super_group_mappings(super_group_mappings)
+            self._rebuild()
+
+    def move_account(self, account: str, group: Optional[str]):
+        """Verschiebt die Summe eines Sachkontos in seine neue Gruppe (nur betroffene Zeilen)"""
+        if self.live_summary is None:
+            return
+        change = self.live_summary.move_account(account, group)
+        if change is None:
+            return
+        for bwa_group in change:
+            self._update_group(bwa_group)
+        self._update_total()
+
+    # --- Tabelle ---
+
+    def _rebuild(self):
+        """Baut alle Zeilen neu auf (Zeitraumwechsel, neue Daten oder Obergruppen)"""
+        self.tree.clear()
+        self._super_items.clear()
+        self._group_items.clear()
+        if self.live_summary is not None:
+            for group in sorted(self.live_summary.group_cents):
+                self._update_group(group)
+        self._update_total()
+
+    def _update_group(self, group: str):
+        """Aktualisiert, ergänzt oder entfernt die Zeile einer BWA-Gruppe samt Obergruppe"""
+        summary = self.live_summary
+        super_group = summary.super_group_of(group)
+        item = self._group_items.get(group)
+
+        if group not in summary.group_cents:
+            if item is not None:
+                parent = item.parent()
+                parent.removeChild(item)
+                del self._group_items[group]
+                if parent.childCount() == 0:
+                    self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(parent))
+                    del self._super_items[super_group]
+        else:
+            if item is None:
+                parent = self._super_item(super_group)
+                item = QTreeWidgetItem([f"  • {group}", ""])
+                # Alphabetische Position wie in der PDF-Tabelle
+                names = [parent.child(i).data(0, Qt.ItemDataRole.UserRole) for i in range(parent.childCount())]
+                parent.insertChild(sum(name < group for name in names), item)
+                item.setData(0, Qt.ItemDataRole.UserRole, group)
+                self._group_items[group] = item
+            self._set_amount(item, summary.group_cents[group])
+
+        if super_group in self._super_items:
+            self._set_amount(self._super_items[super_group], summary.super_group_cents(super_group))
+
+    def _super_item(self, super_group: str) -> QTreeWidgetItem:
+        """Zeile einer Obergruppe (wird bei Bedarf alphabetisch eingefügt)"""
+        item = self._super_items.get(super_group)
+        if item is None:
+            item = QTreeWidgetItem([super_group, ""])
+            font = QFont()
+            font.setBold(True)
+            item.setFont(0, font)
+            item.setFont(1, font)
+            position = sum(name < super_group for name in self._super_items)
+            self.tree.insertTopLevelItem(position, item)
+            item.setExpanded(True)
+            self._super_items[super_group] = item
+        return item
+
+    def _set_amount(self, item: QTreeWidgetItem, cents: int):
+        item.setText(1, format_cents(cents))
+        item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        item.setForeground(1, NEGATIVE_COLOR if cents < 0 else self.palette().text().color())
+
+    def _update_total(self):
+        if self.live_summary is None:
+            self.total_label.setText("Keine Buchungen geladen")
+        else:
+            self.total_label.setText(f"Gesamt: {format_cents(self.live_summary.total_cents())}")
+
+    def rows(self):
+        """Angezeigte Zeilen als (Ebene, Name, Betrag)"""
+        result = []
+        for i in range(self.tree.topLevelItemCount()):
+            super_item = self.tree.topLevelItem(i)
+            result.append((0, super_item.text(0), super_item.text(1)))
+            for j in range(super_item.childCount()):
+                child = super_item.child(j)
+                result.append((1, child.data(0, Qt.ItemDataRole.UserRole), child.text(1)))
+        return result
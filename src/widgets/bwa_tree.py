@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+BWA-Struktur: Obergruppe → BWA-Gruppe → Sachkonto → Buchungen als aufklappbarer Baum
+
+Grundlage ist dieselbe detaillierte Zusammenfassung, die der Generator für die PDF-Tabellen
+baut. Kinder werden erst beim Aufklappen über canFetchMore/fetchMore angelegt, Buchungen
+stammen aus dem BookingIndex und werden in Blöcken nachgeladen.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QTreeView, QLabel, QHeaderView
+from PySide6.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PySide6.QtGui import QFont
+
+from ..utils.amounts import format_cents
+from ..utils.booking_index import BookingIndex
+from ..utils.bwa_summary import build_detailed_summary, UNASSIGNED_SUPER_GROUP
+from .period_selection import NEGATIVE_COLOR, create_period_combos, selected_period
+
+COLUMNS = ["Position", "Buchungen", "Buchungstag", "Buchungsnr.", "Betrag"]
+LABEL_COLUMN, COUNT_COLUMN, DATE_COLUMN, BOOKING_COLUMN, AMOUNT_COLUMN = range(len(COLUMNS))
+
+# Ebenen des Baums
+SUPER_GROUP, BWA_GROUP, ACCOUNT, BOOKING = range(4)
+
+# Buchungen, die je fetchMore unter einem Sachkonto angelegt werden
+FETCH_BATCH = 200
+
+
+class _Node:
+    """Knoten des Baums; 'pending' enthält die noch nicht angelegten Kinder"""
+
+    __slots__ = ('level', 'label', 'cents', 'count', 'parent', 'row', 'children', 'pending', 'key')
+
+    def __init__(self, level: int, label: str, cents: int = 0, count: int = 0,
+                 parent: Optional["_Node"] = None, row: int = 0, key=None):
+        self.level = level
+        self.label = label
+        self.cents = cents
+        self.count = count
+        self.parent = parent
+        self.row = row
+        self.key = key  # Gruppenname, Sachkontonummer oder Position der Buchung
+        self.children: List["_Node"] = []
+        self.pending = ()
+
+
+class BWATreeModel(QAbstractItemModel):
+    """Baummodell über der detaillierten Zusammenfassung eines Zeitraums"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.index_data: Optional[BookingIndex] = None
+        self.account_mappings: Dict[str, str] = {}
+        self.account_names: Dict[str, str] = {}
+        self.super_group_mappings: Dict[str, str] = {}
+        self.quarter: Optional[int] = None
+        self.quarter_mode = "cumulative"
+        self._summaries: Dict[Tuple, Dict] = {}
+        self._root = _Node(-1, "")
+
+    # --- Daten und Zeitraum ---
+
+    def set_ledger(self, data: Optional[pd.DataFrame]):
+        """Baut den Buchungsindex für neue Daten (einmal je Import)"""
+        self.index_data = BookingIndex(data) if data is not None and not data.empty else None
+        self._summaries.clear()
+        self._rebuild()
+
+    def set_mappings(self, account_mappings: Dict[str, str], account_names: Optional[Dict[str, str]] = None,
+                     super_group_mappings: Optional[Dict[str, str]] = None):
+        """Übernimmt Zuordnungen und Namen (Summen je Sachkonto bleiben gültig)"""
+        self.account_mappings = dict(account_mappings or {})
+        self.account_names = dict(account_names or {})
+        self.super_group_mappings = dict(super_group_mappings or {})
+        self._summaries.clear()
+        self._rebuild()
+
+    def set_period(self, quarter: Optional[int], quarter_mode: str = "cumulative"):
+        """Wechselt den Zeitraum (Quartal 1-4 oder None für das Jahr)"""
+        self.quarter = quarter
+        self.quarter_mode = quarter_mode
+        self._rebuild()
+
+    def summary(self) -> Optional[Dict]:
+        """Detaillierte Zusammenfassung des Zeitraums im Format des Generators (je Zeitraum zwischengespeichert)"""
+        if self.index_data is None:
+            return None
+        key = (self.quarter, self.quarter_mode if self.quarter is not None else None)
+        if key not in self._summaries:
+            account_cents = self.index_data.account_cents(self.quarter, self.quarter_mode)
+            self._summaries[key] = build_detailed_summary(account_cents, self.account_mappings, self.account_names)
+        return self._summaries[key]
+
+    def _rebuild(self):
+        """Legt nur die Obergruppen an; alles darunter entsteht beim Aufklappen"""
+        self.beginResetModel()
+        self._root = _Node(-1, "")
+        summary = self.summary()
+        if summary:
+            counts = self.index_data.account_counts(self.quarter, self.quarter_mode)
+            groups: Dict[str, List[Tuple[str, Dict]]] = {}
+            for bwa_group, accounts in summary['detailed_accounts'].items():
+                super_group = self.super_group_mappings.get(bwa_group, UNASSIGNED_SUPER_GROUP)
+                groups.setdefault(super_group, []).append((bwa_group, accounts))
+            # Reihenfolge wie in der PDF-Tabelle: Obergruppen und BWA-Gruppen alphabetisch
+            self._root.pending = [
+                (SUPER_GROUP, super_group, sorted(groups[super_group]), counts)
+                for super_group in sorted(groups)
+            ]
+        self.endResetModel()
+
+    def _create_child(self, parent: _Node, spec, row: int) -> _Node:
+        """Erzeugt einen Kindknoten aus einem vorgemerkten Eintrag"""
+        if parent.level == ACCOUNT:
+            position = int(spec)
+            return _Node(BOOKING, self.index_data.text('Verwendungszweck', position),
+                         int(self.index_data.cents[position]), parent=parent, row=row, key=position)
+
+        level = spec[0]
+        if level == SUPER_GROUP:
+            _, name, bwa_groups, counts = spec
+            node = _Node(SUPER_GROUP, name, parent=parent, row=row, key=name)
+            node.pending = [(BWA_GROUP, group, accounts, counts) for group, accounts in bwa_groups]
+            for _, _, accounts, _ in node.pending:
+                node.cents += sum(details['cents'] for details in accounts.values())
+                node.count += sum(counts.get(account, 0) for account in accounts)
+            return node
+        if level == BWA_GROUP:
+            _, name, accounts, counts = spec
+            node = _Node(BWA_GROUP, name, parent=parent, row=row, key=name)
+            # Sachkonten wie in der PDF-Tabelle nach Betrag (größte zuerst)
+            ordered = sorted(accounts.items(), key=lambda item: abs(item[1]['cents']), reverse=True)
+            node.pending = [(ACCOUNT, account, details, counts.get(account, 0)) for account, details in ordered]
+            node.cents = sum(details['cents'] for details in accounts.values())
+            node.count = sum(counts.get(account, 0) for account in accounts)
+            return node
+
+        _, account, details, count = spec
+        node = _Node(ACCOUNT, f"{account}: {details['name']}", details['cents'], count,
+                     parent=parent, row=row, key=account)
+        # Buchungen als Ausschnitt der Index-Sortierung (keine Suche im Journal)
+        node.pending = self.index_data.bookings(account, self.quarter, self.quarter_mode)
+        return node
+
+    # --- Qt-Schnittstelle ---
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if 0 <= row < len(node.children) and 0 <= column < len(COLUMNS):
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return len(COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()) -> bool:
+        node = self._node(parent)
+        return bool(node.children) or len(node.pending) > 0
+
+    def canFetchMore(self, parent) -> bool:
+        node = self._node(parent)
+        return len(node.children) < len(node.pending)
+
+    def fetchMore(self, parent):
+        """Legt die nächsten Kinder an (Buchungen blockweise, Gruppen vollständig)"""
+        node = self._node(parent)
+        start = len(node.children)
+        remaining = len(node.pending) - start
+        if remaining <= 0:
+            return
+        count = min(remaining, FETCH_BATCH) if node.level == ACCOUNT else remaining
+        self.beginInsertRows(parent, start, start + count - 1)
+        for row in range(start, start + count):
+            node.children.append(self._create_child(node, node.pending[row], row))
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._cell_text(node, column)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (COUNT_COLUMN, AMOUNT_COLUMN):
+            return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        if role == Qt.ItemDataRole.ForegroundRole and column == AMOUNT_COLUMN and node.cents < 0:
+            return NEGATIVE_COLOR
+        if role == Qt.ItemDataRole.FontRole and node.level in (SUPER_GROUP, BWA_GROUP):
+            font = QFont()
+            font.setBold(node.level == SUPER_GROUP)
+            return font
+        return None
+
+    def _cell_text(self, node: _Node, column: int) -> str:
+        """Formatiert eine Zelle erst bei Bedarf"""
+        if column == LABEL_COLUMN:
+            return node.label
+        if column == AMOUNT_COLUMN:
+            return format_cents(node.cents)
+        if node.level != BOOKING:
+            return f"{node.count:,}".replace(",", ".") if column == COUNT_COLUMN else ""
+        if column == DATE_COLUMN:
+            day = self.index_data.days[node.key]
+            return "" if np.isnat(day) else day.astype(object).strftime("%d.%m.%Y")
+        if column == BOOKING_COLUMN:
+            return self.index_data.text('Buchungsnr.', node.key)
+        return ""
+
+    def total_cents(self) -> int:
+        """Summe aller Obergruppen des Zeitraums"""
+        summary = self.summary()
+        if not summary:
+            return 0
+        return sum(summary['summary'].values())
+
+
+class BWATreeWidget(QWidget):
+    """Zeitraumauswahl und Baum der BWA-Struktur"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.model = BWATreeModel(self)
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialisiert Auswahl und Baum"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 10, 0, 0)
+
+        period_layout = QHBoxLayout()
+        self.period_combo, self.mode_combo = create_period_combos(self.apply_period)
+        period_layout.addWidget(self.period_combo)
+        period_layout.addWidget(self.mode_combo)
+        period_layout.addStretch()
+
+        self.total_label = QLabel()
+        self.total_label.setStyleSheet("color: #666666; font-size: 11px;")
+        period_layout.addWidget(self.total_label)
+        layout.addLayout(period_layout)
+
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.model)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setAlternatingRowColors(True)
+        header = self.tree_view.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(LABEL_COLUMN, QHeaderView.ResizeMode.Stretch)
+        for column, width in ((COUNT_COLUMN, 80), (DATE_COLUMN, 90), (BOOKING_COLUMN, 90), (AMOUNT_COLUMN, 110)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+            header.resizeSection(column, width)
+        layout.addWidget(self.tree_view)
+
+    def set_ledger(self, data: Optional[pd.DataFrame], account_mappings: Optional[Dict[str, str]] = None,
+                   account_names: Optional[Dict[str, str]] = None,
+                   super_group_mappings: Optional[Dict[str, str]] = None):
+        """Übernimmt Buchungen und Zuordnungen"""
+        self.model.set_ledger(data)
+        self.set_mappings(account_mappings or {}, account_names, super_group_mappings)
+
+    def set_mappings(self, account_mappings: Dict[str, str], account_names: Optional[Dict[str, str]] = None,
+                     super_group_mappings: Optional[Dict[str, str]] = None):
+        """Aktualisiert Zuordnungen ohne den Index neu zu bauen"""
+        self.model.set_mappings(account_mappings, account_names, super_group_mappings)
+        self.apply_period()
+
+    def clear(self):
+        """Entfernt alle Daten aus dem Baum"""
+        self.model.set_ledger(None)
+        self.total_label.clear()
+
+    def apply_period(self):
+        """Zeigt den gewählten Zeitraum an"""
+        self.model.set_period(*selected_period(self.period_combo, self.mode_combo))
+        if self.model.index_data is not None:
+            self.total_label.setText(f"Summe {format_cents(self.model.total_cents())}")
@@ -25,6 +25,12 @@ class FileDropArea(QFrame):
     # Signal wird ausgesendet wenn BWA generiert werden soll
     bwa_requested = Signal()
     
+    # Signal wird ausgesendet wenn Buchungsübersicht und BWA-Struktur ein- oder ausgeblendet werden sollen
+    details_requested = Signal()
+    
+    # Signal wird ausgesendet wenn die Entwurfsvorschau der BWA geöffnet werden soll
+    preview_requested = Signal()
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
@@ -73,7 +79,7 @@ class FileDropArea(QFrame):
         # Beschreibungstext
         self.desc_label = QLabel(
             "Unterstützte Formate: Excel (.xlsx, .xls), "
-            "LibreOffice Calc (.ods), CSV (.csv), JSON (.json)"
+            "LibreOffice Calc (.ods), CSV (.csv), JSON (.json, .json.gz)"
         )
         self.desc_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.desc_label.setWordWrap(True)
@@ -208,6 +214,52 @@ class FileDropArea(QFrame):
         """)
         self.file_info_layout.addWidget(self.bwa_button)
         
+        # Button für Buchungsübersicht und BWA-Struktur (immer vorhanden)
+        self.details_button = QPushButton("Details anzeigen")
+        self.details_button.setMinimumHeight(35)
+        self.details_button.clicked.connect(self.request_details)
+        self.details_button.setStyleSheet("""
+            QPushButton {
+                background-color: #607D8B;
+                border: none;
+                color: white;
+                padding: 8px 16px;
+                text-align: center;
+                font-size: 12px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #546E7A;
+            }
+            QPushButton:pressed {
+                background-color: #455A64;
+            }
+        """)
+        self.file_info_layout.addWidget(self.details_button)
+        
+        # Button für die Entwurfsvorschau der BWA (immer vorhanden)
+        self.preview_button = QPushButton("Vorschau (Entwurf)")
+        self.preview_button.setMinimumHeight(35)
+        self.preview_button.clicked.connect(self.request_preview)
+        self.preview_button.setStyleSheet("""
+            QPushButton {
+                background-color: #607D8B;
+                border: none;
+                color: white;
+                padding: 8px 16px;
+                text-align: center;
+                font-size: 12px;
+                border-radius: 5px;
+            }
+            QPushButton:hover {
+                background-color: #546E7A;
+            }
+            QPushButton:pressed {
+                background-color: #455A64;
+            }
+        """)
+        self.file_info_layout.addWidget(self.preview_button)
+        
         # Neue Datei Button (immer vorhanden)
         self.new_file_button = QPushButton("Neue Datei importieren")
         self.new_file_button.setMinimumHeight(35)
@@ -300,11 +352,11 @@ class FileDropArea(QFrame):
         file_dialog = QFileDialog(self)
         file_dialog.setWindowTitle("Datei auswählen")
         file_dialog.setNameFilter(
-            "Tabellendateien (*.xlsx *.xls *.ods *.csv *.json);;"
+            "Tabellendateien (*.xlsx *.xls *.ods *.csv *.json *.json.gz);;"
             "Excel-Dateien (*.xlsx *.xls);;"
             "LibreOffice Calc (*.ods);;"
             "CSV-Dateien (*.csv);;"
-            "JSON-Dateien (*.json);;"
+            "JSON-Dateien (*.json *.json.gz);;"
             "Alle Dateien (*.*)"
         )
         file_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
@@ -321,6 +373,8 @@ class FileDropArea(QFrame):
             return False
             
         supported_extensions = ['.xlsx', '.xls', '.ods', '.csv', '.json']
+        if file_path.lower().endswith('.json.gz'):
+            return True
         file_extension = os.path.splitext(file_path)[1].lower()
         return file_extension in supported_extensions
         
@@ -427,9 +481,22 @@ class FileDropArea(QFrame):
         """Sendet Signal für BWA-Generierung"""
         self.bwa_requested.emit()
         
+    def request_details(self):
+        """Sendet Signal für Buchungsübersicht und BWA-Struktur"""
+        self.details_requested.emit()
+        
+    def request_preview(self):
+        """Sendet Signal für die Entwurfsvorschau"""
+        self.preview_requested.emit()
+        
+    def set_details_visible(self, visible: bool):
+        """Passt die Beschriftung an die sichtbaren Details an"""
+        self.details_button.setText("Details ausblenden" if visible else "Details anzeigen")
+        
     def reset_to_default(self):
         """Setzt das Widget auf den Standard-Zustand zurück"""
         self.current_file = None
+        self.set_details_visible(False)
         
         # Datei-Info verstecken
         self.file_info_widget.hide()
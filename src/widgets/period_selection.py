@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsame Zeitraumauswahl (Quartal/Jahr, kumuliert/quartalsweise) und Farben der Betragsanzeige
+"""
+
+from typing import Callable, Optional, Tuple
+
+from PySide6.QtWidgets import QComboBox
+from PySide6.QtCore import QSettings
+from PySide6.QtGui import QColor
+
+# Zeiträume der Auswahl: (Beschriftung, Quartal oder None für das Jahr)
+PERIODS = [("1. Quartal", 1), ("2. Quartal", 2), ("3. Quartal", 3), ("4. Quartal", 4), ("Jahr", None)]
+
+NEGATIVE_COLOR = QColor("#c62828")
+
+
+def create_period_combos(on_change: Callable) -> Tuple[QComboBox, QComboBox]:
+    """
+    Erstellt Zeitraum- und Modusauswahl (Jahr vorausgewählt, Modus aus den Einstellungen)
+
+    Args:
+        on_change (Callable): Wird bei jeder Änderung einer der beiden Auswahlen aufgerufen
+
+    Returns:
+        Tuple[QComboBox, QComboBox]: (Zeitraum, Modus)
+    """
+    period_combo = QComboBox()
+    for label, quarter in PERIODS:
+        period_combo.addItem(label, quarter)
+    period_combo.setCurrentIndex(len(PERIODS) - 1)
+    period_combo.currentIndexChanged.connect(on_change)
+
+    mode_combo = QComboBox()
+    mode_combo.addItem("kumuliert", "cumulative")
+    mode_combo.addItem("quartalsweise", "quarterly")
+    quarter_mode = QSettings().value("quarter_mode", "cumulative")
+    mode_combo.setCurrentIndex(0 if quarter_mode == "cumulative" else 1)
+    mode_combo.currentIndexChanged.connect(on_change)
+    return period_combo, mode_combo
+
+
+def selected_period(period_combo: QComboBox, mode_combo: QComboBox) -> Tuple[Optional[int], str]:
+    """Gewähltes Quartal (None = Jahr) und Modus; der Modus ist nur für Quartale wählbar"""
+    quarter = period_combo.currentData()
+    mode_combo.setEnabled(quarter is not None)
+    return quarter, mode_combo.currentData()
@@ -7,6 +7,7 @@ CI-optimierter Test-Runner für GitHub Actions
 import sys
 import os
 import subprocess
+import tempfile
 import traceback
 from pathlib import Path
 
@@ -17,6 +18,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Umgebungssetup für CI
 os.environ['QT_QPA_PLATFORM'] = 'offscreen'
 os.environ['QT_LOGGING_RULES'] = 'qt.qpa.xcb.warning=false'
+os.environ['FINANZ_CACHE_DIR'] = os.path.join(tempfile.gettempdir(), 'finanzauswertung_tests')
 
 def run_test_safely(test_file):
     """
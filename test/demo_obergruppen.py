@@ -46,22 +46,22 @@ def create_demo_pdf():
     # BWA-Generator
     generator = BWAPDFGenerator()
     
-    # Demo-Daten für BWA-Tabelle
+    # Demo-Daten für BWA-Tabelle (Beträge in Cent)
     demo_summary = {
-        "Mitgliedsbeiträge": 8500.0,
-        "Spenden": 4200.0,
-        "Zuschüsse": 3000.0,
-        "Projektförderung": 5500.0,
-        "Bürokosten": -850.0,
-        "Miete": -1200.0,
-        "Telefon": -120.0,
-        "Internet": -80.0,
-        "Veranstaltungskosten": -2400.0,
-        "Material": -1100.0,
-        "Werbung": -450.0,
-        "Honorare": -3200.0,
-        "Reisekosten": -320.0,
-        "Versicherungen": -280.0
+        "Mitgliedsbeiträge": 850000,
+        "Spenden": 420000,
+        "Zuschüsse": 300000,
+        "Projektförderung": 550000,
+        "Bürokosten": -85000,
+        "Miete": -120000,
+        "Telefon": -12000,
+        "Internet": -8000,
+        "Veranstaltungskosten": -240000,
+        "Material": -110000,
+        "Werbung": -45000,
+        "Honorare": -320000,
+        "Reisekosten": -32000,
+        "Versicherungen": -28000
     }
     
     # BWA-Tabelle erstellen
@@ -9,6 +9,7 @@ import sys
 import subprocess
 import time
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -19,6 +20,8 @@ class FastTestRunner:
         self.test_dir = Path(__file__).parent
         self.project_root = self.test_dir.parent
         self.results = []
+        # Ledger-Cache und Bilder der Tests nicht im Benutzer-Cache ablegen
+        self.cache_dir = os.path.join(tempfile.gettempdir(), "finanzauswertung_tests")
         
     def get_safe_test_files(self) -> list:
         """Nur sichere, schnelle Tests"""
@@ -60,6 +63,7 @@ class FastTestRunner:
             
             env = os.environ.copy()
             env['PYTHONPATH'] = str(self.project_root)
+            env['FINANZ_CACHE_DIR'] = self.cache_dir
             
             result = subprocess.run(
                 [sys.executable, str(self.test_dir / test_file)],
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Referenz-Engine: die ursprüngliche zeilenweise Verarbeitung als Vergleichsmaßstab
+
+Enthält die bisherigen Implementierungen von normalize_account_number, _clean_amount,
+_parse_date, _get_quarter und _create_detailed_quarter_summary (Zeile für Zeile, ohne
+Vektorisierung oder Zwischenspeicher). Einzige Abweichung vom früheren Stand: Beträge
+werden je Buchung kaufmännisch auf ganze Cent gerundet und in Cent summiert, nicht
+endliche Werte ("nan", "inf") gelten als ungültig - so rechnet die Anwendung seit der
+Umstellung auf exakte Centbeträge.
+
+compare_engines() vergleicht jede bereinigte Zeile und jede Auswertung mit dem CSVProcessor.
+"""
+
+import json
+import math
+from datetime import datetime, date
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+CENT = Decimal('0.01')
+
+QUARTER_MODES = ('quarterly', 'cumulative')
+
+
+class ReferenceEngine:
+    """Zeilenweise Bereinigung und Auswertung wie vor den Optimierungen"""
+
+    def __init__(self, decimal_separator: str = ","):
+        self.decimal_separator = decimal_separator
+
+    def normalize_account_number(self, account_nr) -> str:
+        """Normalisiert eine Sachkontonummer zu einem String-Format"""
+        if pd.isna(account_nr):
+            return ""
+
+        # Zu String konvertieren und Whitespace entfernen
+        account_str = str(account_nr).strip()
+
+        # Prüfen ob es eine Zahl ist (auch Floats)
+        if account_str.replace('.', '').replace('-', '').isdigit():
+            try:
+                # Float zu Int zu String (entfernt .0 Endungen)
+                float_val = float(account_str)
+                if float_val.is_integer():
+                    return str(int(float_val))
+                else:
+                    return account_str  # Behalte Original wenn echte Dezimalzahl
+            except ValueError:
+                pass
+
+        return account_str
+
+    def clean_amount(self, amount_str) -> Optional[float]:
+        """Bereinigt Betragswerte"""
+        if pd.isna(amount_str) or amount_str == '':
+            return None
+
+        try:
+            # Euro-Zeichen und Leerzeichen entfernen
+            cleaned = str(amount_str).replace('€', '').replace(' ', '')
+
+            # Dezimaltrennzeichen standardisieren
+            if self.decimal_separator == ",":
+                # Deutsche Notation: 1.234,56 -> 1234.56
+                if ',' in cleaned and '.' in cleaned:
+                    # Beide Zeichen vorhanden, Punkt ist Tausendertrennzeichen
+                    cleaned = cleaned.replace('.', '').replace(',', '.')
+                elif ',' in cleaned:
+                    # Nur Komma vorhanden, ist Dezimaltrennzeichen
+                    cleaned = cleaned.replace(',', '.')
+            else:
+                # Englische Notation: 1,234.56 -> 1234.56
+                if ',' in cleaned and '.' in cleaned:
+                    # Beide Zeichen vorhanden, Komma ist Tausendertrennzeichen
+                    cleaned = cleaned.replace(',', '')
+
+            return float(cleaned)
+
+        except (ValueError, TypeError):
+            return None
+
+    def amount_cents(self, amount_str) -> Optional[int]:
+        """Bereinigter Betrag je Buchung auf ganze Cent gerundet (None wenn ungültig)"""
+        euros = self.clean_amount(amount_str)
+        if euros is None or not math.isfinite(euros):
+            return None
+        # Kürzeste Dezimaldarstellung des float entspricht dem bereinigten Text
+        return int(Decimal(repr(euros)).quantize(CENT, rounding=ROUND_HALF_UP) * 100)
+
+    def parse_date(self, date_str) -> Optional[date]:
+        """Parst Datumswerte"""
+        if pd.isna(date_str) or date_str == '':
+            return None
+
+        try:
+            # Verschiedene Datumsformate versuchen
+            formats = ['%Y.%m.%d', '%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y']
+
+            for fmt in formats:
+                try:
+                    return datetime.strptime(str(date_str).strip(), fmt).date()
+                except ValueError:
+                    continue
+
+            return None
+
+        except Exception:
+            return None
+
+    def get_quarter(self, date_obj: date) -> int:
+        """Bestimmt das Quartal für ein Datum"""
+        if date_obj is None:
+            return 0
+
+        month = date_obj.month
+        if month <= 3:
+            return 1
+        elif month <= 6:
+            return 2
+        elif month <= 9:
+            return 3
+        else:
+            return 4
+
+    def process(self, raw: pd.DataFrame) -> List[Dict]:
+        """
+        Bereinigt die Rohdaten Zeile für Zeile
+
+        Returns:
+            List[Dict]: gültige Buchungen mit 'index', 'account', 'cents', 'date' und 'quarter'
+        """
+        rows = []
+        for index, row in raw.iterrows():
+            account = self.normalize_account_number(row['Sachkontonr.'])
+            if pd.isna(row['Betrag']):
+                continue
+            cents = self.amount_cents(row['Betrag'])
+            booking_day = self.parse_date(row['Buchungstag'])
+            if cents is None or booking_day is None:
+                continue
+            rows.append({
+                'index': index,
+                'account': account,
+                'cents': cents,
+                'date': booking_day,
+                'quarter': self.get_quarter(booking_day),
+            })
+        return rows
+
+    def select_quarter(self, rows: List[Dict], quarter: int, quarter_mode: str) -> List[Dict]:
+        """Buchungen eines Quartals (quartalsweise) oder bis zum Quartalsende (kumuliert)"""
+        if quarter_mode == 'cumulative':
+            return [row for row in rows if row['quarter'] <= quarter]
+        return [row for row in rows if row['quarter'] == quarter]
+
+    def detailed_summary(self, rows: List[Dict], account_mappings: Dict[str, str],
+                         account_names: Optional[Dict[str, str]] = None) -> Dict:
+        """Detaillierte Zusammenfassung mit einzelnen Sachkonten (wie _create_detailed_quarter_summary)"""
+        summary = {}
+        detailed_accounts = {}
+
+        if account_names is None:
+            account_names = {}
+
+        # Gruppiert nach BWA-Gruppen und sammelt Sachkonto-Details
+        for row in rows:
+            account = str(row['account'])
+            cents = row['cents']
+
+            group = account_mappings.get(account, f"Nicht zugeordnet ({account})")
+            account_name = account_names.get(account, f"Sachkonto {account}")
+
+            # BWA-Gruppen-Summe
+            if group not in summary:
+                summary[group] = 0
+                detailed_accounts[group] = {}
+
+            summary[group] += cents
+
+            # Sachkonto-Details sammeln
+            if account not in detailed_accounts[group]:
+                detailed_accounts[group][account] = {
+                    'name': account_name,
+                    'cents': 0
+                }
+
+            detailed_accounts[group][account]['cents'] += cents
+
+        return {
+            'summary': summary,
+            'detailed_accounts': detailed_accounts
+        }
+
+
+def _canonical(value) -> str:
+    """Byte-genaue Darstellung einer Auswertung (inklusive Reihenfolge und Float-Darstellung)"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def compare_engines(raw: pd.DataFrame, decimal_separator: str, account_mappings: Dict[str, str],
+                    account_names: Optional[Dict[str, str]] = None, max_reports: int = 10) -> List[str]:
+    """
+    Verarbeitet dieselben Rohdaten mit Referenz-Engine und CSVProcessor und vergleicht alles
+
+    Das Dezimaltrennzeichen muss vorher in den Einstellungen stehen (liest der CSVProcessor).
+
+    Returns:
+        List[str]: Beschreibungen der Abweichungen (leer wenn identisch)
+    """
+    from src.utils.csv_processor import CSVProcessor
+    from src.utils.bwa_generator import BWAPDFGenerator
+
+    mismatches = []
+
+    def report(message):
+        if len(mismatches) < max_reports:
+            mismatches.append(message)
+        elif len(mismatches) == max_reports:
+            mismatches.append("... weitere Abweichungen ausgelassen")
+
+    reference = ReferenceEngine(decimal_separator)
+    expected = reference.process(raw)
+
+    processor = CSVProcessor()
+    processor.raw_data = raw.copy()
+    if not processor._process_data():
+        return ["CSVProcessor konnte die Rohdaten nicht verarbeiten"]
+    data = processor.processed_data
+
+    # Jede bereinigte Zeile
+    expected_index = [row['index'] for row in expected]
+    if list(data.index) != expected_index:
+        missing = sorted(set(expected_index) - set(data.index))[:5]
+        extra = sorted(set(data.index) - set(expected_index))[:5]
+        report(f"Zeilen unterscheiden sich: fehlend {missing}, zusätzlich {extra}")
+    else:
+        accounts = data['Sachkontonr.'].astype(str).tolist()
+        cents = data['Betrag_Cent'].tolist()
+        euros = data['Betrag_Clean'].tolist()
+        dates = [value.date() for value in data['Buchungstag_Clean']]
+        quarters = data['Quartal'].tolist()
+        for i, row in enumerate(expected):
+            actual = (accounts[i], int(cents[i]), dates[i], int(quarters[i]))
+            wanted = (row['account'], row['cents'], row['date'], row['quarter'])
+            if actual != wanted or euros[i] != row['cents'] / 100:
+                raw_row = raw.loc[row['index'], ['Sachkontonr.', 'Betrag', 'Buchungstag']].tolist()
+                report(f"Zeile {row['index']} {raw_row!r}: erwartet {wanted}, erhalten {actual}")
+
+    # Jede Auswertung (Jahr und alle Quartale in beiden Modi)
+    generator = BWAPDFGenerator()
+    periods = [("Jahr", expected, processor.get_year_data())]
+    for quarter_mode in QUARTER_MODES:
+        for quarter in range(1, 5):
+            selected = (processor.get_data_by_quarter_cumulative(quarter) if quarter_mode == 'cumulative'
+                        else processor.get_data_by_quarter_individual(quarter))
+            periods.append((f"Q{quarter} ({quarter_mode})",
+                            reference.select_quarter(expected, quarter, quarter_mode), selected))
+
+    for name, rows, selected in periods:
+        wanted = _canonical(reference.detailed_summary(rows, account_mappings, account_names))
+        actual = _canonical(generator._create_detailed_quarter_summary(selected, account_mappings, account_names))
+        if wanted != actual:
+            report(f"Auswertung {name} weicht ab:\n   erwartet {wanted[:300]}\n   erhalten {actual[:300]}")
+
+    return mismatches
@@ -11,6 +11,7 @@ import sys
 import subprocess
 import time
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -24,6 +25,8 @@ class TestRunner:
         self.test_dir = Path(__file__).parent
         self.project_root = self.test_dir.parent
         self.results = []
+        # Ledger-Cache und Bilder der Tests nicht im Benutzer-Cache ablegen
+        self.cache_dir = os.path.join(tempfile.gettempdir(), "finanzauswertung_tests")
         self.coverage_enabled = self._check_coverage_available()
         
     def _check_coverage_available(self) -> bool:
@@ -46,6 +49,7 @@ class TestRunner:
             # Umgebungsvariablen für Python-Pfad setzen
             env = os.environ.copy()
             env['PYTHONPATH'] = str(self.project_root)
+            env['FINANZ_CACHE_DIR'] = self.cache_dir
             
             result = subprocess.run(
                 [sys.executable, test_file],
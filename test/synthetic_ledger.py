@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Deterministischer Generator für synthetische Buchungslisten (Benchmarks und Lasttests)
+"""
+
+import contextlib
+import io
+import os
+import random
+import shutil
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import pandas as pd
+
+# Unterstützte Betragsformate (wie sie in Importdateien vorkommen)
+AMOUNT_FORMATS = ('german', 'german_thousands', 'euro_sign', 'english', 'numeric', 'mixed')
+
+# Unterstützte Dateiformate
+FILE_FORMATS = ('csv', 'xlsx', 'ods', 'json')
+
+# Dezimaltrennzeichen, mit dem ein Betragsformat importiert werden muss
+DECIMAL_SEPARATORS = {
+    'german': ',', 'german_thousands': ',', 'euro_sign': ',', 'mixed': ',',
+    'english': '.', 'numeric': '.',
+}
+
+PURPOSES = ['Mitgliedsbeitrag', 'Spende', 'Übungsleiterpauschale', 'Hallenmiete', 'Sportgeräte',
+            'Fahrtkosten', 'Startgebühr', 'Vereinsfeier', 'Versicherung', 'Bankgebühren']
+
+
+def _format_amount(cents: int, amount_format: str):
+    """Formatiert einen Cent-Betrag im angegebenen Format"""
+    if amount_format == 'numeric':
+        return cents / 100
+
+    sign = '-' if cents < 0 else ''
+    euros, rest = divmod(abs(cents), 100)
+    if amount_format == 'german':
+        return f"{sign}{euros},{rest:02d}"
+    if amount_format == 'german_thousands':
+        return f"{sign}{euros:,}".replace(',', '.') + f",{rest:02d}"
+    if amount_format == 'euro_sign':
+        return f"{sign}{euros:,}".replace(',', '.') + f",{rest:02d} €"
+    if amount_format == 'english':
+        return f"{sign}{euros:,}.{rest:02d}"
+    raise ValueError(f"Unbekanntes Betragsformat: {amount_format}")
+
+
+def generate_ledger(rows: int = 10000, accounts: int = 50, date_spread_days: int = 365,
+                    amount_format: str = 'mixed', seed: int = 42, year: int = 2024) -> pd.DataFrame:
+    """
+    Erzeugt eine Buchungsliste mit den Spalten einer Bankexport-Datei
+
+    Args:
+        rows (int): Anzahl Buchungen
+        accounts (int): Anzahl unterschiedlicher Sachkonten
+        date_spread_days (int): Buchungstage verteilen sich auf die ersten n Tage des Jahres
+        amount_format (str): Betragsformat (siehe AMOUNT_FORMATS, 'mixed' = deutsche Varianten gemischt)
+        seed (int): Startwert - gleiche Parameter ergeben immer dieselbe Buchungsliste
+        year (int): Geschäftsjahr
+
+    Returns:
+        pd.DataFrame: Buchungsliste (Beträge als Text bzw. Zahl je nach Format)
+    """
+    if amount_format not in AMOUNT_FORMATS:
+        raise ValueError(f"Unbekanntes Betragsformat: {amount_format}")
+
+    rng = random.Random(seed)
+    account_numbers = [str(1000 + i * 10) for i in range(accounts)]
+    account_names = {number: f"{PURPOSES[i % len(PURPOSES)]} {i // len(PURPOSES) + 1}"
+                     for i, number in enumerate(account_numbers)}
+    start = date(year, 1, 1)
+    spread = max(1, min(date_spread_days, 365))
+    german_formats = ('german', 'german_thousands', 'euro_sign')
+
+    records = []
+    for i in range(rows):
+        account = account_numbers[rng.randrange(accounts)]
+        cents = rng.randint(-250000, 250000)
+        booking_day = start + timedelta(days=rng.randrange(spread))
+        fmt = german_formats[i % 3] if amount_format == 'mixed' else amount_format
+        records.append({
+            'Buchungsnr.': f"B{year % 100:02d}{i:06d}",
+            'Sachkontonr.': account,
+            'Sachkonto': account_names[account],
+            'Buchungstag': booking_day.strftime('%d.%m.%Y'),
+            'Verwendungszweck': f"{PURPOSES[rng.randrange(len(PURPOSES))]} {i}",
+            'Betrag': _format_amount(cents, fmt),
+        })
+    return pd.DataFrame(records)
+
+
+# Schwierige Schreibweisen für den Vergleich von Referenz- und optimierter Verarbeitung
+ADVERSARIAL_AMOUNTS = [
+    "1.234,56", "1234,56", "-12,5", "12.345", "1,234.56", "€ 12,00", "12,00 €", "1 234,56", "  7,1 ",
+    "1,005", "0,001", "-0,00", "1.234.567,89", "12.", ",5", "+3,20", "1e3", "nan", "inf", "abc", "",
+    None, float('nan'), 12.5, 7, -0.015, 1e-7, "12,345.678", "--5", "5-",
+]
+ADVERSARIAL_ACCOUNTS = [
+    "4000", 4000, 4000.0, "4000.0", " 4000 ", "4000.5", "-4000", "04000", "A-100", "1.000.0",
+    "4e3", "", None, float('nan'), 8400, "8400.00", "08400", "8400 ",
+]
+ADVERSARIAL_DATES = [
+    "05.01.2024", "2024-01-05", "2024.01.05", "05/01/2024", "01/31/2024", "5.1.2024", " 05.01.2024 ",
+    "31.02.2024", "2024-13-01", "29.02.2024", "", None, float('nan'), "05.01.24", "2024/01/05",
+    datetime(2024, 3, 31), pd.Timestamp("2024-07-01"), "1.10.2024", "31.12.2024", "30.09.2024",
+]
+
+
+def generate_adversarial_ledger(rows: int = 2000, seed: int = 7) -> pd.DataFrame:
+    """
+    Erzeugt eine Buchungsliste mit ungewöhnlichen und fehlerhaften Schreibweisen
+
+    Gemischte Dezimalnotationen, Euro-Zeichen, Sachkontonummern als Gleitkommazahl
+    und ungültige oder exotische Datumsformate (Spalten mit gemischten Typen).
+    """
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    records = []
+    for i in range(rows):
+        # Überwiegend gültige Werte, damit die Auswertungen nicht leer bleiben
+        if rng.random() < 0.6:
+            cents = rng.randint(-500000, 500000)
+            amount = _format_amount(cents, rng.choice(('german', 'german_thousands', 'euro_sign')))
+        else:
+            amount = rng.choice(ADVERSARIAL_AMOUNTS)
+        if rng.random() < 0.6:
+            booking_day = (start + timedelta(days=rng.randrange(366))).strftime('%d.%m.%Y')
+        else:
+            booking_day = rng.choice(ADVERSARIAL_DATES)
+        records.append({
+            'Sachkontonr.': rng.choice(ADVERSARIAL_ACCOUNTS),
+            'Sachkonto': f"Konto {i % 9}",
+            'Buchungstag': booking_day,
+            'Verwendungszweck': f"{PURPOSES[rng.randrange(len(PURPOSES))]} B{240000 + i}",
+            'Betrag': amount,
+        })
+    return pd.DataFrame(records, dtype=object)
+
+
+def write_ledger(df: pd.DataFrame, file_path: str, file_format: Optional[str] = None) -> str:
+    """
+    Schreibt eine Buchungsliste im gewünschten Dateiformat
+
+    JSON-Dateien werden wie in der Anwendung über Import und JSON-Export erzeugt
+    (erfordert eine laufende Qt-Anwendung für QSettings).
+
+    Returns:
+        str: Pfad der geschriebenen Datei
+    """
+    file_format = file_format or os.path.splitext(file_path)[1].lstrip('.').lower()
+    if file_format == 'csv':
+        df.to_csv(file_path, sep=';', index=False)
+    elif file_format == 'xlsx':
+        df.to_excel(file_path, index=False, engine='openpyxl')
+    elif file_format == 'ods':
+        df.to_excel(file_path, index=False, engine='odf')
+    elif file_format == 'json':
+        _write_json_export(df, file_path)
+    else:
+        raise ValueError(f"Unbekanntes Dateiformat: {file_format}")
+    return file_path
+
+
+def process_ledger(df: pd.DataFrame):
+    """
+    Verarbeitet eine Buchungsliste wie beim Import, aber ohne Datei
+
+    Erfordert eine laufende Qt-Anwendung (QSettings) und das zum Betragsformat passende
+    Dezimaltrennzeichen in den Einstellungen.
+
+    Returns:
+        CSVProcessor: Prozessor mit verarbeitetem Buchungsjournal (processed_data)
+    """
+    from src.utils.csv_processor import CSVProcessor
+
+    processor = CSVProcessor()
+    processor.raw_data = df
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not processor._process_data():
+            raise ValueError("Synthetische Buchungsliste konnte nicht verarbeitet werden")
+    return processor
+
+
+def _write_json_export(df: pd.DataFrame, file_path: str):
+    """Erzeugt einen JSON-Export der Buchungsliste über CSVProcessor und BWA-Generator"""
+    from PySide6.QtCore import QSettings
+    from src.utils.csv_processor import CSVProcessor
+    from src.utils.bwa_generator import BWAPDFGenerator
+
+    settings = QSettings()
+    previous = {key: settings.value(key) for key in ("json_export_compact", "json_export_gzip")}
+    settings.setValue("json_export_compact", False)
+    settings.setValue("json_export_gzip", False)
+    directory = tempfile.mkdtemp()
+    try:
+        csv_path = write_ledger(df, os.path.join(directory, "ledger.csv"))
+        processor = CSVProcessor()
+        if not processor.load_file(csv_path):
+            raise ValueError("Synthetische Buchungsliste konnte nicht importiert werden")
+        mappings = {account: f"Gruppe {int(account) % 7}" for account in processor.get_account_numbers()}
+        if not BWAPDFGenerator()._generate_json_export(os.path.join(directory, "ledger.pdf"), processor, mappings):
+            raise ValueError("JSON-Export der Buchungsliste fehlgeschlagen")
+        shutil.move(os.path.join(directory, "ledger.json"), file_path)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+        for key, value in previous.items():
+            if value is None:
+                settings.remove(key)
+            else:
+                settings.setValue(key, value)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der gemeinsamen Normalisierung von Sachkontonummern
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.account_numbers import normalize_account_number, normalize_account_numbers
+
+
+def legacy_normalize(account_nr) -> str:
+    """Bisherige Implementierung (je Zeile)"""
+    if pd.isna(account_nr):
+        return ""
+    account_str = str(account_nr).strip()
+    if account_str.replace('.', '').replace('-', '').isdigit():
+        try:
+            float_val = float(account_str)
+            if float_val.is_integer():
+                return str(int(float_val))
+            else:
+                return account_str
+        except ValueError:
+            pass
+    return account_str
+
+
+SAMPLES = [
+    '4000', ' 4000 ', 4000, 4000.0, '4000.0', '4000.5', 4000.5, '-12', '0400',
+    '1.2.3', 'AB12', 'Kasse', '', '   ', None, np.nan, 1e3, '12-34', np.int64(7),
+]
+
+
+def check_equivalence():
+    """Gleiches Ergebnis wie die bisherige Implementierung"""
+    for value in SAMPLES:
+        assert normalize_account_number(value) == legacy_normalize(value), repr(value)
+
+    series = pd.Series(SAMPLES * 3, index=range(100, 100 + 3 * len(SAMPLES)), dtype=object)
+    result = normalize_account_numbers(series)
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert list(result.index) == list(series.index)
+    assert result.astype(str).tolist() == [legacy_normalize(v) for v in series]
+
+    # Gleiche Nummern aus verschiedenen Rohwerten teilen sich eine Kategorie
+    assert list(result.cat.categories).count('4000') == 1
+
+    # Listen werden ebenfalls akzeptiert
+    assert normalize_account_numbers(['1000.0', 1000, None]).tolist() == ['1000', '1000', '']
+    return True
+
+
+def check_scaling(rows=200000, accounts=300):
+    """Aufwand hängt von der Anzahl unterschiedlicher Sachkonten ab, nicht von den Zeilen"""
+    series = pd.Series([float(4000 + i % accounts) for i in range(rows)])
+
+    start = time.perf_counter()
+    expected = series.apply(legacy_normalize)
+    apply_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = normalize_account_numbers(series)
+    vector_time = time.perf_counter() - start
+
+    assert result.astype(str).tolist() == expected.tolist()
+    print(f"⏱️  {rows} Zeilen, {accounts} Sachkonten: apply {apply_time:.3f}s, "
+          f"vektorisiert {vector_time:.3f}s")
+    assert vector_time < apply_time
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Normalisierung von Sachkontonummern ===")
+    results = []
+    try:
+        results.append(("Gleiches Verhalten", check_equivalence()))
+        results.append(("Skalierung", check_scaling()))
+    except AssertionError as e:
+        print(f"❌ Test fehlgeschlagen: {e}")
+        results.append(("Normalisierung", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Sachkonten-Stammdaten (Dimensionstabelle) des CSV-Processors
+"""
+
+import sys
+import os
+import time
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor, ACCOUNT_NAME_COLUMNS
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+
+def legacy_account_name(data, account_number):
+    """Bisherige Namensermittlung (ein Durchlauf je Namensspalte)"""
+    for col in ACCOUNT_NAME_COLUMNS:
+        if col in data.columns:
+            matching_rows = data[data['Sachkontonr.'] == account_number]
+            if not matching_rows.empty:
+                name = matching_rows[col].iloc[0]
+                if pd.notna(name) and str(name).strip():
+                    return str(name).strip()
+    return None
+
+
+def create_csv(file_path, rows=20000, accounts=150):
+    """Buchungsliste mit Namen in verschiedenen Spalten (übrige Spalten aus der synthetischen Buchungsliste)"""
+    df = generate_ledger(rows, accounts=accounts, amount_format='german', seed=35)
+    numbers = [4000 + i % accounts for i in range(rows)]
+    df['Sachkontonr.'] = [f"{n}.0" if i % 7 == 0 else str(n) for i, n in enumerate(numbers)]
+    # Erste Buchung von Konto 4001 hat keinen Namen in 'Sachkonto'
+    df['Sachkonto'] = ['' if n == 4001 or n % 10 == 9 else f"Konto {n}" for n in numbers]
+    df['Bezeichnung'] = [f"Bez {n}" if n % 10 != 9 else '' for n in numbers]
+    write_ledger(df, file_path)
+
+
+def check_table(processor):
+    """Inhalt der Stammdaten entspricht den Buchungen"""
+    data = processor.processed_data
+    table = processor.get_account_table()
+
+    assert table.index.tolist() == sorted(data['Sachkontonr.'].astype(str).unique())
+    assert list(table.columns) == ['Name_Import', 'Name_Benutzer', 'Buchungen',
+                                   'Erste_Buchung', 'Letzte_Buchung', 'Summe_Cent']
+
+    for account in ['4000', '4001', '4009', '4123']:
+        rows = data[data['Sachkontonr.'] == account]
+        assert table.at[account, 'Name_Import'] == legacy_account_name(data, account), account
+        assert table.at[account, 'Buchungen'] == len(rows)
+        assert table.at[account, 'Summe_Cent'] == rows['Betrag_Cent'].sum()
+        assert table.at[account, 'Erste_Buchung'] == rows['Buchungstag_Clean'].min()
+        assert table.at[account, 'Letzte_Buchung'] == rows['Buchungstag_Clean'].max()
+
+    assert processor.get_account_name('4001') == 'Bez 4001'
+    assert processor.get_account_name('4009') is None
+    assert processor.get_account_name('9999') is None
+    assert '4009' not in processor.get_all_account_names()
+    assert table['Buchungen'].sum() == len(data)
+    return True
+
+
+def check_user_names(processor):
+    """Benutzer-Namen aus den Einstellungen überschreiben die Import-Bezeichnung"""
+    settings = QSettings()
+    settings.setValue("account_names/4002", "Eigener Name")
+    try:
+        processor.refresh_user_account_names()
+        assert processor.get_account_display_name('4002') == 'Eigener Name'
+        assert processor.get_account_display_name('4003') == 'Konto 4003'
+        # Import-Bezeichnung bleibt unverändert
+        assert processor.get_account_name('4002') == 'Konto 4002'
+    finally:
+        settings.remove("account_names/4002")
+    processor.refresh_user_account_names()
+    assert processor.get_account_display_name('4002') == 'Konto 4002'
+    return True
+
+
+def check_direct_assignment():
+    """Direkt gesetzte Daten (ohne Import) erzeugen eigene Stammdaten"""
+    processor = CSVProcessor()
+    assert processor.get_account_numbers() == []
+    processor.processed_data = pd.DataFrame({
+        'Sachkontonr.': ['2000', '1000', '2000'],
+        'Sachkonto': ['Kasse', 'Bank', 'Kasse'],
+        'Betrag_Clean': [1.5, -2.25, 3.0],
+        'Quartal': [1, 2, 3],
+    })
+    assert processor.get_account_numbers() == ['1000', '2000']
+    assert processor.get_all_account_names() == {'1000': 'Bank', '2000': 'Kasse'}
+    assert processor.get_account_table().at['2000', 'Summe_Cent'] == 450
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Sachkonten-Stammdaten ===")
+    with isolated_settings({"decimal_separator": ",", "csv_separator": ";"}, ("account_names",)):
+        temp_dir = tempfile.mkdtemp()
+        results = []
+        try:
+            file_path = os.path.join(temp_dir, 'buchungen.csv')
+            create_csv(file_path)
+            processor = CSVProcessor()
+            assert processor.load_file(file_path)
+
+            start = time.perf_counter()
+            legacy = {acc: legacy_account_name(processor.processed_data, acc)
+                      for acc in processor.get_account_numbers()}
+            legacy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            names = processor.get_all_account_names()
+            table_time = time.perf_counter() - start
+            assert names == {acc: name for acc, name in legacy.items() if name}
+            print(f"⏱️  Alle Kontonamen: bisher {legacy_time:.3f}s, Stammdaten {table_time:.4f}s")
+
+            results.append(("Stammdaten", check_table(processor)))
+            results.append(("Benutzer-Namen", check_user_names(processor)))
+            results.append(("Direkt gesetzte Daten", check_direct_assignment()))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Sachkonten-Stammdaten", False))
+        finally:
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
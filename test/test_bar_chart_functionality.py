@@ -132,11 +132,11 @@ class TestBarChartFunctionality(unittest.TestCase):
             generator = BWAPDFGenerator()
             generator.settings = self.settings
             
-            # Test-Daten für Summary erstellen (korrekte Struktur: Dict[str, float])
+            # Test-Daten für Summary erstellen (korrekte Struktur: Dict[str, int] in Cent)
             summary = {
-                'Einnahmen': 1500.50,
-                'Spenden': 2200.00,
-                'Verwaltungskosten': -800.75
+                'Einnahmen': 150050,
+                'Spenden': 220000,
+                'Verwaltungskosten': -80075
             }
             
             # Balkendiagramm erstellen
@@ -170,8 +170,8 @@ class TestBarChartFunctionality(unittest.TestCase):
             
             # Test-Daten
             summary = {
-                'Einnahmen': 1500.50,
-                'Ausgaben': -800.75
+                'Einnahmen': 150050,
+                'Ausgaben': -80075
             }
             
             # Prüfen ob Chart-Setting korrekt ausgelesen wird
@@ -192,7 +192,7 @@ class TestBarChartFunctionality(unittest.TestCase):
             generator = BWAPDFGenerator()
             generator.settings = self.settings
             
-            # Leere Summary testen (korrekte Struktur: Dict[str, float])
+            # Leere Summary testen (korrekte Struktur: Dict[str, int] in Cent)
             empty_summary = {}
             chart = generator._create_supergroup_bar_chart(empty_summary, "Q1")
             
@@ -213,10 +213,10 @@ class TestBarChartFunctionality(unittest.TestCase):
             generator = BWAPDFGenerator()
             generator.settings = self.settings
             
-            # Test-Daten (korrekte Struktur: Dict[str, float])
+            # Test-Daten (korrekte Struktur: Dict[str, int] in Cent)
             summary = {
-                'Spenden': 1500.00,        # Positiv
-                'Reisekosten': -300.50     # Negativ
+                'Spenden': 150000,        # Positiv
+                'Reisekosten': -30050     # Negativ
             }
             
             # Chart erstellen
@@ -244,11 +244,11 @@ class TestBarChartFunctionality(unittest.TestCase):
             generator = BWAPDFGenerator()
             generator.settings = self.settings
             
-            # Test-Summary direkt erstellen (korrekte Struktur: Dict[str, float])
+            # Test-Summary direkt erstellen (korrekte Struktur: Dict[str, int] in Cent)
             summary = {
-                'Einnahmen': 1500.50,
-                'Spenden': 2200.00,
-                'Verwaltungskosten': -800.75
+                'Einnahmen': 150050,
+                'Spenden': 220000,
+                'Verwaltungskosten': -80075
             }
             
             # Account mappings für Generator setzen
@@ -278,11 +278,11 @@ class TestBarChartFunctionality(unittest.TestCase):
             generator = BWAPDFGenerator()
             generator.settings = self.settings
             
-            # Test-Summary (korrekte Struktur: Dict[str, float])
+            # Test-Summary (korrekte Struktur: Dict[str, int] in Cent)
             # Diese Daten repräsentieren bereits aggregierte Obergruppen-Werte
             summary = {
-                'Erträge': 3000.00,        # Summe aus Einnahmen + Spenden
-                'Ausgaben': -500.00        # Verwaltungskosten
+                'Erträge': 300000,        # Summe aus Einnahmen + Spenden
+                'Ausgaben': -50000        # Verwaltungskosten
             }
             
             # Chart erstellen
@@ -318,10 +318,10 @@ class TestBarChartFunctionality(unittest.TestCase):
             generator = BWAPDFGenerator()
             generator.settings = self.settings
             
-            # Test-Summary (korrekte Struktur: Dict[str, float])
+            # Test-Summary (korrekte Struktur: Dict[str, int] in Cent)
             summary = {
-                'Sehr sehr sehr lange Obergruppe für Erträge und Einnahmen': 1000.00,
-                'Ausgaben': -500.00
+                'Sehr sehr sehr lange Obergruppe für Erträge und Einnahmen': 100000,
+                'Ausgaben': -50000
             }
             
             # Chart erstellen
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark-Suite mit synthetischen Buchungslisten (Import, Auswertung, PDF und JSON-Export)
+
+Jede Stufe wird einzeln gemessen (beste von BENCHMARK_REPEAT Wiederholungen) und mit
+test/benchmark_baseline.json verglichen. Stufen, die um mehr als BENCHMARK_THRESHOLD
+(relativ, nach Abgleich der Rechnergeschwindigkeit) langsamer sind, lassen den Test fehlschlagen.
+Zusätzlich müssen die Ergebnisse mit der zeilenweisen Referenz-Engine übereinstimmen.
+
+Umgebungsvariablen:
+    BENCHMARK_ROWS, BENCHMARK_ACCOUNTS, BENCHMARK_SPREAD, BENCHMARK_AMOUNT_FORMAT,
+    BENCHMARK_FORMATS (z.B. "csv,json"), BENCHMARK_WORKBOOK_ROWS (Zeilen für .xlsx/.ods)
+    BENCHMARK_REPEAT (Standard 3), BENCHMARK_THRESHOLD (Standard 0.5 = 50 %)
+    BENCHMARK_UPDATE_BASELINE=1  Ergebnis als neue Baseline speichern
+    BENCHMARK_OUTPUT=<Pfad>      Ergebnis zusätzlich als JSON-Datei schreiben
+"""
+
+import sys
+import os
+import json
+import time
+import random
+import platform
+import tempfile
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.file_handler import FileHandler
+from src.utils.bwa_generator import BWAPDFGenerator
+from test_helpers import isolated_settings
+from synthetic_ledger import (generate_ledger, generate_adversarial_ledger, write_ledger,
+                              DECIMAL_SEPARATORS, FILE_FORMATS)
+from reference_engine import compare_engines
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+# Stufen unter dieser Dauer (Sekunden) gelten nie als Regression (Messrauschen)
+MIN_REGRESSION_SECONDS = 0.02
+
+# Von den Benchmarks gesetzte Einstellungen
+SETTING_KEYS = ("decimal_separator", "json_export", "json_export_compact", "json_export_gzip",
+                "generate_account_reports", "generate_quarterly_reports", "generate_chart_report",
+                "quarter_mode")
+
+
+def load_profile() -> Dict:
+    """Benchmark-Profil aus Umgebungsvariablen (mit Standardwerten)"""
+    formats = os.environ.get("BENCHMARK_FORMATS", ",".join(FILE_FORMATS))
+    return {
+        "rows": int(os.environ.get("BENCHMARK_ROWS", 10000)),
+        "accounts": int(os.environ.get("BENCHMARK_ACCOUNTS", 40)),
+        "date_spread_days": int(os.environ.get("BENCHMARK_SPREAD", 365)),
+        "amount_format": os.environ.get("BENCHMARK_AMOUNT_FORMAT", "mixed"),
+        "formats": [fmt.strip() for fmt in formats.split(",") if fmt.strip()],
+        "workbook_rows": int(os.environ.get("BENCHMARK_WORKBOOK_ROWS", 2000)),
+        "seed": 42,
+    }
+
+
+def best_of(repeat: int, action: Callable, setup: Callable = None) -> float:
+    """Beste Laufzeit von 'repeat' Durchläufen (setup wird nicht mitgemessen)"""
+    best = None
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        action(argument) if setup else action()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def calibrate(repeat: int) -> float:
+    """Feste Rechenlast zum Abgleich unterschiedlich schneller Rechner"""
+    def workload():
+        rng = random.Random(1)
+        values = [rng.random() for _ in range(200000)]
+        sorted(values)
+        sum(i * i for i in range(300000))
+    return best_of(repeat, workload)
+
+
+def run_benchmarks(profile: Dict, repeat: int, directory: str) -> Dict[str, float]:
+    """Misst alle Stufen und gibt {Stufe: Sekunden} zurück"""
+    stages = {}
+    settings = QSettings()
+    settings.setValue("decimal_separator", DECIMAL_SEPARATORS[profile["amount_format"]])
+
+    ledger = generate_ledger(profile["rows"], profile["accounts"], profile["date_spread_days"],
+                             profile["amount_format"], profile["seed"])
+    workbook_ledger = ledger.head(profile["workbook_rows"])
+
+    # Datei lesen je Format
+    handler = FileHandler()
+    raw_data = None
+    for fmt in profile["formats"]:
+        source = workbook_ledger if fmt in ('xlsx', 'ods') else ledger
+        path = write_ledger(source, os.path.join(directory, f"buchungen.{fmt}"), fmt)
+        if fmt == 'json':
+            stages["json.import"] = best_of(repeat, lambda: CSVProcessor().load_file(path))
+            continue
+
+        def read(path=path):
+            handler.process_file(path)
+            handler.close_session()
+        stages[f"datei.{fmt}"] = best_of(repeat, read)
+        if fmt == 'csv':
+            raw_data = handler.process_file(path)
+
+    if raw_data is None:
+        raw_data = ledger.copy()
+
+    # Verarbeitung der Rohdaten (mit Messwerten der einzelnen Import-Stufen)
+    processor = CSVProcessor()
+
+    def prepare():
+        processor.raw_data = raw_data.copy()
+        return processor
+
+    def process(p):
+        assert p._process_data(), "Verarbeitung der synthetischen Buchungsliste fehlgeschlagen"
+        for name, metrics in p.get_import_metrics().items():
+            key = f"verarbeitung.{name}"
+            stages[key] = min(stages.get(key, metrics.seconds), metrics.seconds)
+    stages["verarbeitung"] = best_of(repeat, process, prepare)
+
+    # Auswertungen
+    generator = BWAPDFGenerator()
+    mappings = {account: f"Gruppe {int(account) % 7}" for account in processor.get_account_numbers()}
+    stages["auswertung.jahr"] = best_of(repeat, lambda: generator._create_detailed_year_summary(
+        processor.get_year_data(), mappings))
+    stages["auswertung.quartale"] = best_of(repeat, lambda: [
+        generator._create_detailed_quarter_summary(processor.get_data_by_quarter(q), mappings) for q in range(1, 5)])
+    stages["auswertung.sachkonten"] = best_of(repeat, lambda: generator._sum_cents_by_account(
+        processor.get_year_data()))
+    stages["auswertung.stammdaten"] = best_of(repeat, lambda: processor._build_account_table(processor.processed_data))
+
+    # PDF je Abschnitt (beste Laufzeit je Abschnitt)
+    settings.setValue("json_export", False)
+    for name in ("generate_account_reports", "generate_quarterly_reports", "generate_chart_report"):
+        settings.setValue(name, True)
+    pdf_path = os.path.join(directory, "bwa.pdf")
+    total = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        assert generator.generate_bwa_pdf(pdf_path, processor, mappings), "PDF-Erstellung fehlgeschlagen"
+        elapsed = time.perf_counter() - start
+        total = elapsed if total is None else min(total, elapsed)
+        for name, seconds in generator.section_timings.items():
+            key = f"pdf.{name}"
+            stages[key] = min(stages.get(key, seconds), seconds)
+    stages["pdf.gesamt"] = total
+
+    # JSON-Export
+    settings.setValue("json_export_compact", False)
+    settings.setValue("json_export_gzip", False)
+    stages["json.export"] = best_of(repeat, lambda: generator._generate_json_export(pdf_path, processor, mappings))
+    return stages
+
+
+def check_equivalence(profile: Dict) -> bool:
+    """Benchmark-Buchungsliste und ungewöhnliche Schreibweisen gegen die Referenz-Engine"""
+    decimal_separator = DECIMAL_SEPARATORS[profile["amount_format"]]
+    ledgers = [
+        ("Benchmark-Buchungsliste", generate_ledger(profile["rows"], profile["accounts"], profile["date_spread_days"],
+                                                    profile["amount_format"], profile["seed"])),
+        ("Ungewöhnliche Schreibweisen", generate_adversarial_ledger(2000, profile["seed"])),
+    ]
+    QSettings().setValue("decimal_separator", decimal_separator)
+    mappings = {str(1000 + i * 10): f"Gruppe {i % 7}" for i in range(profile["accounts"])}
+    passed = True
+    for name, ledger in ledgers:
+        start = time.perf_counter()
+        mismatches = compare_engines(ledger, decimal_separator, mappings)
+        print(f"{'✅' if not mismatches else '❌'} Referenz-Engine, {name}: {len(mismatches)} Abweichungen "
+              f"({time.perf_counter() - start:.1f}s)")
+        for mismatch in mismatches:
+            print(f"   {mismatch}")
+        passed &= not mismatches
+    return passed
+
+
+def compare(result: Dict, baseline: Dict, threshold: float) -> list:
+    """Liste der Stufen, die gegenüber der Baseline zu langsam sind"""
+    scale = result["calibration"] / baseline["calibration"] if baseline.get("calibration") else 1.0
+    print(f"⚖️  Rechnerfaktor gegenüber Baseline: {scale:.2f}")
+    regressions = []
+    for name, seconds in result["stages"].items():
+        reference = baseline["stages"].get(name)
+        if reference is None:
+            continue
+        limit = reference * scale * (1 + threshold) + MIN_REGRESSION_SECONDS
+        marker = "❌" if seconds > limit else "  "
+        print(f"{marker} {name:<28} {seconds * 1000:9.1f} ms  (Baseline {reference * scale * 1000:9.1f} ms)")
+        if seconds > limit:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    """Führt die Benchmarks aus"""
+    print("=== Benchmark-Suite: synthetische Buchungslisten ===")
+    profile = load_profile()
+    repeat = int(os.environ.get("BENCHMARK_REPEAT", 3))
+    threshold = float(os.environ.get("BENCHMARK_THRESHOLD", 0.5))
+    print(f"Profil: {profile}")
+
+    results = []
+    with isolated_settings(keys=SETTING_KEYS):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                result = {
+                    "profile": profile,
+                    "calibration": round(calibrate(repeat), 6),
+                    "stages": {name: round(seconds, 6)
+                               for name, seconds in run_benchmarks(profile, repeat, directory).items()},
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                }
+            results.append(("Benchmarks ausgeführt", True))
+            results.append(("Referenz-Engine identisch", check_equivalence(profile)))
+        except AssertionError as e:
+            print(f"❌ Benchmark fehlgeschlagen: {e}")
+            results.append(("Benchmarks ausgeführt", False))
+            result = None
+
+    if result is not None:
+        output = os.environ.get("BENCHMARK_OUTPUT")
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+
+        if os.environ.get("BENCHMARK_UPDATE_BASELINE") == "1":
+            with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+                f.write("\n")
+            print(f"💾 Baseline gespeichert: {BASELINE_PATH}")
+        elif os.path.exists(BASELINE_PATH):
+            with open(BASELINE_PATH, encoding='utf-8') as f:
+                baseline = json.load(f)
+            if baseline.get("profile") != profile:
+                print("⚠️ Profil weicht von der Baseline ab - kein Vergleich")
+                for name, seconds in result["stages"].items():
+                    print(f"   {name:<28} {seconds * 1000:9.1f} ms")
+            else:
+                regressions = compare(result, baseline, threshold)
+                results.append((f"Keine Regression über {threshold:.0%}", not regressions))
+        else:
+            print("⚠️ Keine Baseline vorhanden (BENCHMARK_UPDATE_BASELINE=1 zum Anlegen)")
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Buchungsübersicht (virtuelles Tabellenmodell mit Sortierung und Filtern)
+
+Umgebungsvariablen:
+    BOOKING_TABLE_ROWS (Standard 1000000) für den Lasttest
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+import contextlib
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import Qt
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.widgets.booking_table import (BookingTableModel, BookingBrowser, DATE_COLUMN, ACCOUNT_COLUMN,
+                                       NAME_COLUMN, PURPOSE_COLUMN, AMOUNT_COLUMN)
+from src.utils.csv_processor import CSVProcessor
+from synthetic_ledger import generate_ledger, process_ledger, write_ledger
+from test_helpers import isolated_settings
+
+# Zeitgrenzen für eine Million Buchungen (Sekunden)
+FILTER_LIMIT = 1.0
+SORT_LIMIT = 2.0
+
+
+def create_csv(file_path):
+    """Kleine Buchungsliste mit bekannten Werten"""
+    write_ledger(pd.DataFrame({
+        'Sachkontonr.': ['4000', '8400', '4000', '6000', '8400'],
+        'Sachkonto': ['Beiträge', 'Spenden', 'Beiträge', 'Miete', 'Spenden'],
+        'Buchungsnr.': ['B-3', 'B-1', 'B-5', 'B-2', 'B-4'],
+        'Betrag': ['120,00', '1.500,50', '-30,25', '-800,00', '75,00'],
+        'Buchungstag': ['15.01.2024', '03.05.2024', '20.02.2024', '01.10.2024', '24.12.2024'],
+        'Verwendungszweck': ['Jahresbeitrag Müller', 'Spende Sommerfest', 'Rückerstattung Müller',
+                             'Miete Vereinsheim', 'Weihnachtsspende'],
+    }), file_path)
+
+
+def column(model, column_index):
+    """Alle angezeigten Texte einer Spalte"""
+    return [model.cell_text(row, column_index) for row in range(model.rowCount())]
+
+
+def test_small_ledger(directory):
+    """Formatierung, Sortierung und Filter an bekannten Buchungen"""
+    csv_path = os.path.join(directory, "buchungen.csv")
+    create_csv(csv_path)
+    processor = CSVProcessor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert processor.load_file(csv_path)
+
+    model = BookingTableModel()
+    model.set_ledger(processor.processed_data, processor.get_all_account_names())
+    assert model.rowCount() == 5 and model.columnCount() == 6
+
+    # Zellen werden wie im Bericht formatiert
+    assert model.cell_text(1, DATE_COLUMN) == "03.05.2024"
+    assert model.cell_text(1, AMOUNT_COLUMN) == "1.500,50 €"
+    assert model.cell_text(1, NAME_COLUMN) == "Spenden"
+    index = model.index(2, AMOUNT_COLUMN)
+    assert model.data(index, Qt.ItemDataRole.ForegroundRole) is not None, "Negativer Betrag nicht markiert"
+
+    # Sortierung nach Datum, Betrag und Text (ohne Groß-/Kleinschreibung)
+    model.sort(DATE_COLUMN, Qt.SortOrder.AscendingOrder)
+    assert column(model, DATE_COLUMN) == ["15.01.2024", "20.02.2024", "03.05.2024", "01.10.2024", "24.12.2024"]
+    model.sort(AMOUNT_COLUMN, Qt.SortOrder.DescendingOrder)
+    assert column(model, AMOUNT_COLUMN)[0] == "1.500,50 €" and column(model, AMOUNT_COLUMN)[-1] == "-800,00 €"
+    model.sort(PURPOSE_COLUMN, Qt.SortOrder.AscendingOrder)
+    assert column(model, PURPOSE_COLUMN)[0] == "Jahresbeitrag Müller"
+
+    # Filter einzeln und kombiniert
+    model.set_filter(account="4000")
+    assert model.visible_count() == 2 and set(column(model, ACCOUNT_COLUMN)) == {"4000"}
+    model.set_filter(quarter=2)
+    assert column(model, AMOUNT_COLUMN) == ["1.500,50 €"]
+    model.set_filter(min_cents=-5000, max_cents=10000)
+    assert sorted(column(model, AMOUNT_COLUMN)) == ["-30,25 €", "75,00 €"]
+    model.set_filter(text="müller")
+    assert model.visible_count() == 2
+    model.set_filter(text="SPENDEN")  # Bezeichnung des Sachkontos
+    assert model.visible_count() == 2
+    model.set_filter(account="4000", text="rück")
+    assert column(model, AMOUNT_COLUMN) == ["-30,25 €"] and model.visible_cents() == -3025
+    assert model.source_index(0) in processor.processed_data.index
+    model.set_filter(account="9999")
+    assert model.visible_count() == 0
+
+    # Filter bleibt beim Umsortieren erhalten
+    model.set_filter(quarter=4)
+    model.sort(DATE_COLUMN, Qt.SortOrder.DescendingOrder)
+    assert column(model, DATE_COLUMN) == ["24.12.2024", "01.10.2024"]
+    model.set_filter()
+    assert model.visible_count() == 5 and model.visible_cents() == 86525
+    return True
+
+
+def test_browser_widget(directory):
+    """Filterleiste überträgt Auswahl und Eingaben auf das Modell"""
+    csv_path = os.path.join(directory, "buchungen.csv")
+    processor = CSVProcessor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert processor.load_file(csv_path)
+
+    browser = BookingBrowser()
+    browser.set_ledger(processor.processed_data, processor.get_all_account_names())
+    assert browser.account_combo.count() == 4
+    assert "5 Buchungen" in browser.status_label.text()
+
+    browser.account_combo.setCurrentIndex(browser.account_combo.findData("8400"))
+    assert browser.model.visible_count() == 2
+    browser.min_amount_edit.setText("100,00")
+    browser.apply_filter()
+    assert browser.model.visible_count() == 1
+    assert "1 von 5 Buchungen" in browser.status_label.text()
+
+    # Ungültige Beträge werden ignoriert
+    browser.min_amount_edit.setText("abc")
+    browser.apply_filter()
+    assert browser.model.visible_count() == 2
+
+    # Neue Daten setzen alle Filter zurück
+    browser.set_ledger(processor.processed_data, processor.get_all_account_names())
+    assert browser.model.visible_count() == 5 and browser.min_amount_edit.text() == ""
+    browser.clear()
+    assert browser.model.rowCount() == 0
+    browser.deleteLater()
+
+    # Hauptfenster: Übersicht wird erst beim Einblenden gefüllt und beim Zurücksetzen geleert
+    from src.main_window import MainWindow
+    window = MainWindow()
+    window.csv_processor = processor
+    assert window.detail_tabs.isHidden()
+    window.toggle_details()
+    assert not window.detail_tabs.isHidden() and window.booking_browser.model.rowCount() == 5
+    assert window.file_drop_area.details_button.text() == "Details ausblenden"
+    window.reset_csv_data()
+    assert window.detail_tabs.isHidden() and window.booking_browser.model.rowCount() == 0
+    assert window.file_drop_area.details_button.text() == "Details anzeigen"
+    window.deleteLater()
+    return True
+
+
+def test_large_ledger(rows):
+    """Filtern und Sortieren bleiben bei einer Million Buchungen flüssig"""
+    ledger = generate_ledger(rows, accounts=200, amount_format='german', seed=46)
+    # Wiederkehrende Verwendungszwecke wie in echten Buchungslisten (höchstens 5000 verschiedene)
+    ledger['Verwendungszweck'] = [f"{purpose.rsplit(' ', 1)[0]} {i % 500}"
+                                  for i, purpose in enumerate(ledger['Verwendungszweck'])]
+    processor = process_ledger(ledger)
+    data = processor.processed_data
+    account = processor.get_account_numbers()[100]
+    browser = BookingBrowser()
+    browser.resize(900, 600)
+    browser.show()
+
+    start = time.perf_counter()
+    browser.set_ledger(data)
+    load_time = time.perf_counter() - start
+    model = browser.model
+
+    timings = {}
+    start = time.perf_counter()
+    model.set_filter(account=account, quarter=3, min_cents=0)
+    timings["Filter Sachkonto/Quartal/Betrag"] = time.perf_counter() - start
+    expected = int(((data['Sachkontonr.'] == account) & (data['Quartal'] == 3) & (data['Betrag_Cent'] >= 0)).sum())
+    assert 0 < model.visible_count() == expected
+
+    start = time.perf_counter()
+    model.set_filter(text="spende 123")
+    timings["Textsuche"] = time.perf_counter() - start
+    expected = int(data['Verwendungszweck'].str.lower().str.contains("spende 123", regex=False).sum())
+    assert 0 < model.visible_count() == expected
+
+    model.set_filter()
+    for name, column_index in (("Sortierung Betrag", AMOUNT_COLUMN), ("Sortierung Verwendungszweck", PURPOSE_COLUMN)):
+        start = time.perf_counter()
+        model.sort(column_index, Qt.SortOrder.AscendingOrder)
+        timings[name] = time.perf_counter() - start
+    start = time.perf_counter()
+    model.sort(AMOUNT_COLUMN, Qt.SortOrder.DescendingOrder)
+    timings["Sortierung erneut"] = time.perf_counter() - start
+    assert int(model._cents[model._rows[0]]) == int(data['Betrag_Cent'].max())
+
+    # Scrollen formatiert nur die sichtbaren Zeilen
+    start = time.perf_counter()
+    for row in range(0, rows, max(1, rows // 50)):
+        browser.table_view.scrollTo(model.index(row, 0))
+        app.processEvents()
+    scroll_time = time.perf_counter() - start
+
+    print(f"   {rows} Buchungen übernommen in {load_time:.2f}s, 50 Scrollsprünge in {scroll_time:.2f}s")
+    for name, seconds in timings.items():
+        print(f"   {name}: {seconds * 1000:.0f} ms")
+    browser.deleteLater()
+
+    assert timings["Filter Sachkonto/Quartal/Betrag"] < FILTER_LIMIT
+    assert timings["Textsuche"] < FILTER_LIMIT
+    assert max(timings["Sortierung Betrag"], timings["Sortierung Verwendungszweck"]) < SORT_LIMIT
+    assert timings["Sortierung erneut"] < 0.2, "Sortierindex wurde nicht wiederverwendet"
+    assert scroll_time < 5.0
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Buchungsübersicht ===")
+    rows = int(os.environ.get("BOOKING_TABLE_ROWS", 1000000))
+
+    results = []
+    with isolated_settings({"decimal_separator": ","}):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                results.append(("Kleine Buchungsliste", test_small_ledger(directory)))
+                results.append(("Filterleiste", test_browser_widget(directory)))
+                results.append((f"{rows} Buchungen", test_large_ledger(rows)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Buchungsübersicht", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Live-BWA-Vorschau bei der Sachkonten-Zuordnung
+
+Umgebungsvariablen:
+    BWA_PREVIEW_ROWS (Standard 1000000) für die Laufzeit der Aktualisierungen
+"""
+
+import sys
+import os
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.utils.booking_index import BookingIndex
+from src.utils.live_summary import LiveSummary
+from src.widgets.bwa_preview_panel import BWAPreviewPanel
+from synthetic_ledger import generate_ledger, process_ledger
+from test_helpers import isolated_settings
+
+# Vom BWA-Gruppen Tab gespeicherte Zuordnungen
+SETTING_KEYS = ("account_mappings", "account_names")
+
+GROUPS = ["Spenden", "Mitgliedsbeiträge", "Verwaltungskosten", "Projektkosten", "Miete"]
+SUPER_GROUPS = {"Spenden": "Einnahmen", "Mitgliedsbeiträge": "Einnahmen",
+                "Verwaltungskosten": "Ausgaben", "Miete": "Ausgaben"}
+
+PERIODS = [(None, "cumulative")] + [(quarter, mode) for mode in ("cumulative", "quarterly") for quarter in range(1, 5)]
+
+# Eine Aktualisierung soll innerhalb eines Frames (60 Hz) sichtbar sein
+FRAME_SECONDS = 1 / 60
+
+
+def load_processor(rows, seed=8, accounts=40):
+    """Verarbeitete synthetische Buchungsliste"""
+    return process_ledger(generate_ledger(rows, accounts=accounts, amount_format='german', seed=seed))
+
+
+def period_data(processor, quarter, mode):
+    if quarter is None:
+        return processor.get_year_data()
+    if mode == "cumulative":
+        return processor.get_data_by_quarter_cumulative(quarter)
+    return processor.get_data_by_quarter_individual(quarter)
+
+
+def test_incremental_summary():
+    """Verschobene Sachkonten ergeben dieselben Summen wie eine Neuberechnung im Generator"""
+    processor = load_processor(5000)
+    accounts = processor.get_account_numbers()
+    generator = BWAPDFGenerator()
+    rng = random.Random(1)
+
+    mappings = {account: rng.choice(GROUPS) for account in accounts[::2]}
+    summary = LiveSummary.from_index(BookingIndex(processor.processed_data), mappings, SUPER_GROUPS)
+    for quarter, mode in PERIODS:
+        summary.set_period(quarter, mode)
+        for _ in range(40):
+            account = rng.choice(accounts)
+            group = rng.choice(GROUPS + [None])
+            summary.move_account(account, group)
+            if group:
+                mappings[account] = group
+            else:
+                mappings.pop(account, None)
+        expected = generator._create_quarter_summary(period_data(processor, quarter, mode), mappings)
+        assert summary.summary() == expected, f"Summen {quarter}/{mode} weichen ab"
+        assert summary.account_mappings == mappings
+
+    # Verschieben ändert nur die beteiligten Gruppen
+    summary.set_period(None)
+    account = accounts[0]
+    summary.move_account(account, "Spenden")
+    before = dict(summary.group_cents)
+    assert summary.move_account(account, "Spenden") is None
+    old, new = summary.move_account(account, "Miete")
+    assert (old, new) == ("Spenden", "Miete")
+    changed = {group for group in set(before) | set(summary.group_cents)
+               if before.get(group) != summary.group_cents.get(group)}
+    assert changed <= {"Spenden", "Miete"}
+    print(f"   {len(PERIODS)} Zeiträume mit je 40 Verschiebungen identisch")
+    return True
+
+
+def test_panel(rows):
+    """Vorschau aktualisiert nur betroffene Zeilen und bleibt unter einem Frame"""
+    processor = load_processor(rows, seed=9, accounts=200)
+    accounts = processor.get_account_numbers()
+    mappings = {account: GROUPS[i % len(GROUPS)] for i, account in enumerate(accounts[:150])}
+
+    panel = BWAPreviewPanel()
+    start = time.perf_counter()
+    panel.set_ledger(processor.processed_data, mappings, SUPER_GROUPS)
+    load_time = time.perf_counter() - start
+    panel.show()
+    app.processEvents()
+
+    rows_before = panel.rows()
+    assert rows_before[0][:2] == (0, "Ausgaben")
+    untouched = panel._group_items["Projektkosten"]
+
+    # Einzelne Verschiebung: unbeteiligte Zeilen bleiben dieselben Objekte
+    panel.move_account(accounts[0], "Miete")
+    assert panel._group_items["Projektkosten"] is untouched
+
+    rng = random.Random(2)
+    timings = []
+    for _ in range(300):
+        account = rng.choice(accounts)
+        group = rng.choice(GROUPS + ["Neue Gruppe", None])
+        start = time.perf_counter()
+        panel.move_account(account, group)
+        app.processEvents()
+        timings.append(time.perf_counter() - start)
+
+    # Inkrementeller Stand entspricht einem kompletten Neuaufbau
+    incremental = panel.rows()
+    panel._rebuild()
+    assert incremental == panel.rows(), "Inkrementelle Vorschau weicht vom Neuaufbau ab"
+    total = int(processor.processed_data['Betrag_Cent'].sum())
+    assert panel.live_summary.total_cents() == total
+
+    # Zeitraumwechsel aus den vorab summierten Sachkonten
+    start = time.perf_counter()
+    panel.period_combo.setCurrentIndex(0)
+    app.processEvents()
+    switch_time = time.perf_counter() - start
+
+    timings.sort()
+    print(f"   {rows} Buchungen: Vorschau in {load_time * 1000:.0f} ms, Verschiebung Median "
+          f"{timings[len(timings) // 2] * 1000:.2f} ms, Maximum {timings[-1] * 1000:.2f} ms, "
+          f"Zeitraumwechsel {switch_time * 1000:.1f} ms")
+    panel.deleteLater()
+    assert timings[int(len(timings) * 0.95)] < FRAME_SECONDS, "Aktualisierung länger als ein Frame"
+    assert switch_time < 0.1
+    return True
+
+
+def test_mapping_tab():
+    """Speichern und Löschen einer Zuordnung im BWA-Gruppen Tab aktualisiert die Vorschau"""
+    from src.settings.account_mapping import AccountMappingTab
+
+    processor = load_processor(2000, seed=10, accounts=6)
+    accounts = processor.get_account_numbers()
+    tab = AccountMappingTab()
+    tab.account_mappings = {}
+    tab.update_accounts_from_csv(accounts, normalized=True)
+    tab.set_preview_data(processor.processed_data, {"Spenden": "Einnahmen"})
+    assert all(name.startswith("Nicht zugeordnet") for _, name, _ in tab.preview_panel.rows())
+
+    tab.accounts_list.setCurrentRow(0)
+    tab.group_input.setText("Spenden")
+    tab.save_current_mapping()
+    rows = tab.preview_panel.rows()
+    assert (0, "Einnahmen") == rows[0][:2] and rows[1][1] == "Spenden"
+
+    tab.clear_current_mapping()
+    assert "Spenden" not in [name for _, name, _ in tab.preview_panel.rows()]
+
+    tab.set_preview_data(None)
+    assert tab.preview_panel.rows() == [] and tab.preview_panel.live_summary is None
+    tab.deleteLater()
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Live-BWA-Vorschau ===")
+    rows = int(os.environ.get("BWA_PREVIEW_ROWS", 1000000))
+
+    results = []
+    with isolated_settings({"decimal_separator": ","}, SETTING_KEYS):
+        try:
+            results.append(("Inkrementelle Summen", test_incremental_summary()))
+            results.append((f"Vorschau mit {rows} Buchungen", test_panel(rows)))
+            results.append(("BWA-Gruppen Tab", test_mapping_tab()))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Live-Vorschau", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
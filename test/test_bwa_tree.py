@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der BWA-Struktur (Baum mit nachgeladenen Ebenen und Buchungsindex)
+
+Umgebungsvariablen:
+    BWA_TREE_ROWS (Standard 1000000) für den Zeitraumwechsel unter Last
+"""
+
+import sys
+import os
+import json
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QModelIndex
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.widgets.bwa_tree import (BWATreeModel, BWATreeWidget, FETCH_BATCH, SUPER_GROUP, BWA_GROUP,
+                                  ACCOUNT, BOOKING, DATE_COLUMN, AMOUNT_COLUMN)
+from synthetic_ledger import generate_ledger, process_ledger
+from test_helpers import isolated_settings
+
+PERIODS = [(None, "cumulative")] + [(quarter, mode) for mode in ("cumulative", "quarterly") for quarter in range(1, 5)]
+
+# Zeitgrenze für einen Zeitraumwechsel bei einer Million Buchungen (Sekunden)
+SWITCH_LIMIT = 0.1
+
+
+def load_processor(rows, seed=3, accounts=25):
+    """Verarbeitete synthetische Buchungsliste"""
+    return process_ledger(generate_ledger(rows, accounts=accounts, amount_format='german', seed=seed))
+
+
+def mappings_for(processor):
+    """Sachkonten auf vier BWA-Gruppen, davon drei in Obergruppen (eine bleibt unzugeordnet)"""
+    groups = ["Einnahmen", "Ausgaben", "Personal", "Sonstiges"]
+    accounts = processor.get_account_numbers()
+    account_mappings = {account: groups[i % len(groups)] for i, account in enumerate(accounts[:-2])}
+    super_groups = {"Einnahmen": "Ertrag", "Ausgaben": "Aufwand", "Personal": "Aufwand"}
+    return account_mappings, super_groups
+
+
+def period_data(processor, quarter, mode):
+    """Buchungen eines Zeitraums wie bei der PDF-Erstellung"""
+    if quarter is None:
+        return processor.get_year_data()
+    if mode == "cumulative":
+        return processor.get_data_by_quarter_cumulative(quarter)
+    return processor.get_data_by_quarter_individual(quarter)
+
+
+def children(model, parent=QModelIndex()):
+    """Lädt alle Kinder eines Knotens und gibt die Indizes zurück"""
+    while model.canFetchMore(parent):
+        model.fetchMore(parent)
+    return [model.index(row, 0, parent) for row in range(model.rowCount(parent))]
+
+
+def test_summary_equivalence():
+    """Zusammenfassungen aus dem Index sind identisch mit denen des Generators"""
+    processor = load_processor(4000)
+    account_mappings, super_groups = mappings_for(processor)
+    names = {"4000": "Mitgliedsbeiträge"}
+    generator = BWAPDFGenerator()
+
+    model = BWATreeModel()
+    model.set_ledger(processor.processed_data)
+    model.set_mappings(account_mappings, names, super_groups)
+    for quarter, mode in PERIODS:
+        model.set_period(quarter, mode)
+        data = period_data(processor, quarter, mode)
+        expected = json.dumps(generator._create_detailed_quarter_summary(data, account_mappings, names))
+        actual = json.dumps(model.summary())
+        assert actual == expected, f"Zusammenfassung {quarter}/{mode} weicht ab"
+
+        # Buchungen je Sachkonto: dieselben Zeilen, nach Buchungstag sortiert
+        index = model.index_data
+        for account in index.accounts[:5]:
+            positions = index.bookings(account, quarter, mode)
+            rows = data[data['Sachkontonr.'] == account]
+            assert sorted(processor.processed_data.index[positions]) == sorted(rows.index)
+            assert np.all(np.diff(index.days[positions].view(np.int64)) >= 0)
+    print(f"   {len(PERIODS)} Zeiträume identisch")
+    return True
+
+
+def test_lazy_tree():
+    """Ebenen werden erst beim Aufklappen angelegt, Buchungen blockweise"""
+    processor = load_processor(3000, seed=4, accounts=3)
+    _, super_groups = mappings_for(processor)
+    account_mappings = {account: "Einnahmen" for account in processor.get_account_numbers()}
+    model = BWATreeModel()
+    model.set_ledger(processor.processed_data)
+    model.set_mappings(account_mappings, {}, super_groups)
+    model.set_period(None)
+
+    # Vor dem Aufklappen existieren keine Knoten
+    root = QModelIndex()
+    assert model.rowCount(root) == 0 and model.hasChildren(root) and model.canFetchMore(root)
+
+    super_indexes = children(model)
+    assert [model.data(index) for index in super_indexes] == ["Ertrag"]
+    super_index = super_indexes[0]
+    assert super_index.internalPointer().level == SUPER_GROUP
+    assert model.rowCount(super_index) == 0 and model.hasChildren(super_index)
+
+    group_index = children(model, super_index)[0]
+    assert group_index.internalPointer().level == BWA_GROUP and model.parent(group_index) == super_index
+    account_indexes = children(model, group_index)
+    assert len(account_indexes) == 3
+    assert all(index.internalPointer().level == ACCOUNT for index in account_indexes)
+
+    # Sachkonten nach Betrag sortiert (größte zuerst) und Summen stimmen
+    amounts = [abs(index.internalPointer().cents) for index in account_indexes]
+    assert amounts == sorted(amounts, reverse=True)
+    total = int(processor.processed_data['Betrag_Cent'].sum())
+    assert super_index.internalPointer().cents == total == model.total_cents()
+    assert super_index.internalPointer().count == 3000
+
+    # Buchungen werden blockweise nachgeladen
+    account_index = account_indexes[0]
+    account = account_index.internalPointer()
+    assert model.canFetchMore(account_index)
+    model.fetchMore(account_index)
+    assert model.rowCount(account_index) == min(FETCH_BATCH, account.count)
+    bookings = children(model, account_index)
+    assert len(bookings) == account.count
+    leaf = bookings[0]
+    assert leaf.internalPointer().level == BOOKING and not model.hasChildren(leaf)
+    assert sum(index.internalPointer().cents for index in bookings) == account.cents
+    day = model.data(model.index(0, DATE_COLUMN, account_index))
+    assert len(day) == 10 and day[2] == "."
+    assert model.data(model.index(0, AMOUNT_COLUMN, account_index)).endswith(" €")
+    return True
+
+
+def test_period_switch(rows):
+    """Zeitraumwechsel ohne neuen Durchlauf über die Buchungen"""
+    processor = load_processor(rows, seed=5, accounts=200)
+    account_mappings, super_groups = mappings_for(processor)
+
+    widget = BWATreeWidget()
+    start = time.perf_counter()
+    widget.set_ledger(processor.processed_data, account_mappings, {}, super_groups)
+    build_time = time.perf_counter() - start
+    widget.show()
+
+    switch_times = []
+    for index in range(widget.period_combo.count()):
+        for mode_index in (0, 1):
+            start = time.perf_counter()
+            widget.mode_combo.setCurrentIndex(mode_index)
+            widget.period_combo.setCurrentIndex(index)
+            app.processEvents()
+            switch_times.append(time.perf_counter() - start)
+
+    # Buchungen eines Sachkontos aufklappen ohne Suche im Journal
+    model = widget.model
+    super_index = children(model)[0]
+    group_index = children(model, super_index)[0]
+    account_index = children(model, group_index)[0]
+    start = time.perf_counter()
+    for index in (super_index, group_index, account_index):
+        widget.tree_view.expand(index)
+    app.processEvents()
+    expand_time = time.perf_counter() - start
+    assert model.rowCount(account_index) > 0
+
+    # Neue Zuordnung verwendet den vorhandenen Index
+    index_before = model.index_data
+    widget.set_mappings({}, {}, {})
+    assert model.index_data is index_before
+    assert [model.data(index) for index in children(model)] == ["Nicht zugeordnet"]
+
+    print(f"   {rows} Buchungen: Index {build_time:.2f}s, Zeitraumwechsel max. "
+          f"{max(switch_times) * 1000:.0f} ms, Aufklappen {expand_time * 1000:.0f} ms")
+    widget.deleteLater()
+    assert max(switch_times) < SWITCH_LIMIT, f"Zeitraumwechsel zu langsam: {max(switch_times):.3f}s"
+    assert expand_time < SWITCH_LIMIT
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: BWA-Struktur ===")
+    rows = int(os.environ.get("BWA_TREE_ROWS", 1000000))
+
+    results = []
+    with isolated_settings({"decimal_separator": ","}):
+        try:
+            results.append(("Zusammenfassung wie Generator", test_summary_equivalence()))
+            results.append(("Nachladen beim Aufklappen", test_lazy_tree()))
+            results.append((f"Zeitraumwechsel mit {rows} Buchungen", test_period_switch(rows)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("BWA-Struktur", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
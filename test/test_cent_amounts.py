@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der exakten Betragsrechnung in ganzen Cent
+"""
+
+import sys
+import os
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.amounts import parse_amount_cents, parse_amounts_cents, to_cents, amount_cents
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from test_helpers import isolated_settings
+
+
+def check_parsing():
+    """Deutsche und englische Notation, Zahlen aus Excel und ungültige Werte"""
+    german = {
+        '1.234,56 €': 123456, '-0,10': -10, '12,5': 1250, '€ 7': 700,
+        '12.5': 1250, 12.5: 1250, 1234: 123400, 0.1 + 0.2: 30,
+        '0,005': 1, '-0,005': -1, 'abc': None, '': None, None: None, 'nan': None,
+    }
+    for value, expected in german.items():
+        assert parse_amount_cents(value, ",") == expected, (value, parse_amount_cents(value, ","))
+
+    assert parse_amount_cents('1,234.56', ".") == 123456
+    assert parse_amount_cents('-12.34', ".") == -1234
+
+    # Jeder Wert wird einmal geparst, fehlende Werte bleiben leer
+    series = pd.Series(['1,00', None, '1,00', '2,50', 'x'], index=[5, 6, 7, 8, 9])
+    parsed = parse_amounts_cents(series, ",")
+    assert list(parsed.index) == [5, 6, 7, 8, 9]
+    assert parsed.isna().tolist() == [False, True, False, False, True]
+    assert parsed.dropna().tolist() == [100, 100, 250]
+    return True
+
+
+def check_exact_totals(temp_dir):
+    """Viele kleine Beträge ergeben exakte Summen ohne Rundungsdrift"""
+    rows = 30000
+    file_path = os.path.join(temp_dir, 'viele_buchungen.csv')
+    pd.DataFrame({
+        'Sachkontonr.': ['4000' if i % 3 else '4100' for i in range(rows)],
+        'Sachkonto': ['Spenden' if i % 3 else 'Beiträge' for i in range(rows)],
+        'Betrag': ['0,10' if i % 2 else '0,20' for i in range(rows)],
+        'Buchungstag': [f"{1 + i % 28:02d}.{1 + i % 12:02d}.2024" for i in range(rows)],
+        'Verwendungszweck': [f"Buchung {i}" for i in range(rows)],
+    }).to_csv(file_path, sep=';', index=False)
+
+    processor = CSVProcessor()
+    assert processor.load_file(file_path)
+    data = processor.processed_data
+
+    # Fließkomma-Summe der Euro-Beträge driftet, Cent-Summe ist exakt
+    float_sum = sum(data['Betrag_Clean'].tolist())
+    assert float_sum != 4500.0, "Erwartete Rundungsdrift der Fließkomma-Summe"
+    assert int(amount_cents(data).sum()) == 450000
+
+    generator = BWAPDFGenerator()
+    assert generator._calculate_total_amount(processor) == 4500.0
+
+    mappings = {'4000': 'Spenden', '4100': 'Mitgliedsbeiträge'}
+    summary = generator._create_quarter_summary(data, mappings)
+    assert summary == {'Mitgliedsbeiträge': 150000, 'Spenden': 300000}, summary
+
+    detailed = generator._create_detailed_quarter_summary(data, mappings, {'4000': 'Spendenkonto'})
+    assert detailed['summary'] == summary
+    assert detailed['detailed_accounts']['Spenden']['4000'] == {'name': 'Spendenkonto', 'cents': 300000}
+    assert all(isinstance(cents, int) for cents in detailed['summary'].values())
+
+    by_group = processor.get_summary_by_account_group(mappings)
+    assert by_group['Spenden']['Jahr'] == 3000.0
+    assert sum(by_group['Spenden'][f'Q{q}'] for q in range(1, 5)) == 3000.0
+
+    account_details = generator._get_account_detail_data('4100', processor)
+    assert account_details['total'] == 1500.0
+    assert account_details['transactions']['amount_cents'][0] == 20
+    return True
+
+
+def check_formatting():
+    """Formatierung auf Basis ganzer Cent"""
+    generator = BWAPDFGenerator()
+    assert generator._format_cents(123456789) == "1.234.567,89 €"
+    assert generator._format_cents(-5) == "-0,05 €"
+    assert generator._format_amount(1.005) == "1,01 €"
+    assert generator._format_amount(-0.001) == "0,00 €"
+    assert to_cents(-2426.02) == -242602
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Exakte Cent-Beträge ===")
+    with isolated_settings({"decimal_separator": ",", "csv_separator": ";"}):
+        temp_dir = tempfile.mkdtemp()
+        results = []
+        try:
+            results.append(("Betrags-Parser", check_parsing()))
+            results.append(("Exakte Summen", check_exact_totals(temp_dir)))
+            results.append(("Formatierung", check_formatting()))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Cent-Beträge", False))
+        finally:
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
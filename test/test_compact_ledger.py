@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der kompakten Datentypen des verarbeiteten Buchungsjournals
+"""
+
+import sys
+import os
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtCore import QCoreApplication
+
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor, LEDGER_COLUMNS
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+
+def create_csv(file_path, rows=500):
+    """Erstellt eine CSV-Buchungsliste mit einer zusätzlichen, ungenutzten Spalte"""
+    source = generate_ledger(rows, accounts=12, amount_format='german', seed=32)
+    source['Kontonummer/IBAN'] = 'DE00 0000 0000 0000 0000 00'
+    write_ledger(source, file_path)
+    return source
+
+
+def main():
+    """Prüft Datentypen, Werte und die Freigabe der Rohdaten"""
+    print("=== Test: Kompaktes Buchungsjournal ===")
+    with isolated_settings({"decimal_separator": ",", "csv_separator": ";"}):
+        file_path = os.path.join(tempfile.mkdtemp(), 'buchungen.csv')
+        source = create_csv(file_path)
+
+        processor = CSVProcessor()
+        try:
+            assert processor.load_file(file_path), "Datei konnte nicht geladen werden"
+            data = processor.processed_data
+
+            # Rohdaten werden nach der Verarbeitung freigegeben
+            assert processor.raw_data is None
+
+            # Nur von Berichten gelesene Spalten bleiben erhalten
+            assert set(data.columns) <= set(LEDGER_COLUMNS), data.columns
+            assert 'Kontonummer/IBAN' not in data.columns and 'Betrag' not in data.columns
+
+            assert isinstance(data['Sachkontonr.'].dtype, pd.CategoricalDtype)
+            assert data['Quartal'].dtype == 'int8'
+            assert pd.api.types.is_datetime64_any_dtype(data['Buchungstag_Clean'])
+            assert data['Betrag_Cent'].dtype == 'int64'
+            assert data['Betrag_Clean'].dtype == 'float64'
+
+            # Werte unverändert
+            cents = int(source['Betrag'].iloc[2].replace(',', ''))
+            booking_day = pd.to_datetime(source['Buchungstag'].iloc[2], format='%d.%m.%Y')
+            assert data['Betrag_Clean'].iloc[2] == cents / 100, data['Betrag_Clean'].iloc[2]
+            assert data['Betrag_Cent'].iloc[2] == cents
+            assert data['Buchungstag_Clean'].iloc[2] == booking_day
+            assert data['Quartal'].iloc[2] == booking_day.quarter
+            assert processor.get_account_numbers() == sorted(source['Sachkontonr.'].unique())
+            account = source['Sachkontonr.'].iloc[3]
+            assert processor.get_account_name(account) == source['Sachkonto'].iloc[3]
+            assert len(processor.get_data_by_account(account)) == (source['Sachkontonr.'] == account).sum()
+
+            print(f"📊 Speicher je Buchung: {data.memory_usage(deep=True).sum() / len(data):.0f} Bytes")
+            print("✅ Kompaktes Buchungsjournal korrekt")
+            return True
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            return False
+        finally:
+            os.remove(file_path)
+            os.rmdir(os.path.dirname(file_path))
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Differenztest: optimierte Verarbeitung gegen die zeilenweise Referenz-Engine
+
+Zufällige Buchungslisten mit ungewöhnlichen Schreibweisen werden mit beiden Engines
+verarbeitet; jede bereinigte Zeile und jede Auswertung muss identisch sein.
+
+Umgebungsvariablen:
+    EQUIVALENCE_ROWS (Standard 3000), EQUIVALENCE_SEEDS (Standard 5)
+"""
+
+import sys
+import os
+import io
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.file_handler import FileHandler
+from synthetic_ledger import generate_adversarial_ledger, generate_ledger, write_ledger
+from test_helpers import isolated_settings
+from reference_engine import compare_engines
+
+SETTING_KEYS = ("decimal_separator",)
+
+ACCOUNT_MAPPINGS = {"4000": "Einnahmen", "8400": "Erlöse", "A-100": "Sonstiges", "4000.5": "Einnahmen"}
+ACCOUNT_NAMES = {"4000": "Mitgliedsbeiträge", "8400": "Spenden"}
+
+
+def check(raw, decimal_separator, label) -> bool:
+    """Vergleicht beide Engines für eine Buchungsliste"""
+    QSettings().setValue("decimal_separator", decimal_separator)
+    # Ausgaben der Import-Stufen unterdrücken
+    with contextlib.redirect_stdout(io.StringIO()):
+        mismatches = compare_engines(raw, decimal_separator, ACCOUNT_MAPPINGS, ACCOUNT_NAMES)
+    print(f"   {'✅' if not mismatches else '❌'} {label}: {len(raw)} Zeilen, {len(mismatches)} Abweichungen")
+    for mismatch in mismatches:
+        print(f"      {mismatch}")
+    return not mismatches
+
+
+def test_adversarial_ledgers(rows, seeds) -> bool:
+    """Ungewöhnliche Schreibweisen mit deutscher und englischer Notation"""
+    passed = True
+    for seed in range(seeds):
+        raw = generate_adversarial_ledger(rows, seed)
+        for decimal_separator in (",", "."):
+            passed &= check(raw, decimal_separator, f"Seed {seed}, Dezimaltrenner '{decimal_separator}'")
+    return passed
+
+
+def test_file_roundtrip(rows, directory) -> bool:
+    """Rohdaten wie aus einer CSV-Datei gelesen (Sachkontonummern als Gleitkommazahl usw.)"""
+    passed = True
+    for seed, name in ((11, "gemischt.csv"), (12, "gemischt2.csv")):
+        path = write_ledger(generate_adversarial_ledger(rows, seed), os.path.join(directory, name))
+        with contextlib.redirect_stdout(io.StringIO()):
+            raw = FileHandler().process_file(path)
+        passed &= check(raw, ",", f"CSV-Datei {name}")
+
+    # Rein numerische Sachkonten werden beim Einlesen zu float64
+    numeric = generate_ledger(rows, accounts=12, amount_format='german', seed=5)
+    numeric['Sachkontonr.'] = numeric['Sachkontonr.'].astype(float)
+    path = write_ledger(numeric, os.path.join(directory, "numerisch.csv"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        raw = FileHandler().process_file(path)
+    passed &= check(raw, ",", "CSV-Datei mit float-Sachkonten")
+    return passed
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Referenz-Engine gegen optimierte Verarbeitung ===")
+    rows = int(os.environ.get("EQUIVALENCE_ROWS", 3000))
+    seeds = int(os.environ.get("EQUIVALENCE_SEEDS", 5))
+
+    results = []
+    with isolated_settings(keys=SETTING_KEYS), tempfile.TemporaryDirectory() as directory:
+        results.append(("Ungewöhnliche Schreibweisen", test_adversarial_ledgers(rows, seeds)))
+        results.append(("Dateien", test_file_roundtrip(rows, directory)))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Test-Hilfsfunktionen für temporäre Dateien
+Test-Hilfsfunktionen für temporäre Dateien und Einstellungen
 """
 
 import os
+import shutil
 import tempfile
 import atexit
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QSettings
 
 class TestFileManager:
     """Verwaltet temporäre Test-Dateien im test/ Ordner"""
@@ -59,3 +63,44 @@ def get_test_file_path(filename: str) -> str:
 def cleanup_test_files():
     """Räumt alle Test-Dateien auf"""
     test_file_manager.cleanup_all()
+
+
+@contextmanager
+def isolated_settings(values: Optional[Dict[str, object]] = None, keys: Iterable[str] = ()):
+    """
+    Setzt QSettings-Werte für die Dauer eines Tests und stellt danach den vorherigen Stand her
+
+    Gesichert werden die gesetzten Schlüssel und die zusätzlich genannten 'keys', die der Test
+    selbst ändert (Gruppen wie "account_names" samt allen Unterschlüsseln). Der Ledger-Cache
+    ist abgeschaltet und FINANZ_CACHE_DIR zeigt auf ein temporäres Verzeichnis.
+
+    Args:
+        values: Einstellungen für den Test (überschreiben den abgeschalteten Ledger-Cache)
+        keys: Weitere Schlüssel oder Gruppen, die der Test verändert
+
+    Yields:
+        QSettings: Einstellungsobjekt
+    """
+    values = {"ledger_cache/enabled": False, **(values or {})}
+    settings = QSettings()
+    names = set(values) | set(keys)
+    previous = {key: settings.value(key) for key in settings.allKeys()
+                if any(key == name or key.startswith(f"{name}/") for name in names)}
+
+    cache_dir = os.environ.get("FINANZ_CACHE_DIR")
+    temp_cache_dir = tempfile.mkdtemp(prefix="finanz_test_cache_")
+    os.environ["FINANZ_CACHE_DIR"] = temp_cache_dir
+    for key, value in values.items():
+        settings.setValue(key, value)
+    try:
+        yield settings
+    finally:
+        for name in names:
+            settings.remove(name)
+        for key, value in previous.items():
+            settings.setValue(key, value)
+        if cache_dir is None:
+            os.environ.pop("FINANZ_CACHE_DIR", None)
+        else:
+            os.environ["FINANZ_CACHE_DIR"] = cache_dir
+        shutil.rmtree(temp_cache_dir, ignore_errors=True)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Import-Pipeline (Stufen, Messwerte und Gleichwertigkeit zur bisherigen Verarbeitung)
+"""
+
+import sys
+import os
+import time
+from datetime import datetime
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtCore import QCoreApplication
+
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.import_pipeline import (ImportPipeline, ImportContext, ImportStage,
+                                       default_stages, parse_booking_date)
+from synthetic_ledger import generate_ledger
+from test_helpers import isolated_settings
+
+
+def legacy_process(df, decimal_separator=","):
+    """Bisherige zeilenweise Verarbeitung (Referenz)"""
+    def normalize(value):
+        if pd.isna(value):
+            return ""
+        text = str(value).strip()
+        if text.replace('.', '').replace('-', '').isdigit():
+            try:
+                number = float(text)
+                return str(int(number)) if number.is_integer() else text
+            except ValueError:
+                pass
+        return text
+
+    def clean_amount(value):
+        if pd.isna(value) or value == '':
+            return None
+        try:
+            cleaned = str(value).replace('€', '').replace(' ', '')
+            if ',' in cleaned and '.' in cleaned:
+                cleaned = cleaned.replace('.', '').replace(',', '.')
+            elif ',' in cleaned:
+                cleaned = cleaned.replace(',', '.')
+            return float(cleaned)
+        except (ValueError, TypeError):
+            return None
+
+    def parse_date(value):
+        if pd.isna(value) or value == '':
+            return None
+        for fmt in ['%Y.%m.%d', '%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y']:
+            try:
+                return datetime.strptime(str(value).strip(), fmt).date()
+            except ValueError:
+                continue
+        return None
+
+    df = df.copy()
+    df['Sachkontonr.'] = df['Sachkontonr.'].apply(normalize)
+    df = df.dropna(subset=['Sachkontonr.', 'Betrag'])
+    df['Betrag_Clean'] = df['Betrag'].apply(clean_amount)
+    df['Buchungstag_Clean'] = df['Buchungstag'].apply(parse_date)
+    df = df.dropna(subset=['Betrag_Clean', 'Buchungstag_Clean'])
+    df['Quartal'] = df['Buchungstag_Clean'].apply(lambda d: (d.month - 1) // 3 + 1)
+    return df
+
+
+def raw_frame(rows=5000):
+    """Rohdaten mit gemischten Formaten und ungültigen Werten"""
+    date_formats = ['%d.%m.%Y', '%Y-%m-%d', '%Y.%m.%d', '%d/%m/%Y']
+    # Beträge gemischt mit und ohne Tausenderpunkt bzw. Euro-Zeichen
+    df = generate_ledger(rows, accounts=30, amount_format='mixed', seed=37)
+    df = df[['Sachkontonr.', 'Betrag', 'Buchungstag', 'Verwendungszweck']].astype(object)
+    days = pd.to_datetime(df['Buchungstag'], format='%d.%m.%Y')
+    df['Buchungstag'] = [day.strftime(date_formats[i % 4]) for i, day in enumerate(days)]
+    df['Sachkontonr.'] = [int(n) if i % 4 else f" {n}.0 " for i, n in enumerate(df['Sachkontonr.'])]
+    df.loc[7, 'Betrag'] = None
+    df.loc[11, 'Betrag'] = 'ungültig'
+    df.loc[13, 'Buchungstag'] = '31.02.2024'
+    df.loc[17, 'Buchungstag'] = None
+    return df
+
+
+def check_equivalence():
+    """Gleiche Zeilen und Werte wie die bisherige Verarbeitung"""
+    raw = raw_frame()
+    expected = legacy_process(raw)
+    pipeline = ImportPipeline()
+    actual = pipeline.run(raw.copy(), ImportContext(","))
+
+    assert list(actual.index) == list(expected.index), (len(actual), len(expected))
+    assert actual['Sachkontonr.'].astype(str).tolist() == expected['Sachkontonr.'].tolist()
+    assert actual['Betrag_Clean'].tolist() == expected['Betrag_Clean'].round(2).tolist()
+    assert actual['Buchungstag_Clean'].dt.date.tolist() == expected['Buchungstag_Clean'].tolist()
+    assert actual['Quartal'].tolist() == expected['Quartal'].tolist()
+    # Ohne eigene Spalte keine Buchungsnummer (nicht aus dem Verwendungszweck geraten)
+    assert 'Buchungsnr.' not in actual.columns
+    return True
+
+
+def check_metrics():
+    """Jede Stufe liefert Laufzeit und Zeilenzahlen"""
+    raw = raw_frame(20000)
+    pipeline = ImportPipeline()
+    result = pipeline.run(raw, ImportContext(","))
+    names = [stage.name for stage in default_stages()]
+    assert list(pipeline.metrics) == names, list(pipeline.metrics)
+    assert pipeline.metrics['Spalten'].rows_in == 20000
+    assert pipeline.metrics['Filter'].rows_out == len(result)
+    assert pipeline.metrics['Filter'].rows_in - pipeline.metrics['Filter'].rows_out == 4
+    assert all(metrics.seconds >= 0 and metrics.runs == 1 for metrics in pipeline.metrics.values())
+    print(pipeline.format_metrics())
+
+    # Einzelne Stufen lassen sich separat messen
+    context = ImportContext(",")
+    df = raw_frame(20000)
+    for stage in default_stages():
+        start = time.perf_counter()
+        df = stage.run(df, context)
+        assert time.perf_counter() - start < 5
+    return True
+
+
+def check_custom_stage():
+    """Zusätzliche Stufen lassen sich einhängen"""
+    class MarkStage(ImportStage):
+        name = "Markierung"
+
+        def run(self, df, context):
+            df['Markiert'] = True
+            return df
+
+    pipeline = ImportPipeline()
+    pipeline.add_stage(MarkStage(), before="Filter")
+    result = pipeline.run(raw_frame(100), ImportContext(","))
+    assert result['Markiert'].all()
+    assert list(pipeline.metrics)[-2:] == ["Markierung", "Filter"]
+    return True
+
+
+def check_processor_integration():
+    """CSVProcessor nutzt die Pipeline; fehlende Belegspalten brechen den Import nicht mehr ab"""
+    processor = CSVProcessor()
+
+    processor.raw_data = raw_frame(200).drop(columns=['Verwendungszweck'])
+    assert processor._process_data(), "Import ohne Verwendungszweck/Belegnummer schlägt fehl"
+    assert len(processor.processed_data) == 196
+    assert set(processor.get_import_metrics()) == {stage.name for stage in default_stages()}
+
+    # Abweichend benannte Spalte wird übernommen, eine vorhandene 'Buchungsnr.' nie überschrieben
+    raw = raw_frame(200)
+    raw['Buchungs-Nr.'] = [f"N{i}" for i in range(200)]
+    processor.raw_data = raw
+    assert processor._process_data()
+    assert processor.processed_data['Buchungsnr.'].iloc[0] == 'N0'
+    raw = raw_frame(200)
+    raw['Buchungsnummer'] = [f"N{i}" for i in range(200)]
+    raw['Buchungsnr.'] = [f"B{i}" for i in range(200)]
+    processor.raw_data = raw
+    assert processor._process_data()
+    assert processor.processed_data['Buchungsnr.'].iloc[0] == 'B0'
+
+    processor.raw_data = raw_frame(10).drop(columns=['Betrag'])
+    assert not processor._process_data()
+
+    assert str(processor._parse_date('2024-03-05')) == '2024-03-05'
+    assert parse_booking_date('03/05/2024') == datetime(2024, 5, 3).date()
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Import-Pipeline ===")
+    with isolated_settings({"decimal_separator": ","}):
+        results = []
+        try:
+            results.append(("Gleiches Ergebnis wie bisher", check_equivalence()))
+            results.append(("Messwerte je Stufe", check_metrics()))
+            results.append(("Eigene Stufe", check_custom_stage()))
+            results.append(("CSVProcessor", check_processor_integration()))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Import-Pipeline", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
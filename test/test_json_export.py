@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des streamenden JSON-Exports (eingerückt, kompakt und gzip-komprimiert)
+"""
+
+import sys
+import os
+import io
+import gzip
+import json
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.utils.json_export import JSONStreamWriter, StreamedList, write_json
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+
+def create_csv(file_path, rows=3000, accounts=40):
+    """Buchungsliste mit Sonderzeichen im Verwendungszweck"""
+    df = generate_ledger(rows, accounts=accounts, amount_format='german', seed=38)
+    df['Verwendungszweck'] = df['Verwendungszweck'] + ' für "Übungsleiter"'
+    write_ledger(df, file_path)
+
+
+def check_writer_format():
+    """Eingerückte Ausgabe entspricht json.dump(indent=2) Byte für Byte"""
+    expected = {
+        "a": 1, "leer": [], "nested": {"x": [1, 2, {"y": "ä"}], "z": None},
+        "stream": [{"n": i, "list": [i, {"k": "v"}]} for i in range(3)],
+        "leerer_stream": [],
+        "tiefer": [{"inner": [1.5, "zwei"]}],
+    }
+
+    # StreamedList über Generatoren ist nur einmal lesbar - je Ausgabe neu erzeugen
+    def fresh():
+        return {
+            "a": 1, "leer": [], "nested": {"x": [1, 2, {"y": "ä"}], "z": None},
+            "stream": StreamedList({"n": i, "list": [i, {"k": "v"}]} for i in range(3)),
+            "leerer_stream": StreamedList(iter([])),
+            "tiefer": [{"inner": StreamedList(iter([1.5, "zwei"]))}],
+        }
+
+    buffer = io.StringIO()
+    JSONStreamWriter(buffer, indent=2).write(fresh())
+    assert buffer.getvalue() == json.dumps(expected, indent=2, ensure_ascii=False)
+
+    buffer = io.StringIO()
+    JSONStreamWriter(buffer, indent=None).write(fresh())
+    assert buffer.getvalue() == json.dumps(expected, ensure_ascii=False, separators=(',', ':'))
+    return True
+
+
+def export(processor, directory, compact, compressed):
+    """Erzeugt einen JSON-Export mit den angegebenen Optionen"""
+    settings = QSettings()
+    settings.setValue("json_export_compact", compact)
+    settings.setValue("json_export_gzip", compressed)
+    pdf_path = os.path.join(directory, f"bwa_{int(compact)}{int(compressed)}.pdf")
+    assert BWAPDFGenerator()._generate_json_export(pdf_path, processor, {})
+    return pdf_path.rsplit('.', 1)[0] + ('.json.gz' if compressed else '.json')
+
+
+def load(path):
+    """Liest einen Export (ohne Zeitstempel und davon abhängige Prüfsumme)"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    data["metadata"].pop("export_date")
+    data.pop("integrity")
+    return data
+
+
+def check_export_options(processor, directory):
+    """Kompakte und gzip-komprimierte Exporte enthalten dieselben Daten"""
+    plain = export(processor, directory, False, False)
+    compact = export(processor, directory, True, False)
+    compressed = export(processor, directory, True, True)
+
+    reference = load(plain)
+    assert len(reference["account_details"]) == 40
+    assert sum(a["transaction_count"] for a in reference["account_details"]) == 3000
+    assert all(len(a["transactions"]["amount_cents"]) == a["transaction_count"] for a in reference["account_details"])
+    assert reference["account_details"][0]["transactions"]["purpose"][0].endswith(' für "Übungsleiter"')
+    assert load(compact) == reference
+    assert load(compressed) == reference
+
+    sizes = {path: os.path.getsize(path) for path in (plain, compact, compressed)}
+    print(f"📦 eingerückt {sizes[plain]} B, kompakt {sizes[compact]} B, gzip {sizes[compressed]} B")
+    assert sizes[compact] < sizes[plain] and sizes[compressed] < sizes[compact]
+    return compressed
+
+
+def check_gzip_roundtrip(processor, gz_path):
+    """CSVProcessor lädt den gzip-komprimierten Export wieder ein"""
+    reloaded = CSVProcessor()
+    assert reloaded.load_file(gz_path), "Import der .json.gz-Datei fehlgeschlagen"
+    assert reloaded.is_json_source
+    assert len(reloaded.processed_data) == len(processor.processed_data)
+    assert reloaded.get_total_cents() == processor.get_total_cents()
+    return True
+
+
+def check_streaming_memory():
+    """Gestreamte Buchungen werden nicht vorher als Liste gesammelt"""
+    rows = 100000
+    row = {"booking_number": "B240001", "date": "2024-01-01", "purpose": "Buchung", "amount": 1.5}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "stream.json")
+        tracemalloc.start()
+        write_json(path, {"transactions": StreamedList(dict(row) for _ in range(rows))})
+        _, streamed_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        tracemalloc.start()
+        with open(os.path.join(directory, "list.json"), 'w', encoding='utf-8') as f:
+            json.dump({"transactions": [dict(row) for _ in range(rows)]}, f, indent=2, ensure_ascii=False)
+        _, list_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"💾 Spitzenspeicher: gestreamt {streamed_peak / 1024:.0f} KiB, Liste {list_peak / 1024:.0f} KiB")
+    assert streamed_peak * 10 < list_peak
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Streamender JSON-Export ===")
+
+    results = []
+    with isolated_settings({"decimal_separator": ",", "generate_account_reports": True},
+                           ("json_export_compact", "json_export_gzip")):
+        try:
+            results.append(("Format wie json.dump", check_writer_format()))
+            with tempfile.TemporaryDirectory() as directory:
+                csv_path = os.path.join(directory, "buchungen.csv")
+                create_csv(csv_path)
+                processor = CSVProcessor()
+                assert processor.load_file(csv_path)
+                gz_path = check_export_options(processor, directory)
+                results.append(("Kompakt und gzip", True))
+                results.append(("Import .json.gz", check_gzip_roundtrip(processor, gz_path)))
+            results.append(("Speicherbedarf", check_streaming_memory()))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("JSON-Export", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
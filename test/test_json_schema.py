@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des spaltenbasierten JSON-Schemas v2 (Export, Import und Lesbarkeit von v1-Dateien)
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.utils.json_export import JSON_SCHEMA_VERSION, TRANSACTION_COLUMNS
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+
+def create_csv(file_path, rows, accounts=60):
+    """Buchungsliste für den Export (Umlaute im Verwendungszweck)"""
+    df = generate_ledger(rows, accounts=accounts, amount_format='german', seed=39)
+    df['Verwendungszweck'] = df['Verwendungszweck'] + ' für Übungsleiter'
+    write_ledger(df, file_path)
+
+
+def to_v1(data):
+    """Wandelt einen v2-Export in das bisherige Format mit einem Objekt je Buchung um"""
+    data = json.loads(json.dumps(data))
+    data['metadata'].pop('schema_version')
+    for account in data['account_details']:
+        columns = account['transactions']
+        account['transactions'] = [
+            {"booking_number": number, "date": date, "purpose": purpose, "amount": cents / 100}
+            for number, date, purpose, cents in zip(*(columns[column] for column in TRANSACTION_COLUMNS))
+        ]
+    return data
+
+
+def ledger(processor):
+    """Vergleichbare Sicht auf das Buchungsjournal"""
+    data = processor.processed_data
+    return pd.DataFrame({
+        'konto': data['Sachkontonr.'].astype(str).values,
+        'name': data['Sachkonto'].astype(str).values,
+        'nummer': data['Buchungsnr.'].astype(str).values,
+        'tag': data['Buchungstag_Clean'].values,
+        'cent': data['Betrag_Cent'].astype('int64').values,
+        'zweck': data['Verwendungszweck'].astype(str).values,
+    }).sort_values(['nummer']).reset_index(drop=True)
+
+
+def load_timed(path, repeat=3):
+    """Lädt eine Exportdatei und misst die beste Laufzeit"""
+    best = None
+    for _ in range(repeat):
+        processor = CSVProcessor()
+        start = time.perf_counter()
+        assert processor.load_file(path), f"Import von {path} fehlgeschlagen"
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return processor, best
+
+
+def check_roundtrip(directory, rows=60000):
+    """v2-Export wird spaltenweise geschrieben und verlustfrei wieder eingelesen"""
+    csv_path = os.path.join(directory, "buchungen.csv")
+    create_csv(csv_path, rows)
+    source = CSVProcessor()
+    assert source.load_file(csv_path)
+
+    pdf_path = os.path.join(directory, "bwa.pdf")
+    assert BWAPDFGenerator()._generate_json_export(pdf_path, source, {})
+    v2_path = os.path.join(directory, "bwa.json")
+    with open(v2_path, encoding='utf-8') as f:
+        data = json.load(f)
+
+    assert data['metadata']['schema_version'] == JSON_SCHEMA_VERSION == 2
+    account = data['account_details'][0]
+    assert set(account['transactions']) == set(TRANSACTION_COLUMNS)
+    assert all(len(values) == account['transaction_count'] for values in account['transactions'].values())
+
+    v1_path = os.path.join(directory, "bwa_v1.json")
+    with open(v1_path, 'w', encoding='utf-8') as f:
+        json.dump(to_v1(data), f, indent=2, ensure_ascii=False)
+
+    v2, v2_time = load_timed(v2_path)
+    v1, v1_time = load_timed(v1_path)
+
+    expected = ledger(source)
+    assert ledger(v2).equals(expected), "v2-Import weicht vom Original ab"
+    assert ledger(v1).equals(expected), "v1-Import weicht vom Original ab"
+    assert v2.get_total_cents() == source.get_total_cents()
+
+    v1_size, v2_size = os.path.getsize(v1_path), os.path.getsize(v2_path)
+    print(f"⏱️  {rows} Buchungen: v1 {v1_time:.3f}s / {v1_size / 1024:.0f} KiB, "
+          f"v2 {v2_time:.3f}s / {v2_size / 1024:.0f} KiB")
+    assert v2_size * 2 < v1_size
+    assert v2_time < v1_time
+    return True
+
+
+def check_invalid_columns():
+    """Unterschiedlich lange Spalten werden abgewiesen"""
+    processor = CSVProcessor()
+    processor.json_data = {
+        'metadata': {'schema_version': 2},
+        'account_details': [{
+            'account_number': '4000', 'account_name': 'Kasse',
+            'transactions': {'booking_number': ['B1'], 'date': ['2024-01-01'],
+                             'purpose': [], 'amount_cents': [100]},
+        }],
+    }
+    try:
+        processor._create_dataframe_from_json()
+    except ValueError as e:
+        assert 'purpose' in str(e)
+        return True
+    return False
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: JSON-Schema v2 ===")
+
+    results = []
+    with isolated_settings({"json_export_compact": False, "json_export_gzip": False,
+                            "decimal_separator": ",", "generate_account_reports": True}):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                results.append(("Roundtrip v1/v2", check_roundtrip(directory)))
+            results.append(("Ungültige Spalten", check_invalid_columns()))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("JSON-Schema v2", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des Snapshot-Schnellpfads (BWA aus geprüften JSON-Auswertungen ohne Neuberechnung)
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.utils.report_snapshot import ReportSnapshot, snapshot_checksum
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+TEST_SETTINGS = {"json_export_compact": False, "json_export_gzip": False, "decimal_separator": ",",
+                 "generate_account_reports": True, "generate_quarterly_reports": True,
+                 "generate_chart_report": True, "quarter_mode": "cumulative"}
+
+
+def create_export(directory):
+    """Erstellt einen JSON-Export mit Prüfsumme"""
+    csv_path = write_ledger(generate_ledger(4000, accounts=25, amount_format='german', seed=40),
+                            os.path.join(directory, "buchungen.csv"))
+    processor = CSVProcessor()
+    assert processor.load_file(csv_path)
+    mappings = {account: ("Einnahmen" if position % 2 else "Ausgaben")
+                for position, account in enumerate(processor.get_account_numbers())}
+    assert BWAPDFGenerator()._generate_json_export(os.path.join(directory, "bwa.pdf"), processor, mappings)
+    return os.path.join(directory, "bwa.json")
+
+
+class CountingProcessor(CSVProcessor):
+    """Zählt, wie oft das Buchungsjournal aus dem JSON-Export aufgebaut wird"""
+
+    def __init__(self):
+        super().__init__()
+        self.ledger_builds = 0
+
+    def _create_dataframe_from_json(self):
+        self.ledger_builds += 1
+        return super()._create_dataframe_from_json()
+
+
+def render(json_path, pdf_path, trusted):
+    """Lädt den Export und erstellt daraus die BWA"""
+    QSettings().setValue("json_trusted_snapshot", trusted)
+    processor = CountingProcessor()
+    start = time.perf_counter()
+    assert processor.load_file(json_path), "JSON-Import fehlgeschlagen"
+    load_time = time.perf_counter() - start
+    assert BWAPDFGenerator().generate_bwa_pdf(pdf_path, processor), "PDF-Erstellung fehlgeschlagen"
+    return processor, load_time, time.perf_counter() - start
+
+
+def pdf_text(pdf_path):
+    """Text aller Seiten einer PDF-Datei"""
+    with pymupdf.open(pdf_path) as document:
+        return [page.get_text() for page in document]
+
+
+def check_checksum(json_path):
+    """Export enthält eine Prüfsumme über Auswertungen, Zuordnungen und Buchungen"""
+    with open(json_path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert list(data)[-1] == 'integrity', "Prüfsumme wird nach den Sachkonten geschrieben"
+    assert data['integrity']['checksum'] == snapshot_checksum(data)
+    assert ReportSnapshot.from_json(data) is not None
+
+    # Jede Änderung an Buchungen oder Zuordnungen macht den Snapshot ungültig
+    data['account_details'][3]['transactions']['amount_cents'][0] += 1
+    assert ReportSnapshot.from_json(data) is None
+    data['account_details'][3]['transactions']['amount_cents'][0] -= 1
+    data['account_mappings'][next(iter(data['account_mappings']))] = "Sonstiges"
+    assert ReportSnapshot.from_json(data) is None
+    return True
+
+
+def check_fast_path(json_path, directory):
+    """Geprüfter Snapshot ergibt dieselbe BWA, ohne das Buchungsjournal aufzubauen"""
+    fast, fast_load, fast_total = render(json_path, os.path.join(directory, "schnell.pdf"), True)
+    assert fast.report_snapshot is not None
+    assert fast.ledger_builds == 0, "Buchungsjournal wurde trotz Snapshot aufgebaut"
+    assert fast.processed_data is None and fast.has_data()
+    assert fast.get_account_numbers() == fast.report_snapshot.account_numbers()
+    assert fast.ledger_builds == 0, "Sachkontenliste hat das Buchungsjournal aufgebaut"
+
+    full, full_load, full_total = render(json_path, os.path.join(directory, "voll.pdf"), False)
+    assert full.report_snapshot is None and full.processed_data is not None
+    assert full.ledger_builds == 1
+    assert fast.get_record_count() == full.get_record_count()
+
+    print(f"⏱️  Import: Snapshot {fast_load:.3f}s / neu berechnet {full_load:.3f}s; "
+          f"mit PDF: {fast_total:.3f}s / {full_total:.3f}s")
+    assert fast_load < full_load
+
+    if PYMUPDF_AVAILABLE:
+        fast_pages = pdf_text(os.path.join(directory, "schnell.pdf"))
+        full_pages = pdf_text(os.path.join(directory, "voll.pdf"))
+        assert len(fast_pages) == len(full_pages), (len(fast_pages), len(full_pages))
+        for number, (fast_page, full_page) in enumerate(zip(fast_pages, full_pages), 1):
+            assert fast_page == full_page, f"Seite {number} unterscheidet sich"
+    else:
+        print("⚠️ PyMuPDF nicht verfügbar - Seitenvergleich übersprungen")
+
+    # Buchungsjournal wird erst auf ausdrückliche Anforderung aufgebaut
+    assert fast.ledger_builds == 0
+    assert len(fast.ensure_ledger()) == len(full.processed_data)
+    assert fast.ledger_builds == 1 and not fast._json_pending
+    fast.ensure_ledger()
+    assert fast.ledger_builds == 1
+    return True
+
+
+def check_ledger_error(json_path):
+    """Fehler beim späteren Aufbau des Buchungsjournals erreichen den Aufrufer"""
+    QSettings().setValue("json_trusted_snapshot", True)
+    processor = CSVProcessor()
+    assert processor.load_file(json_path)
+    # Unvollständige Buchungsspalte (wird erst beim Aufbau des Journals bemerkt)
+    processor.json_data['account_details'][0]['transactions']['date'].pop()
+    try:
+        processor.ensure_ledger()
+        raise AssertionError("Fehler beim Aufbau des Buchungsjournals wurde verschluckt")
+    except ValueError as e:
+        print(f"   Erwarteter Fehler: {e}")
+    # Journal bleibt ausstehend, Berichtsdaten des Snapshots bleiben nutzbar
+    assert processor.processed_data is None and processor.has_data()
+    return True
+
+
+def check_tampered_file(json_path):
+    """Veränderte Exporte werden vollständig neu berechnet"""
+    with open(json_path, encoding='utf-8') as f:
+        data = json.load(f)
+    data['account_details'][0]['transactions']['amount_cents'][0] += 100
+    tampered_path = json_path.replace('.json', '_geaendert.json')
+    with open(tampered_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+    QSettings().setValue("json_trusted_snapshot", True)
+    processor = CSVProcessor()
+    assert processor.load_file(tampered_path)
+    assert processor.report_snapshot is None
+    assert not processor._json_pending and processor.processed_data is not None
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Snapshot-Schnellpfad für JSON-Exporte ===")
+    results = []
+    with isolated_settings(TEST_SETTINGS, ("json_trusted_snapshot",)):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                json_path = create_export(directory)
+                results.append(("Prüfsumme", check_checksum(json_path)))
+                results.append(("Schnellpfad", check_fast_path(json_path, directory)))
+                results.append(("Veränderter Export", check_tampered_file(json_path)))
+                results.append(("Fehler beim Journal-Aufbau", check_ledger_error(json_path)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Snapshot-Schnellpfad", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
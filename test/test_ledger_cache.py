@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des Ledger-Caches (Schlüssel, LRU-Verdrängung, defekte Einträge, atomares Schreiben)
+und der Wiederherstellung der letzten Sitzung
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils import ledger_cache
+from src.utils.ledger_cache import LedgerCache
+from src.utils.csv_processor import CSVProcessor
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+TEST_SETTINGS = {"decimal_separator": ",", "csv_separator": ";", "ledger_cache/enabled": True,
+                 "ledger_cache/max_size_mb": 1, "restore_last_session": False}
+
+# Vom Test selbst geänderte Einstellungen
+SETTING_KEYS = ("last_session",)
+
+PARSE_SETTINGS = {"decimal_separator": ",", "csv_separator": ";"}
+
+
+def entry_frame(seed):
+    """DataFrame mit knapp 0,4 MB als Pickle (zwei Einträge passen in 1 MB, drei nicht)"""
+    return pd.DataFrame({"Betrag_Cent": np.arange(48 * 1024, dtype="int64") + seed})
+
+
+def test_cache_key(temp_dir):
+    """Schlüssel ändert sich mit Dateiinhalt, Blatt und Import-Einstellungen"""
+    cache = LedgerCache(cache_dir=temp_dir)
+    path = os.path.join(temp_dir, "buchungen.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Sachkontonr.;Betrag\n4000;1,00\n")
+
+    key = cache.make_key(path, None, PARSE_SETTINGS)
+    assert cache.make_key(path, None, dict(PARSE_SETTINGS)) == key
+    assert cache.make_key(path, None, {**PARSE_SETTINGS, "decimal_separator": "."}) != key
+    assert cache.make_key(path, None, {**PARSE_SETTINGS, "csv_separator": ","}) != key
+    assert cache.make_key(path, "Tabelle2", PARSE_SETTINGS) != key
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("4001;2,00\n")
+    changed = cache.make_key(path, None, PARSE_SETTINGS)
+    assert changed != key
+
+    # Neue Formatversion macht alle bisherigen Einträge ungültig
+    original_version = ledger_cache.CACHE_FORMAT_VERSION
+    try:
+        ledger_cache.CACHE_FORMAT_VERSION = original_version + 1
+        assert cache.make_key(path, None, PARSE_SETTINGS) != changed
+    finally:
+        ledger_cache.CACHE_FORMAT_VERSION = original_version
+    return True
+
+
+def test_store_and_load(temp_dir):
+    """Gespeicherte Einträge werden unverändert geladen, ohne temporäre Dateien"""
+    cache = LedgerCache(cache_dir=temp_dir)
+    df = entry_frame(1)
+    assert cache.store("eintrag", df)
+    assert not [name for name in os.listdir(temp_dir) if name.endswith(".tmp")]
+    loaded = cache.load("eintrag")
+    assert loaded is not None and loaded.equals(df)
+    assert cache.load("fehlt") is None
+    assert cache.get_size_bytes() > 0
+    assert cache.clear() == 1 and cache.get_size_bytes() == 0
+    return True
+
+
+def test_lru_eviction(temp_dir):
+    """Bei Überschreiten der Größengrenze wird der am längsten nicht genutzte Eintrag verdrängt"""
+    cache = LedgerCache(cache_dir=temp_dir)
+    now = time.time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert cache.store("a", entry_frame(1))
+        os.utime(os.path.join(temp_dir, "a.pkl"), (now - 100, now - 100))
+        assert cache.store("b", entry_frame(2))
+        os.utime(os.path.join(temp_dir, "b.pkl"), (now - 50, now - 50))
+
+        # Laden aktualisiert die Zugriffszeit: "a" ist jetzt jünger als "b"
+        assert cache.load("a") is not None
+        assert cache.store("c", entry_frame(3))
+
+    remaining = sorted(name for name in os.listdir(temp_dir) if name.endswith(".pkl"))
+    assert remaining == ["a.pkl", "c.pkl"], remaining
+    assert cache.get_size_bytes() <= cache.get_max_size_bytes()
+    return True
+
+
+def test_corrupt_entry(temp_dir):
+    """Defekte Einträge werden verworfen statt einen Fehler auszulösen"""
+    cache = LedgerCache(cache_dir=temp_dir)
+    path = os.path.join(temp_dir, "defekt.pkl")
+    with open(path, "wb") as f:
+        f.write(b"kein Pickle")
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert cache.load("defekt") is None
+    assert not os.path.exists(path)
+    return True
+
+
+def test_atomic_write(temp_dir):
+    """Ein abgebrochener Schreibvorgang lässt den alten Eintrag unverändert"""
+    cache = LedgerCache(cache_dir=temp_dir)
+    df = entry_frame(4)
+    assert cache.store("atomar", df)
+    path = os.path.join(temp_dir, "atomar.pkl")
+    before = open(path, "rb").read()
+
+    def failing_writer(tmp_path):
+        tmp_path.write_bytes(b"halb geschrieben")
+        raise OSError("Datenträger voll")
+
+    try:
+        cache._write_atomic(cache.cache_dir / "atomar.pkl", failing_writer)
+        assert False, "Fehler wurde nicht weitergegeben"
+    except OSError:
+        pass
+    assert open(path, "rb").read() == before
+    assert not os.path.exists(f"{path}.tmp")
+    assert cache.load("atomar").equals(df)
+    return True
+
+
+def test_cache_dir(temp_dir):
+    """Ohne Organisationsnamen (z.B. in Tests) landet der Cache im temporären Verzeichnis"""
+    from src.utils.app_paths import get_cache_dir
+
+    assert get_cache_dir("ledger_cache") == Path(os.environ["FINANZ_CACHE_DIR"]) / "ledger_cache"
+    previous = os.environ.pop("FINANZ_CACHE_DIR")
+    try:
+        assert not app.organizationName()
+        assert get_cache_dir().is_relative_to(tempfile.gettempdir())
+    finally:
+        os.environ["FINANZ_CACHE_DIR"] = previous
+    return True
+
+
+def test_restore_last_session(temp_dir):
+    """Die zuletzt importierte Datei wird beim Start aus dem Cache geladen"""
+    from PySide6.QtCore import QSettings
+    from src.main_window import MainWindow
+
+    path = write_ledger(generate_ledger(500, accounts=10, amount_format='german', seed=5),
+                        os.path.join(temp_dir, "sitzung.csv"))
+    settings = QSettings()
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor = CSVProcessor()
+        assert processor.load_file(path) and not processor.loaded_from_cache
+
+        window = MainWindow()
+        try:
+            # Ohne Einstellung keine Wiederherstellung
+            settings.setValue("last_session/file_path", path)
+            assert not window.restore_last_session()
+
+            settings.setValue("restore_last_session", True)
+            assert window.restore_last_session()
+            assert window.csv_processor.loaded_from_cache
+            assert len(window.csv_processor.processed_data) == len(processor.processed_data)
+
+            # Nicht mehr vorhandene Datei wird ignoriert
+            settings.setValue("last_session/file_path", os.path.join(temp_dir, "fehlt.csv"))
+            assert not window.restore_last_session()
+        finally:
+            window.close()
+            window.deleteLater()
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Ledger-Cache ===")
+    results = []
+    with isolated_settings(TEST_SETTINGS, SETTING_KEYS):
+        try:
+            tests = [("Cache-Schlüssel", test_cache_key), ("Speichern und Laden", test_store_and_load),
+                     ("LRU-Verdrängung", test_lru_eviction), ("Defekte Einträge", test_corrupt_entry),
+                     ("Atomares Schreiben", test_atomic_write), ("Cache-Verzeichnis", test_cache_dir),
+                     ("Letzte Sitzung", test_restore_last_session)]
+            for name, test in tests:
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    results.append((name, test(temp_dir)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Ledger-Cache", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der kopierfreien Zugriffsmethoden (Copy-on-Write) des CSV-Processors
+"""
+
+import sys
+import os
+import tempfile
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+
+def load_ledger(temp_dir, rows=60000):
+    """Lädt eine Buchungsliste über den normalen Import"""
+    file_path = write_ledger(generate_ledger(rows, accounts=25, amount_format='german', seed=34),
+                             os.path.join(temp_dir, 'buchungen.csv'))
+
+    processor = CSVProcessor()
+    assert processor.load_file(file_path), "Datei konnte nicht geladen werden"
+    return processor
+
+
+def measure_peak(func):
+    """Spitzenwert der neu angelegten Speicherblöcke während eines Aufrufs (Bytes)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - before
+
+
+def check_mutation_isolated(processor):
+    """Änderungen an zurückgegebenen Daten verändern das Journal nicht"""
+    original = processor.processed_data
+    snapshot = original.copy(deep=True)
+    account = processor.get_account_numbers()[3]
+
+    settings = QSettings()
+    for mode in ("cumulative", "individual"):
+        settings.setValue("quarter_mode", mode)
+        for data in (processor.get_year_data(), processor.get_data_by_quarter(4),
+                     processor.get_data_by_quarter(2), processor.get_data_by_account(account)):
+            data.loc[data.index[0], 'Betrag_Cent'] = 999999999
+            data['Betrag_Clean'] = 0.0
+            data['Zusatz'] = 1
+            data.drop(index=data.index[:10], inplace=True)
+
+    assert processor.processed_data is original
+    pd.testing.assert_frame_equal(processor.processed_data, snapshot)
+    return True
+
+
+def check_allocations(processor):
+    """Berichtsberechnungen legen keine Kopien des ganzen Journals an"""
+    ledger_bytes = int(processor.processed_data.memory_usage(deep=True).sum())
+    generator = BWAPDFGenerator()
+    settings = QSettings()
+    settings.setValue("quarter_mode", "cumulative")
+
+    year_view = measure_peak(lambda: [processor.get_year_data() for _ in range(20)])
+    full_quarter = measure_peak(lambda: processor.get_data_by_quarter(4))
+
+    def balances():
+        generator._calculate_total_amount(processor)
+        generator._calculate_new_balance(processor)
+        for quarter in range(1, 5):
+            generator._calculate_quarter_balance(quarter, processor)
+
+    balance_peak = measure_peak(balances)
+
+    print(f"📊 Journal: {ledger_bytes / 1024:.0f} KiB, 20x Jahresdaten: {year_view / 1024:.1f} KiB, "
+          f"Q4 kumulativ: {full_quarter / 1024:.1f} KiB, Kontostände: {balance_peak / 1024:.0f} KiB")
+
+    # Flache Ansichten statt Kopien (nur Verwaltungsobjekte)
+    assert year_view < ledger_bytes * 0.05, year_view
+    assert full_quarter < ledger_bytes * 0.05, full_quarter
+    # Kontostände filtern nur die Cent-Spalte
+    assert balance_peak < ledger_bytes * 0.25, balance_peak
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Kopierfreie Zugriffsmethoden ===")
+    temp_dir = tempfile.mkdtemp()
+    results = []
+    with isolated_settings({"decimal_separator": ",", "csv_separator": ";"}, ("quarter_mode",)):
+        try:
+            processor = load_ledger(temp_dir)
+            results.append(("Journal bleibt unverändert", check_mutation_isolated(processor)))
+            results.append(("Keine Vollkopien", check_allocations(processor)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Zugriffsmethoden", False))
+        finally:
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Speicherbudgets je Verarbeitungsstufe (tracemalloc) und Leck-Prüfung bei wiederholtem Import
+
+Gemessen werden Spitzen- und verbleibender Speicher für Import, PDF-Erstellung, JSON-Export
+und JSON-Import. Wird ein Budget überschritten, werden die größten Allokationsstellen ausgegeben.
+
+Umgebungsvariablen:
+    MEMORY_ROWS (Standard 100000, z.B. 1000000 für große Buchungslisten)
+    MEMORY_PDF_ROWS (Standard 10000 - die PDF-Erstellung ist unter tracemalloc sehr langsam)
+    MEMORY_LEAK_ROWS (Standard 20000), MEMORY_LEAK_REPEAT (Standard 5)
+    MEMORY_BUDGET_FACTOR (Standard 1.0) skaliert alle Budgets
+"""
+
+import sys
+import os
+import gc
+import weakref
+import tempfile
+import tracemalloc
+from typing import Callable, Dict, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+MB = 1024 * 1024
+
+# Budget je Stufe: (Spitze fest, Spitze je Zeile, verbleibend fest, verbleibend je Zeile) in Byte
+STAGE_BUDGETS: Dict[str, Tuple[int, int, int, int]] = {
+    "import.csv": (16 * MB, 650, 4 * MB, 250),
+    "pdf": (16 * MB, 2500, 4 * MB, 0),
+    "json.export": (8 * MB, 100, 2 * MB, 0),
+    "json.import": (8 * MB, 650, 4 * MB, 380),
+}
+
+# Zulässiges Wachstum nach dem ersten von mehreren Importen in dasselbe Hauptfenster
+LEAK_BUDGET = 2 * MB
+
+TOP_ALLOCATIONS = 10
+
+TEST_SETTINGS = {"decimal_separator": ",", "json_export_compact": False, "json_export_gzip": False,
+                 "json_trusted_snapshot": False, "restore_last_session": False,
+                 "generate_account_reports": True, "generate_quarterly_reports": True,
+                 "generate_chart_report": True}
+
+# Vom Test selbst geänderte Einstellungen
+SETTING_KEYS = ("json_export", "last_session")
+
+
+def budget(stage: str, rows: int) -> Tuple[int, int]:
+    """Spitzen- und verbleibendes Budget einer Stufe in Byte"""
+    factor = float(os.environ.get("MEMORY_BUDGET_FACTOR", 1.0))
+    peak_fixed, peak_per_row, retained_fixed, retained_per_row = STAGE_BUDGETS[stage]
+    return (int((peak_fixed + peak_per_row * rows) * factor),
+            int((retained_fixed + retained_per_row * rows) * factor))
+
+
+def print_top_allocations(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot):
+    """Gibt die Allokationsstellen mit dem größten Zuwachs aus"""
+    print(f"   Größte Allokationsstellen (Zuwachs seit Stufenbeginn, Top {TOP_ALLOCATIONS}):")
+    for stat in after.compare_to(before, 'lineno')[:TOP_ALLOCATIONS]:
+        if stat.size_diff <= 0:
+            break
+        frame = stat.traceback[0]
+        print(f"   {stat.size_diff / MB:8.2f} MB  {stat.count_diff:+8d}  {frame.filename}:{frame.lineno}")
+
+
+def measure(stage: str, rows: int, action: Callable):
+    """
+    Misst Spitzen- und verbleibenden Speicher einer Stufe und prüft das Budget
+
+    Returns:
+        Tuple[bool, Any]: (Budget eingehalten, Rückgabewert der Stufe)
+    """
+    gc.collect()
+    before = tracemalloc.take_snapshot()
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+
+    result = action()
+
+    peak = tracemalloc.get_traced_memory()[1] - base
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - base
+    peak_budget, retained_budget = budget(stage, rows)
+    passed = peak <= peak_budget and retained <= retained_budget
+
+    print(f"{'✅' if passed else '❌'} {stage:<12} {rows:>8} Zeilen  "
+          f"Spitze {peak / MB:7.1f} MB (Budget {peak_budget / MB:7.1f})  "
+          f"verbleibend {retained / MB:7.1f} MB (Budget {retained_budget / MB:7.1f})")
+    if not passed:
+        print_top_allocations(before, tracemalloc.take_snapshot())
+    return passed, result
+
+
+def warm_up(directory: str):
+    """Einmaliger Durchlauf, damit Modul-Initialisierungen (z.B. chardet-Sprachmodelle) nicht mitzählen"""
+    settings = QSettings()
+    csv_path = write_ledger(generate_ledger(200, 10), os.path.join(directory, "aufwaermen.csv"))
+    processor = CSVProcessor()
+    assert processor.load_file(csv_path), "Import beim Aufwärmen fehlgeschlagen"
+    mappings = {account: "Gruppe" for account in processor.get_account_numbers()}
+    generator = BWAPDFGenerator()
+    pdf_path = os.path.join(directory, "aufwaermen.pdf")
+    settings.setValue("json_export", True)
+    assert generator.generate_bwa_pdf(pdf_path, processor, mappings), "PDF beim Aufwärmen fehlgeschlagen"
+    assert CSVProcessor().load_file(os.path.join(directory, "aufwaermen.json")), "JSON beim Aufwärmen fehlgeschlagen"
+
+
+def check_pipeline(directory: str, rows: int, pdf_rows: int) -> bool:
+    """Budgets für Import, JSON-Export und JSON-Import sowie PDF-Erstellung"""
+    settings = QSettings()
+    passed = True
+
+    csv_path = write_ledger(generate_ledger(rows, 40), os.path.join(directory, "buchungen.csv"))
+    processor = CSVProcessor()
+    ok, loaded = measure("import.csv", rows, lambda: processor.load_file(csv_path))
+    assert loaded, "Import der Buchungsliste fehlgeschlagen"
+    passed &= ok
+
+    generator = BWAPDFGenerator()
+    mappings = {account: f"Gruppe {int(account) % 7}" for account in processor.get_account_numbers()}
+    pdf_path = os.path.join(directory, "bwa.pdf")
+    ok, exported = measure("json.export", rows, lambda: generator._generate_json_export(pdf_path, processor, mappings))
+    assert exported, "JSON-Export fehlgeschlagen"
+    passed &= ok
+
+    json_processor = CSVProcessor()
+    ok, loaded = measure("json.import", rows, lambda: json_processor.load_file(os.path.join(directory, "bwa.json")))
+    assert loaded, "JSON-Import fehlgeschlagen"
+    passed &= ok
+    del processor, json_processor
+
+    # PDF mit eigener (kleinerer) Buchungsliste
+    pdf_csv = write_ledger(generate_ledger(pdf_rows, 40), os.path.join(directory, "pdf_buchungen.csv"))
+    pdf_processor = CSVProcessor()
+    assert pdf_processor.load_file(pdf_csv), "Import der PDF-Buchungsliste fehlgeschlagen"
+    settings.setValue("json_export", False)
+    ok, created = measure("pdf", pdf_rows, lambda: generator.generate_bwa_pdf(pdf_path, pdf_processor, mappings))
+    assert created, "PDF-Erstellung fehlgeschlagen"
+    return passed and ok
+
+
+def check_repeated_imports(directory: str, rows: int, repeat: int) -> bool:
+    """Wiederholte Importe in dasselbe Hauptfenster geben den alten Prozessor vollständig frei"""
+    from src.main_window import MainWindow
+
+    csv_path = write_ledger(generate_ledger(rows, 40), os.path.join(directory, "wiederholt.csv"))
+    window = MainWindow()
+    released = []
+    sizes = []
+    snapshots = []
+    try:
+        for _ in range(repeat):
+            assert window.csv_processor.load_file(csv_path), "Import fehlgeschlagen"
+            window._apply_imported_data(csv_path)
+            released.append(weakref.ref(window.csv_processor))
+            window.reset_csv_data()
+            QApplication.processEvents()
+            gc.collect()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+            snapshots.append(tracemalloc.take_snapshot())
+    finally:
+        window.close()
+        window.deleteLater()
+
+    alive = sum(1 for ref in released if ref() is not None)
+    growth = sizes[-1] - sizes[0]
+    passed = alive == 0 and growth <= LEAK_BUDGET
+    print(f"{'✅' if passed else '❌'} {repeat} Importe à {rows} Zeilen: "
+          f"{alive} alte Prozessoren noch referenziert, Zuwachs nach dem ersten Import "
+          f"{growth / MB:.2f} MB (Budget {LEAK_BUDGET / MB:.1f})")
+    if not passed:
+        for ref in released:
+            if ref() is not None:
+                referrers = [type(referrer).__name__ for referrer in gc.get_referrers(ref())]
+                print(f"   Noch referenziert von: {referrers}")
+        print_top_allocations(snapshots[0], snapshots[-1])
+    return passed
+
+
+def main():
+    """Führt alle Speicher-Tests aus"""
+    print("=== Test: Speicherbudgets je Verarbeitungsstufe ===")
+    rows = int(os.environ.get("MEMORY_ROWS", 100000))
+    pdf_rows = int(os.environ.get("MEMORY_PDF_ROWS", 10000))
+    leak_rows = int(os.environ.get("MEMORY_LEAK_ROWS", 20000))
+    leak_repeat = int(os.environ.get("MEMORY_LEAK_REPEAT", 5))
+
+    results = []
+    tracemalloc.start()
+    with isolated_settings(TEST_SETTINGS, SETTING_KEYS):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                warm_up(directory)
+                results.append(("Budgets je Stufe", check_pipeline(directory, rows, pdf_rows)))
+                results.append(("Wiederholte Importe", check_repeated_imports(directory, leak_rows, leak_repeat)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Speicherbudgets", False))
+        finally:
+            tracemalloc.stop()
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
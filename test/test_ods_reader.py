@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des Streaming-ODS-Lesers (Vergleich und Benchmark gegen die pandas-Engine 'odf')
+"""
+
+import sys
+import os
+import time
+import zipfile
+import tempfile
+import tracemalloc
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.utils import ods_reader
+from synthetic_ledger import generate_ledger
+
+CONTENT_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<office:document-content'
+    ' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"'
+    ' xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"'
+    ' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"'
+    ' xmlns:dc="http://purl.org/dc/elements/1.1/"'
+    ' office:version="1.2"><office:body><office:spreadsheet>'
+)
+CONTENT_FOOTER = '</office:spreadsheet></office:body></office:document-content>'
+
+MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0">'
+    '<manifest:file-entry manifest:full-path="/" '
+    'manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    '</manifest:manifest>'
+)
+
+
+def write_ods(file_path, tables_xml):
+    """Schreibt eine minimale ODS-Datei mit dem angegebenen Tabelleninhalt"""
+    with zipfile.ZipFile(file_path, 'w') as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.spreadsheet',
+                         compress_type=zipfile.ZIP_STORED)
+        archive.writestr('META-INF/manifest.xml', MANIFEST)
+        archive.writestr('content.xml', CONTENT_HEADER + tables_xml + CONTENT_FOOTER)
+
+
+def text_cell(text, repeat=1):
+    """Textzelle"""
+    attr = f' table:number-columns-repeated="{repeat}"' if repeat > 1 else ''
+    return f'<table:table-cell office:value-type="string"{attr}><text:p>{text}</text:p></table:table-cell>'
+
+
+def float_cell(value, display, value_type='float'):
+    """Zahlenzelle (float, currency, percentage)"""
+    return (f'<table:table-cell office:value-type="{value_type}" office:value="{value}">'
+            f'<text:p>{display}</text:p></table:table-cell>')
+
+
+def date_cell(value, display):
+    """Datumszelle"""
+    return (f'<table:table-cell office:value-type="date" office:date-value="{value}">'
+            f'<text:p>{display}</text:p></table:table-cell>')
+
+
+def row(cells, repeat=1):
+    """Tabellenzeile"""
+    attr = f' table:number-rows-repeated="{repeat}"' if repeat > 1 else ''
+    return f'<table:table-row{attr}>{"".join(cells)}</table:table-row>'
+
+
+def edge_case_tables():
+    """Tabellen mit wiederholten Zeilen/Spalten, typisierten Werten und Sonderfällen"""
+    empty_cells = '<table:table-cell table:number-columns-repeated="1020"/>'
+    bookings = [
+        row([text_cell('Sachkontonr.'), text_cell('Betrag'), text_cell('Buchungstag'),
+             text_cell('Verwendungszweck'), text_cell('Quote'), text_cell('Aktiv'), empty_cells]),
+        row([float_cell('4000', '4000'), float_cell('12.5', '12,50 €', 'currency'),
+             date_cell('2024-01-15', '15.01.24'), text_cell('B240001<text:s text:c="3"/>Spende'),
+             float_cell('0.19', '19 %', 'percentage'),
+             '<table:table-cell office:value-type="boolean" office:boolean-value="true">'
+             '<text:p>TRUE</text:p></table:table-cell>', empty_cells]),
+        # Wiederholte Zeile mit wiederholten Zellen
+        row([float_cell('4100', '4100'), float_cell('-3', '-3,00 €', 'currency'),
+             date_cell('2024-04-01T00:00:00', '01.04.24'), text_cell('Miete'),
+             float_cell('1', '100 %', 'percentage'),
+             '<table:table-cell office:value-type="boolean" office:boolean-value="false">'
+             '<text:p>FALSE</text:p></table:table-cell>'], repeat=3),
+        # Leere Zeilen zwischen Daten bleiben erhalten
+        row(['<table:table-cell table:number-columns-repeated="1024"/>'], repeat=2),
+        row([text_cell('1000'), float_cell('1234.56', '1.234,56'), text_cell('31.12.2024'),
+             '<table:table-cell office:value-type="string"><text:p>Mit</text:p>'
+             '<office:annotation><text:p>Kommentar</text:p></office:annotation>'
+             '<text:p> Notiz</text:p></table:table-cell>',
+             '<table:covered-table-cell/>', text_cell('#N/A')]),
+        # Nachfolgende Leerzeilen werden verworfen
+        row(['<table:table-cell table:number-columns-repeated="1024"/>'], repeat=1048000),
+    ]
+    members = [
+        row([text_cell('Mitglied'), text_cell('Beitrag')]),
+        row([text_cell('A'), float_cell('50', '50')]),
+    ]
+    return (
+        '<table:table table:name="Mitglieder">' + ''.join(members) + '</table:table>'
+        '<table:table table:name="Buchungen">' + ''.join(bookings) + '</table:table>'
+        '<table:table table:name="Leer"><table:table-row>'
+        '<table:table-cell table:number-columns-repeated="1024"/></table:table-row></table:table>'
+    )
+
+
+def check_edge_cases(file_path):
+    """Ergebnis muss exakt dem der odf-Engine entsprechen"""
+    write_ods(file_path, edge_case_tables())
+
+    expected_names = pd.ExcelFile(file_path, engine='odf').sheet_names
+    assert ods_reader.get_sheet_names(file_path) == expected_names, expected_names
+
+    for sheet in expected_names:
+        expected = pd.read_excel(file_path, sheet_name=sheet, engine='odf')
+        actual = ods_reader.read_sheet(file_path, sheet)
+        pd.testing.assert_frame_equal(actual, expected)
+
+    # Ohne Blatt-Namen wird das erste Blatt gelesen
+    pd.testing.assert_frame_equal(
+        ods_reader.read_sheet(file_path),
+        pd.read_excel(file_path, sheet_name=0, engine='odf')
+    )
+
+    try:
+        ods_reader.read_sheet(file_path, 'Fehlt')
+        return False
+    except ValueError:
+        pass
+    return True
+
+
+def check_released_rows(file_path, rows=15000):
+    """Blattnamen, Kopfzeilen und spätere Blätter werden gelesen, ohne Zeilen im Speicher zu halten"""
+    sheet_rows = ''.join(row([text_cell(f"Buchung {i}"), text_cell(str(i))]) for i in range(rows))
+    write_ods(file_path, ''.join(f'<table:table table:name="Blatt {n}">{sheet_rows}</table:table>'
+                                 for n in range(3)))
+
+    peaks = {}
+    for name, read in (("Blattnamen", lambda: ods_reader.get_sheet_names(file_path)),
+                       ("Kopfzeilen", lambda: ods_reader.read_header_rows(file_path)),
+                       ("Vorschau letztes Blatt",
+                        lambda: list(ods_reader.iter_sheet_rows(file_path, "Blatt 2", max_rows=5)))):
+        tracemalloc.start()
+        result = read()
+        peaks[name] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert result, name
+
+    print("💾 Spitzenspeicher: " + ", ".join(f"{name} {peak / 1024:.0f} KiB" for name, peak in peaks.items()))
+    # Gehaltene (auch geleerte) Zeilenelemente kämen auf mehrere MiB
+    assert max(peaks.values()) < 1024 * 1024, peaks
+    return True
+
+
+def check_benchmark(file_path, rows=3000):
+    """Vergleicht die Laufzeit mit der odf-Engine an einer typischen Buchungsliste"""
+    df = generate_ledger(rows, accounts=40, amount_format='numeric', seed=31)
+    with pd.ExcelWriter(file_path, engine='odf') as writer:
+        df.to_excel(writer, sheet_name='Buchungen', index=False)
+
+    start = time.perf_counter()
+    expected = pd.read_excel(file_path, sheet_name='Buchungen', engine='odf')
+    odf_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = ods_reader.read_sheet(file_path, 'Buchungen')
+    native_time = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(actual, expected)
+    print(f"⏱️  {rows} Zeilen: odf-Engine {odf_time:.2f}s, Streaming-Leser {native_time:.2f}s "
+          f"(Faktor {odf_time / max(native_time, 1e-9):.1f})")
+    assert native_time < odf_time, "Streaming-Leser ist langsamer als die odf-Engine"
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Streaming-ODS-Leser ===")
+    try:
+        import odf  # noqa: F401
+    except ImportError:
+        print("⚠️ Vergleichstest übersprungen - odfpy nicht installiert")
+        return True
+
+    temp_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        results.append(("Sonderfälle wie odf-Engine", check_edge_cases(os.path.join(temp_dir, 'sonderfaelle.ods'))))
+        results.append(("Zeilen freigegeben", check_released_rows(os.path.join(temp_dir, 'blaetter.ods'))))
+        results.append(("Benchmark", check_benchmark(os.path.join(temp_dir, 'benchmark.ods'))))
+    except AssertionError as e:
+        print(f"❌ Test fehlgeschlagen: {e}")
+        results.append(("ODS-Leser", False))
+    finally:
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der kompakten PDF-Ausgabe (Logo in Druckauflösung, Nachoptimierung mit PyMuPDF)
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+from PIL import Image as PILImage
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.utils import pdf_compaction
+from src.utils.pdf_compaction import print_resolution_image, optimize_pdf, format_size, PYMUPDF_AVAILABLE
+from synthetic_ledger import generate_ledger
+from test_helpers import isolated_settings
+
+if PYMUPDF_AVAILABLE:
+    import pymupdf
+
+TEST_SETTINGS = {"decimal_separator": ",", "json_export": False, "generate_account_reports": True}
+
+# Vom Test selbst geänderte Einstellungen
+SETTING_KEYS = ("organization/logo_path", "pdf_compact", "pdf_optimize")
+
+# Maximale Logogröße auf dem Deckblatt (6 x 4 cm) bei 300 dpi
+LOGO_BOX = (709, 472)
+
+
+def create_logo(path, size=(4000, 3000), format="JPEG"):
+    """Großes Logo mit Verlauf (wie ein Foto in voller Kameraauflösung)"""
+    width, height = size
+    image = PILImage.linear_gradient("L").resize(size).convert("RGB")
+    image.paste((200, 40, 40), (width // 4, height // 4, width // 2, height // 2))
+    image.save(path, format)
+
+
+def test_logo_downsampling(temp_dir):
+    """Logo wird einmal verkleinert und nach Pfad und Änderungszeit zwischengespeichert"""
+    logo = os.path.join(temp_dir, "logo.jpg")
+    create_logo(logo)
+    scaled = print_resolution_image(logo, 6 * 28.3465, 4 * 28.3465)
+    assert scaled != logo and scaled.endswith(".jpg")
+    assert not os.path.exists(f"{scaled}.tmp")
+    with PILImage.open(scaled) as image:
+        assert image.width <= LOGO_BOX[0] and image.height <= LOGO_BOX[1], image.size
+        assert max(image.width - LOGO_BOX[0], image.height - LOGO_BOX[1]) >= -1
+
+    # Zweiter Aufruf aus dem Cache, geänderte Datei ergibt ein neues Bild
+    assert print_resolution_image(logo, 6 * 28.3465, 4 * 28.3465) == scaled
+    create_logo(logo, size=(3000, 3000))
+    os.utime(logo, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    rescaled = print_resolution_image(logo, 6 * 28.3465, 4 * 28.3465)
+    assert rescaled != scaled
+    with PILImage.open(rescaled) as image:
+        assert image.width == image.height
+
+    # Abgebrochenes Schreiben hinterlässt weder ein halbes Bild noch eine temporäre Datei
+    pdf_compaction._image_cache.clear()
+    os.remove(rescaled)
+    original_save = PILImage.Image.save
+
+    def failing_save(image, fp, *args, **kwargs):
+        with open(fp, "wb") as f:
+            f.write(b"halb")
+        raise OSError("Datenträger voll")
+
+    PILImage.Image.save = failing_save
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert print_resolution_image(logo, 6 * 28.3465, 4 * 28.3465) == logo
+    finally:
+        PILImage.Image.save = original_save
+    assert not os.path.exists(rescaled) and not os.path.exists(f"{rescaled}.tmp")
+    assert print_resolution_image(logo, 6 * 28.3465, 4 * 28.3465) == rescaled
+
+    # Kleine Bilder und Grafiken mit Transparenz
+    small = os.path.join(temp_dir, "klein.png")
+    PILImage.new("RGBA", (200, 100), (0, 0, 255, 128)).save(small)
+    assert print_resolution_image(small, 170, 113) == small
+    large_png = os.path.join(temp_dir, "gross.png")
+    PILImage.new("RGBA", (3000, 2000), (0, 0, 255, 128)).save(large_png)
+    assert print_resolution_image(large_png, 170, 113).endswith(".png")
+    assert print_resolution_image(os.path.join(temp_dir, "fehlt.png"), 170, 113).endswith("fehlt.png")
+    return True
+
+
+def test_compact_output(temp_dir):
+    """Kompakter Modus verkleinert das PDF bei identischem Text"""
+    processor = CSVProcessor()
+    processor.raw_data = generate_ledger(3000, accounts=30, amount_format='german', seed=21)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert processor._process_data()
+    mappings = {account: "Spenden" for account in processor.get_account_numbers()}
+    logo = os.path.join(temp_dir, "logo_bwa.jpg")
+    create_logo(logo)
+
+    settings = QSettings()
+    settings.setValue("organization/logo_path", logo)
+    generator = BWAPDFGenerator()
+    standard_path = os.path.join(temp_dir, "standard.pdf")
+    compact_path = os.path.join(temp_dir, "kompakt.pdf")
+
+    settings.setValue("pdf_compact", False)
+    settings.setValue("pdf_optimize", False)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert generator.generate_bwa_pdf(standard_path, processor, mappings)
+    assert generator.size_report['before'] == generator.size_report['after'] == os.path.getsize(standard_path)
+
+    settings.setValue("pdf_compact", True)
+    settings.setValue("pdf_optimize", True)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert generator.generate_bwa_pdf(compact_path, processor, mappings)
+    report = generator.size_report
+    assert "PDF-Größe:" in output.getvalue()
+    assert report['after'] == os.path.getsize(compact_path) and report['after'] <= report['before']
+
+    standard_size = os.path.getsize(standard_path)
+    compact_size = os.path.getsize(compact_path)
+    assert compact_size < standard_size / 2, f"{compact_size} nicht deutlich kleiner als {standard_size}"
+
+    if PYMUPDF_AVAILABLE:
+        with pymupdf.open(standard_path) as standard, pymupdf.open(compact_path) as compact:
+            assert [page.get_text() for page in standard] == [page.get_text() for page in compact]
+            images = compact[0].get_images(full=True)
+            assert len(images) == 1
+            assert images[0][2] <= LOGO_BOX[0] and images[0][3] <= LOGO_BOX[1]
+    print(f"   Standard {format_size(standard_size)}, kompakt {format_size(compact_size)} "
+          f"(Optimierung {format_size(report['before'])} → {format_size(report['after'])})")
+    return True
+
+
+def test_optimize_pdf(temp_dir):
+    """Nachoptimierung ersetzt die Datei nur bei kleinerem Ergebnis"""
+    if not PYMUPDF_AVAILABLE:
+        return True
+    path = os.path.join(temp_dir, "doppelt.pdf")
+    with pymupdf.open() as document:
+        for _ in range(5):
+            page = document.new_page()
+            page.insert_text((72, 72), "Gleicher Inhalt " * 20)
+        document.save(path)
+    before, after = optimize_pdf(path)
+    assert after <= before and os.path.getsize(path) == after
+    assert not os.path.exists(f"{path}.optimiert")
+    with pymupdf.open(path) as document:
+        assert document.page_count == 5
+    assert format_size(512) == "512 B" and format_size(1536) == "1,5 KB"
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Kompakte PDF-Ausgabe ===")
+    results = []
+    with isolated_settings(TEST_SETTINGS, SETTING_KEYS):
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # Verkleinerte Bilder landen im temporären Cache-Verzeichnis des Tests
+                pdf_compaction._image_cache.clear()
+                results.append(("Logo in Druckauflösung", test_logo_downsampling(temp_dir)))
+                results.append(("Kompakter Modus", test_compact_output(temp_dir)))
+                results.append(("Nachoptimierung", test_optimize_pdf(temp_dir)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Kompakte PDF-Ausgabe", False))
+        finally:
+            pdf_compaction._image_cache.clear()
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Entwurfsvorschau (Entwurfs-PDF, LRU-Cache und Rasterung nur sichtbarer Seiten)
+"""
+
+import sys
+import os
+import io
+import time
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from src.dialogs.pdf_preview_dialog import PDFPreviewDialog, PixmapCache, PYMUPDF_AVAILABLE, PAGE_CACHE_SIZE
+from synthetic_ledger import generate_ledger
+from test_helpers import isolated_settings
+
+if PYMUPDF_AVAILABLE:
+    import pymupdf
+
+TEST_SETTINGS = {"decimal_separator": ",", "json_export": True, "generate_account_reports": True,
+                 "generate_quarterly_reports": True, "generate_chart_report": True}
+
+
+def load_processor(rows=3000, accounts=30):
+    """Verarbeitete synthetische Buchungsliste"""
+    processor = CSVProcessor()
+    processor.raw_data = generate_ledger(rows, accounts=accounts, amount_format='german', seed=12)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert processor._process_data()
+    return processor
+
+
+def page_texts(path):
+    with pymupdf.open(path) as document:
+        return [page.get_text() for page in document]
+
+
+def test_draft_pdf(processor, temp_dir):
+    """Entwurf ohne Sachkonten bzw. mit gekürzten Buchungslisten, Summen unverändert"""
+    generator = BWAPDFGenerator()
+    mappings = {account: "Spenden" for account in processor.get_account_numbers()}
+    full_path = os.path.join(temp_dir, "voll.pdf")
+    draft_path = os.path.join(temp_dir, "entwurf.pdf")
+    short_path = os.path.join(temp_dir, "kurz.pdf")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        assert generator.generate_bwa_pdf(full_path, processor, mappings)
+        full_time = time.perf_counter() - start
+        start = time.perf_counter()
+        assert generator.generate_draft_pdf(draft_path, processor, mappings)
+        draft_time = time.perf_counter() - start
+        assert generator.generate_draft_pdf(short_path, processor, mappings, include_accounts=True, max_bookings=5)
+    assert generator._draft is None
+
+    full, draft, short = page_texts(full_path), page_texts(draft_path), page_texts(short_path)
+    assert not any("Buchungsnr." in text for text in draft), "Entwurf enthält Sachkonten"
+    assert len(draft) < len(short) < len(full)
+
+    # Gekürzte Sachkonten: Hinweis auf ausgelassene Buchungen, Gesamtsumme wie im vollständigen PDF
+    account = processor.get_account_numbers()[0]
+    count = len(processor.get_data_by_account(account))
+    title = f"\nSachkonto {account}\n"
+    full_account = "".join(full).split(title)[1]
+    short_account = "".join(short).split(title)[1]
+    assert f"{count - 5} weitere Buchungen (Entwurf)" in short_account
+    total = full_account.split("GESAMTERGEBNIS JAHR")[1].split()[0]
+    assert short_account.split("GESAMTERGEBNIS JAHR")[1].split()[0] == total
+    print(f"   Vollständig {len(full)} Seiten in {full_time:.2f}s, Entwurf {len(draft)} Seiten in "
+          f"{draft_time:.2f}s, gekürzt {len(short)} Seiten")
+    return True
+
+
+def test_pixmap_cache():
+    """LRU: zuletzt angezeigte Seiten bleiben, die ältesten werden verdrängt"""
+    cache = PixmapCache(3)
+    for index in range(3):
+        cache.put(index, index)
+    assert cache.get(0) == 0  # 0 ist jetzt zuletzt verwendet
+    cache.put(3, 3)
+    assert cache.keys() == [2, 0, 3] and cache.get(1) is None
+    assert len(cache) == 3
+    return True
+
+
+def test_lazy_rendering(processor):
+    """Gerastert werden nur sichtbare Seiten, der Cache bleibt begrenzt"""
+    mappings = {account: "Spenden" for account in processor.get_account_numbers()}
+    dialog = PDFPreviewDialog(processor, mappings)
+    dialog.accounts_checkbox.setChecked(True)
+    dialog.bookings_spin.setValue(40)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert dialog.refresh()
+    dialog.resize(700, 900)
+    dialog.show()
+    app.processEvents()
+
+    view = dialog.page_view
+    pages = view.page_count()
+    assert pages > PAGE_CACHE_SIZE, f"Zu wenige Seiten für den Test: {pages}"
+    visible = len(view.pages_in(dialog.scroll_area.viewport().rect()))
+    assert 0 < view.render_count <= visible + 1, f"{view.render_count} Seiten gerastert, sichtbar {visible}"
+
+    # Durch das Dokument scrollen: jede Seite höchstens einmal je Besuch, Cache begrenzt
+    scrollbar = dialog.scroll_area.verticalScrollBar()
+    step = dialog.scroll_area.viewport().height()
+    for value in range(0, scrollbar.maximum() + step, step):
+        scrollbar.setValue(value)
+        app.processEvents()
+    assert view.render_count <= pages + 1
+    assert len(view.cache) <= PAGE_CACHE_SIZE
+    last = (pages - 1, view.zoom, view.devicePixelRatioF())
+    assert last in view.cache.keys()
+
+    # Zurück zum Anfang: erste Seiten wurden verdrängt und werden neu gerastert
+    before = view.render_count
+    scrollbar.setValue(0)
+    app.processEvents()
+    assert view.render_count > before
+    dialog.reject()
+    assert dialog.document is None and len(view.cache) == 0
+    print(f"   {pages} Seiten, {view.render_count} Rasterungen beim Durchblättern")
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Entwurfsvorschau ===")
+    if not PYMUPDF_AVAILABLE:
+        print("⚠️ PyMuPDF nicht installiert - Test übersprungen")
+        return True
+
+    results = []
+    with isolated_settings(TEST_SETTINGS):
+        try:
+            processor = load_processor()
+            with tempfile.TemporaryDirectory() as temp_dir:
+                results.append(("Entwurfs-PDF", test_draft_pdf(processor, temp_dir)))
+                # Entwurf schreibt keinen JSON-Export (nur das vollständige PDF)
+                exports = [name for name in os.listdir(temp_dir) if not name.endswith(".pdf")]
+                assert len(exports) == 1 and exports[0].startswith("voll"), f"JSON-Exporte: {exports}"
+            results.append(("LRU-Cache", test_pixmap_cache()))
+            results.append(("Rasterung sichtbarer Seiten", test_lazy_rendering(processor)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Entwurfsvorschau", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
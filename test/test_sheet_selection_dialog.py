@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des Blatt-Auswahl-Dialogs (Vorschau im Hintergrund, Schließen ohne Warten)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication, QDialog
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.dialogs.sheet_selection_dialog import SheetSelectionDialog
+from src.utils.csv_processor import CSVProcessor
+from src.utils.workbook_session import WorkbookSession, PreviewCancelled
+from test_helpers import isolated_settings
+from test_ods_reader import write_ods, text_cell, row
+
+# Dauer einer langsamen Vorschau (z.B. großes ODS-Blatt)
+SLOW_PREVIEW_SECONDS = 2.0
+# Zeilen des großen Blatts vor dem Buchungsblatt (Vorschau und Import müssen es überspringen)
+ARCHIVE_ROWS = 150000
+
+
+class SlowSession:
+    """Sitzung, deren Vorschau erst nach einer Freigabe fertig wird und zwischen Zeilenblöcken abbricht"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.finished = threading.Event()
+        self.reads = []
+
+    def read_preview(self, sheet_name, nrows, cancelled=None):
+        self.reads.append(sheet_name)
+        self.started.set()
+        try:
+            deadline = time.monotonic() + SLOW_PREVIEW_SECONDS
+            while not self.release.is_set() and time.monotonic() < deadline:
+                if cancelled is not None and cancelled.is_set():
+                    raise PreviewCancelled(sheet_name)
+                time.sleep(0.01)
+            return pd.DataFrame({'Sachkontonr.': ['1000'], 'Betrag': [1.0]}), 1
+        finally:
+            self.finished.set()
+
+
+def create_workbook(file_path):
+    """ODS-Datei mit großem Archivblatt vor dem Buchungsblatt"""
+    archive = ''.join(row([text_cell(f"Mitglied {i}"), text_cell(str(i))]) for i in range(ARCHIVE_ROWS))
+    bookings = ''.join(
+        row([text_cell(str(4000 + i % 5)), text_cell(f"{i},50"), text_cell(f"{1 + i % 28:02d}.03.2024")])
+        for i in range(20)
+    )
+    write_ods(file_path,
+              f'<table:table table:name="Archiv">{archive}</table:table>'
+              f'<table:table table:name="Buchungen">'
+              f'{row([text_cell(name) for name in ("Sachkontonr.", "Betrag", "Buchungstag")])}{bookings}'
+              f'</table:table>')
+
+
+def test_preview_loaded():
+    """Vorschau wird im Hintergrund geladen und angezeigt"""
+    session = SlowSession()
+    session.release.set()
+    dialog = SheetSelectionDialog("buchungen.xlsx", ["Mitglieder", "Buchungen"], session=session,
+                                  preferred_sheet="Buchungen")
+    deadline = time.monotonic() + SLOW_PREVIEW_SECONDS
+    while "Buchungen" not in dialog.preview_cache and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    assert "Buchungen" in dialog.preview_cache
+    assert "Sachkontonr." in dialog.columns_text.toPlainText()
+    dialog.accept()
+    assert dialog.get_selected_sheet() == "Buchungen"
+    return True
+
+
+def test_close_without_waiting():
+    """Schließen während einer langsamen Vorschau blockiert nicht und bricht den Leser ab"""
+    session = SlowSession()
+    dialog = SheetSelectionDialog("buchungen.xlsx", ["Mitglieder", "Buchungen"], session=session)
+    assert session.started.wait(SLOW_PREVIEW_SECONDS)
+
+    start = time.perf_counter()
+    dialog.reject()
+    elapsed = time.perf_counter() - start
+    assert dialog.result() == QDialog.DialogCode.Rejected
+    assert elapsed < 0.2, f"Schließen dauerte {elapsed:.2f}s"
+
+    # Der laufende Leser endet ohne Freigabe, sein Ergebnis erreicht den Dialog nicht mehr
+    assert session.finished.wait(0.5), "Leser hat den Abbruch nicht bemerkt"
+    dialog.thread_pool.waitForDone()
+    app.processEvents()
+    assert not dialog.preview_cache and not dialog._workers
+    assert session.reads == ["Mitglieder"]
+    print(f"   Schließen nach {elapsed * 1000:.0f} ms")
+    return True
+
+
+def test_import_after_accept(temp_dir):
+    """Import direkt nach der Auswahl wartet nicht auf die laufende Vorschau (gemeinsame Sitzung)"""
+    file_path = os.path.join(temp_dir, "vereinsdaten.ods")
+    create_workbook(file_path)
+
+    # Vergleichswerte: Vorschau und Import jeweils allein
+    start = time.perf_counter()
+    WorkbookSession(file_path).read_preview("Buchungen")
+    preview_time = time.perf_counter() - start
+    start = time.perf_counter()
+    assert CSVProcessor().load_file(file_path, "Buchungen")
+    load_time = time.perf_counter() - start
+
+    processor = CSVProcessor()
+    session = processor.get_workbook_session(file_path)
+    dialog = SheetSelectionDialog(file_path, session.sheet_names, session=session, preferred_sheet="Buchungen")
+    assert "Buchungen" in dialog._workers
+    time.sleep(min(0.2, preview_time / 4))
+
+    start = time.perf_counter()
+    dialog.accept()
+    assert processor.load_file(file_path, dialog.get_selected_sheet())
+    elapsed = time.perf_counter() - start
+
+    print(f"   Vorschau allein {preview_time:.2f}s, Import allein {load_time:.2f}s, "
+          f"accept() bis Import fertig {elapsed:.2f}s")
+    assert processor.get_record_count() == 20
+    assert elapsed < load_time + preview_time / 2, "Import hat auf die abgebrochene Vorschau gewartet"
+
+    # Abgebrochene Vorschau wird nicht zwischengespeichert
+    dialog.thread_pool.waitForDone()
+    app.processEvents()
+    assert ("Buchungen", dialog.preview_rows) not in session._previews
+    assert "Buchungen" not in dialog.preview_cache
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Blatt-Auswahl-Dialog ===")
+    results = []
+    with isolated_settings({"decimal_separator": ","}):
+        try:
+            results.append(("Vorschau im Hintergrund", test_preview_loaded()))
+            results.append(("Schließen ohne Warten", test_close_without_waiting()))
+            with tempfile.TemporaryDirectory() as temp_dir:
+                results.append(("Import nach Auswahl", test_import_after_accept(temp_dir)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Blatt-Auswahl-Dialog", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Hänger-Überwachung der Ereignisschleife
+"""
+
+import sys
+import os
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings, QTimer, QEventLoop
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils import stall_monitor
+from src.utils.stall_monitor import StallMonitor, configure_stall_monitor, get_stall_monitor, STALL_ENV
+from test_helpers import isolated_settings
+
+SETTING_KEYS = ("stall_monitor_enabled", "stall_monitor_threshold_ms")
+
+
+def blocking_call(seconds):
+    """Blockiert die Ereignisschleife (wie ein langer Import)"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+def run_event_loop(milliseconds, action=None):
+    """Lässt die Ereignisschleife laufen und führt 'action' darin aus"""
+    loop = QEventLoop()
+    if action is not None:
+        QTimer.singleShot(50, action)
+    QTimer.singleShot(milliseconds, loop.quit)
+    loop.exec()
+
+
+def test_idle_loop():
+    """Ohne blockierende Aufrufe wird kein Hänger protokolliert"""
+    monitor = StallMonitor(threshold_ms=150, heartbeat_ms=20)
+    monitor.start()
+    run_event_loop(400)
+    monitor.stop()
+    print(f"   {monitor.heartbeats} Heartbeats, größte Verzögerung {monitor.max_latency * 1000:.0f} ms")
+    assert monitor.heartbeats > 5
+    assert monitor.stall_count == 0
+    assert "Keine Hänger" in monitor.format_summary()
+    return True
+
+
+def test_stall_with_stack(directory):
+    """Blockierender Aufruf wird mit Dauer und Stack protokolliert"""
+    log_path = os.path.join(directory, "hänger.log")
+    monitor = StallMonitor(threshold_ms=150, heartbeat_ms=20, log_path=log_path)
+    monitor.start()
+    run_event_loop(900, lambda: blocking_call(0.5))
+    monitor.stop()
+
+    assert monitor.stall_count == 1, f"{monitor.stall_count} Hänger statt 1"
+    stall = monitor.stalls[0]
+    print(f"   Hänger {stall.seconds * 1000:.0f} ms bei {stall.location}")
+    assert 0.4 <= stall.seconds < 0.8
+    assert any("blocking_call" in entry for entry in stall.stack), "Blockierender Aufruf fehlt im Stack"
+    assert "blocking_call" in stall.location
+
+    with open(log_path, encoding='utf-8') as f:
+        log = f.read()
+    assert "blockiert" in log and "blocking_call" in log
+
+    summary = monitor.summary()
+    assert summary['stalls'] == 1 and summary['max_latency_ms'] >= 400
+    assert "1 Hänger" in monitor.format_summary()
+    return True
+
+
+def test_configuration(directory):
+    """Aktivierung über Einstellung, Umgebungsvariable und Anzeige im Über-Dialog"""
+    settings = QSettings()
+    os.environ["FINANZ_CACHE_DIR"] = directory
+    os.environ.pop(STALL_ENV, None)
+    try:
+        settings.setValue("stall_monitor_enabled", False)
+        assert configure_stall_monitor() is None and get_stall_monitor() is None
+
+        settings.setValue("stall_monitor_enabled", True)
+        settings.setValue("stall_monitor_threshold_ms", 300)
+        monitor = configure_stall_monitor()
+        assert monitor is not None and monitor.is_running
+        assert monitor.threshold == 0.3
+        assert monitor.log_path.startswith(os.path.join(directory, "logs"))
+
+        from src.dialogs.about_dialog import AboutDialog
+        dialog = AboutDialog()
+        assert "Hänger" in dialog.stall_summary_label.text()
+        dialog.deleteLater()
+
+        # Umgebungsvariable hat Vorrang
+        os.environ[STALL_ENV] = "0"
+        assert configure_stall_monitor() is None and not monitor.is_running
+        os.environ[STALL_ENV] = "500"
+        settings.setValue("stall_monitor_enabled", False)
+        monitor = configure_stall_monitor()
+        assert monitor is not None and monitor.threshold == 0.5
+    finally:
+        os.environ.pop(STALL_ENV, None)
+        settings.setValue("stall_monitor_enabled", False)
+        configure_stall_monitor()
+        os.environ.pop("FINANZ_CACHE_DIR", None)
+    assert stall_monitor.get_stall_monitor() is None
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Hänger-Überwachung der Oberfläche ===")
+
+    results = []
+    with isolated_settings(keys=SETTING_KEYS):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                results.append(("Ruhige Ereignisschleife", test_idle_loop()))
+                results.append(("Hänger mit Stack", test_stall_with_stack(directory)))
+                results.append(("Aktivierung", test_configuration(directory)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Hänger-Überwachung", False))
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -63,10 +63,12 @@ def test_string_consistency():
     print(f"Datei geladen: {success}")
     
     if success:
-        print("\n--- Rohdaten nach Laden ---")
-        print(f"Raw data Sachkontonr. column type: {processor.raw_data['Sachkontonr.'].dtype}")
-        print(f"Raw data sample: {processor.raw_data['Sachkontonr.'].head().tolist()}")
-        print(f"Raw data types: {[type(x) for x in processor.raw_data['Sachkontonr.'].head().tolist()]}")
+        # Rohdaten sind bei einem Treffer im Import-Cache nicht vorhanden
+        if processor.raw_data is not None:
+            print("\n--- Rohdaten nach Laden ---")
+            print(f"Raw data Sachkontonr. column type: {processor.raw_data['Sachkontonr.'].dtype}")
+            print(f"Raw data sample: {processor.raw_data['Sachkontonr.'].head().tolist()}")
+            print(f"Raw data types: {[type(x) for x in processor.raw_data['Sachkontonr.'].head().tolist()]}")
         
         print("\n--- Verarbeitete Daten ---")
         print(f"Processed data Sachkontonr. column type: {processor.processed_data['Sachkontonr.'].dtype}")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des Laufzeit-Tracings (Spans und Export im Chrome-Trace-Format)
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QSettings
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from src.utils.tracing import tracer, span, traced, configure_tracing, TRACE_ENV
+from src.utils.csv_processor import CSVProcessor
+from src.utils.bwa_generator import BWAPDFGenerator
+from synthetic_ledger import generate_ledger, write_ledger
+from test_helpers import isolated_settings
+
+TEST_SETTINGS = {"decimal_separator": ",", "json_export": False, "generate_account_reports": True,
+                 "generate_quarterly_reports": True, "generate_chart_report": True}
+
+
+def reset_tracer():
+    """Tracer in den Ausgangszustand versetzen"""
+    tracer.disable()
+    tracer.clear()
+    tracer.output_path = None
+
+
+def test_disabled_overhead():
+    """Deaktiviert werden keine Ereignisse gesammelt und Spans kosten fast nichts"""
+    reset_tracer()
+
+    @traced("Funktion")
+    def work(value):
+        return value + 1
+
+    calls = 100000
+    start = time.perf_counter()
+    for i in range(calls):
+        with span("Schleife", "test", index=i):
+            work(i)
+    elapsed = time.perf_counter() - start
+    print(f"   {calls} deaktivierte Spans: {elapsed * 1000:.1f} ms")
+    assert not tracer.events, "Deaktivierter Tracer hat Ereignisse gespeichert"
+    assert elapsed < 1.0, f"Deaktivierte Spans zu langsam: {elapsed:.3f}s"
+    assert work(1) == 2 and work.__name__ == "work"
+    return True
+
+
+def test_configuration(directory):
+    """Aktivierung über Umgebungsvariable (Vorrang) und Einstellung"""
+    reset_tracer()
+    settings = QSettings()
+    os.environ.pop(TRACE_ENV, None)
+
+    settings.setValue("trace_enabled", False)
+    assert not configure_tracing() and not tracer.enabled
+
+    # Einstellung: Standardpfad im Cache-Verzeichnis
+    os.environ["FINANZ_CACHE_DIR"] = directory
+    settings.setValue("trace_enabled", True)
+    assert configure_tracing() and tracer.enabled
+    assert tracer.output_path.startswith(os.path.join(directory, "traces"))
+
+    # Umgebungsvariable hat Vorrang
+    reset_tracer()
+    trace_path = os.path.join(directory, "eigener_trace.json")
+    os.environ[TRACE_ENV] = trace_path
+    settings.setValue("trace_enabled", False)
+    assert configure_tracing() and tracer.output_path == trace_path
+
+    os.environ[TRACE_ENV] = "0"
+    settings.setValue("trace_enabled", True)
+    assert not configure_tracing() and not tracer.enabled
+    os.environ.pop(TRACE_ENV)
+    os.environ.pop("FINANZ_CACHE_DIR")
+    return True
+
+
+def test_chrome_trace(directory):
+    """Import und PDF-Erstellung erzeugen verschachtelte Spans im Chrome-Trace-Format"""
+    reset_tracer()
+    trace_path = os.path.join(directory, "trace.json")
+    tracer.enable(trace_path)
+
+    csv_path = write_ledger(generate_ledger(600, accounts=6, amount_format='german', seed=43),
+                            os.path.join(directory, "buchungen.csv"))
+    processor = CSVProcessor()
+    assert processor.load_file(csv_path)
+    mappings = {account: "Einnahmen" for account in processor.get_account_numbers()}
+    assert BWAPDFGenerator().generate_bwa_pdf(os.path.join(directory, "bwa.pdf"), processor, mappings)
+    assert tracer.write() == trace_path
+    tracer.disable()
+
+    with open(trace_path, encoding='utf-8') as f:
+        trace = json.load(f)
+    events = trace["traceEvents"]
+    spans = [event for event in events if event["ph"] == "X"]
+    names = {event["name"] for event in spans}
+    print(f"   {len(spans)} Spans, u.a.: {sorted(names)[:8]}")
+
+    # Alle Ebenen sind vertreten
+    expected = {"Import", "Datei lesen", "CSV lesen", "Encoding erkennen", "Verarbeitung", "Beträge",
+                "BWA erstellen", "Deckblatt", "Quartale", "Jahr", "Sachkonten", "Sachkonto",
+                "Seitenaufbau", "Seite 1", "Fußzeile"}
+    missing = expected - names
+    assert not missing, f"Fehlende Spans: {missing}"
+
+    # Pflichtfelder und Metadaten
+    for event in spans:
+        assert {"name", "cat", "ts", "dur", "pid", "tid"} <= set(event)
+        assert event["dur"] >= 0
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in events)
+
+    # Kind-Spans liegen innerhalb ihres Eltern-Spans
+    def single(name):
+        return next(event for event in spans if event["name"] == name)
+    parent, child = single("Import"), single("Verarbeitung")
+    assert parent["ts"] <= child["ts"] and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"] + 1
+    reading = single("Datei lesen")
+    assert reading["args"]["rows"] == 600
+
+    stage = single("Beträge")
+    assert stage["args"]["rows_in"] == 600
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Laufzeit-Tracing ===")
+    results = []
+    with isolated_settings(TEST_SETTINGS, ("trace_enabled",)):
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                results.append(("Deaktiviert ohne Kosten", test_disabled_overhead()))
+                results.append(("Aktivierung", test_configuration(directory)))
+                results.append(("Chrome-Trace", test_chrome_trace(directory)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Tracing", False))
+        finally:
+            reset_tracer()
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test der Arbeitsmappen-Sitzung (Datei wird pro Import nur einmal geöffnet)
+"""
+
+import sys
+import os
+import time
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import workbook_session
+from src.utils.file_handler import FileHandler
+from src.utils.workbook_session import WorkbookSession
+
+
+class CountingExcelFile(pd.ExcelFile):
+    """ExcelFile, das die Anzahl der Öffnungen zählt"""
+    open_count = 0
+
+    def __init__(self, *args, **kwargs):
+        CountingExcelFile.open_count += 1
+        super().__init__(*args, **kwargs)
+
+
+def create_workbook(file_path, engine):
+    """Erstellt eine Arbeitsmappe mit zwei Blättern"""
+    bwa_data = pd.DataFrame({
+        'Sachkontonr.': ['1000', '4000', '5000'],
+        'Betrag': [100.0, -50.0, 25.5],
+        'Buchungstag': ['2024-01-15', '2024-02-10', '2024-03-05']
+    })
+    other_data = pd.DataFrame({'Mitglied': ['A', 'B'], 'Beitrag': [50.0, 75.0]})
+    with pd.ExcelWriter(file_path, engine=engine) as writer:
+        bwa_data.to_excel(writer, sheet_name='BWA Daten', index=False)
+        other_data.to_excel(writer, sheet_name='Mitglieder', index=False)
+
+
+def check_single_open(file_path):
+    """Blatt-Namen, Vorschau und Import dürfen die Datei nur einmal öffnen"""
+    CountingExcelFile.open_count = 0
+    handler = FileHandler()
+
+    sheet_names = handler.get_sheet_names(file_path)
+    assert sheet_names == ['BWA Daten', 'Mitglieder'], sheet_names
+    assert handler.has_multiple_sheets(file_path)
+
+    # Vorschau wie im Dialog über die gemeinsame Sitzung
+    session = handler.get_session(file_path)
+    session.read_sheet('Mitglieder')
+    preview = session.read_sheet('BWA Daten')
+
+    # Eigentlicher Import
+    df = handler.process_file(file_path, 'BWA Daten')
+    assert len(df) == 3
+    assert list(df.columns) == list(preview.columns)
+
+    # Änderung der Spaltennamen darf den Sitzungs-Cache nicht verändern
+    df.columns = [c.upper() for c in df.columns]
+    assert 'Sachkontonr.' in session.read_sheet('BWA Daten').columns
+
+    # ODS wird mit dem Streaming-Leser gelesen und nie über odfpy geöffnet
+    expected_opens = 0 if file_path.endswith('.ods') else 1
+    assert CountingExcelFile.open_count == expected_opens, f"Datei {CountingExcelFile.open_count}x geöffnet"
+
+    handler.close_session()
+    return True
+
+
+def check_preview(file_path, engine):
+    """Die Vorschau liest nur Kopfzeile und die ersten Zeilen"""
+    big_data = pd.DataFrame({
+        'Sachkontonr.': [str(1000 + i % 7) for i in range(500)],
+        'Betrag': [i * 0.5 for i in range(500)],
+        'Buchungstag': ['2024-01-15'] * 500
+    })
+    with pd.ExcelWriter(file_path, engine=engine) as writer:
+        big_data.to_excel(writer, sheet_name='Buchungen', index=False)
+        pd.DataFrame({'Leer': []}).to_excel(writer, sheet_name='Leer', index=False)
+
+    CountingExcelFile.open_count = 0
+    session = WorkbookSession(file_path)
+    assert session.sheet_names == ['Buchungen', 'Leer']
+
+    preview, total_rows = session.read_preview('Buchungen', 10)
+    assert len(preview) == 10, len(preview)
+    assert list(preview.columns) == ['Sachkontonr.', 'Betrag', 'Buchungstag']
+    assert preview['Betrag'].iloc[3] == 1.5
+    if engine == 'openpyxl':
+        # Zeilenanzahl aus den Blatt-Metadaten
+        assert total_rows == 500, total_rows
+    else:
+        # ODS wird ohne odfpy-Vollparsing gestreamt
+        assert total_rows is None
+        assert CountingExcelFile.open_count == 0, "ODS-Vorschau hat die Datei vollständig geöffnet"
+
+    # Zweiter Aufruf kommt aus dem Cache
+    assert session.read_preview('Buchungen', 10)[0] is preview
+
+    empty_preview, _ = session.read_preview('Leer', 10)
+    assert len(empty_preview) == 0
+
+    session.close()
+    return True
+
+
+def check_invalidation(file_path):
+    """Eine geänderte Datei muss neu geöffnet werden"""
+    handler = FileHandler()
+    session = handler.get_session(file_path)
+    assert handler.get_session(file_path) is session
+
+    # Datei neu schreiben (Änderungszeit ändert sich)
+    time.sleep(0.01)
+    create_workbook(file_path, 'openpyxl')
+    os.utime(file_path, None)
+    assert handler.get_session(file_path) is not session
+
+    handler.close_session()
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Arbeitsmappen-Sitzung ===")
+    original_excel_file = workbook_session.pd.ExcelFile
+    workbook_session.pd.ExcelFile = CountingExcelFile
+
+    temp_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        xlsx_path = os.path.join(temp_dir, 'sitzung.xlsx')
+        create_workbook(xlsx_path, 'openpyxl')
+        results.append(("Excel einmal öffnen", check_single_open(xlsx_path)))
+        results.append(("Ungültig nach Änderung", check_invalidation(xlsx_path)))
+        results.append(("Excel-Vorschau", check_preview(os.path.join(temp_dir, 'vorschau.xlsx'), 'openpyxl')))
+
+        try:
+            ods_path = os.path.join(temp_dir, 'sitzung.ods')
+            create_workbook(ods_path, 'odf')
+            results.append(("ODS einmal öffnen", check_single_open(ods_path)))
+            results.append(("ODS-Vorschau", check_preview(os.path.join(temp_dir, 'vorschau.ods'), 'odf')))
+        except ImportError:
+            print("⚠️ ODS-Test übersprungen - odfpy nicht installiert")
+
+    except AssertionError as e:
+        print(f"❌ Test fehlgeschlagen: {e}")
+        results.append(("Arbeitsmappen-Sitzung", False))
+    finally:
+        workbook_session.pd.ExcelFile = original_excel_file
+        for name in os.listdir(temp_dir):
+            os.remove(os.path.join(temp_dir, name))
+        os.rmdir(temp_dir)
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
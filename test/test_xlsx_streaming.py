@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test des Streaming-Imports für .xlsx-Dateien (read-only, in Teilstücken)
+"""
+
+import sys
+import os
+import tempfile
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtCore import QCoreApplication
+
+app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+from src.utils.csv_processor import CSVProcessor, USED_COLUMNS
+from src.utils.file_handler import FileHandler
+from synthetic_ledger import generate_ledger
+from test_helpers import isolated_settings
+
+
+def create_ledger(file_path, rows=257):
+    """Erstellt eine Buchungsliste mit numerischen Sachkonten, einer ungenutzten Spalte und ungültigen Zeilen"""
+    df = generate_ledger(rows, accounts=9, amount_format='german', seed=30)
+    df['Sachkontonr.'] = df['Sachkontonr.'].astype(int)
+    df['Interne Notiz'] = 'nicht benötigt'
+    # Ungültige Zeilen, die verworfen werden müssen
+    df.loc[5, 'Betrag'] = None
+    df.loc[17, 'Buchungstag'] = 'kein Datum'
+    df.to_excel(file_path, sheet_name='Buchungen', index=False)
+
+
+def legacy_result(processor, file_path):
+    """Verarbeitung über pd.read_excel wie bisher"""
+    processor.raw_data = FileHandler().process_file(file_path, 'Buchungen')
+    processor.raw_data.columns = processor.raw_data.columns.str.strip()
+    assert processor._process_data()
+    return processor.processed_data
+
+
+def check_equivalence(file_path):
+    """Streaming und Vollimport liefern dieselben verarbeiteten Werte"""
+    processor = CSVProcessor()
+    expected = legacy_result(processor, file_path)
+
+    # Kleine Teilstücke erzwingen, damit Grenzen zwischen Teilstücken geprüft werden
+    handler = FileHandler()
+    chunks = list(handler.iter_xlsx_chunks(file_path, 'Buchungen', USED_COLUMNS, chunk_size=50))
+    assert len(chunks) == 6, len(chunks)
+    assert 'Interne Notiz' not in chunks[0].columns
+    handler.close_session()
+
+    processor.xlsx_chunk_rows = 50
+    assert processor._load_xlsx_streaming(file_path, 'Buchungen')
+    actual = processor.processed_data
+    assert processor.raw_data is None
+
+    assert len(actual) == len(expected) == 255, (len(actual), len(expected))
+    assert list(actual.index) == list(expected.index)
+    for column in ['Sachkontonr.', 'Betrag_Clean', 'Buchungstag_Clean', 'Quartal', 'Verwendungszweck']:
+        assert actual[column].tolist() == expected[column].tolist(), column
+    return True
+
+
+def check_empty_sheet(temp_dir):
+    """Leeres Blatt mit Kopfzeile ergibt ein leeres Ergebnis"""
+    file_path = os.path.join(temp_dir, 'leer.xlsx')
+    pd.DataFrame(columns=['Sachkontonr.', 'Betrag', 'Buchungstag']).to_excel(file_path, index=False)
+    chunks = list(FileHandler().iter_xlsx_chunks(file_path, columns=USED_COLUMNS))
+    assert len(chunks) == 1 and chunks[0].empty
+    assert list(chunks[0].columns) == ['Sachkontonr.', 'Betrag', 'Buchungstag']
+    return True
+
+
+def main():
+    """Führt alle Tests aus"""
+    print("=== Test: Streaming-Import für .xlsx ===")
+    with isolated_settings({"decimal_separator": ","}):
+        temp_dir = tempfile.mkdtemp()
+        results = []
+        try:
+            file_path = os.path.join(temp_dir, 'buchungen.xlsx')
+            create_ledger(file_path)
+            results.append(("Gleiches Ergebnis wie Vollimport", check_equivalence(file_path)))
+            results.append(("Leeres Blatt", check_empty_sheet(temp_dir)))
+        except AssertionError as e:
+            print(f"❌ Test fehlgeschlagen: {e}")
+            results.append(("Streaming-Import", False))
+        finally:
+            for name in os.listdir(temp_dir):
+                os.remove(os.path.join(temp_dir, name))
+            os.rmdir(temp_dir)
+
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    return all(passed for _, passed in results)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)